@@ -1,24 +1,153 @@
 """
 AWS Connect Contact Flow와 연동되는 Lambda 함수
+
+콜드 스타트 최적화:
+- boto3와 NLU 모듈은 처음 필요한 요청에서 임포트 (영업시간/대기열 확인은 AWS SDK 없이 처리)
+- AWS 클라이언트와 NLU 인스턴스(시스템 프롬프트 포함)는 컨테이너 재사용 동안 모듈 범위에서 유지
+- 호출별 단계 소요 시간을 한 줄 로그로 기록 (Connect 타임아웃 8초 대비 남은 시간 포함)
 """
 import json
 import logging
 import os
+import time
+from contextlib import contextmanager
 from typing import Dict, Any, Optional
-import boto3
 from datetime import datetime
 
+from conversation_log_pipeline import (
+    CONVERSATION_LOG, ESCALATION_LOG, ConversationLogPipeline, LogSpool, default_delivery_mode
+)
+
 # 로깅 설정
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-# AWS 클라이언트 초기화
-dynamodb = boto3.resource('dynamodb')
-s3_client = boto3.client('s3')
-
 # 환경 변수
 CONVERSATIONS_TABLE = os.environ.get('CONVERSATIONS_TABLE', 'aicc-conversations')
 CHATBOT_RESPONSES_BUCKET = os.environ.get('CHATBOT_RESPONSES_BUCKET', 'aicc-chatbot-responses')
+# Connect 흐름의 Lambda 호출 제한 시간 안에 응답하도록 Bedrock 호출 시간 제한
+BEDROCK_CONNECT_TIMEOUT = float(os.environ.get('BEDROCK_CONNECT_TIMEOUT', '1'))
+BEDROCK_READ_TIMEOUT = float(os.environ.get('BEDROCK_READ_TIMEOUT', '5'))
+# 응답 이후 로그 기록용 스풀 디렉터리 (컨테이너 재사용 동안 유지)
+LOG_SPOOL_DIR = os.environ.get('LOG_SPOOL_DIR', '/tmp/aicc-log-spool')
+# 프로비저닝된 동시성 사용 시 초기화 단계에서 NLU 미리 생성
+PRELOAD_NLU = os.environ.get('PRELOAD_NLU', 'false').lower() == 'true'
+
+CONNECT_TIMEOUT_MS = 8000
+
+# 컨테이너 재사용 동안 유지되는 AWS 클라이언트/NLU 인스턴스
+_aws_clients: Dict[str, Any] = {}
+_nlu = None
+_cold_start = True
+
+def get_dynamodb():
+    """DynamoDB 리소스 (컨테이너당 1회 생성)"""
+    if 'dynamodb' not in _aws_clients:
+        import boto3
+        _aws_clients['dynamodb'] = boto3.resource('dynamodb')
+    return _aws_clients['dynamodb']
+
+def get_s3_client():
+    """S3 클라이언트 (컨테이너당 1회 생성)"""
+    if 's3' not in _aws_clients:
+        import boto3
+        _aws_clients['s3'] = boto3.client('s3')
+    return _aws_clients['s3']
+
+def get_nlu():
+    """Bedrock NLU 인스턴스 (컨테이너당 1회 생성, 시스템 프롬프트도 이때 한 번만 구성)"""
+    global _nlu
+    if _nlu is None:
+        import boto3
+        from botocore.config import Config
+        from src.chatbot_nlu_bedrock import BedrockChatbotNLU
+
+        bedrock_client = boto3.client(
+            'bedrock-runtime',
+            region_name=os.environ.get('BEDROCK_REGION', os.environ.get('AWS_REGION', 'us-east-1')),
+            config=Config(
+                connect_timeout=BEDROCK_CONNECT_TIMEOUT,
+                read_timeout=BEDROCK_READ_TIMEOUT,
+                retries={'max_attempts': 2, 'mode': 'standard'},
+                tcp_keepalive=True
+            )
+        )
+        _nlu = BedrockChatbotNLU(bedrock_client=bedrock_client)
+    return _nlu
+
+class InvocationTimer:
+    """호출별 단계 소요 시간 측정"""
+
+    def __init__(self, context=None):
+        self.context = context
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+
+    @contextmanager
+    def measure(self, phase: str):
+        """단계 측정 컨텍스트"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[phase] = self.phases.get(phase, 0.0) + time.perf_counter() - started
+
+    def report(self, request_type: str, contact_id: str, cold_start: bool) -> Dict[str, Any]:
+        """측정 결과를 한 줄 로그로 기록"""
+        metrics = {
+            'request_type': request_type,
+            'contact_id': contact_id,
+            'cold_start': cold_start,
+            'duration_ms': round((time.perf_counter() - self.started) * 1000, 1),
+            'phases_ms': {phase: round(elapsed * 1000, 1) for phase, elapsed in self.phases.items()}
+        }
+        if self.context is not None and hasattr(self.context, 'get_remaining_time_in_millis'):
+            metrics['remaining_ms'] = self.context.get_remaining_time_in_millis()
+
+        if metrics['duration_ms'] > CONNECT_TIMEOUT_MS * 0.5:
+            logger.warning(f"Connect 응답 지연: {json.dumps(metrics, ensure_ascii=False)}")
+        else:
+            logger.info(f"호출 처리 시간: {json.dumps(metrics, ensure_ascii=False)}")
+        return metrics
+
+# 현재 호출의 측정기 (Lambda 컨테이너는 한 번에 한 호출만 처리)
+_timer: Optional[InvocationTimer] = None
+
+def _measure(phase: str):
+    """현재 호출 측정기로 단계 측정 (측정기가 없으면 새로 생성)"""
+    return (_timer or InvocationTimer()).measure(phase)
+
+def write_conversation_logs(records):
+    """대화 로그 DynamoDB 일괄 기록"""
+    table = get_dynamodb().Table(CONVERSATIONS_TABLE)
+    with table.batch_writer() as batch:
+        for record in records:
+            batch.put_item(Item=record['item'])
+    logger.info(f"대화 로그 저장 완료: {len(records)}건")
+
+def write_escalation_logs(records):
+    """에스컬레이션 로그 S3 기록 (키는 contact_id와 로그 시각으로 결정)"""
+    s3_client = get_s3_client()
+    for record in records:
+        log_time = datetime.fromisoformat(record['timestamp'])
+        log_key = f"escalations/{record['contact_id']}/{log_time.strftime('%Y%m%d_%H%M%S_%f')}.json"
+        s3_client.put_object(
+            Bucket=CHATBOT_RESPONSES_BUCKET,
+            Key=log_key,
+            Body=json.dumps(record['item'], ensure_ascii=False),
+            ContentType='application/json'
+        )
+    logger.info(f"에스컬레이션 로그 저장 완료: {len(records)}건")
+
+# 초기화 단계에서 생성 (Lambda 확장 등록은 초기화 단계에서만 가능)
+log_pipeline = ConversationLogPipeline(
+    LogSpool(LOG_SPOOL_DIR),
+    {CONVERSATION_LOG: write_conversation_logs, ESCALATION_LOG: write_escalation_logs}
+)
+log_pipeline.start(default_delivery_mode())
+
+if PRELOAD_NLU:
+    get_nlu()
 
 def lambda_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
     """
@@ -31,8 +160,15 @@ def lambda_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
     Returns:
         Dict: Connect로 반환할 응답 데이터
     """
+    global _timer, _cold_start
+    _timer = InvocationTimer(context)
+    cold_start, _cold_start = _cold_start, False
+    request_type = None
+    contact_id = ''
+
     try:
-        logger.info(f"Lambda 이벤트 수신: {json.dumps(event, ensure_ascii=False)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Lambda 이벤트 수신: {json.dumps(event, ensure_ascii=False)}")
         
         # Connect 이벤트에서 필요한 정보 추출
         contact_data = event.get('Details', {}).get('ContactData', {})
@@ -51,7 +187,7 @@ def lambda_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
         # 요청 타입 확인
         request_type = parameters.get('requestType', 'chat')
         
-        logger.info(f"처리 요청 - Contact ID: {contact_id}, 입력: {user_input}, 의도: {intent_name}")
+        logger.debug(f"처리 요청 - Contact ID: {contact_id}, 입력: {user_input}, 의도: {intent_name}")
         
         # 요청 타입별 처리
         if request_type == 'chat':
@@ -67,26 +203,33 @@ def lambda_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
         else:
             response = handle_default_request(contact_id, user_input, session_attributes)
         
-        logger.info(f"응답 생성 완료: {json.dumps(response, ensure_ascii=False)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"응답 생성 완료: {json.dumps(response, ensure_ascii=False)}")
         return response
         
     except Exception as e:
         logger.error(f"Lambda 처리 중 오류 발생: {str(e)}", exc_info=True)
         return create_error_response(str(e))
+    finally:
+        # 로그 기록은 응답 이후 수행 (inline 모드만 여기서 기록)
+        with _measure('log_handoff'):
+            log_pipeline.invocation_finished()
+        _timer.report(request_type or 'unknown', contact_id, cold_start)
+        _timer = None
 
 def handle_chat_request(contact_id: str, user_input: str, 
                        session_attributes: Dict, customer_phone: str) -> Dict[str, Any]:
     """채팅 요청 처리"""
     try:
-        # NLU 모듈 임포트 (여기서 임포트하여 콜드 스타트 최적화)
-        from src.chatbot_nlu_bedrock import BedrockChatbotNLU
-        
-        # NLU 처리
-        nlu = BedrockChatbotNLU()
-        nlu_result = nlu.process_message(user_input, contact_id, session_attributes)
+        # NLU 처리 (컨테이너 재사용 시 인스턴스 재사용)
+        with _measure('nlu_init'):
+            nlu = get_nlu()
+        with _measure('nlu'):
+            nlu_result = nlu.process_message(user_input, contact_id, session_attributes)
         
         # 대화 로그 저장
-        save_conversation_log(contact_id, user_input, nlu_result, customer_phone)
+        with _measure('conversation_log'):
+            save_conversation_log(contact_id, user_input, nlu_result, customer_phone)
         
         # Connect 응답 형식으로 변환
         response = {
@@ -154,7 +297,8 @@ def handle_escalation_request(contact_id: str, session_attributes: Dict,
             'queue_info': queue_info
         }
         
-        save_escalation_log(escalation_data)
+        with _measure('escalation_log'):
+            save_escalation_log(escalation_data)
         
         # 대기 시간에 따른 응답 생성
         if queue_info['estimated_wait_time'] > 300:  # 5분 이상
@@ -255,10 +399,8 @@ def handle_default_request(contact_id: str, user_input: str,
 
 def save_conversation_log(contact_id: str, user_input: str, 
                          nlu_result, customer_phone: str):
-    """대화 로그 DynamoDB 저장"""
+    """대화 로그 저장 요청 (DynamoDB 기록은 응답 이후 수행)"""
     try:
-        table = dynamodb.Table(CONVERSATIONS_TABLE)
-        
         log_item = {
             'contact_id': contact_id,
             'timestamp': datetime.now().isoformat(),
@@ -273,27 +415,21 @@ def save_conversation_log(contact_id: str, user_input: str,
             'claude_reasoning': nlu_result.claude_reasoning
         }
         
-        table.put_item(Item=log_item)
-        logger.info(f"대화 로그 저장 완료: {contact_id}")
+        log_pipeline.enqueue(CONVERSATION_LOG, contact_id, log_item['timestamp'], log_item)
         
     except Exception as e:
         logger.error(f"대화 로그 저장 오류: {str(e)}")
 
 def save_escalation_log(escalation_data: Dict):
-    """에스컬레이션 로그 저장"""
+    """에스컬레이션 로그 저장 요청 (S3 기록은 응답 이후 수행)"""
     try:
-        # S3에 에스컬레이션 로그 저장
-        log_key = f"escalations/{escalation_data['contact_id']}/{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        
-        s3_client.put_object(
-            Bucket=CHATBOT_RESPONSES_BUCKET,
-            Key=log_key,
-            Body=json.dumps(escalation_data, ensure_ascii=False),
-            ContentType='application/json'
+        log_pipeline.enqueue(
+            ESCALATION_LOG,
+            escalation_data['contact_id'],
+            escalation_data['escalation_time'],
+            escalation_data
         )
         
-        logger.info(f"에스컬레이션 로그 저장 완료: {log_key}")
-        
     except Exception as e:
         logger.error(f"에스컬레이션 로그 저장 오류: {str(e)}")
 
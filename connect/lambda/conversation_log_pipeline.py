@@ -0,0 +1,288 @@
+"""
+Connect Lambda 대화/에스컬레이션 로그 비동기 전송 파이프라인
+
+핸들러는 로그를 /tmp의 추가 전용 스풀 파일에 기록만 하고 바로 Connect에 응답합니다.
+저장소 기록은 응답 이후 다음 중 한 방식으로 수행됩니다.
+
+- extension: 내부 Lambda 확장(INVOKE 이벤트 구독) 스레드가 핸들러 종료 후 일괄 기록.
+  Lambda는 확장이 다음 이벤트를 요청할 때까지 컨테이너를 동결하지 않으므로 호출자 지연에 포함되지 않음
+- thread: 백그라운드 스레드가 기록 (로컬 실행/확장 미사용 환경)
+- inline: 핸들러 종료 시 동기 기록 (기존 동작)
+- manual: 자동 기록 없음 (``flush`` 직접 호출, 테스트/배치용)
+
+전달은 같은 실행 환경이 살아 있는 동안에만 최소 1회(at-least-once)입니다. 일괄 기록이
+실패하면 건별로 다시 기록하고, 실패한 로그는 시도 횟수를 늘려 스풀 끝에 다시 추가한 뒤
+스풀을 확정하므로 한 건의 오류가 다른 로그의 기록을 막지 않습니다. ``max_attempts``회
+실패한 로그는 ``dead_letter.jsonl``과 오류 로그로 옮겨 더 이상 재시도하지 않습니다.
+재전송 시에도 저장 키가 (contact_id, timestamp)로 결정되므로 중복 기록되지 않습니다.
+
+/tmp는 실행 환경과 함께 사라지고 내부 확장은 SHUTDOWN 이벤트를 받지 못하므로, 실행 환경이
+회수되기 전 기록되지 않은 로그는 유실됩니다.
+"""
+import json
+import logging
+import os
+import threading
+import urllib.request
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CONVERSATION_LOG = 'conversation'
+ESCALATION_LOG = 'escalation'
+
+# 로그 종류별 일괄 기록 함수: records -> None (실패 시 예외)
+LogSink = Callable[[List[Dict[str, Any]]], None]
+
+
+class LogSpool:
+    """
+    추가 전용 로그 스풀 파일
+
+    ``records.jsonl``에 한 줄씩 추가하고, 저장소 기록이 끝난 위치를 ``offset`` 파일에
+    원자적으로 갱신합니다. 확정된 위치가 파일 끝에 도달하면 파일을 비웁니다.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.records_path = self.directory / 'records.jsonl'
+        self.offset_path = self.directory / 'offset'
+        self.dead_letter_path = self.directory / 'dead_letter.jsonl'
+        self._lock = threading.Lock()
+
+    def append(self, record: Dict[str, Any]):
+        """로그 추가"""
+        line = json.dumps(record, ensure_ascii=False, default=str) + '\n'
+        with self._lock:
+            with open(self.records_path, 'a', encoding='utf-8') as spool:
+                spool.write(line)
+
+    def dead_letter(self, record: Dict[str, Any]):
+        """재시도 한도를 넘은 로그 격리 (스풀 확정 대상에서 제외)"""
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            with open(self.dead_letter_path, 'a', encoding='utf-8') as dead_letter:
+                dead_letter.write(line + '\n')
+        # /tmp는 실행 환경과 함께 사라지므로 CloudWatch에도 원본을 남김
+        logger.error(f"로그 기록 재시도 한도 초과, 격리: {line}")
+
+    def pending(self) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        아직 확정되지 않은 로그 조회
+
+        Returns:
+            Tuple: (로그 목록, 확정 시 사용할 파일 위치)
+        """
+        with self._lock:
+            offset = self._read_offset()
+            try:
+                with open(self.records_path, 'rb') as spool:
+                    spool.seek(offset)
+                    data = spool.read()
+            except FileNotFoundError:
+                return [], offset
+
+        # 기록 도중인 마지막 줄은 다음 전송에서 처리
+        complete = data[:data.rfind(b'\n') + 1]
+        records = []
+        for line in complete.splitlines():
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                logger.error(f"손상된 스풀 로그 건너뜀: {line[:200]!r}")
+        return records, offset + len(complete)
+
+    def commit(self, position: int):
+        """지정 위치까지 기록 완료 확정"""
+        with self._lock:
+            try:
+                size = self.records_path.stat().st_size
+            except FileNotFoundError:
+                size = 0
+
+            if position >= size:
+                # 모두 기록됨: 파일을 비워 스풀이 계속 커지지 않도록 함
+                self.records_path.write_bytes(b'')
+                position = 0
+            self._write_offset(position)
+
+    def _read_offset(self) -> int:
+        try:
+            return int(self.offset_path.read_text() or 0)
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def _write_offset(self, position: int):
+        temp_path = self.offset_path.with_suffix('.tmp')
+        temp_path.write_text(str(position))
+        os.replace(temp_path, self.offset_path)
+
+
+class ConversationLogPipeline:
+    """대화/에스컬레이션 로그 비동기 일괄 전송기"""
+
+    def __init__(self, spool: LogSpool, sinks: Dict[str, LogSink], max_attempts: int = 5):
+        self.spool = spool
+        self.sinks = sinks
+        self.max_attempts = max_attempts
+        self.mode: Optional[str] = None
+
+        self._flush_lock = threading.Lock()
+        self._invocation_done = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.stats = {
+            'enqueued': 0, 'delivered': 0, 'duplicates': 0, 'failed_flushes': 0, 'retried': 0, 'dead_lettered': 0
+        }
+
+    def enqueue(self, kind: str, contact_id: str, timestamp: str, item: Dict[str, Any]):
+        """
+        로그 추가 (저장소 기록 없이 스풀에만 기록)
+
+        Args:
+            kind: 로그 종류 (conversation, escalation)
+            contact_id: Connect 연락 ID
+            timestamp: 로그 시각 (중복 제거 키)
+            item: 저장할 로그 내용
+        """
+        self.spool.append({'kind': kind, 'contact_id': contact_id, 'timestamp': timestamp, 'item': item})
+        self.stats['enqueued'] += 1
+
+    def flush(self) -> int:
+        """
+        스풀의 미확정 로그를 저장소에 일괄 기록
+
+        Returns:
+            int: 기록한 로그 수 (중복 제거 후)
+        """
+        with self._flush_lock:
+            records, position = self.spool.pending()
+            if not records:
+                return 0
+
+            # (종류, contact_id, timestamp) 기준 중복 제거 (마지막 기록 우선)
+            unique: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+            for record in records:
+                unique[(record['kind'], record['contact_id'], record['timestamp'])] = record
+            self.stats['duplicates'] += len(records) - len(unique)
+
+            by_kind: Dict[str, List[Dict[str, Any]]] = {}
+            for record in unique.values():
+                by_kind.setdefault(record['kind'], []).append(record)
+
+            delivered = 0
+            failed = False
+            for kind, kind_records in by_kind.items():
+                sink = self.sinks.get(kind)
+                if sink is None:
+                    logger.error(f"알 수 없는 로그 종류: {kind} ({len(kind_records)}건 폐기)")
+                    continue
+                try:
+                    sink(kind_records)
+                    delivered += len(kind_records)
+                    continue
+                except Exception as e:
+                    failed = True
+                    logger.error(f"로그 일괄 기록 오류, 건별 재시도: {str(e)}")
+
+                # 오류 로그를 골라내 나머지는 기록
+                for record in kind_records:
+                    try:
+                        sink([record])
+                        delivered += 1
+                    except Exception as e:
+                        self._retry_later(record, e)
+
+            # 실패한 로그는 스풀 끝에 다시 추가했으므로 이번 위치까지 확정
+            self.spool.commit(position)
+            if failed:
+                self.stats['failed_flushes'] += 1
+            self.stats['delivered'] += delivered
+            return delivered
+
+    def _retry_later(self, record: Dict[str, Any], error: Exception):
+        """실패한 로그를 시도 횟수와 함께 다시 스풀에 추가하거나 한도 초과 시 격리"""
+        record = dict(record, attempts=record.get('attempts', 0) + 1, error=str(error))
+        if record['attempts'] >= self.max_attempts:
+            self.spool.dead_letter(record)
+            self.stats['dead_lettered'] += 1
+        else:
+            self.spool.append(record)
+            self.stats['retried'] += 1
+
+    def start(self, mode: str):
+        """
+        자동 전송 시작
+
+        Args:
+            mode: extension, thread, inline, manual 중 하나
+        """
+        if mode == 'extension':
+            try:
+                extension_id = self._register_extension()
+            except Exception as e:
+                logger.error(f"Lambda 확장 등록 오류, 백그라운드 스레드로 전환: {str(e)}")
+                mode = 'thread'
+            else:
+                self._thread = threading.Thread(
+                    target=self._run_extension, args=(extension_id,), name='log-pipeline-extension', daemon=True
+                )
+                self._thread.start()
+
+        if mode == 'thread':
+            self._thread = threading.Thread(target=self._run_thread, name='log-pipeline', daemon=True)
+            self._thread.start()
+
+        self.mode = mode
+
+    def invocation_finished(self):
+        """핸들러 종료 알림 (응답 직전 호출)"""
+        if self.mode == 'inline':
+            self.flush()
+        elif self._thread is not None:
+            self._invocation_done.set()
+
+    def _run_thread(self):
+        while True:
+            self._invocation_done.wait()
+            self._invocation_done.clear()
+            self.flush()
+
+    def _run_extension(self, extension_id: str):
+        while True:
+            # 다음 호출 시작까지 대기 (이 요청이 이전 호출의 후처리 완료를 의미)
+            self._extension_request('event/next', extension_id=extension_id)
+            self._invocation_done.wait()
+            self._invocation_done.clear()
+            self.flush()
+
+    def _register_extension(self) -> str:
+        request = urllib.request.Request(
+            self._extension_url('register'),
+            data=json.dumps({'events': ['INVOKE']}).encode(),
+            headers={'Lambda-Extension-Name': 'conversation-log-pipeline'},
+            method='POST'
+        )
+        with urllib.request.urlopen(request) as response:
+            return response.headers['Lambda-Extension-Identifier']
+
+    def _extension_request(self, path: str, extension_id: str):
+        request = urllib.request.Request(
+            self._extension_url(path), headers={'Lambda-Extension-Identifier': extension_id}
+        )
+        with urllib.request.urlopen(request) as response:
+            return response.read()
+
+    @staticmethod
+    def _extension_url(path: str) -> str:
+        return f"http://{os.environ['AWS_LAMBDA_RUNTIME_API']}/2020-01-01/extension/{path}"
+
+
+def default_delivery_mode() -> str:
+    """실행 환경에 맞는 전송 방식 (LOG_DELIVERY_MODE 환경 변수 우선)"""
+    mode = os.environ.get('LOG_DELIVERY_MODE')
+    if mode:
+        return mode
+    return 'extension' if os.environ.get('AWS_LAMBDA_RUNTIME_API') else 'thread'
@@ -5,6 +5,7 @@ from flask import Flask, request, jsonify, session
 from flask_cors import CORS
 import logging
 import json
+import os
 from typing import Dict, Any
 import uuid
 from datetime import datetime
@@ -14,21 +15,21 @@ from ..services.nlu_service import NLUService
 from ..services.escalation_service import EscalationService
 from ..chatbot_scenario import ChatbotScenario
 from ..chatbot_faq import ChatbotFAQ
-from ..utils.logger import setup_logger
-from ..utils.config import Config
+from ..utils.logger import get_logger
+from ..utils.tracing import get_tracer, traced
 
 # 로거 설정
-logger = setup_logger(__name__)
+logger = get_logger(__name__)
 
 # Flask 앱 생성
 app = Flask(__name__)
-app.secret_key = Config.get('SECRET_KEY', 'default-secret-key')
+app.secret_key = os.getenv('SECRET_KEY', 'default-secret-key')
 CORS(app)
 
 # 서비스 초기화
 conversation_service = ConversationService()
-nlu_service = NLUService(Config.get('LEX_BOT_NAME'))
-escalation_service = EscalationService(Config.get('CONNECT_INSTANCE_ID'))
+nlu_service = NLUService(os.getenv('LEX_BOT_NAME'))
+escalation_service = EscalationService(os.getenv('CONNECT_INSTANCE_ID'))
 scenario_manager = ChatbotScenario()
 faq_manager = ChatbotFAQ()
 
@@ -41,6 +42,16 @@ def health_check():
         'version': '1.0.0'
     })
 
+@app.route('/api/v1/metrics/latency', methods=['GET'])
+def get_latency_metrics():
+    """단계별 지연 히스토그램 조회 (reset=true면 조회 후 초기화)"""
+    reset = request.args.get('reset', 'false').lower() == 'true'
+    return jsonify({
+        'success': True,
+        'stages': get_tracer().get_latency_stats(reset=reset),
+        'timestamp': datetime.now().isoformat()
+    })
+
 @app.route('/api/v1/conversation/start', methods=['POST'])
 def start_conversation():
     """대화 시작"""
@@ -80,6 +91,7 @@ def start_conversation():
         }), 500
 
 @app.route('/api/v1/conversation/message', methods=['POST'])
+@traced('chatbot_api.send_message')
 def send_message():
     """메시지 전송 및 처리"""
     try:
@@ -119,7 +131,7 @@ def send_message():
         )
         
         # 응답 처리
-        response_data = await _process_nlu_result(conversation, nlu_result)
+        response_data = _process_nlu_result(conversation, nlu_result)
         
         return jsonify(response_data)
         
@@ -392,7 +404,7 @@ def get_conversation_status():
             'error': '상태를 조회할 수 없습니다.'
         }), 500
 
-async def _process_nlu_result(conversation, nlu_result):
+def _process_nlu_result(conversation, nlu_result):
     """NLU 결과 처리"""
     try:
         if not nlu_result['success']:
@@ -515,7 +527,7 @@ def internal_error(error):
 
 if __name__ == '__main__':
     app.run(
-        host=Config.get('API_HOST', '0.0.0.0'),
-        port=Config.get('API_PORT', 8000),
-        debug=Config.get('DEBUG', False)
+        host=os.getenv('API_HOST', '0.0.0.0'),
+        port=int(os.getenv('API_PORT', '8000')),
+        debug=os.getenv('DEBUG', 'false').lower() == 'true'
     ) 
\ No newline at end of file
@@ -0,0 +1,493 @@
+"""
+AWS Connect 콜센터용 챗봇 API (ASGI 비동기 버전)
+Flask 버전(chatbot_api.py)과 동일한 경로/요청/응답 형식을 제공하며,
+저장소/NLU 호출은 제한된 I/O 스레드 풀에서 실행하고 서로 독립적인 호출은 동시에 수행
+
+실행: uvicorn --factory src.api.chatbot_api_async:create_app
+"""
+import logging
+import os
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from starlette.exceptions import HTTPException as StarletteHTTPException
+from starlette.middleware.sessions import SessionMiddleware
+
+from ..utils.async_executor import BoundedExecutor
+from ..utils.logger import init_logging
+from ..utils.tracing import get_tracer, traced
+
+# 로깅 핸들러 설정은 앱 시작 시 수행 (import만으로 루트 핸들러/로그 디렉터리를 만들지 않음)
+logger = logging.getLogger(__name__)
+
+
+def _map_intent_to_scenario(intent):
+    """의도를 시나리오에 매핑"""
+    mapping = {
+        'product_inquiry': 'product_inquiry',
+        'reservation': 'reservation',
+        'cancel_request': 'cancellation',
+        'technical_support': 'tech_support'
+    }
+    return mapping.get(intent)
+
+
+def _error(message: str, status_code: int, **extra) -> JSONResponse:
+    """오류 응답 생성"""
+    return JSONResponse({'success': False, 'error': message, **extra}, status_code=status_code)
+
+
+async def _json_body(request: Request) -> Dict[str, Any]:
+    """요청 본문 JSON 파싱 (본문이 없으면 빈 딕셔너리)"""
+    body = await request.body()
+    if not body:
+        return {}
+    return await request.json()
+
+
+def create_app(conversation_service=None, nlu_service=None, escalation_service=None,
+               scenario_manager=None, faq_manager=None,
+               executor: Optional[BoundedExecutor] = None) -> FastAPI:
+    """
+    챗봇 API 앱 생성
+
+    Args:
+        conversation_service: 대화 서비스 (None시 ConversationService 생성)
+        nlu_service: NLU 서비스 (None시 NLUService 생성)
+        escalation_service: 에스컬레이션 서비스 (None시 EscalationService 생성)
+        scenario_manager: 시나리오 관리자 (None시 ChatbotScenario 생성)
+        faq_manager: FAQ 관리자 (None시 ChatbotFAQ 생성)
+        executor: 블로킹 호출 실행기 (None시 기본 크기로 생성)
+
+    Returns:
+        FastAPI: ASGI 앱
+    """
+    if conversation_service is None:
+        from ..services.conversation_service import ConversationService
+        conversation_service = ConversationService()
+    if nlu_service is None:
+        from ..services.nlu_service import NLUService
+        nlu_service = NLUService(os.getenv('LEX_BOT_NAME'))
+    if escalation_service is None:
+        from ..services.escalation_service import EscalationService
+        escalation_service = EscalationService(os.getenv('CONNECT_INSTANCE_ID'))
+    if scenario_manager is None:
+        from ..chatbot_scenario import ChatbotScenario
+        scenario_manager = ChatbotScenario()
+    if faq_manager is None:
+        from ..chatbot_faq import ChatbotFAQ
+        faq_manager = ChatbotFAQ()
+
+    io = executor or BoundedExecutor()
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        init_logging(log_level=os.getenv('LOG_LEVEL', 'INFO'))
+        yield
+        io.shutdown(wait=False)
+
+    app = FastAPI(title='AICC 챗봇 API', version='1.0.0', docs_url=None, redoc_url=None, lifespan=lifespan)
+    app.add_middleware(SessionMiddleware, secret_key=os.getenv('SECRET_KEY', 'default-secret-key'))
+    app.add_middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'])
+    app.state.executor = io
+
+    @app.get('/health')
+    async def health_check():
+        """헬스 체크"""
+        return {
+            'status': 'healthy',
+            'timestamp': datetime.now().isoformat(),
+            'version': '1.0.0'
+        }
+
+    @app.get('/api/v1/metrics/latency')
+    async def get_latency_metrics(reset: bool = False):
+        """단계별 지연 히스토그램 조회 (reset=true면 조회 후 초기화)"""
+        return {
+            'success': True,
+            'stages': get_tracer().get_latency_stats(reset=reset),
+            'timestamp': datetime.now().isoformat()
+        }
+
+    @app.post('/api/v1/conversation/start')
+    async def start_conversation(request: Request):
+        """대화 시작"""
+        try:
+            data = await _json_body(request)
+
+            session_id = data.get('session_id') or str(uuid.uuid4())
+            conversation = await io.run(
+                conversation_service.create_conversation,
+                session_id=session_id,
+                user_id=data.get('user_id'),
+                channel=data.get('channel', 'web_chat')
+            )
+
+            request.session['conversation_id'] = conversation.conversation_id
+            request.session['session_id'] = session_id
+
+            return {
+                'success': True,
+                'conversation_id': conversation.conversation_id,
+                'session_id': session_id,
+                'message': '안녕하세요! 무엇을 도와드릴까요?',
+                'timestamp': datetime.now().isoformat()
+            }
+
+        except Exception as e:
+            logger.error(f"대화 시작 오류: {str(e)}")
+            return _error('대화를 시작할 수 없습니다.', 500, timestamp=datetime.now().isoformat())
+
+    @app.post('/api/v1/conversation/message')
+    @traced('chatbot_api.send_message')
+    async def send_message(request: Request):
+        """메시지 전송 및 처리"""
+        try:
+            data = await _json_body(request)
+
+            conversation_id = request.session.get('conversation_id')
+            if not conversation_id:
+                return _error('활성 대화가 없습니다.', 400)
+
+            user_message = data.get('message', '').strip()
+            if not user_message:
+                return _error('메시지가 비어있습니다.', 400)
+
+            conversation = await io.run(conversation_service.get_conversation, conversation_id)
+            if not conversation:
+                return _error('대화를 찾을 수 없습니다.', 404)
+
+            # 사용자 메시지 저장과 NLU 처리는 서로 독립적이므로 동시 실행
+            session_id = request.session.get('session_id')
+            stored_message, nlu_result = await io.gather(
+                io.run(conversation_service.send_user_message, conversation_id, user_message),
+                io.run(nlu_service.process_user_input, user_message, session_id, conversation.context)
+            )
+            if stored_message is not None:
+                conversation.add_message(stored_message)
+
+            return await _process_nlu_result(conversation, nlu_result, session_id)
+
+        except Exception as e:
+            logger.error(f"메시지 처리 오류: {str(e)}")
+            return _error('메시지를 처리할 수 없습니다.', 500, timestamp=datetime.now().isoformat())
+
+    @app.post('/api/v1/conversation/faq')
+    async def search_faq(request: Request):
+        """FAQ 검색"""
+        try:
+            data = await _json_body(request)
+            query = data.get('query', '').strip()
+            category = data.get('category')
+
+            if not query:
+                return _error('검색어가 필요합니다.', 400)
+
+            search_result = await io.run(faq_manager.search_faq, query, category)
+
+            faq_items = [
+                {
+                    'faq_id': faq.faq_id,
+                    'category': faq.category,
+                    'question': faq.question,
+                    'answer': faq.answer,
+                    'keywords': faq.keywords
+                }
+                for faq in search_result.faq_items
+            ]
+
+            return {
+                'success': True,
+                'query': query,
+                'total_count': search_result.total_count,
+                'confidence': search_result.confidence_score,
+                'faqs': faq_items,
+                'timestamp': datetime.now().isoformat()
+            }
+
+        except Exception as e:
+            logger.error(f"FAQ 검색 오류: {str(e)}")
+            return _error('FAQ 검색 중 오류가 발생했습니다.', 500)
+
+    @app.post('/api/v1/conversation/escalate')
+    async def escalate_conversation(request: Request):
+        """대화 에스컬레이션"""
+        try:
+            data = await _json_body(request)
+
+            conversation_id = request.session.get('conversation_id')
+            if not conversation_id:
+                return _error('활성 대화가 없습니다.', 400)
+
+            reason = data.get('reason', 'customer_request')
+            description = data.get('description', '고객 요청에 의한 상담원 연결')
+
+            conversation = await io.run(conversation_service.get_conversation, conversation_id)
+            if not conversation:
+                return _error('대화를 찾을 수 없습니다.', 404)
+
+            escalation_result = await io.run(
+                escalation_service.process_manual_escalation,
+                session_id=request.session.get('session_id'),
+                reason=reason,
+                description=description,
+                conversation_history=[msg.to_dict() for msg in conversation.messages],
+                customer_data=conversation.context.get('customer_data', {})
+            )
+
+            if escalation_result['success']:
+                await io.run(
+                    conversation_service.escalate_conversation,
+                    conversation_id,
+                    escalation_result['escalation_id'],
+                    reason
+                )
+
+            return {
+                'success': escalation_result['success'],
+                'message': escalation_result.get('message'),
+                'escalation_id': escalation_result.get('escalation_id'),
+                'reference_number': escalation_result.get('reference_number'),
+                'estimated_wait_time': escalation_result.get('estimated_wait_time'),
+                'timestamp': datetime.now().isoformat()
+            }
+
+        except Exception as e:
+            logger.error(f"에스컬레이션 요청 오류: {str(e)}")
+            return _error('상담원 연결 요청을 처리할 수 없습니다.', 500)
+
+    @app.post('/api/v1/conversation/scenario/start')
+    async def start_scenario(request: Request):
+        """시나리오 시작"""
+        try:
+            data = await _json_body(request)
+
+            scenario_id = data.get('scenario_id')
+            if not scenario_id:
+                return _error('시나리오 ID가 필요합니다.', 400)
+
+            result = await io.run(
+                scenario_manager.start_scenario,
+                request.session.get('session_id'), scenario_id, data.get('initial_data', {})
+            )
+
+            if result['success']:
+                request.session['active_scenario'] = scenario_id
+                request.session['scenario_step'] = result['step_id']
+
+            return {
+                'success': result['success'],
+                'message': result.get('message'),
+                'step_id': result.get('step_id'),
+                'input_type': result.get('input_type'),
+                'timestamp': datetime.now().isoformat()
+            }
+
+        except Exception as e:
+            logger.error(f"시나리오 시작 오류: {str(e)}")
+            return _error('시나리오를 시작할 수 없습니다.', 500)
+
+    @app.post('/api/v1/conversation/scenario/input')
+    async def process_scenario_input(request: Request):
+        """시나리오 입력 처리"""
+        try:
+            data = await _json_body(request)
+
+            user_input = data.get('input', '').strip()
+            if not user_input:
+                return _error('입력이 필요합니다.', 400)
+
+            session_id = request.session.get('session_id')
+            if not session_id:
+                return _error('세션이 없습니다.', 400)
+
+            result = await io.run(scenario_manager.process_user_input, session_id, user_input)
+
+            if result['success']:
+                request.session['scenario_step'] = result.get('step_id')
+
+            return {
+                'success': result['success'],
+                'message': result.get('message'),
+                'step_id': result.get('step_id'),
+                'input_type': result.get('input_type'),
+                'progress': result.get('progress'),
+                'retry_count': result.get('retry_count'),
+                'timestamp': datetime.now().isoformat()
+            }
+
+        except Exception as e:
+            logger.error(f"시나리오 입력 처리 오류: {str(e)}")
+            return _error('입력을 처리할 수 없습니다.', 500)
+
+    @app.post('/api/v1/conversation/end')
+    async def end_conversation(request: Request):
+        """대화 종료"""
+        try:
+            data = await _json_body(request)
+
+            conversation_id = request.session.get('conversation_id')
+            if not conversation_id:
+                return _error('활성 대화가 없습니다.', 400)
+
+            result = await io.run(
+                conversation_service.complete_conversation, conversation_id, data.get('summary', '')
+            )
+
+            if result:
+                request.session.pop('conversation_id', None)
+                request.session.pop('active_scenario', None)
+                request.session.pop('scenario_step', None)
+
+            return {
+                'success': result,
+                'message': '대화가 완료되었습니다.' if result else '대화 종료 중 오류가 발생했습니다.',
+                'timestamp': datetime.now().isoformat()
+            }
+
+        except Exception as e:
+            logger.error(f"대화 종료 오류: {str(e)}")
+            return _error('대화를 종료할 수 없습니다.', 500)
+
+    @app.get('/api/v1/conversation/status')
+    async def get_conversation_status(request: Request):
+        """대화 상태 조회"""
+        try:
+            conversation_id = request.session.get('conversation_id')
+            if not conversation_id:
+                return _error('활성 대화가 없습니다.', 400)
+
+            conversation = await io.run(conversation_service.get_conversation, conversation_id)
+            if not conversation:
+                return _error('대화를 찾을 수 없습니다.', 404)
+
+            return {
+                'success': True,
+                'conversation_id': conversation.conversation_id,
+                'status': conversation.status.value,
+                'message_count': len(conversation.messages),
+                'duration': conversation.get_conversation_duration(),
+                'assigned_agent': conversation.assigned_agent_id,
+                'active_scenario': request.session.get('active_scenario'),
+                'timestamp': datetime.now().isoformat()
+            }
+
+        except Exception as e:
+            logger.error(f"대화 상태 조회 오류: {str(e)}")
+            return _error('상태를 조회할 수 없습니다.', 500)
+
+    async def _process_nlu_result(conversation, nlu_result, session_id):
+        """NLU 결과 처리"""
+        try:
+            if not nlu_result['success']:
+                return {
+                    'success': False,
+                    'error': nlu_result.get('error'),
+                    'response': '죄송합니다. 요청을 처리할 수 없습니다.'
+                }
+
+            intent = nlu_result['intent']
+            confidence = nlu_result['confidence']
+            entities = nlu_result['entities']
+            next_action = nlu_result['next_action']
+
+            bot_response = None
+            additional_data = {}
+
+            if next_action == 'faq_search':
+                faq_query = entities.get('query', conversation.messages[-1].content)
+                faq_result = await io.run(faq_manager.search_faq, faq_query)
+
+                if faq_result.faq_items and faq_result.confidence_score > 0.7:
+                    bot_response = faq_result.faq_items[0].answer
+                    additional_data['faq_match'] = True
+                else:
+                    bot_response = "관련 정보를 찾지 못했습니다. 다른 질문이 있으시면 말씀해 주세요."
+
+            elif next_action == 'scenario_flow':
+                scenario_id = _map_intent_to_scenario(intent)
+                if scenario_id:
+                    scenario_result = await io.run(
+                        scenario_manager.start_scenario, session_id, scenario_id, entities
+                    )
+                    bot_response = scenario_result.get('message')
+                    additional_data['scenario_started'] = scenario_id
+
+            elif next_action == 'escalate':
+                auto_escalation = await io.run(
+                    escalation_service.handle_auto_escalation,
+                    [msg.to_dict() for msg in conversation.messages],
+                    conversation.context.get('customer_data', {}),
+                    session_id
+                )
+
+                if auto_escalation and auto_escalation['success']:
+                    bot_response = auto_escalation['message']
+                    additional_data['escalated'] = True
+                    additional_data['escalation_id'] = auto_escalation['escalation_id']
+                else:
+                    bot_response = nlu_result['response_text']
+
+            else:
+                bot_response = nlu_result['response_text']
+
+            if bot_response:
+                await io.run(
+                    conversation_service.send_bot_message,
+                    conversation.conversation_id,
+                    bot_response,
+                    {'intent': intent, 'confidence': confidence, 'entities': entities}
+                )
+
+            for key, value in nlu_result.get('session_attributes', {}).items():
+                conversation.update_context(key, value)
+
+            return {
+                'success': True,
+                'response': bot_response,
+                'intent': intent,
+                'confidence': confidence,
+                'entities': entities,
+                'next_action': next_action,
+                'sentiment': nlu_result.get('sentiment'),
+                'timestamp': datetime.now().isoformat(),
+                **additional_data
+            }
+
+        except Exception as e:
+            logger.error(f"NLU 결과 처리 오류: {str(e)}")
+            return {
+                'success': False,
+                'error': 'NLU 결과를 처리할 수 없습니다.',
+                'response': '죄송합니다. 일시적인 오류가 발생했습니다.'
+            }
+
+    @app.exception_handler(StarletteHTTPException)
+    async def http_error(request: Request, exc: StarletteHTTPException):
+        """HTTP 에러 핸들러 (404는 Flask 버전과 같은 형식)"""
+        if exc.status_code == 404:
+            return _error('API 엔드포인트를 찾을 수 없습니다.', 404, timestamp=datetime.now().isoformat())
+        return _error(str(exc.detail), exc.status_code, timestamp=datetime.now().isoformat())
+
+    @app.exception_handler(Exception)
+    async def internal_error(request: Request, exc: Exception):
+        """500 에러 핸들러"""
+        logger.error(f"내부 서버 오류: {str(exc)}")
+        return _error('내부 서버 오류가 발생했습니다.', 500, timestamp=datetime.now().isoformat())
+
+    return app
+
+
+if __name__ == '__main__':
+    import uvicorn
+
+    uvicorn.run(
+        create_app(),
+        host=os.getenv('API_HOST', '0.0.0.0'),
+        port=int(os.getenv('API_PORT', '8000'))
+    )
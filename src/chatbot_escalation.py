@@ -6,11 +6,13 @@ import logging
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 from enum import Enum
-import boto3
 from botocore.exceptions import ClientError
 from datetime import datetime, timedelta
 import uuid
 
+from .utils.aws_client import get_client, get_resource, parallel_scan
+from .chatbot_escalation_scheduler import EscalationScheduler
+
 logger = logging.getLogger(__name__)
 
 class EscalationReason(Enum):
@@ -31,6 +33,14 @@ class EscalationPriority(Enum):
     HIGH = 3
     CRITICAL = 4
 
+# 우선순위별 SLA (상담원 배정까지 허용 시간, 초)
+DEFAULT_SLA_SECONDS = {
+    EscalationPriority.CRITICAL: 60,
+    EscalationPriority.HIGH: 180,
+    EscalationPriority.MEDIUM: 300,
+    EscalationPriority.LOW: 600
+}
+
 class EscalationStatus(Enum):
     """에스컬레이션 상태"""
     PENDING = "pending"
@@ -74,9 +84,10 @@ class ChatbotEscalation:
     """AWS Connect 챗봇 에스컬레이션 관리자"""
     
     def __init__(self, connect_instance_id: str, 
-                 dynamodb_table_name: str = "chatbot_escalations"):
-        self.connect_client = boto3.client('connect')
-        self.dynamodb = boto3.resource('dynamodb')
+                 dynamodb_table_name: str = "chatbot_escalations",
+                 scheduler: Optional[EscalationScheduler] = None):
+        self.connect_client = get_client('connect')
+        self.dynamodb = get_resource('dynamodb')
         self.escalation_table = self.dynamodb.Table(dynamodb_table_name)
         self.agent_table = self.dynamodb.Table(f"{dynamodb_table_name}_agents")
         
@@ -96,6 +107,15 @@ class ChatbotEscalation:
             EscalationReason.BOT_LIMITATION: "general-queue",
             EscalationReason.SYSTEM_ERROR: "tech-support-queue"
         }
+        
+        # 로컬 우선순위 큐 및 SLA 스케줄러 (백그라운드 스레드가 AWS Connect로 라우팅)
+        self.scheduler = scheduler or EscalationScheduler(
+            sla_seconds=DEFAULT_SLA_SECONDS,
+            aging_seconds=self.escalation_rules['aging_seconds'],
+            router=self._send_to_connect_queue
+        )
+        if self.scheduler.router is None:
+            self.scheduler.router = self._send_to_connect_queue
     
     def request_escalation(self, session_id: str, reason: EscalationReason,
                           description: str, conversation_history: List[Dict],
@@ -151,8 +171,9 @@ class ChatbotEscalation:
             # DynamoDB에 저장
             self._save_escalation_request(escalation_request)
             
-            # AWS Connect 큐에 요청 전송
-            connect_response = self._send_to_connect_queue(escalation_request)
+            # 로컬 큐에 적재만 하고 AWS Connect 전송은 스케줄러 스레드가 우선순위 순으로 처리
+            self.scheduler.submit(escalation_request)
+            connect_response = self._local_queue_response(escalation_id)
             
             if connect_response['success']:
                 # 고객에게 확인 메시지 생성
@@ -221,7 +242,8 @@ class ChatbotEscalation:
             
             self._save_escalation_request(escalation)
             
-            # AWS Connect에서 제거 (큐에서 대기 중인 경우)
+            # 로컬 큐 및 AWS Connect에서 제거 (큐에서 대기 중인 경우)
+            self.scheduler.complete(escalation_id)
             self._remove_from_connect_queue(escalation_id)
             
             return {
@@ -289,6 +311,9 @@ class ChatbotEscalation:
             
             self._save_escalation_request(escalation)
             
+            # SLA 추적 종료
+            self.scheduler.complete(escalation_id)
+            
             # 상담원에게 알림 전송
             self._notify_agent(agent_id, escalation)
             
@@ -303,18 +328,29 @@ class ChatbotEscalation:
             logger.error(f"상담원 배정 오류: {str(e)}")
             return {'success': False, 'message': '상담원 배정을 처리할 수 없습니다.'}
     
+    def route_pending_escalations(self, max_items: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        로컬 큐에 대기 중인 요청을 우선순위 순으로 AWS Connect에 즉시 전송 (평상시는 스케줄러 스레드가 처리)
+        
+        Args:
+            max_items: 최대 전송 건수 (None시 큐가 빌 때까지)
+            
+        Returns:
+            Dict: 에스컬레이션 ID별 Connect 전송 결과
+        """
+        return self.scheduler.route(self._send_to_connect_queue, max_items=max_items)
+    
     def get_escalation_analytics(self, start_date: str, end_date: str) -> Dict[str, Any]:
         """에스컬레이션 분석 데이터"""
         try:
-            response = self.escalation_table.scan(
+            escalations = list(parallel_scan(
+                self.escalation_table,
                 FilterExpression='created_at BETWEEN :start AND :end',
                 ExpressionAttributeValues={
                     ':start': start_date,
                     ':end': end_date
                 }
-            )
-            
-            escalations = response.get('Items', [])
+            ))
             
             analytics = {
                 'total_escalations': len(escalations),
@@ -491,6 +527,7 @@ class ChatbotEscalation:
         """에스컬레이션 규칙 로드"""
         return {
             'max_retry_attempts': 3,
+            'aging_seconds': 60,
             'auto_escalation_keywords': [
                 '화남', '짜증', '취소', '환불', '불만', '화가', '최악', '실망'
             ],
@@ -574,6 +611,18 @@ class ChatbotEscalation:
             logger.error(f"Connect 큐 전송 오류: {str(e)}")
             return {'success': False, 'error': str(e)}
     
+    def _local_queue_response(self, escalation_id: str) -> Dict[str, Any]:
+        """로컬 큐 적재 직후 응답 (스케줄러 스레드가 이미 전송했으면 순번 없음)"""
+        position = self.scheduler.position(escalation_id)
+        if position is None and not self.scheduler.is_tracked(escalation_id):
+            return {'success': False, 'error': 'escalation expired before routing'}
+        
+        return {
+            'success': True,
+            'queue_position': position if position is not None else 'N/A',
+            'queued_locally': position is not None
+        }
+    
     def _remove_from_connect_queue(self, escalation_id: str):
         """AWS Connect 큐에서 제거"""
         try:
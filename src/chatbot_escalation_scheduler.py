@@ -0,0 +1,434 @@
+"""
+AWS Connect 콜센터용 에스컬레이션 스케줄러 모듈
+우선순위 큐(에이징 포함)와 타이머 휠 기반 SLA 데드라인 관리
+"""
+import logging
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _WheelTimer:
+    """타이머 휠 항목"""
+    key: str
+    deadline: float
+    tick: int
+    callback: Callable[[str], Any]
+
+
+class TimerWheel:
+    """해시드 타이머 휠
+
+    데드라인을 tick 단위 슬롯에 배치하여 등록/취소를 O(1)로 처리하고,
+    ``advance`` 호출 시 만료된 슬롯의 타이머만 실행합니다.
+    """
+
+    def __init__(self, tick_seconds: float = 1.0, wheel_size: int = 512,
+                 clock: Callable[[], float] = time.monotonic):
+        if tick_seconds <= 0 or wheel_size <= 0:
+            raise ValueError("tick_seconds와 wheel_size는 0보다 커야 합니다.")
+
+        self.tick_seconds = tick_seconds
+        self.wheel_size = wheel_size
+        self.clock = clock
+
+        self._slots: List[Dict[str, _WheelTimer]] = [{} for _ in range(wheel_size)]
+        self._index: Dict[str, _WheelTimer] = {}
+        self._current_tick = self._tick_of(clock())
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def schedule(self, key: str, deadline: float, callback: Callable[[str], Any]):
+        """데드라인 등록 (동일 키는 재등록)"""
+        self.cancel(key)
+
+        tick = max(math.ceil(deadline / self.tick_seconds), self._current_tick + 1)
+        timer = _WheelTimer(key=key, deadline=deadline, tick=tick, callback=callback)
+        self._slots[tick % self.wheel_size][key] = timer
+        self._index[key] = timer
+
+    def cancel(self, key: str) -> bool:
+        """데드라인 취소"""
+        timer = self._index.pop(key, None)
+        if timer is None:
+            return False
+        self._slots[timer.tick % self.wheel_size].pop(key, None)
+        return True
+
+    def advance(self, now: Optional[float] = None) -> List[_WheelTimer]:
+        """현재 시각까지 만료된 타이머를 꺼내 반환 (콜백은 호출자가 실행)"""
+        now = self.clock() if now is None else now
+        target_tick = self._tick_of(now)
+        if target_tick <= self._current_tick:
+            return []
+
+        expired = []
+        # 한 바퀴 이상 건너뛴 경우 모든 슬롯을 한 번씩만 확인
+        steps = min(target_tick - self._current_tick, self.wheel_size)
+        for offset in range(1, steps + 1):
+            slot = self._slots[(self._current_tick + offset) % self.wheel_size]
+            for key in [k for k, t in slot.items() if t.tick <= target_tick]:
+                timer = slot.pop(key)
+                del self._index[key]
+                expired.append(timer)
+
+        self._current_tick = target_tick
+        expired.sort(key=lambda t: t.deadline)
+        return expired
+
+    def next_deadline(self) -> Optional[float]:
+        """가장 가까운 타이머의 만료 시각"""
+        if not self._index:
+            return None
+
+        for offset in range(1, self.wheel_size + 1):
+            slot = self._slots[(self._current_tick + offset) % self.wheel_size]
+            due = [t for t in slot.values() if t.tick == self._current_tick + offset]
+            if due:
+                return (self._current_tick + offset) * self.tick_seconds
+
+        # 모든 타이머가 다음 바퀴 이후에 있는 경우
+        return min(t.tick for t in self._index.values()) * self.tick_seconds
+
+    def _tick_of(self, timestamp: float) -> int:
+        return int(timestamp // self.tick_seconds)
+
+
+@dataclass
+class _QueuedEscalation:
+    """큐 대기 항목"""
+    escalation: Any
+    level: int
+    enqueued_at: float
+    sequence: int
+    removed: bool = False
+
+
+class EscalationPriorityQueue:
+    """에이징을 지원하는 다단계 우선순위 큐
+
+    우선순위 레벨별 FIFO 큐를 두고, 대기 시간이 ``aging_seconds``를 넘을 때마다
+    유효 우선순위를 한 단계씩 올려 낮은 우선순위 요청의 기아(starvation)를 방지합니다.
+    """
+
+    def __init__(self, max_level: int = 4, aging_seconds: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_level = max_level
+        self.aging_seconds = aging_seconds
+        self.clock = clock
+
+        self._levels: Dict[int, Deque[_QueuedEscalation]] = {
+            level: deque() for level in range(1, max_level + 1)
+        }
+        self._entries: Dict[str, _QueuedEscalation] = {}
+        self._sequence = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, escalation_id: str) -> bool:
+        return escalation_id in self._entries
+
+    def push(self, escalation: Any, enqueued_at: Optional[float] = None):
+        """요청 추가"""
+        self.remove(escalation.escalation_id)
+
+        level = min(max(int(escalation.priority.value), 1), self.max_level)
+        self._sequence += 1
+        entry = _QueuedEscalation(
+            escalation=escalation,
+            level=level,
+            enqueued_at=self.clock() if enqueued_at is None else enqueued_at,
+            sequence=self._sequence
+        )
+        self._levels[level].append(entry)
+        self._entries[escalation.escalation_id] = entry
+
+    def requeue_front(self, escalation: Any, enqueued_at: float):
+        """전송 실패 요청을 원래 대기 순서를 유지한 채 다시 추가"""
+        level = min(max(int(escalation.priority.value), 1), self.max_level)
+        entry = _QueuedEscalation(
+            escalation=escalation,
+            level=level,
+            enqueued_at=enqueued_at,
+            sequence=0
+        )
+        self._levels[level].appendleft(entry)
+        self._entries[escalation.escalation_id] = entry
+
+    def pop(self, now: Optional[float] = None) -> Optional[_QueuedEscalation]:
+        """유효 우선순위가 가장 높은 요청 추출"""
+        now = self.clock() if now is None else now
+        best_level = None
+        best_key = None
+
+        # 각 레벨의 선두가 해당 레벨에서 가장 오래 대기한 항목
+        for level, bucket in self._levels.items():
+            self._discard_removed(bucket)
+            if not bucket:
+                continue
+            head = bucket[0]
+            key = (self.effective_level(head, now), -head.enqueued_at, -head.sequence)
+            if best_key is None or key > best_key:
+                best_key = key
+                best_level = level
+
+        if best_level is None:
+            return None
+
+        entry = self._levels[best_level].popleft()
+        del self._entries[entry.escalation.escalation_id]
+        return entry
+
+    def remove(self, escalation_id: str) -> bool:
+        """요청 제거 (지연 삭제)"""
+        entry = self._entries.pop(escalation_id, None)
+        if entry is None:
+            return False
+        entry.removed = True
+        return True
+
+    def position(self, escalation_id: str, now: Optional[float] = None) -> Optional[int]:
+        """현재 시점 기준 대기 순번 (1부터 시작)"""
+        target = self._entries.get(escalation_id)
+        if target is None:
+            return None
+
+        now = self.clock() if now is None else now
+        target_key = self._order_key(target, now)
+        ahead = sum(1 for entry in self._entries.values() if self._order_key(entry, now) > target_key)
+        return ahead + 1
+
+    def effective_level(self, entry: _QueuedEscalation, now: float) -> int:
+        """에이징이 반영된 유효 우선순위"""
+        if self.aging_seconds <= 0:
+            return entry.level
+        boost = int(max(now - entry.enqueued_at, 0) // self.aging_seconds)
+        return min(entry.level + boost, self.max_level)
+
+    def _order_key(self, entry: _QueuedEscalation, now: float):
+        return (self.effective_level(entry, now), -entry.enqueued_at, -entry.sequence)
+
+    def _discard_removed(self, bucket: Deque[_QueuedEscalation]):
+        while bucket and bucket[0].removed:
+            bucket.popleft()
+
+
+class EscalationScheduler:
+    """로컬 에스컬레이션 스케줄러
+
+    요청을 우선순위 큐에 적재한 뒤 우선순위 순으로 Connect에 라우팅하고,
+    요청별 SLA 데드라인을 타이머 휠에 등록하여 만료 시 ``on_timeout``을 호출합니다.
+    데드라인 처리와 라우팅은 백그라운드 스레드가 담당합니다. ``router``가 있으면
+    요청 등록 즉시 스레드가 큐를 비우고, 전송이 실패하면 ``retry_seconds`` 후 다시 시도합니다.
+    """
+
+    def __init__(self, sla_seconds: Optional[Dict[Any, float]] = None,
+                 default_sla_seconds: float = 300.0,
+                 aging_seconds: float = 60.0,
+                 max_level: int = 4,
+                 tick_seconds: float = 1.0,
+                 wheel_size: int = 512,
+                 on_timeout: Optional[Callable[[str], Any]] = None,
+                 router: Optional[Callable[[Any], Dict[str, Any]]] = None,
+                 retry_seconds: float = 1.0,
+                 clock: Callable[[], float] = time.monotonic,
+                 auto_start: bool = True):
+        self.sla_seconds = sla_seconds or {}
+        self.default_sla_seconds = default_sla_seconds
+        self.on_timeout = on_timeout
+        self.router = router
+        self.retry_seconds = retry_seconds
+        self.clock = clock
+        self.auto_start = auto_start
+
+        self.queue = EscalationPriorityQueue(max_level=max_level, aging_seconds=aging_seconds, clock=clock)
+        self.wheel = TimerWheel(tick_seconds=tick_seconds, wheel_size=wheel_size, clock=clock)
+
+        self._lock = threading.RLock()
+        self._wakeup = threading.Condition(self._lock)
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._next_route_at = 0.0
+
+        self.stats = {'submitted': 0, 'routed': 0, 'route_failures': 0, 'timeouts': 0}
+
+    def submit(self, escalation: Any) -> float:
+        """
+        에스컬레이션 요청 등록
+
+        Args:
+            escalation: ``escalation_id``와 ``priority`` 속성을 가진 요청
+
+        Returns:
+            float: SLA 데드라인 (clock 기준)
+        """
+        with self._lock:
+            now = self.clock()
+            deadline = now + self._sla_for(escalation.priority)
+
+            self.queue.push(escalation, enqueued_at=now)
+            self.wheel.schedule(escalation.escalation_id, deadline, self._handle_deadline)
+            self.stats['submitted'] += 1
+            self._wakeup.notify_all()
+
+        if self.auto_start:
+            self.start()
+        return deadline
+
+    def route(self, send: Callable[[Any], Dict[str, Any]],
+              max_items: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        대기 중인 요청을 우선순위 순으로 전송
+
+        전송이 실패하면 해당 요청을 원래 순서로 되돌리고 라우팅을 중단합니다.
+
+        Args:
+            send: 요청을 받아 ``{'success': bool, ...}``를 반환하는 전송 함수
+            max_items: 이번 호출에서 전송할 최대 건수
+
+        Returns:
+            Dict: 에스컬레이션 ID별 전송 결과
+        """
+        results = {}
+        while max_items is None or len(results) < max_items:
+            with self._lock:
+                entry = self.queue.pop()
+            if entry is None:
+                break
+
+            escalation_id = entry.escalation.escalation_id
+            try:
+                response = send(entry.escalation)
+            except Exception as e:
+                response = {'success': False, 'error': str(e)}
+
+            if not response.get('success'):
+                with self._lock:
+                    # 전송 중 취소/타임아웃된 요청은 되돌리지 않음
+                    if escalation_id in self.wheel:
+                        self.queue.requeue_front(entry.escalation, entry.enqueued_at)
+                    self.stats['route_failures'] += 1
+                logger.warning(f"에스컬레이션 라우팅 지연: {escalation_id} ({response.get('error')})")
+                break
+
+            with self._lock:
+                self.stats['routed'] += 1
+            results[escalation_id] = response
+
+        return results
+
+    def complete(self, escalation_id: str) -> bool:
+        """상담원 배정/취소 등으로 SLA 추적 종료"""
+        with self._lock:
+            removed = self.queue.remove(escalation_id)
+            cancelled = self.wheel.cancel(escalation_id)
+            self._wakeup.notify_all()
+        return removed or cancelled
+
+    def is_tracked(self, escalation_id: str) -> bool:
+        """SLA 추적 중 여부 (라우팅 후 배정 대기 포함)"""
+        with self._lock:
+            return escalation_id in self.wheel
+
+    def position(self, escalation_id: str) -> Optional[int]:
+        """로컬 큐 대기 순번"""
+        with self._lock:
+            return self.queue.position(escalation_id)
+
+    def pending_count(self) -> int:
+        """로컬 큐 대기 건수"""
+        with self._lock:
+            return len(self.queue)
+
+    def fire_expired(self, now: Optional[float] = None) -> List[str]:
+        """만료된 SLA 데드라인 처리"""
+        with self._lock:
+            expired = self.wheel.advance(now)
+
+        fired = []
+        for timer in expired:
+            try:
+                timer.callback(timer.key)
+            except Exception as e:
+                logger.error(f"SLA 타임아웃 처리 오류: {timer.key} ({str(e)})")
+            fired.append(timer.key)
+        return fired
+
+    def start(self):
+        """데드라인 처리/라우팅 스레드 시작"""
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name="escalation-sla-wheel", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """데드라인 처리/라우팅 스레드 종료"""
+        with self._lock:
+            self._running = False
+            self._wakeup.notify_all()
+            thread = self._thread
+            self._thread = None
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._running:
+                    return
+                now = self.clock()
+                waits = []
+                if self.router is not None and len(self.queue):
+                    waits.append(self._next_route_at - now)
+                next_deadline = self.wheel.next_deadline()
+                if next_deadline is not None:
+                    waits.append(next_deadline - now)
+                if not waits:
+                    # 대기 요청과 데드라인이 없으면 submit까지 대기
+                    self._wakeup.wait()
+                    continue
+                delay = min(waits)
+                if delay > 0:
+                    self._wakeup.wait(delay)
+                    continue
+                route_due = self.router is not None and len(self.queue) > 0 and now >= self._next_route_at
+
+            if route_due:
+                self._route_pending()
+            else:
+                self.fire_expired()
+
+    def _route_pending(self):
+        failures = self.stats['route_failures']
+        results = self.route(self.router)
+        with self._lock:
+            if self.stats['route_failures'] > failures:
+                # 전송 실패로 남은 요청은 잠시 후 재시도
+                self._next_route_at = self.clock() + self.retry_seconds
+        if results:
+            logger.info(f"에스컬레이션 라우팅 완료: {len(results)}건")
+
+    def _handle_deadline(self, escalation_id: str):
+        with self._lock:
+            self.queue.remove(escalation_id)
+            self.stats['timeouts'] += 1
+
+        logger.warning(f"에스컬레이션 SLA 초과: {escalation_id}")
+        if self.on_timeout:
+            self.on_timeout(escalation_id)
+
+    def _sla_for(self, priority: Any) -> float:
+        return float(self.sla_seconds.get(priority, self.default_sla_seconds))
@@ -5,11 +5,13 @@ import json
 import logging
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
-import boto3
 from botocore.exceptions import ClientError
 import re
 from datetime import datetime
 
+from .utils.aws_client import batch_put, get_resource, iter_items, parallel_scan
+from .utils.tracing import traced
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -38,7 +40,7 @@ class ChatbotFAQ:
     """AWS Connect 챗봇 FAQ 관리자"""
     
     def __init__(self, dynamodb_table_name: str = "chatbot_faq"):
-        self.dynamodb = boto3.resource('dynamodb')
+        self.dynamodb = get_resource('dynamodb')
         self.faq_table = self.dynamodb.Table(dynamodb_table_name)
         self.analytics_table = self.dynamodb.Table(f"{dynamodb_table_name}_analytics")
         
@@ -49,6 +51,7 @@ class ChatbotFAQ:
         # 내장 FAQ 데이터
         self._initialize_default_faqs()
     
+    @traced('faq.search')
     def search_faq(self, query: str, category: Optional[str] = None, 
                    max_results: Optional[int] = None) -> FAQSearchResult:
         """
@@ -162,8 +165,7 @@ class ChatbotFAQ:
                 scan_kwargs['FilterExpression'] += ' AND category = :category'
                 scan_kwargs['ExpressionAttributeValues'][':category'] = category
             
-            response = self.faq_table.scan(**scan_kwargs)
-            items = response.get('Items', [])
+            items = list(iter_items(self.faq_table.scan, **scan_kwargs))
             
             # 조회수 기준 정렬
             sorted_items = sorted(items, key=lambda x: x.get('view_count', 0), reverse=True)
@@ -194,14 +196,15 @@ class ChatbotFAQ:
     def get_categories(self) -> List[str]:
         """FAQ 카테고리 목록 조회"""
         try:
-            response = self.faq_table.scan(
+            items = iter_items(
+                self.faq_table.scan,
                 ProjectionExpression='category',
                 FilterExpression='is_active = :active',
                 ExpressionAttributeValues={':active': True}
             )
             
             categories = set()
-            for item in response.get('Items', []):
+            for item in items:
                 categories.add(item['category'])
             
             return sorted(list(categories))
@@ -214,24 +217,10 @@ class ChatbotFAQ:
                 keywords: List[str], priority: int = 0) -> bool:
         """새 FAQ 추가"""
         try:
-            faq_id = self._generate_faq_id()
-            current_time = datetime.now().isoformat()
-            
-            item = {
-                'faq_id': faq_id,
-                'category': category,
-                'question': question,
-                'answer': answer,
-                'keywords': keywords,
-                'priority': priority,
-                'is_active': True,
-                'created_at': current_time,
-                'updated_at': current_time,
-                'view_count': 0
-            }
+            item = self._build_faq_item(category, question, answer, keywords, priority)
             
             self.faq_table.put_item(Item=item)
-            logger.info(f"새 FAQ 추가됨: {faq_id}")
+            logger.info(f"새 FAQ 추가됨: {item['faq_id']}")
             return True
             
         except Exception as e:
@@ -284,7 +273,8 @@ class ChatbotFAQ:
     def get_faq_analytics(self, start_date: str, end_date: str) -> Dict:
         """FAQ 분석 데이터 조회"""
         try:
-            response = self.analytics_table.scan(
+            items = parallel_scan(
+                self.analytics_table,
                 FilterExpression='search_date BETWEEN :start AND :end',
                 ExpressionAttributeValues={
                     ':start': start_date,
@@ -300,7 +290,7 @@ class ChatbotFAQ:
                 'category_distribution': {}
             }
             
-            for item in response.get('Items', []):
+            for item in items:
                 analytics_data['total_searches'] += item.get('search_count', 0)
                 
                 if item.get('result_count', 0) > 0:
@@ -339,8 +329,7 @@ class ChatbotFAQ:
                 scan_kwargs['FilterExpression'] += ' AND category = :category'
                 scan_kwargs['ExpressionAttributeValues'][':category'] = category
             
-            response = self.faq_table.scan(**scan_kwargs)
-            return response.get('Items', [])
+            return list(iter_items(self.faq_table.scan, **scan_kwargs))
             
         except Exception as e:
             logger.error(f"DynamoDB 검색 오류: {str(e)}")
@@ -431,6 +420,23 @@ class ChatbotFAQ:
         except Exception as e:
             logger.error(f"검색 분석 업데이트 오류: {str(e)}")
     
+    def _build_faq_item(self, category: str, question: str, answer: str,
+                        keywords: List[str], priority: int = 0) -> Dict:
+        """신규 FAQ 항목 생성"""
+        current_time = datetime.now().isoformat()
+        return {
+            'faq_id': self._generate_faq_id(),
+            'category': category,
+            'question': question,
+            'answer': answer,
+            'keywords': keywords,
+            'priority': priority,
+            'is_active': True,
+            'created_at': current_time,
+            'updated_at': current_time,
+            'view_count': 0
+        }
+    
     def _generate_faq_id(self) -> str:
         """FAQ ID 생성"""
         import uuid
@@ -505,14 +511,17 @@ class ChatbotFAQ:
         try:
             response = self.faq_table.scan(Limit=1)
             if not response.get('Items'):
-                for faq_data in default_faqs:
-                    self.add_faq(
+                items = [
+                    self._build_faq_item(
                         category=faq_data['category'],
                         question=faq_data['question'],
                         answer=faq_data['answer'],
                         keywords=faq_data['keywords'],
                         priority=1
                     )
-                logger.info("기본 FAQ 데이터 초기화 완료")
+                    for faq_data in default_faqs
+                ]
+                batch_put(self.faq_table, items, key_names=['faq_id'])
+                logger.info(f"기본 FAQ 데이터 초기화 완료: {len(items)}건")
         except Exception as e:
             logger.error(f"기본 FAQ 초기화 오류: {str(e)}") 
\ No newline at end of file
@@ -11,6 +11,8 @@ from botocore.exceptions import ClientError
 from dotenv import load_dotenv
 import re
 
+from .utils.tracing import get_tracer, traced
+
 # .env 파일 로드
 load_dotenv()
 
@@ -37,16 +39,20 @@ class NLUResponse:
 class BedrockChatbotNLU:
     """AWS Bedrock Claude 기반 챗봇 자연어 이해 처리기"""
     
-    def __init__(self, model_id: Optional[str] = None):
+    def __init__(self, model_id: Optional[str] = None, bedrock_client=None):
         self.model_id = model_id or os.getenv('BEDROCK_MODEL_ID', 'anthropic.claude-3-sonnet-20240229-v1:0')
         
-        # AWS 클라이언트 초기화
-        session = boto3.Session(
-            aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-            aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
-            region_name=os.getenv('AWS_REGION', 'us-east-1')  # Bedrock은 us-east-1 사용
-        )
-        self.bedrock_client = session.client('bedrock-runtime')
+        # AWS 클라이언트 초기화 (호출자가 재사용 클라이언트를 전달할 수 있음)
+        if bedrock_client is None:
+            session = boto3.Session(
+                aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
+                aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
+                region_name=os.getenv('AWS_REGION', 'us-east-1')  # Bedrock은 us-east-1 사용
+            )
+            bedrock_client = session.client('bedrock-runtime')
+        # 전달받은 클라이언트도 추적 (이미 계측된 클라이언트는 건너뜀)
+        get_tracer().instrument_botocore(bedrock_client)
+        self.bedrock_client = bedrock_client
         
         # 의도 정의 및 설명
         self.intent_definitions = {
@@ -185,6 +191,7 @@ class BedrockChatbotNLU:
             logger.error(f"Bedrock NLU 처리 중 오류 발생: {str(e)}")
             return self._create_error_response()
     
+    @traced('bedrock.call_claude')
     def _call_claude(self, text: str, session_attributes: Dict) -> str:
         """AWS Bedrock Claude 호출"""
         try:
@@ -3,11 +3,21 @@ AWS Connect 콜센터용 시나리오 관리 모듈
 """
 import json
 import logging
+import os
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 from enum import Enum
 import boto3
 
+from .chatbot_scenario_machine import CompiledScenario, CompiledStep
+from .chatbot_scenario_registry import (
+    BuiltInScenarioSource, DynamoDBScenarioSource, FileScenarioSource, ScenarioRegistry, ScenarioSource,
+    get_shared_registry
+)
+from .chatbot_scenario_session_store import (
+    CachedSessionStore, DynamoDBSessionBackend, SessionBackend, SessionConflictError
+)
+
 logger = logging.getLogger(__name__)
 
 class ScenarioStatus(Enum):
@@ -40,21 +50,53 @@ class ScenarioSession:
     retry_count: int
     created_at: str
     updated_at: str
+    version: int = 0
+    scenario_version: str = ''
 
 class ChatbotScenario:
     """AWS Connect 챗봇 시나리오 관리자"""
     
-    def __init__(self, dynamodb_table_name: str = "chatbot_scenarios"):
+    def __init__(self, dynamodb_table_name: str = "chatbot_scenarios",
+                 session_backend: Optional[SessionBackend] = None,
+                 session_cache_ttl: float = 30.0,
+                 scenario_sources: Optional[List[ScenarioSource]] = None,
+                 scenario_reload_interval: float = 30.0):
         self.dynamodb = boto3.resource('dynamodb')
         self.scenarios_table = self.dynamodb.Table(dynamodb_table_name)
         self.sessions_table = self.dynamodb.Table(f"{dynamodb_table_name}_sessions")
         
+        # 세션 저장소 (로컬 캐시 + 변경 속성 조건부 기록)
+        self.session_store = CachedSessionStore(
+            session_backend or DynamoDBSessionBackend(self.sessions_table),
+            to_item=self._session_to_item,
+            from_item=self._session_from_item,
+            ttl_seconds=session_cache_ttl
+        )
+        
         # 내장 시나리오 정의
         self.built_in_scenarios = self._load_built_in_scenarios()
         
+        # 버전별 컴파일 시나리오 레지스트리 (초기 로드 후 백그라운드 재로드)
+        # 기본 원본은 프로세스 전역 레지스트리를 공유해 인스턴스마다 재로드 스레드를 만들지 않음
+        self._owns_registry = scenario_sources is not None
+        if self._owns_registry:
+            self.scenario_registry = ScenarioRegistry(scenario_sources, reload_interval=scenario_reload_interval)
+            self.scenario_registry.refresh()
+            self.scenario_registry.start()
+        else:
+            self.scenario_registry = get_shared_registry(
+                f"{dynamodb_table_name}|{os.getenv('SCENARIO_DEFINITIONS_DIR', '')}",
+                lambda: ScenarioRegistry(self._default_scenario_sources(), reload_interval=scenario_reload_interval)
+            )
+        
         # 재시도 제한
         self.max_retry_count = 3
     
+    def close(self):
+        """직접 생성한 레지스트리의 재로드 종료 (공유 레지스트리는 유지)"""
+        if self._owns_registry:
+            self.scenario_registry.stop()
+    
     def start_scenario(self, session_id: str, scenario_id: str, 
                       initial_data: Optional[Dict] = None) -> Dict[str, Any]:
         """
@@ -75,18 +117,19 @@ class ChatbotScenario:
                 return self._create_error_response(f"시나리오 '{scenario_id}'를 찾을 수 없습니다.")
             
             # 첫 번째 단계 가져오기
-            first_step = self._get_first_step(scenario_def)
+            first_step = scenario_def.first_step
             
-            # 세션 생성
+            # 세션 생성 (진행 중 정의가 바뀌어도 시작 버전으로 고정)
             session = ScenarioSession(
                 session_id=session_id,
                 scenario_id=scenario_id,
-                current_step=first_step['step_id'],
+                current_step=first_step.step_id,
                 status=ScenarioStatus.ACTIVE,
                 collected_data=initial_data or {},
                 retry_count=0,
                 created_at=self._get_current_timestamp(),
-                updated_at=self._get_current_timestamp()
+                updated_at=self._get_current_timestamp(),
+                scenario_version=scenario_def.version
             )
             
             # 세션 저장
@@ -94,9 +137,9 @@ class ChatbotScenario:
             
             return {
                 'success': True,
-                'message': first_step['message'],
-                'step_id': first_step['step_id'],
-                'input_type': first_step['input_type'],
+                'message': first_step.message.raw,
+                'step_id': first_step.step_id,
+                'input_type': first_step.input_type,
                 'session_status': session.status.value
             }
             
@@ -108,6 +151,8 @@ class ChatbotScenario:
         """
         사용자 입력 처리
         
+        다른 워커가 같은 세션을 먼저 갱신한 경우 최신 세션으로 한 번 재처리합니다.
+        
         Args:
             session_id: 세션 ID
             user_input: 사용자 입력
@@ -115,6 +160,16 @@ class ChatbotScenario:
         Returns:
             Dict: 처리 결과
         """
+        for _ in range(2):
+            try:
+                return self._process_user_input(session_id, user_input)
+            except SessionConflictError:
+                logger.warning(f"세션 동시 갱신 감지, 재처리: {session_id}")
+        
+        return self._create_error_response("입력을 처리할 수 없습니다.")
+    
+    def _process_user_input(self, session_id: str, user_input: str) -> Dict[str, Any]:
+        """사용자 입력 처리 (세션 버전 충돌 시 SessionConflictError 전파)"""
         try:
             # 세션 조회
             session = self._get_session(session_id)
@@ -122,8 +177,10 @@ class ChatbotScenario:
                 return self._create_error_response("세션을 찾을 수 없습니다.")
             
             # 시나리오 정의 로드
-            scenario_def = self._get_scenario_definition(session.scenario_id)
-            current_step = self._get_step_by_id(scenario_def, session.current_step)
+            scenario_def = self._get_scenario_definition(session.scenario_id, session.scenario_version)
+            current_step = scenario_def.get_step(session.current_step) if scenario_def else None
+            if not current_step:
+                return self._create_error_response("시나리오 단계를 찾을 수 없습니다.")
             
             # 입력 검증
             validation_result = self._validate_input(current_step, user_input)
@@ -142,12 +199,11 @@ class ChatbotScenario:
                 }
             
             # 데이터 수집
-            field_name = current_step.get('field_name', f"step_{current_step['step_id']}")
-            session.collected_data[field_name] = validation_result['processed_value']
+            session.collected_data[current_step.field_name] = validation_result['processed_value']
             session.retry_count = 0  # 성공 시 재시도 카운트 리셋
             
-            # 다음 단계 결정
-            next_step_result = self._determine_next_step(current_step, validation_result['processed_value'])
+            # 다음 단계 결정 (컴파일 시 검증된 전이)
+            next_step_result = current_step.next_transition(validation_result['processed_value'])
             
             if next_step_result['action'] == 'complete':
                 session.status = ScenarioStatus.COMPLETED
@@ -158,20 +214,22 @@ class ChatbotScenario:
                 return self._escalate_scenario(session, next_step_result.get('reason', '조건 충족'))
             
             elif next_step_result['action'] == 'continue':
-                next_step = self._get_step_by_id(scenario_def, next_step_result['next_step_id'])
-                session.current_step = next_step['step_id']
+                next_step = scenario_def.get_step(next_step_result['next_step_id'])
+                session.current_step = next_step.step_id
                 session.updated_at = self._get_current_timestamp()
                 self._save_session(session)
                 
                 return {
                     'success': True,
-                    'message': self._personalize_message(next_step['message'], session.collected_data),
-                    'step_id': next_step['step_id'],
-                    'input_type': next_step['input_type'],
+                    'message': next_step.message.render(session.collected_data),
+                    'step_id': next_step.step_id,
+                    'input_type': next_step.input_type,
                     'session_status': session.status.value,
-                    'progress': self._calculate_progress(scenario_def, session.current_step)
+                    'progress': next_step.progress
                 }
             
+        except SessionConflictError:
+            raise
         except Exception as e:
             logger.error(f"사용자 입력 처리 오류: {str(e)}")
             return self._create_error_response("입력을 처리할 수 없습니다.")
@@ -208,6 +266,42 @@ class ChatbotScenario:
             'session_status': session.status.value
         }
     
+    def validate_recorded_inputs(self, scenario_id: str, records: List[Dict[str, Any]],
+                                 version: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        녹취 세션 입력 일괄 검증 (재생/QA용)
+        
+        Args:
+            scenario_id: 시나리오 ID
+            records: {'step_id': 단계 ID, 'user_input': 입력} 목록
+            version: 시나리오 버전 (None시 최신 버전)
+            
+        Returns:
+            List[Dict]: 입력 순서대로의 검증 결과
+        """
+        scenario_def = self._get_scenario_definition(scenario_id, version)
+        if not scenario_def:
+            return [{'valid': False, 'error_message': '시나리오를 찾을 수 없습니다.'} for _ in records]
+        
+        # 단계별로 묶어 각 단계의 컴파일된 검증기로 한 번에 검증
+        positions_by_step: Dict[str, List[int]] = {}
+        for position, record in enumerate(records):
+            positions_by_step.setdefault(record.get('step_id'), []).append(position)
+        
+        results: List[Dict[str, Any]] = [{} for _ in records]
+        for step_id, positions in positions_by_step.items():
+            step = scenario_def.get_step(step_id)
+            if step is None:
+                for position in positions:
+                    results[position] = {'valid': False, 'error_message': f"알 수 없는 단계: {step_id}"}
+                continue
+            
+            batch = step.validator.validate_batch(records[position].get('user_input') for position in positions)
+            for position, result in zip(positions, batch):
+                results[position] = result
+        
+        return results
+    
     def _load_built_in_scenarios(self) -> Dict[str, Any]:
         """내장 시나리오 로드"""
         return {
@@ -311,153 +405,25 @@ class ChatbotScenario:
             }
         }
     
-    def _get_scenario_definition(self, scenario_id: str) -> Optional[Dict]:
-        """시나리오 정의 조회"""
-        # 우선 내장 시나리오 확인
-        if scenario_id in self.built_in_scenarios:
-            return self.built_in_scenarios[scenario_id]
-        
-        # DynamoDB에서 커스텀 시나리오 조회
-        try:
-            response = self.scenarios_table.get_item(Key={'scenario_id': scenario_id})
-            return response.get('Item')
-        except Exception as e:
-            logger.error(f"시나리오 정의 조회 오류: {str(e)}")
-            return None
-    
-    def _get_first_step(self, scenario_def: Dict) -> Dict:
-        """첫 번째 단계 조회"""
-        steps = scenario_def.get('steps', [])
-        return steps[0] if steps else {}
-    
-    def _get_step_by_id(self, scenario_def: Dict, step_id: str) -> Optional[Dict]:
-        """단계 ID로 단계 조회"""
-        steps = scenario_def.get('steps', [])
-        for step in steps:
-            if step['step_id'] == step_id:
-                return step
-        return None
-    
-    def _validate_input(self, step: Dict, user_input: str) -> Dict[str, Any]:
-        """입력 검증"""
-        input_type = step.get('input_type', 'text')
-        validation_rules = step.get('validation_rules', {})
-        
-        if input_type == 'choice':
-            return self._validate_choice_input(user_input, validation_rules)
-        elif input_type == 'date':
-            return self._validate_date_input(user_input, validation_rules)
-        elif input_type == 'number':
-            return self._validate_number_input(user_input, validation_rules)
-        else:
-            return self._validate_text_input(user_input, validation_rules)
-    
-    def _validate_choice_input(self, user_input: str, rules: Dict) -> Dict[str, Any]:
-        """선택형 입력 검증"""
-        choices = rules.get('choices', [])
-        if user_input.strip() in choices:
-            return {'valid': True, 'processed_value': user_input.strip()}
-        
-        return {
-            'valid': False,
-            'error_message': f"올바른 선택지를 입력해주세요: {', '.join(choices)}"
-        }
-    
-    def _validate_text_input(self, user_input: str, rules: Dict) -> Dict[str, Any]:
-        """텍스트 입력 검증"""
-        min_length = rules.get('min_length', 1)
-        max_length = rules.get('max_length', 1000)
-        pattern = rules.get('pattern')
-        
-        if len(user_input.strip()) < min_length:
-            return {'valid': False, 'error_message': f'최소 {min_length}글자 이상 입력해주세요.'}
-        
-        if len(user_input.strip()) > max_length:
-            return {'valid': False, 'error_message': f'최대 {max_length}글자까지 입력 가능합니다.'}
-        
-        if pattern:
-            import re
-            if not re.match(pattern, user_input.strip()):
-                error_msg = rules.get('error_message', '올바른 형식으로 입력해주세요.')
-                return {'valid': False, 'error_message': error_msg}
-        
-        return {'valid': True, 'processed_value': user_input.strip()}
-    
-    def _validate_date_input(self, user_input: str, rules: Dict) -> Dict[str, Any]:
-        """날짜 입력 검증"""
-        from datetime import datetime, date
+    def _default_scenario_sources(self) -> List[ScenarioSource]:
+        """기본 시나리오 정의 원본 (내장 > 로컬 파일 > DynamoDB 순)"""
+        sources: List[ScenarioSource] = [BuiltInScenarioSource(self.built_in_scenarios)]
         
-        try:
-            date_format = rules.get('date_format', '%Y-%m-%d')
-            parsed_date = datetime.strptime(user_input.strip(), date_format).date()
-            
-            if rules.get('future_only', False) and parsed_date <= date.today():
-                return {'valid': False, 'error_message': '오늘 이후의 날짜를 입력해주세요.'}
-            
-            return {'valid': True, 'processed_value': user_input.strip()}
-            
-        except ValueError:
-            return {'valid': False, 'error_message': '올바른 날짜 형식으로 입력해주세요. (예: 2024-01-15)'}
-    
-    def _validate_number_input(self, user_input: str, rules: Dict) -> Dict[str, Any]:
-        """숫자 입력 검증"""
-        try:
-            number = float(user_input.strip())
-            
-            min_value = rules.get('min_value')
-            max_value = rules.get('max_value')
-            
-            if min_value is not None and number < min_value:
-                return {'valid': False, 'error_message': f'{min_value} 이상의 값을 입력해주세요.'}
-            
-            if max_value is not None and number > max_value:
-                return {'valid': False, 'error_message': f'{max_value} 이하의 값을 입력해주세요.'}
-            
-            return {'valid': True, 'processed_value': number}
-            
-        except ValueError:
-            return {'valid': False, 'error_message': '올바른 숫자를 입력해주세요.'}
-    
-    def _determine_next_step(self, current_step: Dict, user_value: Any) -> Dict[str, Any]:
-        """다음 단계 결정"""
-        next_steps = current_step.get('next_steps', {})
-        
-        # 사용자 값에 따른 조건부 분기
-        if str(user_value) in next_steps:
-            next_action = next_steps[str(user_value)]
-        else:
-            next_action = next_steps.get('default', 'complete')
+        definitions_dir = os.getenv('SCENARIO_DEFINITIONS_DIR')
+        if definitions_dir:
+            sources.append(FileScenarioSource(definitions_dir))
         
-        if next_action == 'complete':
-            return {'action': 'complete'}
-        elif next_action == 'escalate':
-            return {'action': 'escalate', 'reason': '사용자 요청'}
-        else:
-            return {'action': 'continue', 'next_step_id': next_action}
+        sources.append(DynamoDBScenarioSource(self.scenarios_table))
+        return sources
     
-    def _personalize_message(self, message: str, collected_data: Dict) -> str:
-        """메시지 개인화"""
-        try:
-            return message.format(**collected_data)
-        except (KeyError, ValueError):
-            return message
+    def _get_scenario_definition(self, scenario_id: str,
+                                 version: Optional[str] = None) -> Optional[CompiledScenario]:
+        """컴파일된 시나리오 정의 조회 (레지스트리 메모리 조회만 수행)"""
+        return self.scenario_registry.get(scenario_id, version)
     
-    def _calculate_progress(self, scenario_def: Dict, current_step_id: str) -> float:
-        """진행률 계산"""
-        steps = scenario_def.get('steps', [])
-        if not steps:
-            return 100.0
-        
-        current_index = -1
-        for i, step in enumerate(steps):
-            if step['step_id'] == current_step_id:
-                current_index = i
-                break
-        
-        if current_index == -1:
-            return 0.0
-        
-        return (current_index + 1) / len(steps) * 100
+    def _validate_input(self, step: CompiledStep, user_input: str) -> Dict[str, Any]:
+        """입력 검증 (단계 컴파일 시 생성된 검증기 사용)"""
+        return step.validator(user_input)
     
     def _complete_scenario(self, session: ScenarioSession) -> Dict[str, Any]:
         """시나리오 완료 처리"""
@@ -484,46 +450,52 @@ class ChatbotScenario:
         }
     
     def _save_session(self, session: ScenarioSession):
-        """세션 저장"""
+        """세션 저장 (변경된 속성만 기록)"""
         try:
-            self.sessions_table.put_item(Item={
-                'session_id': session.session_id,
-                'scenario_id': session.scenario_id,
-                'current_step': session.current_step,
-                'status': session.status.value,
-                'collected_data': session.collected_data,
-                'retry_count': session.retry_count,
-                'created_at': session.created_at,
-                'updated_at': session.updated_at
-            })
+            self.session_store.save(session)
+        except SessionConflictError:
+            raise
         except Exception as e:
             logger.error(f"세션 저장 오류: {str(e)}")
             raise
     
     def _get_session(self, session_id: str) -> Optional[ScenarioSession]:
-        """세션 조회"""
+        """세션 조회 (로컬 캐시 우선)"""
         try:
-            response = self.sessions_table.get_item(Key={'session_id': session_id})
-            item = response.get('Item')
-            
-            if not item:
-                return None
-            
-            return ScenarioSession(
-                session_id=item['session_id'],
-                scenario_id=item['scenario_id'],
-                current_step=item['current_step'],
-                status=ScenarioStatus(item['status']),
-                collected_data=item['collected_data'],
-                retry_count=item['retry_count'],
-                created_at=item['created_at'],
-                updated_at=item['updated_at']
-            )
-            
+            return self.session_store.get(session_id)
         except Exception as e:
             logger.error(f"세션 조회 오류: {str(e)}")
             return None
     
+    def _session_to_item(self, session: ScenarioSession) -> Dict[str, Any]:
+        """세션을 저장 항목으로 변환"""
+        return {
+            'session_id': session.session_id,
+            'scenario_id': session.scenario_id,
+            'current_step': session.current_step,
+            'status': session.status.value,
+            'collected_data': session.collected_data,
+            'retry_count': session.retry_count,
+            'created_at': session.created_at,
+            'updated_at': session.updated_at,
+            'scenario_version': session.scenario_version
+        }
+    
+    def _session_from_item(self, item: Dict[str, Any]) -> ScenarioSession:
+        """저장 항목을 세션으로 변환"""
+        return ScenarioSession(
+            session_id=item['session_id'],
+            scenario_id=item['scenario_id'],
+            current_step=item['current_step'],
+            status=ScenarioStatus(item['status']),
+            collected_data=item['collected_data'],
+            retry_count=int(item['retry_count']),
+            created_at=item['created_at'],
+            updated_at=item['updated_at'],
+            version=int(item.get('version', 0)),
+            scenario_version=str(item.get('scenario_version', ''))
+        )
+    
     def _get_current_timestamp(self) -> str:
         """현재 타임스탬프 반환"""
         from datetime import datetime
@@ -0,0 +1,246 @@
+"""
+AWS Connect 콜센터용 시나리오 상태 머신 모듈
+시나리오 정의를 로드 시점에 불변 상태 머신으로 컴파일
+"""
+import logging
+from collections import deque
+from dataclasses import dataclass
+from string import Formatter
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from .chatbot_scenario_validators import StepValidator, ValidatorRegistry, default_registry
+
+logger = logging.getLogger(__name__)
+
+# 단계 이동이 아닌 종료 액션
+COMPLETE_ACTION = 'complete'
+ESCALATE_ACTION = 'escalate'
+TERMINAL_ACTIONS = (COMPLETE_ACTION, ESCALATE_ACTION)
+
+
+class ScenarioDefinitionError(ValueError):
+    """시나리오 정의 오류"""
+
+    def __init__(self, scenario_id: str, problems: List[str]):
+        self.scenario_id = scenario_id
+        self.problems = problems
+        super().__init__(f"시나리오 '{scenario_id}' 정의 오류: {'; '.join(problems)}")
+
+
+@dataclass(frozen=True)
+class MessageTemplate:
+    """사전 파싱된 메시지 템플릿
+
+    ``str.format`` 필드를 컴파일 시점에 분해해 두고, 렌더링 시에는 값 치환만 수행합니다.
+    참조 필드가 누락되면 기존 동작과 같이 원본 메시지를 그대로 반환합니다.
+    """
+    raw: str
+    parts: Tuple[Tuple[str, Optional[str], str, Optional[str]], ...]
+    fields: Tuple[str, ...]
+    static_text: Optional[str]
+
+    @classmethod
+    def parse(cls, message: str) -> 'MessageTemplate':
+        """메시지 문자열 파싱"""
+        try:
+            parts = tuple(Formatter().parse(message))
+        except ValueError:
+            # 중괄호가 맞지 않는 메시지는 치환 없이 그대로 사용
+            return cls(raw=message, parts=(), fields=(), static_text=message)
+
+        fields = tuple(field_name for _, field_name, _, _ in parts if field_name is not None)
+        if not fields:
+            return cls(raw=message, parts=(), fields=(), static_text=''.join(p[0] for p in parts))
+
+        return cls(raw=message, parts=parts, fields=fields, static_text=None)
+
+    def render(self, data: Mapping[str, Any]) -> str:
+        """수집 데이터로 메시지 렌더링"""
+        if self.static_text is not None:
+            return self.static_text
+
+        try:
+            chunks = []
+            for literal, field_name, format_spec, conversion in self.parts:
+                chunks.append(literal)
+                if field_name is None:
+                    continue
+                if field_name.isidentifier():
+                    value = data[field_name]
+                else:
+                    # 속성/인덱스 접근 필드는 표준 포매터에 위임
+                    value = Formatter().get_field(field_name, (), data)[0]
+                if conversion:
+                    value = Formatter().convert_field(value, conversion)
+                chunks.append(format(value, format_spec or ''))
+            return ''.join(chunks)
+        except (KeyError, ValueError, IndexError, AttributeError, TypeError):
+            return self.raw
+
+
+@dataclass(frozen=True)
+class CompiledStep:
+    """컴파일된 시나리오 단계"""
+    step_id: str
+    index: int
+    step_name: str
+    field_name: str
+    input_type: str
+    validation_rules: Mapping[str, Any]
+    validator: StepValidator
+    message: MessageTemplate
+    transitions: Mapping[str, Mapping[str, Any]]
+    default_transition: Mapping[str, Any]
+    progress: float
+    definition: Mapping[str, Any]
+
+    def next_transition(self, user_value: Any) -> Mapping[str, Any]:
+        """사용자 값에 따른 다음 전이 (읽기 전용)"""
+        return self.transitions.get(str(user_value), self.default_transition)
+
+
+@dataclass(frozen=True)
+class CompiledScenario:
+    """컴파일된 시나리오 상태 머신"""
+    scenario_id: str
+    name: str
+    version: str
+    steps: Tuple[CompiledStep, ...]
+    step_index: Mapping[str, CompiledStep]
+    definition: Mapping[str, Any]
+
+    @property
+    def first_step(self) -> CompiledStep:
+        return self.steps[0]
+
+    def get_step(self, step_id: str) -> Optional[CompiledStep]:
+        """단계 ID로 단계 조회 (O(1))"""
+        return self.step_index.get(step_id)
+
+    def progress(self, step_id: str) -> float:
+        """단계별 진행률"""
+        step = self.step_index.get(step_id)
+        return step.progress if step else 0.0
+
+
+def compile_scenario(definition: Dict[str, Any], version: Optional[str] = None,
+                     validators: Optional[ValidatorRegistry] = None) -> CompiledScenario:
+    """
+    시나리오 정의를 상태 머신으로 컴파일
+
+    Args:
+        definition: ``steps`` 목록을 포함한 시나리오 정의
+        version: 정의 버전 (None시 정의의 ``version`` 속성 사용)
+        validators: 입력 검증기 레지스트리 (None시 기본 레지스트리)
+
+    Returns:
+        CompiledScenario: 컴파일된 시나리오
+
+    Raises:
+        ScenarioDefinitionError: 단계 누락, 중복, 정의되지 않은 전이, 도달 불가 단계가 있는 경우
+    """
+    scenario_id = definition.get('scenario_id', '<unknown>')
+    raw_steps = definition.get('steps') or []
+    problems = []
+
+    if not raw_steps:
+        raise ScenarioDefinitionError(scenario_id, ['단계가 정의되지 않았습니다'])
+
+    step_ids = []
+    for position, raw_step in enumerate(raw_steps):
+        step_id = raw_step.get('step_id')
+        if not step_id:
+            problems.append(f"{position}번째 단계에 step_id가 없습니다")
+        elif step_id in step_ids:
+            problems.append(f"중복된 step_id: {step_id}")
+        elif step_id in TERMINAL_ACTIONS:
+            problems.append(f"예약어는 step_id로 사용할 수 없습니다: {step_id}")
+        step_ids.append(step_id)
+
+    known_ids = set(step_ids)
+    for raw_step in raw_steps:
+        for condition, target in (raw_step.get('next_steps') or {}).items():
+            if target not in TERMINAL_ACTIONS and target not in known_ids:
+                problems.append(f"{raw_step.get('step_id')}: '{condition}' 조건의 전이 대상 '{target}'이(가) 없습니다")
+
+    if problems:
+        raise ScenarioDefinitionError(scenario_id, problems)
+
+    unreachable = _find_unreachable_steps(raw_steps)
+    if unreachable:
+        raise ScenarioDefinitionError(scenario_id, [f"도달할 수 없는 단계: {', '.join(unreachable)}"])
+
+    total = len(raw_steps)
+    validators = validators or default_registry
+    compiled_steps = tuple(
+        _compile_step(raw_step, index, total, validators) for index, raw_step in enumerate(raw_steps)
+    )
+
+    return CompiledScenario(
+        scenario_id=scenario_id,
+        name=definition.get('name', scenario_id),
+        version=str(version if version is not None else definition.get('version', '')),
+        steps=compiled_steps,
+        step_index=MappingProxyType({step.step_id: step for step in compiled_steps}),
+        definition=MappingProxyType(dict(definition))
+    )
+
+
+def _compile_step(raw_step: Dict[str, Any], index: int, total: int,
+                  validators: ValidatorRegistry) -> CompiledStep:
+    """단일 단계 컴파일"""
+    next_steps = raw_step.get('next_steps') or {}
+    input_type = raw_step.get('input_type', 'text')
+    validation_rules = dict(raw_step.get('validation_rules') or {})
+    transitions = {
+        str(condition): _compile_transition(target)
+        for condition, target in next_steps.items()
+        if condition != 'default'
+    }
+
+    return CompiledStep(
+        step_id=raw_step['step_id'],
+        index=index,
+        step_name=raw_step.get('step_name', raw_step['step_id']),
+        field_name=raw_step.get('field_name', f"step_{raw_step['step_id']}"),
+        input_type=input_type,
+        validation_rules=MappingProxyType(validation_rules),
+        validator=validators.compile(input_type, validation_rules),
+        message=MessageTemplate.parse(raw_step.get('message', '')),
+        transitions=MappingProxyType(transitions),
+        default_transition=_compile_transition(next_steps.get('default', COMPLETE_ACTION)),
+        progress=(index + 1) / total * 100,
+        definition=MappingProxyType(dict(raw_step))
+    )
+
+
+def _compile_transition(target: str) -> Mapping[str, Any]:
+    """전이 대상을 처리 결과 형태로 변환"""
+    if target == COMPLETE_ACTION:
+        return MappingProxyType({'action': 'complete'})
+    if target == ESCALATE_ACTION:
+        return MappingProxyType({'action': 'escalate', 'reason': '사용자 요청'})
+    return MappingProxyType({'action': 'continue', 'next_step_id': target})
+
+
+def _find_unreachable_steps(raw_steps: List[Dict[str, Any]]) -> List[str]:
+    """첫 단계에서 도달할 수 없는 단계 탐색"""
+    edges = {}
+    for raw_step in raw_steps:
+        next_steps = dict(raw_step.get('next_steps') or {})
+        targets = set(next_steps.values())
+        if 'default' not in next_steps:
+            targets.add(COMPLETE_ACTION)
+        edges[raw_step['step_id']] = targets - set(TERMINAL_ACTIONS)
+
+    start = raw_steps[0]['step_id']
+    visited = {start}
+    pending = deque([start])
+    while pending:
+        for target in edges[pending.popleft()]:
+            if target not in visited:
+                visited.add(target)
+                pending.append(target)
+
+    return [raw_step['step_id'] for raw_step in raw_steps if raw_step['step_id'] not in visited]
@@ -0,0 +1,405 @@
+"""
+AWS Connect 콜센터용 시나리오 정의 레지스트리 모듈
+버전별 시나리오 정의를 컴파일/캐시하고 백그라운드에서 새 버전을 다시 로드
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from .chatbot_scenario_machine import CompiledScenario, ScenarioDefinitionError, compile_scenario
+
+logger = logging.getLogger(__name__)
+
+
+class ScenarioSource:
+    """시나리오 정의 원본 인터페이스"""
+
+    name = 'source'
+
+    def fetch_manifest(self) -> Dict[str, str]:
+        """시나리오 ID별 현재 버전 조회"""
+        raise NotImplementedError
+
+    def fetch_definition(self, scenario_id: str, version: str) -> Optional[Dict[str, Any]]:
+        """시나리오 정의 조회 (해당 버전을 제공할 수 없으면 None 또는 현재 정의)"""
+        raise NotImplementedError
+
+
+class BuiltInScenarioSource(ScenarioSource):
+    """코드에 내장된 시나리오 정의"""
+
+    name = 'builtin'
+
+    def __init__(self, definitions: Dict[str, Dict[str, Any]], version: str = 'builtin'):
+        self.definitions = definitions
+        self.version = version
+
+    def fetch_manifest(self) -> Dict[str, str]:
+        return {scenario_id: self.version for scenario_id in self.definitions}
+
+    def fetch_definition(self, scenario_id: str, version: str) -> Optional[Dict[str, Any]]:
+        if version != self.version:
+            return None
+        return self.definitions.get(scenario_id)
+
+
+class FileScenarioSource(ScenarioSource):
+    """로컬 디렉터리의 JSON 시나리오 정의 (``<scenario_id>.json``)
+
+    정의에 ``version`` 속성이 있으면 그 값을, 없으면 파일 내용 해시를 버전으로 사용합니다.
+    """
+
+    name = 'file'
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self._loaded: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+
+    def fetch_manifest(self) -> Dict[str, str]:
+        manifest = {}
+        loaded = {}
+
+        for path in sorted(self.directory.glob('*.json')):
+            try:
+                raw = path.read_bytes()
+                definition = json.loads(raw)
+            except (OSError, ValueError) as e:
+                logger.error(f"시나리오 파일 로드 오류: {path} ({str(e)})")
+                continue
+
+            scenario_id = definition.setdefault('scenario_id', path.stem)
+            version = str(definition.get('version') or hashlib.sha256(raw).hexdigest()[:12])
+            manifest[scenario_id] = version
+            loaded[scenario_id] = (version, definition)
+
+        self._loaded = loaded
+        return manifest
+
+    def fetch_definition(self, scenario_id: str, version: str) -> Optional[Dict[str, Any]]:
+        loaded = self._loaded.get(scenario_id)
+        if loaded and loaded[0] == version:
+            return loaded[1]
+        return None
+
+
+class DynamoDBScenarioSource(ScenarioSource):
+    """DynamoDB 시나리오 테이블 (항목의 ``version`` 속성으로 버전 판별)
+
+    ``scenario_id`` 항목은 현재 버전이고, ``publish``는 같은 정의를
+    ``<scenario_id>#<version>`` 항목으로도 저장해 재시작한 인스턴스에서도
+    세션에 고정된 과거 버전을 조회할 수 있게 합니다.
+    """
+
+    name = 'dynamodb'
+    VERSION_SEPARATOR = '#'
+
+    def __init__(self, table):
+        self.table = table
+
+    def publish(self, definition: Dict[str, Any]):
+        """새 버전 게시 (버전별 항목을 먼저 저장한 뒤 현재 항목 교체)"""
+        scenario_id = definition['scenario_id']
+        version = definition['version']
+        self.table.put_item(Item=dict(definition, scenario_id=self._version_key(scenario_id, str(version))))
+        self.table.put_item(Item=dict(definition))
+
+    def fetch_manifest(self) -> Dict[str, str]:
+        manifest = {}
+        scan_kwargs = {
+            'ProjectionExpression': 'scenario_id, #v',
+            'ExpressionAttributeNames': {'#v': 'version'}
+        }
+
+        while True:
+            response = self.table.scan(**scan_kwargs)
+            for item in response.get('Items', []):
+                # 버전별 항목은 고정 버전 조회용
+                if self.VERSION_SEPARATOR in item['scenario_id']:
+                    continue
+                manifest[item['scenario_id']] = str(item.get('version', ''))
+
+            last_key = response.get('LastEvaluatedKey')
+            if not last_key:
+                return manifest
+            scan_kwargs['ExclusiveStartKey'] = last_key
+
+    def fetch_definition(self, scenario_id: str, version: str) -> Optional[Dict[str, Any]]:
+        current = self.table.get_item(Key={'scenario_id': scenario_id}, ConsistentRead=True).get('Item')
+        if current is not None and str(current.get('version', '')) == version:
+            return current
+
+        # 현재 버전이 아니면 버전별 항목 조회 (없으면 현재 정의)
+        pinned = self.table.get_item(Key={'scenario_id': self._version_key(scenario_id, version)}).get('Item')
+        if pinned is not None:
+            return dict(pinned, scenario_id=scenario_id)
+        return current
+
+    def _version_key(self, scenario_id: str, version: str) -> str:
+        return f"{scenario_id}{self.VERSION_SEPARATOR}{version}"
+
+
+class ScenarioRegistry:
+    """
+    버전별 컴파일 시나리오 레지스트리
+
+    요청 경로의 ``get``은 메모리만 조회하며, 원본 조회와 컴파일은 ``refresh``
+    (초기 로드 및 백그라운드 재로드 스레드)에서만 수행합니다. 메모리에 없는 고정
+    버전(재시작 또는 다른 인스턴스에서 시작한 세션)은 최신 버전으로 응답하고 로드를
+    요청해 두면 재로드 스레드가 곧바로 가져옵니다. 원본에 없는 버전은 ``missing_ttl`` 동안
+    다시 조회하지 않습니다.
+    원본 목록은 우선순위 순서이며 같은 시나리오 ID는 앞선 원본의 정의를 사용합니다.
+    """
+
+    def __init__(self, sources: List[ScenarioSource],
+                 reload_interval: float = 30.0,
+                 retained_versions: int = 5,
+                 missing_ttl: float = 300.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.sources = sources
+        self.reload_interval = reload_interval
+        self.retained_versions = retained_versions
+        self.missing_ttl = missing_ttl
+        self.clock = clock
+
+        # 읽기는 잠금 없이 참조를 교체하는 방식(copy-on-write)
+        self._latest: Dict[str, CompiledScenario] = {}
+        self._versions: Dict[Tuple[str, str], CompiledScenario] = {}
+        self._history: Dict[str, List[str]] = {}
+        # 시나리오 ID별 정의를 제공한 원본 이름
+        self._origin: Dict[str, str] = {}
+
+        # 로드 요청된 고정 버전과 원본에 없던 버전(재조회 가능 시각)
+        self._requested: Set[Tuple[str, str]] = set()
+        self._missing: Dict[Tuple[str, str], float] = {}
+        self._requested_lock = threading.Lock()
+
+        self._refresh_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def get(self, scenario_id: str, version: Optional[str] = None) -> Optional[CompiledScenario]:
+        """
+        컴파일된 시나리오 조회 (네트워크 호출 없음)
+
+        Args:
+            scenario_id: 시나리오 ID
+            version: 고정된 버전 (None 또는 메모리에 없으면 최신 버전)
+
+        Returns:
+            Optional[CompiledScenario]: 컴파일된 시나리오
+        """
+        if version:
+            compiled = self._versions.get((scenario_id, version))
+            if compiled is not None:
+                return compiled
+            self._request_version(scenario_id, version)
+        return self._latest.get(scenario_id)
+
+    def scenario_ids(self) -> List[str]:
+        """등록된 시나리오 ID 목록"""
+        return list(self._latest)
+
+    def refresh(self) -> Dict[str, str]:
+        """
+        원본에서 새 버전을 확인해 컴파일 후 교체
+
+        Returns:
+            Dict: 이번에 갱신된 시나리오 ID별 버전
+        """
+        with self._refresh_lock:
+            latest = dict(self._latest)
+            versions = dict(self._versions)
+            seen = set()
+            updated = {}
+
+            for source in self.sources:
+                try:
+                    manifest = source.fetch_manifest()
+                except Exception as e:
+                    logger.error(f"시나리오 목록 조회 오류 ({source.name}): {str(e)}")
+                    # 조회 실패한 원본의 시나리오는 기존 버전 유지
+                    seen.update(sid for sid in self._latest if self._origin.get(sid) == source.name)
+                    continue
+
+                for scenario_id, version in manifest.items():
+                    if scenario_id in seen:
+                        continue
+                    seen.add(scenario_id)
+
+                    current = latest.get(scenario_id)
+                    if current is not None and current.version == version \
+                            and self._origin.get(scenario_id) == source.name:
+                        continue
+
+                    compiled = versions.get((scenario_id, version))
+                    if compiled is None:
+                        compiled = self._compile(source, scenario_id, version)
+                        if compiled is None:
+                            continue
+
+                    latest[scenario_id] = compiled
+                    versions[(scenario_id, compiled.version)] = compiled
+                    self._origin[scenario_id] = source.name
+                    self._remember_version(scenario_id, compiled.version, versions)
+                    updated[scenario_id] = compiled.version
+
+            # 모든 원본에서 사라진 시나리오 제거 (세션 고정용 과거 버전은 유지)
+            for scenario_id in set(latest) - seen:
+                del latest[scenario_id]
+
+            self._load_requested(versions)
+            self._versions = versions
+            self._latest = latest
+
+        if updated:
+            logger.info(f"시나리오 정의 갱신: {updated}")
+        return updated
+
+    def start(self):
+        """백그라운드 재로드 시작"""
+        if self._thread is not None or self.reload_interval <= 0:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="scenario-registry-reload", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """백그라운드 재로드 종료"""
+        self._stop_event.set()
+        self._wakeup.set()
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout)
+
+    def load_requested_versions(self) -> int:
+        """
+        ``get``에서 요청된 고정 버전 로드 (재로드 스레드에서 호출)
+
+        Returns:
+            int: 로드한 버전 수
+        """
+        with self._refresh_lock:
+            versions = dict(self._versions)
+            loaded = self._load_requested(versions)
+            self._versions = versions
+        return loaded
+
+    def _run(self):
+        next_refresh = self.clock() + self.reload_interval
+        while not self._stop_event.is_set():
+            self._wakeup.wait(max(0.0, next_refresh - self.clock()))
+            self._wakeup.clear()
+            if self._stop_event.is_set():
+                return
+            try:
+                if self.clock() >= next_refresh:
+                    next_refresh = self.clock() + self.reload_interval
+                    self.refresh()
+                else:
+                    self.load_requested_versions()
+            except Exception as e:
+                logger.error(f"시나리오 재로드 오류: {str(e)}")
+
+    def _request_version(self, scenario_id: str, version: str):
+        """메모리에 없는 고정 버전 로드 요청 (원본 조회는 재로드 스레드에서 수행)"""
+        key = (scenario_id, version)
+        with self._requested_lock:
+            if key in self._requested or self._missing.get(key, 0.0) > self.clock():
+                return
+            self._requested.add(key)
+        logger.warning(f"고정된 시나리오 버전이 메모리에 없어 최신 버전 사용 후 로드 요청: {scenario_id}@{version}")
+        self._wakeup.set()
+
+    def _load_requested(self, versions: Dict[Tuple[str, str], CompiledScenario]) -> int:
+        """요청된 고정 버전을 원본에서 조회해 versions에 추가 (_refresh_lock 보유 상태에서 호출)"""
+        with self._requested_lock:
+            requested, self._requested = self._requested, set()
+
+        loaded = 0
+        for scenario_id, version in requested:
+            if (scenario_id, version) in versions:
+                continue
+            for source in self.sources:
+                compiled = self._compile(source, scenario_id, version)
+                # 현재 정의만 제공하는 원본은 다른 버전을 반환할 수 있음
+                if compiled is None or compiled.version != version:
+                    continue
+                versions[(scenario_id, version)] = compiled
+                self._remember_version(scenario_id, version, versions)
+                logger.info(f"고정된 시나리오 버전 로드: {scenario_id}@{version} ({source.name})")
+                loaded += 1
+                break
+            else:
+                logger.warning(f"고정된 시나리오 버전을 찾을 수 없음: {scenario_id}@{version}")
+                now = self.clock()
+                with self._requested_lock:
+                    self._missing = {key: until for key, until in self._missing.items() if until > now}
+                    self._missing[(scenario_id, version)] = now + self.missing_ttl
+        return loaded
+
+    def _compile(self, source: ScenarioSource, scenario_id: str, version: str) -> Optional[CompiledScenario]:
+        try:
+            definition = source.fetch_definition(scenario_id, version)
+            if not definition:
+                return None
+            # 목록 조회 이후 갱신된 경우 실제 정의의 버전을 사용
+            if definition.get('version') is not None:
+                version = str(definition['version'])
+            return compile_scenario(definition, version=version)
+        except ScenarioDefinitionError as e:
+            # 잘못된 새 버전은 배포하지 않고 기존 버전 유지
+            logger.error(f"시나리오 정의 검증 오류 ({source.name}): {str(e)}")
+        except Exception as e:
+            logger.error(f"시나리오 정의 조회 오류 ({source.name}): {str(e)}")
+        return None
+
+    def _remember_version(self, scenario_id: str, version: str,
+                          versions: Dict[Tuple[str, str], CompiledScenario]):
+        history = self._history.setdefault(scenario_id, [])
+        if version in history:
+            history.remove(version)
+        history.append(version)
+        while len(history) > self.retained_versions:
+            versions.pop((scenario_id, history.pop(0)), None)
+
+
+# 프로세스 전역 레지스트리 (같은 원본 구성은 초기 로드와 재로드 스레드를 공유)
+_shared_registries: Dict[str, ScenarioRegistry] = {}
+_shared_registries_lock = threading.Lock()
+
+
+def get_shared_registry(key: str, factory: Callable[[], ScenarioRegistry]) -> ScenarioRegistry:
+    """
+    프로세스 전역 레지스트리 가져오기 (없으면 생성 후 초기 로드 및 재로드 시작)
+
+    Args:
+        key: 원본 구성 식별 키
+        factory: 레지스트리 생성 함수
+
+    Returns:
+        ScenarioRegistry: 공유 레지스트리
+    """
+    registry = _shared_registries.get(key)
+    if registry is None:
+        with _shared_registries_lock:
+            registry = _shared_registries.get(key)
+            if registry is None:
+                registry = factory()
+                registry.refresh()
+                registry.start()
+                _shared_registries[key] = registry
+    return registry
+
+
+def stop_shared_registries(timeout: Optional[float] = None):
+    """공유 레지스트리 재로드 종료 (프로세스 종료/테스트용)"""
+    with _shared_registries_lock:
+        registries = list(_shared_registries.values())
+        _shared_registries.clear()
+    for registry in registries:
+        registry.stop(timeout)
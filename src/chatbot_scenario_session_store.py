@@ -0,0 +1,269 @@
+"""
+AWS Connect 콜센터용 시나리오 세션 저장소 모듈
+TTL 기반 로컬 캐시, 변경 속성만 기록하는 dirty tracking, 버전 기반 낙관적 동시성 제어
+"""
+import copy
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from botocore.exceptions import ClientError
+
+logger = logging.getLogger(__name__)
+
+# 버전 속성 이름
+VERSION_ATTRIBUTE = 'version'
+
+
+class SessionConflictError(Exception):
+    """다른 워커가 먼저 세션을 갱신한 경우"""
+
+    def __init__(self, session_id: str, expected_version: int):
+        self.session_id = session_id
+        self.expected_version = expected_version
+        super().__init__(f"세션 버전 충돌: {session_id} (expected version {expected_version})")
+
+
+class SessionBackend:
+    """세션 저장 백엔드 인터페이스"""
+
+    def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """세션 항목 조회"""
+        raise NotImplementedError
+
+    def create(self, item: Dict[str, Any]):
+        """
+        신규 세션 항목 기록
+
+        Raises:
+            SessionConflictError: 같은 ID의 세션이 이미 있는 경우
+        """
+        raise NotImplementedError
+
+    def update(self, session_id: str, changes: Dict[str, Any], expected_version: int):
+        """
+        변경 속성만 조건부 기록
+
+        Args:
+            session_id: 세션 ID
+            changes: 변경된 속성 (버전 속성 포함)
+            expected_version: 저장소에 있어야 하는 현재 버전
+
+        Raises:
+            SessionConflictError: 저장소 버전이 expected_version과 다른 경우
+        """
+        raise NotImplementedError
+
+
+class DynamoDBSessionBackend(SessionBackend):
+    """DynamoDB 세션 백엔드"""
+
+    def __init__(self, table):
+        self.table = table
+
+    def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        response = self.table.get_item(Key={'session_id': session_id}, ConsistentRead=True)
+        return response.get('Item')
+
+    def create(self, item: Dict[str, Any]):
+        try:
+            self.table.put_item(Item=item, ConditionExpression='attribute_not_exists(session_id)')
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException':
+                raise SessionConflictError(item['session_id'], 0) from e
+            raise
+
+    def update(self, session_id: str, changes: Dict[str, Any], expected_version: int):
+        names = {'#v': VERSION_ATTRIBUTE}
+        values = {':expected': expected_version}
+        assignments = []
+
+        for position, (attribute, value) in enumerate(changes.items()):
+            names[f'#a{position}'] = attribute
+            values[f':v{position}'] = value
+            assignments.append(f'#a{position} = :v{position}')
+
+        # 버전 속성이 없는 기존 세션은 버전 0으로 간주
+        condition = '#v = :expected'
+        if expected_version == 0:
+            condition = 'attribute_not_exists(#v) OR #v = :expected'
+
+        try:
+            self.table.update_item(
+                Key={'session_id': session_id},
+                UpdateExpression='SET ' + ', '.join(assignments),
+                ConditionExpression=f'attribute_exists(session_id) AND ({condition})',
+                ExpressionAttributeNames=names,
+                ExpressionAttributeValues=values
+            )
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException':
+                raise SessionConflictError(session_id, expected_version) from e
+            raise
+
+
+class InMemorySessionBackend(SessionBackend):
+    """테스트용 인메모리 세션 백엔드"""
+
+    def __init__(self):
+        self.items: Dict[str, Dict[str, Any]] = {}
+        self.calls = {'load': 0, 'create': 0, 'update': 0}
+        self._lock = threading.Lock()
+
+    def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self.calls['load'] += 1
+            item = self.items.get(session_id)
+            return copy.deepcopy(item) if item is not None else None
+
+    def create(self, item: Dict[str, Any]):
+        with self._lock:
+            self.calls['create'] += 1
+            if item['session_id'] in self.items:
+                raise SessionConflictError(item['session_id'], 0)
+            self.items[item['session_id']] = copy.deepcopy(item)
+
+    def update(self, session_id: str, changes: Dict[str, Any], expected_version: int):
+        with self._lock:
+            self.calls['update'] += 1
+            item = self.items.get(session_id)
+            if item is None or int(item.get(VERSION_ATTRIBUTE, 0)) != expected_version:
+                raise SessionConflictError(session_id, expected_version)
+            item.update(copy.deepcopy(changes))
+
+
+@dataclass
+class _CacheEntry:
+    """세션 캐시 항목"""
+    snapshot: Dict[str, Any]
+    version: int
+    expires_at: float
+
+
+class CachedSessionStore:
+    """
+    TTL 기반 로컬 캐시를 갖는 세션 저장소
+
+    조회는 캐시가 유효하면 백엔드를 호출하지 않고, 저장은 마지막으로 읽거나 쓴 스냅샷과
+    비교해 변경된 속성만 버전 조건과 함께 기록합니다. 변경이 없으면 기록하지 않습니다.
+    """
+
+    def __init__(self, backend: SessionBackend,
+                 to_item: Callable[[Any], Dict[str, Any]],
+                 from_item: Callable[[Dict[str, Any]], Any],
+                 ttl_seconds: float = 30.0,
+                 max_entries: int = 10000,
+                 clock: Callable[[], float] = time.monotonic):
+        self.backend = backend
+        self.to_item = to_item
+        self.from_item = from_item
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.clock = clock
+
+        self._cache: 'OrderedDict[str, _CacheEntry]' = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.stats = {'hits': 0, 'misses': 0, 'writes': 0, 'skipped_writes': 0, 'conflicts': 0}
+
+    def get(self, session_id: str) -> Optional[Any]:
+        """세션 조회"""
+        with self._lock:
+            entry = self._cache.get(session_id)
+            if entry is not None and entry.expires_at > self.clock():
+                self._cache.move_to_end(session_id)
+                self.stats['hits'] += 1
+                return self.from_item(copy.deepcopy(entry.snapshot))
+            self._cache.pop(session_id, None)
+            self.stats['misses'] += 1
+
+        item = self.backend.load(session_id)
+        if item is None:
+            return None
+
+        item[VERSION_ATTRIBUTE] = int(item.get(VERSION_ATTRIBUTE, 0))
+        self._remember(session_id, item)
+        return self.from_item(copy.deepcopy(item))
+
+    def save(self, session: Any):
+        """
+        세션 저장
+
+        신규 세션(version 0)은 전체 기록하고, 기존 세션은 변경 속성만 버전 조건부로
+        기록합니다. 성공 시 ``session.version``이 증가합니다.
+
+        Raises:
+            SessionConflictError: 다른 워커가 먼저 갱신한 경우 (캐시는 무효화됨)
+        """
+        item = self.to_item(session)
+        session_id = item['session_id']
+        expected_version = int(session.version)
+
+        with self._lock:
+            entry = self._cache.get(session_id)
+            snapshot = entry.snapshot if entry is not None and entry.version == expected_version else None
+
+        if snapshot is None and expected_version == 0:
+            self._create_or_replace(item)
+        else:
+            changes = {
+                key: value for key, value in item.items()
+                if key not in ('session_id', VERSION_ATTRIBUTE)
+                and (snapshot is None or snapshot.get(key) != value)
+            }
+            if not changes:
+                with self._lock:
+                    self.stats['skipped_writes'] += 1
+                return
+
+            changes[VERSION_ATTRIBUTE] = expected_version + 1
+            try:
+                self.backend.update(session_id, changes, expected_version)
+            except SessionConflictError:
+                self.invalidate(session_id)
+                with self._lock:
+                    self.stats['conflicts'] += 1
+                raise
+            item[VERSION_ATTRIBUTE] = expected_version + 1
+
+        session.version = item[VERSION_ATTRIBUTE]
+        with self._lock:
+            self.stats['writes'] += 1
+        self._remember(session_id, item)
+
+    def invalidate(self, session_id: str):
+        """캐시 무효화"""
+        with self._lock:
+            self._cache.pop(session_id, None)
+
+    def _create_or_replace(self, item: Dict[str, Any]):
+        """신규 세션 기록 (같은 ID의 이전 세션이 있으면 버전을 이어서 교체)"""
+        session_id = item['session_id']
+        try:
+            item[VERSION_ATTRIBUTE] = 1
+            self.backend.create(item)
+            return
+        except SessionConflictError:
+            pass
+
+        # 시나리오 재시작: 현재 버전 기준으로 전체 속성 교체
+        current = self.backend.load(session_id) or {}
+        current_version = int(current.get(VERSION_ATTRIBUTE, 0))
+        changes = {key: value for key, value in item.items() if key != 'session_id'}
+        changes[VERSION_ATTRIBUTE] = current_version + 1
+        self.backend.update(session_id, changes, current_version)
+        item[VERSION_ATTRIBUTE] = current_version + 1
+
+    def _remember(self, session_id: str, item: Dict[str, Any]):
+        with self._lock:
+            self._cache[session_id] = _CacheEntry(
+                snapshot=copy.deepcopy(item),
+                version=int(item[VERSION_ATTRIBUTE]),
+                expires_at=self.clock() + self.ttl_seconds
+            )
+            self._cache.move_to_end(session_id)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
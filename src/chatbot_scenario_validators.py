@@ -0,0 +1,222 @@
+"""
+시나리오 단계 입력 검증기 레지스트리
+단계별 검증 규칙(정규식, 선택지, 숫자 범위, 날짜 형식)을 한 번만 컴파일하여 재사용
+
+src 시나리오 엔진과 3.2 챗봇 시나리오 엔진이 함께 사용하므로 표준 라이브러리 외의
+의존성과 패키지 상대 import를 두지 않습니다.
+"""
+import re
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional
+
+# 검증 결과: {'valid': bool, 'processed_value': Any} 또는 {'valid': False, 'error_message': str}
+ValidationResult = Dict[str, Any]
+ValidatorFactory = Callable[[Mapping[str, Any]], 'StepValidator']
+
+# 'YYYY-MM-DD' 형태의 표기를 strptime 형식으로 변환
+_DATE_TOKENS = (('YYYY', '%Y'), ('YY', '%y'), ('MM', '%m'), ('DD', '%d'), ('HH', '%H'), ('mm', '%M'), ('ss', '%S'))
+
+
+class StepValidator:
+    """컴파일된 단계 검증기"""
+
+    input_type = 'any'
+
+    def __call__(self, user_input: Any) -> ValidationResult:
+        return self.validate(user_input)
+
+    def validate(self, user_input: Any) -> ValidationResult:
+        """단일 입력 검증"""
+        return {'valid': True, 'processed_value': user_input}
+
+    def validate_batch(self, inputs: Iterable[Any]) -> List[ValidationResult]:
+        """여러 입력 일괄 검증 (녹취 세션 재생/QA용)"""
+        validate = self.validate
+        return [validate(user_input) for user_input in inputs]
+
+
+class ChoiceValidator(StepValidator):
+    """선택형 입력 검증"""
+
+    input_type = 'choice'
+
+    def __init__(self, rules: Mapping[str, Any]):
+        choices = [str(choice) for choice in rules.get('choices', [])]
+        self.choices = frozenset(choices)
+        self.error = {
+            'valid': False,
+            'error_message': rules.get('error_message') or f"올바른 선택지를 입력해주세요: {', '.join(choices)}"
+        }
+
+    def validate(self, user_input: Any) -> ValidationResult:
+        value = _as_text(user_input).strip()
+        if value in self.choices:
+            return {'valid': True, 'processed_value': value}
+        return dict(self.error)
+
+    def validate_batch(self, inputs: Iterable[Any]) -> List[ValidationResult]:
+        choices = self.choices
+        results = []
+        for value in (_as_text(user_input).strip() for user_input in inputs):
+            results.append({'valid': True, 'processed_value': value} if value in choices else dict(self.error))
+        return results
+
+
+class TextValidator(StepValidator):
+    """텍스트 입력 검증
+
+    ``error_message``는 패턴 불일치, ``length_error_message``는 길이 위반 시 메시지를 대체합니다.
+    ``max_length``를 None으로 지정하면 최대 길이를 검사하지 않습니다.
+    """
+
+    input_type = 'text'
+
+    def __init__(self, rules: Mapping[str, Any]):
+        self.min_length = int(rules.get('min_length', 1))
+        max_length = rules.get('max_length', 1000)
+        self.max_length = int(max_length) if max_length is not None else None
+        pattern = rules.get('pattern')
+        self.pattern = re.compile(pattern) if pattern else None
+
+        length_message = rules.get('length_error_message')
+        self.too_short = {
+            'valid': False,
+            'error_message': length_message or f'최소 {self.min_length}글자 이상 입력해주세요.'
+        }
+        self.too_long = {
+            'valid': False,
+            'error_message': length_message or f'최대 {self.max_length}글자까지 입력 가능합니다.'
+        }
+        self.mismatch = {
+            'valid': False,
+            'error_message': rules.get('error_message', '올바른 형식으로 입력해주세요.')
+        }
+
+    def validate(self, user_input: Any) -> ValidationResult:
+        value = _as_text(user_input).strip()
+
+        if len(value) < self.min_length:
+            return dict(self.too_short)
+        if self.max_length is not None and len(value) > self.max_length:
+            return dict(self.too_long)
+        if self.pattern is not None and not self.pattern.match(value):
+            return dict(self.mismatch)
+
+        return {'valid': True, 'processed_value': value}
+
+
+class DateValidator(StepValidator):
+    """날짜 입력 검증"""
+
+    input_type = 'date'
+
+    def __init__(self, rules: Mapping[str, Any]):
+        self.date_format = _to_strptime_format(rules.get('date_format', '%Y-%m-%d'))
+        self.future_only = bool(rules.get('future_only', False))
+        self.invalid = {
+            'valid': False,
+            'error_message': rules.get('error_message', '올바른 날짜 형식으로 입력해주세요. (예: 2024-01-15)')
+        }
+        self.not_future = {'valid': False, 'error_message': '오늘 이후의 날짜를 입력해주세요.'}
+
+    def validate(self, user_input: Any) -> ValidationResult:
+        return self._validate(user_input, date.today())
+
+    def validate_batch(self, inputs: Iterable[Any]) -> List[ValidationResult]:
+        today = date.today()
+        return [self._validate(user_input, today) for user_input in inputs]
+
+    def _validate(self, user_input: Any, today: date) -> ValidationResult:
+        value = _as_text(user_input).strip()
+        try:
+            parsed_date = datetime.strptime(value, self.date_format).date()
+        except ValueError:
+            return dict(self.invalid)
+
+        if self.future_only and parsed_date <= today:
+            return dict(self.not_future)
+
+        return {'valid': True, 'processed_value': value}
+
+
+class NumberValidator(StepValidator):
+    """숫자 입력 검증"""
+
+    input_type = 'number'
+
+    def __init__(self, rules: Mapping[str, Any]):
+        self.min_value = rules.get('min_value')
+        self.max_value = rules.get('max_value')
+        self.invalid = {'valid': False, 'error_message': rules.get('error_message', '올바른 숫자를 입력해주세요.')}
+        self.too_small = {'valid': False, 'error_message': f'{self.min_value} 이상의 값을 입력해주세요.'}
+        self.too_large = {'valid': False, 'error_message': f'{self.max_value} 이하의 값을 입력해주세요.'}
+
+    def validate(self, user_input: Any) -> ValidationResult:
+        try:
+            number = float(_as_text(user_input).strip())
+        except ValueError:
+            return dict(self.invalid)
+
+        if self.min_value is not None and number < self.min_value:
+            return dict(self.too_small)
+        if self.max_value is not None and number > self.max_value:
+            return dict(self.too_large)
+
+        return {'valid': True, 'processed_value': number}
+
+
+class ValidatorRegistry:
+    """입력 유형별 검증기 팩토리 레지스트리"""
+
+    def __init__(self, default_type: str = 'text'):
+        self.default_type = default_type
+        self._factories: Dict[str, ValidatorFactory] = {}
+
+    def register(self, input_type: str, factory: ValidatorFactory):
+        """입력 유형 검증기 등록"""
+        self._factories[input_type] = factory
+
+    def is_registered(self, input_type: str) -> bool:
+        return input_type in self._factories
+
+    def compile(self, input_type: Optional[str], rules: Optional[Mapping[str, Any]] = None) -> StepValidator:
+        """
+        단계 검증기 컴파일
+
+        Args:
+            input_type: 입력 유형 (미등록 유형은 기본 유형으로 처리)
+            rules: 검증 규칙
+
+        Returns:
+            StepValidator: 재사용 가능한 검증기
+        """
+        factory = self._factories.get(input_type or self.default_type) or self._factories[self.default_type]
+        return factory(rules or {})
+
+
+def _as_text(user_input: Any) -> str:
+    if user_input is None:
+        return ''
+    return user_input if isinstance(user_input, str) else str(user_input)
+
+
+def _to_strptime_format(date_format: str) -> str:
+    if '%' in date_format:
+        return date_format
+    for token, directive in _DATE_TOKENS:
+        date_format = date_format.replace(token, directive)
+    return date_format
+
+
+def create_default_registry() -> ValidatorRegistry:
+    """기본 입력 유형(choice, text, date, number, any)이 등록된 레지스트리 생성"""
+    registry = ValidatorRegistry(default_type='text')
+    registry.register('any', lambda rules: StepValidator())
+    registry.register('choice', ChoiceValidator)
+    registry.register('text', TextValidator)
+    registry.register('date', DateValidator)
+    registry.register('number', NumberValidator)
+    return registry
+
+
+default_registry = create_default_registry()
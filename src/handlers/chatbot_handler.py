@@ -2,12 +2,15 @@
 AWS Lambda 챗봇 핸들러
 로컬 개발환경에서 테스트 가능한 구조로 작성
 """
+import base64
 import json
 import logging
 import os
 import sys
-from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
+from decimal import Decimal
 
 # 프로젝트 루트를 Python 경로에 추가
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
@@ -22,6 +25,9 @@ load_dotenv()  # 기본 .env
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 배치 처리 시 동시 NLU 호출 수
+BATCH_NLU_CONCURRENCY = int(os.getenv('BATCH_NLU_CONCURRENCY', '8'))
+
 class ChatbotHandler:
     """챗봇 핸들러 클래스"""
     
@@ -182,6 +188,120 @@ class ChatbotHandler:
         except Exception as e:
             logger.error(f"대화 저장 중 오류: {e}")
     
+    def process_chat_batch(self, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        채팅 메시지 일괄 처리
+        
+        동일한 발화(메시지 + 컨텍스트)는 NLU를 한 번만 호출하고, 결과는 일괄 저장합니다.
+        
+        Args:
+            messages: 메시지 목록 (item_id, message, session_id, context)
+            
+        Returns:
+            Dict: 처리 결과 목록(results)과 실패 항목 식별자(batchItemFailures)
+        """
+        failed_ids: List[str] = []
+        groups: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        for item in messages:
+            message = item.get('message')
+            if not isinstance(message, str) or not message.strip():
+                logger.error(f"메시지가 없거나 문자열이 아닌 배치 항목: {item.get('item_id')}")
+                failed_ids.append(item['item_id'])
+                continue
+            groups.setdefault(self._utterance_key(item), []).append(item)
+        
+        logger.info(f"배치 처리 시작: {len(messages)}건 (고유 발화 {len(groups)}건)")
+        nlu_results = self._run_batch_nlu(groups)
+        
+        results = []
+        entries = []
+        for key, items in groups.items():
+            nlu_result = nlu_results.get(key)
+            if nlu_result is None:
+                failed_ids.extend(item['item_id'] for item in items)
+                continue
+            for item in items:
+                result = self._build_chat_result(nlu_result, item['session_id'], item.get('context'))
+                results.append({'item_id': item['item_id'], **result})
+                entries.append((item, nlu_result))
+        
+        # 저장 실패 시 어떤 항목이 기록됐는지 알 수 없으므로 전체를 재시도 대상으로 반환
+        if entries and not self.use_mock_services and not self._save_conversations(entries):
+            failed_ids.extend(result['item_id'] for result in results)
+            results = []
+        
+        return {
+            'results': results,
+            'batchItemFailures': [{'itemIdentifier': item_id} for item_id in failed_ids]
+        }
+    
+    @staticmethod
+    def _utterance_key(item: Dict[str, Any]) -> Tuple[str, str]:
+        """중복 제거용 발화 키"""
+        context = json.dumps(item.get('context') or {}, ensure_ascii=False, sort_keys=True)
+        return item['message'].strip(), context
+    
+    def _run_batch_nlu(self, groups: Dict[Tuple[str, str], List[Dict[str, Any]]]) -> Dict[Tuple[str, str], Dict]:
+        """고유 발화별 NLU 동시 호출 (실패한 발화는 결과에서 제외)"""
+        def analyze(key: Tuple[str, str]) -> Optional[Dict[str, Any]]:
+            first = groups[key][0]
+            try:
+                if self.use_mock_services:
+                    return self._mock_chat_response(first['message'], first['session_id'], first.get('context'))
+                return self._call_bedrock_nlu(first['message'], first.get('context') or {})
+            except Exception as e:
+                logger.error(f"배치 NLU 처리 중 오류: {e}")
+                return None
+        
+        keys = list(groups)
+        if not keys:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(BATCH_NLU_CONCURRENCY, len(keys))) as executor:
+            analyzed = executor.map(analyze, keys)
+            return {key: result for key, result in zip(keys, analyzed) if result is not None}
+    
+    def _build_chat_result(self, nlu_result: Dict, session_id: str, context: Optional[Dict]) -> Dict[str, Any]:
+        """NLU 결과로 채팅 응답 생성"""
+        return {
+            'success': True,
+            'intent': nlu_result.get('intent', 'general_inquiry'),
+            'confidence': nlu_result.get('confidence', 0.5),
+            'response_text': nlu_result.get('response_text', '처리 중입니다.'),
+            'session_id': session_id,
+            'next_action': nlu_result.get('next_action', 'continue_conversation'),
+            'timestamp': datetime.now().isoformat(),
+            'context': nlu_result.get('context', context or {}),
+            'mock_response': self.use_mock_services
+        }
+    
+    def _save_conversations(self, entries: List[Tuple[Dict[str, Any], Dict]]) -> bool:
+        """
+        대화 내용을 DynamoDB에 일괄 저장
+        
+        정렬 키는 항목 자체의 시각과 식별자로 만들어 같은 세션의 메시지가
+        같은 시각에 처리되어도 서로 덮어쓰지 않게 합니다.
+        """
+        try:
+            table = self.dynamodb.Table(os.getenv('DYNAMODB_TABLE_NAME'))
+            received_at = datetime.now().isoformat()
+            with table.batch_writer(overwrite_by_pkeys=['session_id', 'timestamp']) as batch:
+                for item, nlu_result in entries:
+                    batch.put_item(
+                        Item={
+                            'session_id': item['session_id'],
+                            'timestamp': f"{item.get('timestamp') or received_at}#{item['item_id']}",
+                            'message_id': item['item_id'],
+                            'user_message': item['message'],
+                            'intent': nlu_result.get('intent'),
+                            'confidence': Decimal(str(nlu_result.get('confidence', 0))),
+                            'response_text': nlu_result.get('response_text')
+                        }
+                    )
+            return True
+        except Exception as e:
+            logger.error(f"대화 일괄 저장 중 오류: {e}")
+            return False
+    
     def process_escalation(self, session_id: str, reason: str = 'customer_request') -> Dict[str, Any]:
         """상담원 에스컬레이션 처리"""
         try:
@@ -219,21 +339,95 @@ class ChatbotHandler:
         }
 
 
+def _record_id(record: Dict[str, Any]) -> str:
+    """SQS/Kinesis 레코드 식별자 (부분 실패 응답용)"""
+    return record['kinesis']['sequenceNumber'] if 'kinesis' in record else record['messageId']
+
+
+def _record_timestamp(record: Dict[str, Any]) -> Optional[str]:
+    """레코드가 큐/스트림에 들어온 시각 (ISO 형식)"""
+    if 'kinesis' in record:
+        arrival = record['kinesis'].get('approximateArrivalTimestamp')
+        return datetime.fromtimestamp(float(arrival)).isoformat() if arrival else None
+    sent = record.get('attributes', {}).get('SentTimestamp')
+    return datetime.fromtimestamp(int(sent) / 1000).isoformat() if sent else None
+
+
+def _parse_batch_messages(event: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    배치 이벤트를 메시지 목록으로 변환
+    
+    SQS/Kinesis 레코드(Records) 또는 직접 호출(request_type=batch, messages)을 지원합니다.
+    
+    Returns:
+        Tuple: (메시지 목록, 해석 실패 항목 식별자 목록)
+    """
+    messages = []
+    failed_ids = []
+    
+    if 'Records' in event:
+        for record in event['Records']:
+            is_kinesis = 'kinesis' in record
+            item_id = _record_id(record)
+            try:
+                body = base64.b64decode(record['kinesis']['data']) if is_kinesis else record['body']
+                message = {'item_id': item_id, **json.loads(body)}
+                message.setdefault('timestamp', _record_timestamp(record))
+                messages.append(message)
+            except (ValueError, TypeError) as e:
+                logger.error(f"배치 레코드 해석 오류 ({item_id}): {e}")
+                failed_ids.append(item_id)
+    else:
+        for index, message in enumerate(event.get('messages', [])):
+            messages.append({'item_id': str(message.get('id', index)), **message})
+    
+    for message in messages:
+        message.setdefault('session_id', f"session_{message['item_id']}")
+    return messages, failed_ids
+
+
+def _handle_batch(handler: ChatbotHandler, event: Dict[str, Any]) -> Dict[str, Any]:
+    """배치 요청 처리 (SQS/Kinesis는 부분 실패 응답 형식으로 반환)"""
+    messages, failed_ids = _parse_batch_messages(event)
+    result = handler.process_chat_batch(messages)
+    result['batchItemFailures'] = [{'itemIdentifier': item_id} for item_id in failed_ids] + result['batchItemFailures']
+    
+    logger.info(f"배치 처리 완료: 성공 {len(result['results'])}건, 실패 {len(result['batchItemFailures'])}건")
+    
+    if 'Records' in event:
+        return {'batchItemFailures': result['batchItemFailures']}
+    
+    return {
+        'statusCode': 200,
+        'headers': {
+            'Content-Type': 'application/json',
+            'Access-Control-Allow-Origin': '*'
+        },
+        'body': json.dumps({'success': True, **result}, ensure_ascii=False)
+    }
+
+
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     AWS Lambda 진입점
     로컬 테스트에서도 동일한 인터페이스 사용
     """
     try:
-        logger.info(f"Lambda 핸들러 시작: {json.dumps(event, ensure_ascii=False)}")
+        if 'Records' in event:
+            logger.info(f"Lambda 핸들러 시작: 배치 레코드 {len(event['Records'])}건")
+        else:
+            logger.info(f"Lambda 핸들러 시작: {json.dumps(event, ensure_ascii=False)}")
         
         # 핸들러 인스턴스 생성
         handler = ChatbotHandler()
         
         # 요청 타입에 따른 처리
-        request_type = event.get('request_type', 'chat')
+        request_type = 'batch' if 'Records' in event else event.get('request_type', 'chat')
         
-        if request_type == 'chat':
+        if request_type == 'batch':
+            return _handle_batch(handler, event)
+        
+        elif request_type == 'chat':
             message = event.get('message', '')
             session_id = event.get('session_id', f'session_{int(datetime.now().timestamp())}')
             context = event.get('context', {})
@@ -278,6 +472,13 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             
     except Exception as e:
         logger.error(f"Lambda 핸들러 오류: {e}")
+        
+        # SQS/Kinesis는 500 응답도 성공으로 처리되어 배치가 삭제되므로 전체를 재시도 대상으로 반환
+        if 'Records' in event:
+            return {'batchItemFailures': [
+                {'itemIdentifier': _record_id(record)} for record in event['Records']
+            ]}
+        
         return {
             'statusCode': 500,
             'headers': {
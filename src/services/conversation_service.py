@@ -4,11 +4,12 @@ AWS Connect 콜센터용 대화 서비스
 import json
 import logging
 from typing import Dict, List, Optional, Any
-import boto3
 from botocore.exceptions import ClientError
 from datetime import datetime
 import uuid
 
+from ..utils.aws_client import get_client, get_resource, iter_items, transact_write
+from ..utils.tracing import traced
 from ..models.conversation import Conversation, Message, MessageSource, MessageType, ConversationStatus
 
 logger = logging.getLogger(__name__)
@@ -17,17 +18,18 @@ class ConversationService:
     """대화 관리 서비스"""
     
     def __init__(self, dynamodb_table_name: str = "conversations"):
-        self.dynamodb = boto3.resource('dynamodb')
+        self.dynamodb = get_resource('dynamodb')
         self.conversations_table = self.dynamodb.Table(dynamodb_table_name)
         self.messages_table = self.dynamodb.Table(f"{dynamodb_table_name}_messages")
         
         # S3 for conversation archives
-        self.s3_client = boto3.client('s3')
+        self.s3_client = get_client('s3')
         self.archive_bucket = "aicc-conversation-archives"
         
         # CloudWatch for metrics
-        self.cloudwatch = boto3.client('cloudwatch')
+        self.cloudwatch = get_client('cloudwatch')
     
+    @traced('conversation.create')
     def create_conversation(self, session_id: str, user_id: Optional[str] = None,
                           channel: str = "web_chat") -> Conversation:
         """
@@ -72,6 +74,7 @@ class ConversationService:
             logger.error(f"대화 생성 오류: {str(e)}")
             raise
     
+    @traced('conversation.get')
     def get_conversation(self, conversation_id: str) -> Optional[Conversation]:
         """
         대화 조회
@@ -118,11 +121,8 @@ class ConversationService:
             # 대화에 메시지 추가
             conversation.add_message(message)
             
-            # DynamoDB에 메시지 저장
-            self._save_message(message)
-            
-            # 대화 정보 업데이트
-            self._update_conversation(conversation)
+            # DynamoDB에 메시지 저장 및 대화 정보 업데이트 (한 번의 요청)
+            self._save_message(message, conversation)
             
             # 실시간 알림 (필요시)
             if conversation.assigned_agent_id:
@@ -406,10 +406,8 @@ class ConversationService:
                 scan_kwargs['FilterExpression'] += ' AND assigned_agent_id = :agent_id'
                 scan_kwargs['ExpressionAttributeValues'][':agent_id'] = agent_id
             
-            response = self.conversations_table.scan(**scan_kwargs)
-            
             conversations = []
-            for item in response.get('Items', []):
+            for item in iter_items(self.conversations_table.scan, **scan_kwargs):
                 conversation = Conversation.from_dict(item)
                 conversations.append(conversation)
             
@@ -452,10 +450,8 @@ class ConversationService:
                 scan_kwargs['FilterExpression'] = ' AND '.join(filter_expressions)
                 scan_kwargs['ExpressionAttributeValues'] = expression_values
             
-            response = self.conversations_table.scan(**scan_kwargs)
-            
             conversations = []
-            for item in response.get('Items', []):
+            for item in iter_items(self.conversations_table.scan, **scan_kwargs):
                 conversation = Conversation.from_dict(item)
                 
                 # 메시지 내용에서 검색어 확인
@@ -486,6 +482,7 @@ class ConversationService:
             content=content
         )
     
+    @traced('conversation.save')
     def _save_conversation(self, conversation: Conversation):
         """대화 저장"""
         try:
@@ -499,10 +496,21 @@ class ConversationService:
             logger.error(f"대화 저장 오류: {str(e)}")
             raise
     
-    def _save_message(self, message: Message):
-        """메시지 저장"""
+    @traced('conversation.save_message')
+    def _save_message(self, message: Message, conversation: Optional[Conversation] = None):
+        """메시지 저장 (대화가 주어지면 대화 정보와 함께 트랜잭션으로 저장)"""
         try:
-            self.messages_table.put_item(Item=message.to_dict())
+            if conversation is None:
+                self.messages_table.put_item(Item=message.to_dict())
+                return
+            
+            conversation_data = conversation.to_dict()
+            conversation_data.pop('messages', None)
+            
+            transact_write(self.dynamodb, [
+                {'Put': {'TableName': self.messages_table.name, 'Item': message.to_dict()}},
+                {'Put': {'TableName': self.conversations_table.name, 'Item': conversation_data}}
+            ])
             
         except Exception as e:
             logger.error(f"메시지 저장 오류: {str(e)}")
@@ -523,7 +531,8 @@ class ConversationService:
     def _get_conversation_messages(self, conversation_id: str) -> List[Message]:
         """대화 메시지 조회"""
         try:
-            response = self.messages_table.query(
+            items = iter_items(
+                self.messages_table.query,
                 IndexName='conversation-index',
                 KeyConditionExpression='conversation_id = :conv_id',
                 ExpressionAttributeValues={':conv_id': conversation_id},
@@ -531,7 +540,7 @@ class ConversationService:
             )
             
             messages = []
-            for item in response.get('Items', []):
+            for item in items:
                 message = Message.from_dict(item)
                 messages.append(message)
             
@@ -4,12 +4,13 @@ AWS Connect 콜센터용 대화 서비스 (DynamoDB 강화 버전)
 import json
 import logging
 from typing import Dict, List, Optional, Any
-import boto3
 from botocore.exceptions import ClientError
 from datetime import datetime, timedelta
 import uuid
 from decimal import Decimal
 
+from ..utils.aws_client import count_items, get_client, get_resource, parallel_scan
+
 logger = logging.getLogger(__name__)
 
 class ConversationServiceEnhanced:
@@ -17,20 +18,20 @@ class ConversationServiceEnhanced:
     
     def __init__(self, table_prefix: str = "aicc"):
         # DynamoDB 테이블 설정
-        self.dynamodb = boto3.resource('dynamodb')
+        self.dynamodb = get_resource('dynamodb')
         self.conversations_table = self.dynamodb.Table(f"{table_prefix}_conversations")
         self.messages_table = self.dynamodb.Table(f"{table_prefix}_messages")
         self.analytics_table = self.dynamodb.Table(f"{table_prefix}_analytics")
         
         # DynamoDB 클라이언트 (배치 작업용)
-        self.dynamodb_client = boto3.client('dynamodb')
+        self.dynamodb_client = get_client('dynamodb')
         
         # S3 for conversation archives
-        self.s3_client = boto3.client('s3')
+        self.s3_client = get_client('s3')
         self.archive_bucket = 'aicc-conversation-archives'
         
         # CloudWatch for metrics
-        self.cloudwatch = boto3.client('cloudwatch')
+        self.cloudwatch = get_client('cloudwatch')
     
     def create_conversation_enhanced(self, session_id: str, user_id: Optional[str] = None,
                                    channel: str = "web_chat", metadata: Optional[Dict] = None):
@@ -165,14 +166,13 @@ class ConversationServiceEnhanced:
                 start_time = datetime.now() - timedelta(hours=24)
             
             # 분석 데이터 조회
-            response = self.analytics_table.scan(
+            analytics_items = parallel_scan(
+                self.analytics_table,
                 FilterExpression='#timestamp >= :start_time',
                 ExpressionAttributeNames={'#timestamp': 'timestamp'},
                 ExpressionAttributeValues={':start_time': start_time.isoformat()}
             )
             
-            analytics_items = response.get('Items', [])
-            
             # 데이터 집계
             dashboard_data = {
                 'total_conversations': 0,
@@ -327,14 +327,12 @@ class ConversationServiceEnhanced:
             conversation = conversation_response['Item']
             
             # 메시지 통계 조회
-            messages_response = self.messages_table.query(
+            message_count = count_items(
+                self.messages_table.query,
                 KeyConditionExpression='conversation_id = :conversation_id',
-                ExpressionAttributeValues={':conversation_id': conversation_id},
-                Select='COUNT'
+                ExpressionAttributeValues={':conversation_id': conversation_id}
             )
             
-            message_count = messages_response.get('Count', 0)
-            
             # 요약 정보 구성
             summary = {
                 'conversation_id': conversation_id,
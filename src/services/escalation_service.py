@@ -4,10 +4,10 @@ AWS Connect 콜센터용 에스컬레이션 서비스
 import json
 import logging
 from typing import Dict, List, Optional, Any
-import boto3
 from botocore.exceptions import ClientError
 from datetime import datetime, timedelta
 
+from ..utils.aws_client import get_client
 from ..chatbot_escalation import ChatbotEscalation, EscalationReason, EscalationPriority, EscalationStatus
 
 logger = logging.getLogger(__name__)
@@ -18,10 +18,13 @@ class EscalationService:
     def __init__(self, connect_instance_id: str, dynamodb_table_name: str = "escalation_service"):
         self.escalation_manager = ChatbotEscalation(connect_instance_id, dynamodb_table_name)
         
+        # SLA 데드라인 만료 시 타임아웃 처리 (스케줄러가 직접 호출)
+        self.escalation_manager.scheduler.on_timeout = self.handle_escalation_timeout
+        
         # Additional services
-        self.sns_client = boto3.client('sns')
-        self.ses_client = boto3.client('ses')
-        self.lambda_client = boto3.client('lambda')
+        self.sns_client = get_client('sns')
+        self.ses_client = get_client('ses')
+        self.lambda_client = get_client('lambda')
         
         # Configuration
         self.notification_topic_arn = "arn:aws:sns:region:account:escalation-notifications"
@@ -500,7 +503,7 @@ class EscalationService:
         """리포트 저장"""
         try:
             # S3에 리포트 저장
-            s3_client = boto3.client('s3')
+            s3_client = get_client('s3')
             report_key = f"reports/escalation/{datetime.now().strftime('%Y/%m')}/report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
             
             s3_client.put_object(
@@ -4,11 +4,12 @@ AWS Connect 콜센터용 자연어 이해(NLU) 서비스
 import json
 import logging
 from typing import Dict, List, Optional, Any, Tuple
-import boto3
 from botocore.exceptions import ClientError
 from datetime import datetime
 import re
 
+from ..utils.aws_client import get_client, get_resource, parallel_scan
+from ..utils.tracing import traced
 from ..chatbot_nlu import ChatbotNLU, NLUResponse, IntentResult
 
 logger = logging.getLogger(__name__)
@@ -20,15 +21,15 @@ class NLUService:
         self.nlu_engine = ChatbotNLU(lex_bot_name)
         
         # DynamoDB for analytics and training data
-        self.dynamodb = boto3.resource('dynamodb')
+        self.dynamodb = get_resource('dynamodb')
         self.analytics_table = self.dynamodb.Table(dynamodb_table_name)
         self.training_table = self.dynamodb.Table(f"{dynamodb_table_name}_training")
         
         # Comprehend for sentiment analysis
-        self.comprehend = boto3.client('comprehend')
+        self.comprehend = get_client('comprehend')
         
         # CloudWatch for metrics
-        self.cloudwatch = boto3.client('cloudwatch')
+        self.cloudwatch = get_client('cloudwatch')
         
         # 감정 분석 설정
         self.sentiment_threshold = {
@@ -41,6 +42,7 @@ class NLUService:
         self.supported_languages = ['ko', 'en', 'ja', 'zh']
         self.default_language = 'ko'
     
+    @traced('nlu.process_user_input')
     def process_user_input(self, user_input: str, session_id: str,
                           session_attributes: Optional[Dict] = None,
                           include_sentiment: bool = True) -> Dict[str, Any]:
@@ -263,15 +265,14 @@ class NLUService:
             Dict: 분석 통계
         """
         try:
-            response = self.analytics_table.scan(
+            analytics_data = list(parallel_scan(
+                self.analytics_table,
                 FilterExpression='created_at BETWEEN :start AND :end',
                 ExpressionAttributeValues={
                     ':start': start_date,
                     ':end': end_date
                 }
-            )
-            
-            analytics_data = response.get('Items', [])
+            ))
             
             # 통계 계산
             total_requests = len(analytics_data)
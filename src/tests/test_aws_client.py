@@ -0,0 +1,405 @@
+"""
+AWS 클라이언트 레지스트리 단위 테스트
+"""
+import asyncio
+import os
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from boto3.dynamodb.conditions import Key
+from botocore.exceptions import ClientError
+from moto import mock_dynamodb
+
+from src.utils import aws_client
+from src.utils.aws_client import (
+    AWSClientManager, ClientProfile, DynamoDBClient, ReadStats, UnprocessedItemsError, async_batch_put,
+    batch_get, batch_put, count_items, get_aws_client_manager, iter_items, parallel_scan, transact_write
+)
+
+AWS_ENV = {
+    'AWS_ACCESS_KEY_ID': 'testing',
+    'AWS_SECRET_ACCESS_KEY': 'testing',
+    'AWS_REGION': 'ap-northeast-2'
+}
+
+
+def _create_table(manager: AWSClientManager):
+    return manager.get_resource('dynamodb').create_table(
+        TableName='pool_test',
+        KeySchema=[{'AttributeName': 'id', 'KeyType': 'HASH'}],
+        AttributeDefinitions=[{'AttributeName': 'id', 'AttributeType': 'S'}],
+        BillingMode='PAY_PER_REQUEST'
+    )
+
+
+class TestAWSClientManager(unittest.TestCase):
+    """AWSClientManager 테스트"""
+
+    def setUp(self):
+        patcher = patch.dict(os.environ, AWS_ENV)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_clients_created_lazily_and_shared(self):
+        """생성자에서 네트워크 호출 없이, 서비스별 클라이언트는 한 번만 생성"""
+        with patch('src.utils.aws_client.boto3.Session') as session_class:
+            session = session_class.return_value
+            manager = AWSClientManager()
+
+            self.assertFalse(session.client.called)
+
+            first = manager.get_client('dynamodb')
+            second = manager.get_client('dynamodb')
+            manager.get_resource('dynamodb')
+            manager.get_resource('dynamodb')
+
+        self.assertIs(first, second)
+        self.assertEqual(session.client.call_count, 1)
+        self.assertEqual(session.resource.call_count, 1)
+        config = session.client.call_args.kwargs['config']
+        self.assertEqual(config.max_pool_connections, 50)
+        self.assertEqual(config.retries, {'max_attempts': 5, 'mode': 'adaptive'})
+        self.assertTrue(config.tcp_keepalive)
+
+    def test_clients_are_per_region(self):
+        """리전이 다르면 별도 클라이언트 생성"""
+        manager = AWSClientManager()
+
+        seoul = manager.get_client('s3')
+        virginia = manager.get_client('s3', region_name='us-east-1')
+
+        self.assertIsNot(seoul, virginia)
+        self.assertEqual(virginia.meta.region_name, 'us-east-1')
+
+    def test_global_manager_is_singleton(self):
+        self.assertIs(get_aws_client_manager(), get_aws_client_manager())
+
+    @mock_dynamodb
+    def test_pool_metrics_count_requests(self):
+        """요청 수와 동시 요청 수 집계"""
+        manager = AWSClientManager()
+        table = _create_table(manager)
+        table.put_item(Item={'id': '1'})
+
+        metrics = manager.get_pool_metrics(reset=True)['dynamodb@ap-northeast-2/resource']
+
+        self.assertEqual(metrics['requests'], 2)
+        self.assertEqual(metrics['in_flight'], 0)
+        self.assertEqual(metrics['peak_in_flight'], 1)
+        self.assertEqual(metrics['saturated_requests'], 0)
+        self.assertEqual(manager.get_pool_metrics()['dynamodb@ap-northeast-2/resource']['requests'], 0)
+
+    @mock_dynamodb
+    def test_pool_saturation_detected(self):
+        """풀 크기를 넘는 동시 요청은 포화로 집계"""
+        manager = AWSClientManager(service_profiles={'dynamodb': ClientProfile(max_pool_connections=1)})
+        table = _create_table(manager)
+        barrier = threading.Barrier(2, timeout=5)
+
+        def hold_connection(**kwargs):
+            barrier.wait()
+
+        table.meta.client.meta.events.register('before-send', hold_connection)
+
+        threads = [threading.Thread(target=table.put_item, kwargs={'Item': {'id': str(i)}}) for i in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        metrics = manager.get_pool_metrics()['dynamodb@ap-northeast-2/resource']
+        self.assertEqual(metrics['peak_in_flight'], 2)
+        self.assertEqual(metrics['saturated_requests'], 1)
+        self.assertEqual(metrics['peak_utilization'], 2.0)
+
+    def test_publish_pool_metrics(self):
+        """요청이 있었던 풀만 CloudWatch로 전송"""
+        manager = AWSClientManager()
+        cloudwatch = MagicMock()
+        manager._clients[('cloudwatch', manager.region_name)] = cloudwatch
+        manager._track_pool(MagicMock(), 'dynamodb@ap-northeast-2', 'dynamodb')
+        manager._track_pool(MagicMock(), 's3@ap-northeast-2', 's3')
+        manager._pool_stats['dynamodb@ap-northeast-2'].requests = 3
+
+        self.assertTrue(manager.publish_pool_metrics())
+
+        metric_data = cloudwatch.put_metric_data.call_args.kwargs['MetricData']
+        self.assertEqual({metric['Dimensions'][0]['Value'] for metric in metric_data}, {'dynamodb@ap-northeast-2'})
+
+
+
+class SegmentedTable:
+    """세그먼트/페이지를 지원하는 인메모리 테이블 (moto는 Segment를 무시함)"""
+
+    def __init__(self, items):
+        self.items = items
+
+    def scan(self, Segment, TotalSegments, Limit=10, ExclusiveStartKey=None, **kwargs):
+        segment_items = [item for item in self.items if item['sk'] % TotalSegments == Segment]
+        start = ExclusiveStartKey['index'] if ExclusiveStartKey else 0
+        page = segment_items[start:start + Limit]
+        response = {'Items': page, 'Count': len(page), 'ScannedCount': len(page),
+                    'ConsumedCapacity': {'CapacityUnits': 0.5}}
+        if start + Limit < len(segment_items):
+            response['LastEvaluatedKey'] = {'index': start + Limit}
+        return response
+
+
+def _throttle_error(code='ProvisionedThroughputExceededException'):
+    return ClientError({'Error': {'Code': code, 'Message': 'slow down'}}, 'Scan')
+
+
+@mock_dynamodb
+class TestDynamoDBReads(unittest.TestCase):
+    """DynamoDB 전체 페이지/병렬 스캔 조회 테스트"""
+
+    def setUp(self):
+        patcher = patch.dict(os.environ, AWS_ENV)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.manager = AWSClientManager()
+        self.table = self.manager.get_resource('dynamodb').create_table(
+            TableName='reads',
+            KeySchema=[{'AttributeName': 'pk', 'KeyType': 'HASH'}, {'AttributeName': 'sk', 'KeyType': 'RANGE'}],
+            AttributeDefinitions=[{'AttributeName': 'pk', 'AttributeType': 'S'},
+                                  {'AttributeName': 'sk', 'AttributeType': 'N'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        with self.table.batch_writer() as batch:
+            for index in range(25):
+                batch.put_item(Item={'pk': f"p{index % 2}", 'sk': index, 'payload': 'x' * 10})
+
+    def test_iter_items_reads_every_page(self):
+        """페이지 크기보다 많은 항목도 모두 반환"""
+        stats = ReadStats()
+
+        items = list(iter_items(self.table.scan, stats=stats, Limit=4))
+
+        self.assertEqual(len(items), 25)
+        self.assertEqual(stats.pages, 7)
+        self.assertEqual(stats.items, 25)
+
+    def test_iter_items_limit_and_projection(self):
+        """limit은 전체 반환 항목 수, 페이지 경계를 넘어 적용"""
+        items = list(iter_items(self.table.scan, limit=6, Limit=4, ProjectionExpression='pk, sk'))
+
+        self.assertEqual(len(items), 6)
+        self.assertNotIn('payload', items[0])
+
+    def test_query_and_count_span_pages(self):
+        client = DynamoDBClient(self.manager)
+
+        items = list(client.iter_query('reads', Key('pk').eq('p0'), page_size=3))
+
+        self.assertEqual([item['sk'] for item in items], list(range(0, 25, 2)))
+        self.assertEqual(client.query_items('reads', Key('pk').eq('p1'), limit=5)[-1]['sk'], 9)
+        self.assertEqual(count_items(self.table.query, KeyConditionExpression=Key('pk').eq('p1'), Limit=2), 12)
+
+    def test_parallel_scan_returns_each_item_once(self):
+        stats = ReadStats()
+
+        table = SegmentedTable([{'sk': index} for index in range(25)])
+
+        items = list(parallel_scan(table, total_segments=4, stats=stats, Limit=3))
+
+        self.assertEqual(sorted(item['sk'] for item in items), list(range(25)))
+        self.assertEqual(stats.items, 25)
+        self.assertEqual(stats.pages, 9)
+        self.assertEqual(stats.consumed_capacity, 4.5)
+
+    def test_parallel_scan_stops_when_consumer_closes(self):
+        """소비자가 중단해도 작업 스레드가 대기열에서 멈추지 않음"""
+        items = parallel_scan(SegmentedTable([{'sk': index} for index in range(25)]),
+                              total_segments=4, buffer_pages=1, Limit=1)
+
+        self.assertIn('sk', next(items))
+        items.close()
+
+        for thread in threading.enumerate():
+            if thread.name.startswith('dynamodb-scan'):
+                thread.join(timeout=2)
+                self.assertFalse(thread.is_alive())
+
+    @patch('src.utils.aws_client.time.sleep')
+    def test_throttled_page_is_retried(self, sleep):
+        """처리량 초과 시 같은 페이지를 백오프 후 재시도"""
+        scan = MagicMock(side_effect=[_throttle_error(), _throttle_error('ThrottlingException'),
+                                      {'Items': [{'pk': 'a'}], 'Count': 1}])
+        stats = ReadStats()
+
+        items = list(iter_items(scan, stats=stats))
+
+        self.assertEqual(items, [{'pk': 'a'}])
+        self.assertEqual(stats.throttled, 2)
+        self.assertEqual(sleep.call_count, 2)
+
+    def test_other_errors_are_raised(self):
+        scan = MagicMock(side_effect=_throttle_error('ValidationException'))
+
+        with self.assertRaises(ClientError):
+            list(iter_items(scan))
+        with self.assertRaises(ClientError):
+            list(parallel_scan(MagicMock(scan=scan), total_segments=2))
+
+
+
+@mock_dynamodb
+class TestDynamoDBWrites(unittest.TestCase):
+    """DynamoDB 일괄 쓰기/조회 테스트"""
+
+    def setUp(self):
+        patcher = patch.dict(os.environ, AWS_ENV)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.manager = AWSClientManager()
+        self.tables = {}
+        for name in ('items', 'audit'):
+            self.tables[name] = self.manager.get_resource('dynamodb').create_table(
+                TableName=name,
+                KeySchema=[{'AttributeName': 'id', 'KeyType': 'HASH'}],
+                AttributeDefinitions=[{'AttributeName': 'id', 'AttributeType': 'S'}],
+                BillingMode='PAY_PER_REQUEST'
+            )
+
+    def test_batch_put_and_get_chunk_to_limits(self):
+        """25개/100개 한도를 넘는 요청도 모두 처리"""
+        table = self.tables['items']
+
+        self.assertEqual(batch_put(table, [{'id': str(index), 'n': index} for index in range(130)]), 130)
+        keys = [{'id': str(index)} for index in range(125)] + [{'id': '1'}, {'id': 'missing'}]
+        items = batch_get(table, keys, projection_expression='id')
+
+        self.assertEqual(len(list(iter_items(table.scan))), 130)
+        self.assertEqual(sorted(int(item['id']) for item in items), list(range(125)))
+        self.assertNotIn('n', items[0])
+
+    def test_batch_put_keeps_last_item_per_key(self):
+        """같은 키가 중복되면 마지막 항목만 저장"""
+        table = self.tables['items']
+        items = [{'id': str(index % 20), 'n': index} for index in range(40)]
+
+        self.assertEqual(batch_put(table, items), 20)
+        self.assertEqual(table.get_item(Key={'id': '3'})['Item']['n'], 23)
+        self.assertEqual(len(list(iter_items(table.scan))), 20)
+
+    def test_client_batch_put_describes_table_once(self):
+        """DynamoDBClient.batch_put은 테이블 키 스키마를 한 번만 조회"""
+        client = DynamoDBClient(self.manager)
+        describes = []
+        client.resource.meta.client.meta.events.register(
+            'before-call.dynamodb.DescribeTable', lambda **kwargs: describes.append(1)
+        )
+
+        for attempt in range(3):
+            self.assertTrue(client.batch_put('items', [{'id': '1', 'n': attempt}, {'id': '1', 'n': 9}]))
+        self.assertTrue(client.batch_put('items', [{'id': '2'}], key_names=['id']))
+
+        self.assertEqual(len(describes), 1)
+        self.assertEqual(self.tables['items'].get_item(Key={'id': '1'})['Item']['n'], 9)
+
+    @patch('src.utils.aws_client.time.sleep')
+    def test_unprocessed_items_are_retried(self, sleep):
+        client = MagicMock()
+        table = MagicMock(meta=MagicMock(client=client))
+        table.name = 'items'
+        unprocessed = {'items': [{'PutRequest': {'Item': {'id': '2'}}}]}
+        client.batch_write_item.side_effect = [{'UnprocessedItems': unprocessed}, {'UnprocessedItems': {}}]
+
+        batch_put(table, [{'id': '1'}, {'id': '2'}])
+
+        self.assertEqual(client.batch_write_item.call_args.kwargs['RequestItems'], unprocessed)
+        self.assertEqual(sleep.call_count, 1)
+
+    @patch('src.utils.aws_client.time.sleep')
+    def test_unprocessed_items_raise_after_retries(self, sleep):
+        client = MagicMock()
+        table = MagicMock(meta=MagicMock(client=client))
+        table.name = 'items'
+        client.batch_write_item.return_value = {
+            'UnprocessedItems': {'items': [{'PutRequest': {'Item': {'id': '1'}}}]}
+        }
+
+        with self.assertRaises(UnprocessedItemsError) as raised:
+            batch_put(table, [{'id': '1'}], max_retries=2)
+
+        self.assertEqual(raised.exception.unprocessed, [{'id': '1'}])
+        self.assertEqual(client.batch_write_item.call_count, 3)
+
+    def test_chunks_share_concurrency_budget(self):
+        """동시 일괄 요청 수는 프로세스 예산을 넘지 않음"""
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def write(RequestItems):
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.02)
+            with lock:
+                active.pop()
+            return {}
+
+        table = MagicMock(meta=MagicMock(client=MagicMock(batch_write_item=write)))
+        table.name = 'items'
+        with patch.object(aws_client, '_batch_budget', threading.BoundedSemaphore(2)):
+            batch_put(table, [{'id': str(index)} for index in range(200)])
+
+        self.assertEqual(len(peak), 8)
+        self.assertLessEqual(max(peak), 2)
+
+    def test_transact_write_spans_tables(self):
+        dynamodb = self.manager.get_resource('dynamodb')
+
+        written = transact_write(dynamodb, [
+            {'Put': {'TableName': 'items', 'Item': {'id': 'a', 'n': 1}}},
+            {'Put': {'TableName': 'audit', 'Item': {'id': 'a', 'action': 'create'}}}
+        ])
+        rejected = transact_write(dynamodb, [
+            {'Put': {'TableName': 'items', 'Item': {'id': 'a', 'n': 2},
+                     'ConditionExpression': 'attribute_not_exists(id)'}}
+        ])
+
+        self.assertTrue(written)
+        self.assertFalse(rejected)
+        self.assertEqual(self.tables['items'].get_item(Key={'id': 'a'})['Item']['n'], 1)
+        self.assertEqual(self.tables['audit'].get_item(Key={'id': 'a'})['Item']['action'], 'create')
+
+    def test_transact_write_rejects_oversized_transaction(self):
+        with self.assertRaises(ValueError):
+            transact_write(MagicMock(), [{'Put': {'TableName': 'items', 'Item': {'id': str(i)}}} for i in range(101)])
+
+    def test_async_batch_put(self):
+        table = self.tables['items']
+
+        written = asyncio.run(async_batch_put(table, [{'id': str(index)} for index in range(30)]))
+
+        self.assertEqual(written, 30)
+        self.assertEqual(len(batch_get(table, [{'id': str(index)} for index in range(30)])), 30)
+
+    def test_faq_defaults_seeded_in_batch(self):
+        """기본 FAQ는 일괄 저장으로 초기화"""
+        from src.chatbot_faq import ChatbotFAQ
+
+        self.manager.get_resource('dynamodb').create_table(
+            TableName='chatbot_faq',
+            KeySchema=[{'AttributeName': 'faq_id', 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': 'faq_id', 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        self.manager.get_pool_metrics(reset=True)
+        with patch('src.chatbot_faq.get_resource', self.manager.get_resource):
+            faq = ChatbotFAQ()
+
+        # 존재 확인 scan 1회 + batch_write_item 1회
+        metrics = self.manager.get_pool_metrics()['dynamodb@ap-northeast-2/resource']
+        self.assertEqual(metrics['requests'], 2)
+        self.assertEqual(len(faq.get_popular_faqs(limit=100)), 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,183 @@
+"""
+비동기 챗봇 API 단위 테스트
+"""
+import threading
+import unittest
+import uuid
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+from src.api.chatbot_api_async import create_app
+from src.models.conversation import Conversation, ConversationStatus, Message, MessageSource, MessageType
+from src.utils.async_executor import BoundedExecutor
+from src.utils.tracing import Tracer, current_span, set_tracer, span
+
+
+class FakeConversationService:
+    """테스트용 대화 서비스"""
+
+    def __init__(self):
+        self.conversations = {}
+        self.bot_messages = []
+
+    def create_conversation(self, session_id, user_id=None, channel='web_chat'):
+        conversation = Conversation(
+            conversation_id=f"conv_{uuid.uuid4().hex[:8]}",
+            session_id=session_id,
+            user_id=user_id,
+            channel=channel,
+            status=ConversationStatus.ACTIVE
+        )
+        self.conversations[conversation.conversation_id] = conversation
+        return conversation
+
+    def get_conversation(self, conversation_id):
+        conversation = self.conversations.get(conversation_id)
+        if conversation is None:
+            return None
+        return Conversation(**{**conversation.__dict__, 'messages': list(conversation.messages)})
+
+    def send_user_message(self, conversation_id, content):
+        return self._add(conversation_id, MessageSource.USER, content)
+
+    def send_bot_message(self, conversation_id, content, metadata=None):
+        self.bot_messages.append(content)
+        return self._add(conversation_id, MessageSource.BOT, content)
+
+    def complete_conversation(self, conversation_id, summary=None):
+        self.conversations[conversation_id].status = ConversationStatus.COMPLETED
+        return True
+
+    def _add(self, conversation_id, source, content):
+        message = Message(
+            message_id=uuid.uuid4().hex,
+            conversation_id=conversation_id,
+            source=source,
+            message_type=MessageType.TEXT,
+            content=content
+        )
+        self.conversations[conversation_id].add_message(message)
+        return message
+
+
+class FakeNLUService:
+    """테스트용 NLU 서비스"""
+
+    def __init__(self, next_action='respond'):
+        self.next_action = next_action
+
+    def process_user_input(self, user_input, session_id, session_attributes=None):
+        return {
+            'success': True,
+            'intent': 'greeting',
+            'confidence': 0.9,
+            'entities': {},
+            'response_text': f"응답: {user_input}",
+            'next_action': self.next_action,
+            'session_attributes': {}
+        }
+
+
+def _make_client(conversation_service=None, nlu_service=None, **kwargs):
+    app = create_app(
+        conversation_service=conversation_service or FakeConversationService(),
+        nlu_service=nlu_service or FakeNLUService(),
+        escalation_service=SimpleNamespace(),
+        scenario_manager=SimpleNamespace(),
+        faq_manager=SimpleNamespace(),
+        executor=BoundedExecutor(max_workers=4),
+        **kwargs
+    )
+    return TestClient(app)
+
+
+class TestChatbotApiAsync(unittest.TestCase):
+    """비동기 챗봇 API 테스트"""
+
+    def test_health(self):
+        response = _make_client().get('/health')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['status'], 'healthy')
+
+    def test_conversation_flow(self):
+        """대화 시작 후 세션 쿠키로 메시지 처리"""
+        conversations = FakeConversationService()
+        client = _make_client(conversation_service=conversations)
+
+        started = client.post('/api/v1/conversation/start', json={'user_id': 'user_1'}).json()
+        response = client.post('/api/v1/conversation/message', json={'message': '안녕하세요'})
+
+        self.assertTrue(started['success'])
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertTrue(body['success'])
+        self.assertEqual(body['response'], '응답: 안녕하세요')
+        self.assertEqual(body['intent'], 'greeting')
+        self.assertEqual(conversations.bot_messages, ['응답: 안녕하세요'])
+
+        status = client.get('/api/v1/conversation/status').json()
+        self.assertEqual(status['message_count'], 2)
+
+    def test_message_without_conversation(self):
+        response = _make_client().post('/api/v1/conversation/message', json={'message': '안녕'})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'success': False, 'error': '활성 대화가 없습니다.'})
+
+    def test_unknown_route_returns_json_404(self):
+        response = _make_client().get('/api/v1/unknown')
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json()['error'], 'API 엔드포인트를 찾을 수 없습니다.')
+
+    def test_user_message_and_nlu_run_concurrently(self):
+        """사용자 메시지 저장과 NLU 처리가 동시에 실행됨"""
+        barrier = threading.Barrier(2, timeout=5)
+
+        class BlockingConversationService(FakeConversationService):
+            def send_user_message(self, conversation_id, content):
+                barrier.wait()
+                return super().send_user_message(conversation_id, content)
+
+        class BlockingNLUService(FakeNLUService):
+            def process_user_input(self, user_input, session_id, session_attributes=None):
+                barrier.wait()
+                return super().process_user_input(user_input, session_id, session_attributes)
+
+        client = _make_client(BlockingConversationService(), BlockingNLUService())
+        client.post('/api/v1/conversation/start', json={})
+
+        response = client.post('/api/v1/conversation/message', json={'message': '동시 처리'})
+
+        self.assertTrue(response.json()['success'])
+
+    def test_latency_metrics_include_message_spans(self):
+        """메시지 처리 스팬이 작업 스레드의 하위 스팬과 함께 집계됨"""
+        set_tracer(Tracer())
+        self.addCleanup(set_tracer, None)
+        nested = []
+
+        class TracingNLUService(FakeNLUService):
+            def process_user_input(self, user_input, session_id, session_attributes=None):
+                with span('nlu.fake') as nlu_span:
+                    nested.append(nlu_span)
+                return super().process_user_input(user_input, session_id, session_attributes)
+
+        client = _make_client(nlu_service=TracingNLUService())
+        client.post('/api/v1/conversation/start', json={})
+        client.post('/api/v1/conversation/message', json={'message': '추적'})
+
+        stages = client.get('/api/v1/metrics/latency').json()['stages']
+        self.assertEqual(stages['chatbot_api.send_message']['count'], 1)
+        self.assertEqual(stages['nlu.fake']['count'], 1)
+        self.assertIsNotNone(nested[0].parent_id)
+        self.assertIsNone(current_span())
+
+        client.get('/api/v1/metrics/latency?reset=true')
+        self.assertEqual(client.get('/api/v1/metrics/latency').json()['stages'], {})
+
+
+if __name__ == '__main__':
+    unittest.main()
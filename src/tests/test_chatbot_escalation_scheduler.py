@@ -0,0 +1,209 @@
+"""
+에스컬레이션 스케줄러 단위 테스트
+"""
+import threading
+import unittest
+from dataclasses import dataclass
+
+from src.chatbot_escalation import DEFAULT_SLA_SECONDS, EscalationPriority
+from src.chatbot_escalation_scheduler import EscalationPriorityQueue, EscalationScheduler, TimerWheel
+
+
+class FakeClock:
+    """테스트용 수동 시계"""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@dataclass
+class FakeEscalation:
+    escalation_id: str
+    priority: EscalationPriority
+
+
+class TestTimerWheel(unittest.TestCase):
+    """TimerWheel 테스트"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.wheel = TimerWheel(tick_seconds=1.0, wheel_size=8, clock=self.clock)
+        self.fired = []
+
+    def test_fires_only_expired_timers(self):
+        """만료된 타이머만 실행"""
+        self.wheel.schedule('a', 1002.0, self.fired.append)
+        self.wheel.schedule('b', 1005.0, self.fired.append)
+
+        expired = self.wheel.advance(1003.0)
+
+        self.assertEqual([t.key for t in expired], ['a'])
+        self.assertIn('b', self.wheel)
+        self.assertNotIn('a', self.wheel)
+
+    def test_deadline_beyond_one_rotation(self):
+        """휠 크기를 넘는 데드라인은 다음 바퀴에서 실행"""
+        self.wheel.schedule('far', 1020.0, self.fired.append)
+
+        self.assertEqual(self.wheel.advance(1012.0), [])
+        self.assertEqual([t.key for t in self.wheel.advance(1020.0)], ['far'])
+
+    def test_cancel(self):
+        """타이머 취소"""
+        self.wheel.schedule('a', 1002.0, self.fired.append)
+
+        self.assertTrue(self.wheel.cancel('a'))
+        self.assertFalse(self.wheel.cancel('a'))
+        self.assertEqual(self.wheel.advance(1010.0), [])
+
+    def test_next_deadline(self):
+        """다음 만료 시각 계산"""
+        self.assertIsNone(self.wheel.next_deadline())
+
+        self.wheel.schedule('a', 1004.0, self.fired.append)
+        self.wheel.schedule('b', 1002.5, self.fired.append)
+
+        self.assertEqual(self.wheel.next_deadline(), 1003.0)
+
+
+class TestEscalationPriorityQueue(unittest.TestCase):
+    """EscalationPriorityQueue 테스트"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.queue = EscalationPriorityQueue(aging_seconds=60, clock=self.clock)
+
+    def test_pops_in_priority_then_fifo_order(self):
+        """우선순위 순, 동일 우선순위는 선입선출"""
+        self.queue.push(FakeEscalation('low', EscalationPriority.LOW))
+        self.queue.push(FakeEscalation('high_1', EscalationPriority.HIGH))
+        self.queue.push(FakeEscalation('high_2', EscalationPriority.HIGH))
+        self.queue.push(FakeEscalation('critical', EscalationPriority.CRITICAL))
+
+        order = [self.queue.pop().escalation.escalation_id for _ in range(4)]
+
+        self.assertEqual(order, ['critical', 'high_1', 'high_2', 'low'])
+        self.assertIsNone(self.queue.pop())
+
+    def test_aging_prevents_starvation(self):
+        """오래 대기한 낮은 우선순위 요청이 승격"""
+        self.queue.push(FakeEscalation('old_low', EscalationPriority.LOW))
+        self.clock.now += 150  # LOW + 2단계 = HIGH
+        self.queue.push(FakeEscalation('new_high', EscalationPriority.HIGH))
+
+        self.assertEqual(self.queue.position('old_low'), 1)
+        self.assertEqual(self.queue.pop().escalation.escalation_id, 'old_low')
+
+    def test_remove(self):
+        """대기 중 요청 제거"""
+        self.queue.push(FakeEscalation('a', EscalationPriority.MEDIUM))
+        self.queue.push(FakeEscalation('b', EscalationPriority.MEDIUM))
+
+        self.assertTrue(self.queue.remove('a'))
+        self.assertEqual(len(self.queue), 1)
+        self.assertEqual(self.queue.pop().escalation.escalation_id, 'b')
+
+
+class TestEscalationScheduler(unittest.TestCase):
+    """EscalationScheduler 테스트"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.timeouts = []
+        self.scheduler = EscalationScheduler(
+            sla_seconds=DEFAULT_SLA_SECONDS,
+            on_timeout=self.timeouts.append,
+            clock=self.clock,
+            auto_start=False
+        )
+
+    def test_route_in_priority_order(self):
+        """우선순위 순으로 라우팅"""
+        self.scheduler.submit(FakeEscalation('medium', EscalationPriority.MEDIUM))
+        self.scheduler.submit(FakeEscalation('critical', EscalationPriority.CRITICAL))
+        sent = []
+
+        def send(escalation):
+            sent.append(escalation.escalation_id)
+            return {'success': True}
+
+        results = self.scheduler.route(send)
+
+        self.assertEqual(sent, ['critical', 'medium'])
+        self.assertEqual(set(results), {'critical', 'medium'})
+        self.assertEqual(self.scheduler.pending_count(), 0)
+
+    def test_failed_send_keeps_request_queued(self):
+        """전송 실패 시 요청이 큐에 남음"""
+        self.scheduler.submit(FakeEscalation('a', EscalationPriority.HIGH))
+        self.scheduler.submit(FakeEscalation('b', EscalationPriority.LOW))
+
+        results = self.scheduler.route(lambda e: {'success': False, 'error': 'throttled'})
+
+        self.assertEqual(results, {})
+        self.assertEqual(self.scheduler.pending_count(), 2)
+        self.assertEqual(self.scheduler.position('a'), 1)
+
+    def test_sla_deadline_fires_timeout(self):
+        """SLA 데드라인 도달 시 타임아웃 콜백 호출"""
+        self.scheduler.submit(FakeEscalation('critical', EscalationPriority.CRITICAL))
+        self.scheduler.submit(FakeEscalation('low', EscalationPriority.LOW))
+
+        self.assertEqual(self.scheduler.fire_expired(self.clock.now + 30), [])
+        self.assertEqual(self.scheduler.fire_expired(self.clock.now + 61), ['critical'])
+
+        self.assertEqual(self.timeouts, ['critical'])
+        self.assertEqual(self.scheduler.pending_count(), 1)
+
+    def test_complete_cancels_deadline(self):
+        """배정 완료 시 SLA 추적 종료"""
+        self.scheduler.submit(FakeEscalation('a', EscalationPriority.CRITICAL))
+
+        self.assertTrue(self.scheduler.complete('a'))
+        self.assertEqual(self.scheduler.fire_expired(self.clock.now + 3600), [])
+        self.assertEqual(self.timeouts, [])
+
+    def test_background_thread_fires_deadline(self):
+        """백그라운드 스레드가 데드라인에 맞춰 타임아웃 처리"""
+        fired = threading.Event()
+        scheduler = EscalationScheduler(
+            sla_seconds={EscalationPriority.CRITICAL: 0.05},
+            tick_seconds=0.01,
+            on_timeout=lambda escalation_id: fired.set()
+        )
+        try:
+            scheduler.submit(FakeEscalation('a', EscalationPriority.CRITICAL))
+            self.assertTrue(fired.wait(2.0))
+        finally:
+            scheduler.stop(timeout=1.0)
+
+
+    def test_background_thread_routes_submitted_requests(self):
+        """등록된 요청을 백그라운드 스레드가 라우팅하고 실패 시 재시도"""
+        attempts = []
+        routed = threading.Event()
+
+        def send(escalation):
+            attempts.append(escalation.escalation_id)
+            if len(attempts) == 1:
+                return {'success': False, 'error': 'throttled'}
+            routed.set()
+            return {'success': True}
+
+        scheduler = EscalationScheduler(router=send, retry_seconds=0.05, tick_seconds=0.01)
+        try:
+            scheduler.submit(FakeEscalation('a', EscalationPriority.HIGH))
+            self.assertTrue(routed.wait(2.0))
+        finally:
+            scheduler.stop(timeout=1.0)
+
+        self.assertEqual(attempts, ['a', 'a'])
+        self.assertEqual(scheduler.pending_count(), 0)
+        self.assertTrue(scheduler.is_tracked('a'))
+        self.assertEqual(scheduler.stats['route_failures'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
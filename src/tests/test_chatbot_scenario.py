@@ -0,0 +1,448 @@
+"""
+AWS Connect 콜센터용 시나리오 모듈 단위 테스트
+"""
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from src.chatbot_scenario import ChatbotScenario, ScenarioSession, ScenarioStatus
+from src.chatbot_scenario_session_store import CachedSessionStore, InMemorySessionBackend, SessionConflictError
+from src.chatbot_scenario_machine import MessageTemplate, ScenarioDefinitionError, compile_scenario
+from src.chatbot_scenario_registry import (
+    BuiltInScenarioSource, DynamoDBScenarioSource, FileScenarioSource, ScenarioRegistry, stop_shared_registries
+)
+from src.chatbot_scenario_validators import create_default_registry
+
+
+def _scenario(steps, scenario_id='test_scenario'):
+    return {'scenario_id': scenario_id, 'name': '테스트', 'steps': steps}
+
+
+def _make_chatbot_scenario(**kwargs):
+    """DynamoDB 없이 ChatbotScenario 생성"""
+    with patch('src.chatbot_scenario.boto3.resource') as mock_resource:
+        mock_resource.return_value.Table.return_value.scan.return_value = {'Items': []}
+        return ChatbotScenario(scenario_reload_interval=0, **kwargs)
+
+
+class FakeScenarioTable:
+    """DynamoDB 시나리오 테이블 대체 (scenario_id 키)"""
+
+    def __init__(self):
+        self.items = {}
+        self.reads = 0
+
+    def put_item(self, Item):
+        self.items[Item['scenario_id']] = dict(Item)
+
+    def get_item(self, Key, **kwargs):
+        self.reads += 1
+        item = self.items.get(Key['scenario_id'])
+        return {'Item': dict(item)} if item is not None else {}
+
+    def scan(self, **kwargs):
+        return {'Items': [dict(item) for item in self.items.values()]}
+
+
+class TestScenarioCompiler(unittest.TestCase):
+    """시나리오 상태 머신 컴파일 테스트"""
+
+    def test_compile_builds_index_and_progress(self):
+        """단계 인덱스와 진행률 사전 계산"""
+        compiled = compile_scenario(_scenario([
+            {'step_id': 'a', 'message': 'A', 'input_type': 'text', 'next_steps': {'default': 'b'}},
+            {'step_id': 'b', 'message': 'B', 'input_type': 'text', 'next_steps': {'default': 'complete'}}
+        ]))
+
+        self.assertEqual(compiled.first_step.step_id, 'a')
+        self.assertEqual(compiled.get_step('b').index, 1)
+        self.assertEqual(compiled.progress('a'), 50.0)
+        self.assertEqual(compiled.progress('b'), 100.0)
+        self.assertEqual(compiled.progress('missing'), 0.0)
+
+    def test_transitions(self):
+        """조건부 전이와 기본 전이"""
+        compiled = compile_scenario(_scenario([
+            {'step_id': 'a', 'message': 'A', 'input_type': 'choice',
+             'next_steps': {'1': 'b', '4': 'escalate'}},
+            {'step_id': 'b', 'message': 'B', 'input_type': 'text'}
+        ]))
+        step = compiled.get_step('a')
+
+        self.assertEqual(step.next_transition('1')['next_step_id'], 'b')
+        self.assertEqual(step.next_transition('4')['action'], 'escalate')
+        self.assertEqual(step.next_transition('9')['action'], 'complete')
+
+    def test_undefined_transition_rejected(self):
+        """정의되지 않은 전이 대상 검출"""
+        with self.assertRaises(ScenarioDefinitionError) as ctx:
+            compile_scenario(_scenario([
+                {'step_id': 'a', 'message': 'A', 'next_steps': {'default': 'missing'}}
+            ]))
+        self.assertIn('missing', str(ctx.exception))
+
+    def test_unreachable_step_rejected(self):
+        """도달 불가 단계 검출"""
+        with self.assertRaises(ScenarioDefinitionError) as ctx:
+            compile_scenario(_scenario([
+                {'step_id': 'a', 'message': 'A', 'next_steps': {'default': 'complete'}},
+                {'step_id': 'orphan', 'message': 'B'}
+            ]))
+        self.assertIn('orphan', str(ctx.exception))
+
+    def test_duplicate_and_empty_rejected(self):
+        """중복 단계 및 빈 시나리오 검출"""
+        with self.assertRaises(ScenarioDefinitionError):
+            compile_scenario(_scenario([
+                {'step_id': 'a', 'message': 'A', 'next_steps': {'default': 'a'}},
+                {'step_id': 'a', 'message': 'B'}
+            ]))
+        with self.assertRaises(ScenarioDefinitionError):
+            compile_scenario(_scenario([]))
+
+    def test_message_template(self):
+        """사전 파싱된 메시지 템플릿 렌더링"""
+        template = MessageTemplate.parse('{name}님, {count:03d}건 {{확인}}')
+
+        self.assertEqual(template.fields, ('name', 'count'))
+        self.assertEqual(template.render({'name': '홍길동', 'count': 7}), '홍길동님, 007건 {확인}')
+        self.assertEqual(template.render({}), template.raw)
+        self.assertEqual(MessageTemplate.parse('안내 {{고정}}').render({}), '안내 {고정}')
+        self.assertEqual(MessageTemplate.parse('깨진 {').render({}), '깨진 {')
+
+
+class TestStepValidators(unittest.TestCase):
+    """단계 입력 검증기 테스트"""
+
+    def setUp(self):
+        self.registry = create_default_registry()
+
+    def test_choice(self):
+        validator = self.registry.compile('choice', {'choices': ['1', '2']})
+
+        self.assertEqual(validator(' 2 '), {'valid': True, 'processed_value': '2'})
+        self.assertFalse(validator('3')['valid'])
+
+    def test_text_length_and_pattern(self):
+        validator = self.registry.compile('text', {'pattern': r'^01[0-9]-[0-9]{4}-[0-9]{4}$',
+                                                   'error_message': '형식 오류'})
+
+        self.assertTrue(validator('010-1234-5678')['valid'])
+        self.assertEqual(validator('01012345678')['error_message'], '형식 오류')
+        self.assertFalse(validator('')['valid'])
+
+    def test_date_accepts_token_format(self):
+        validator = self.registry.compile('date', {'date_format': 'YYYY-MM-DD', 'future_only': True})
+
+        self.assertTrue(validator('2999-01-15')['valid'])
+        self.assertEqual(validator('2000-01-15')['error_message'], '오늘 이후의 날짜를 입력해주세요.')
+        self.assertFalse(validator('15/01/2999')['valid'])
+
+    def test_number_bounds(self):
+        validator = self.registry.compile('number', {'min_value': 1, 'max_value': 10})
+
+        self.assertEqual(validator('5')['processed_value'], 5.0)
+        self.assertFalse(validator('11')['valid'])
+        self.assertFalse(validator('abc')['valid'])
+
+    def test_batch_matches_single(self):
+        validator = self.registry.compile('choice', {'choices': ['1', '2']})
+        inputs = ['1', '3', 2, None]
+
+        self.assertEqual(validator.validate_batch(inputs), [validator(value) for value in inputs])
+
+    def test_unknown_type_uses_default(self):
+        self.assertEqual(self.registry.compile('unknown', {}).input_type, 'text')
+        self.assertTrue(self.registry.compile('any')(None)['valid'])
+
+
+class TestScenarioRegistry(unittest.TestCase):
+    """시나리오 레지스트리 테스트"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+    def _write(self, scenario_id, version, message):
+        definition = _scenario([
+            {'step_id': 'a', 'message': message, 'next_steps': {'default': 'complete'}}
+        ], scenario_id=scenario_id)
+        definition['version'] = version
+        with open(os.path.join(self.temp_dir.name, f'{scenario_id}.json'), 'w', encoding='utf-8') as f:
+            json.dump(definition, f)
+
+    def test_reload_keeps_previous_versions(self):
+        """새 버전 반영 후에도 이전 버전 조회 가능"""
+        self._write('survey', 1, '첫 번째 버전')
+        registry = ScenarioRegistry([FileScenarioSource(self.temp_dir.name)], reload_interval=0)
+        registry.refresh()
+
+        self._write('survey', 2, '두 번째 버전')
+        self.assertEqual(registry.refresh(), {'survey': '2'})
+
+        self.assertEqual(registry.get('survey').first_step.message.raw, '두 번째 버전')
+        self.assertEqual(registry.get('survey', '1').first_step.message.raw, '첫 번째 버전')
+        self.assertEqual(registry.refresh(), {})
+
+    def test_invalid_new_version_is_not_published(self):
+        """검증 실패한 새 버전은 반영하지 않음"""
+        self._write('survey', 1, '정상')
+        registry = ScenarioRegistry([FileScenarioSource(self.temp_dir.name)], reload_interval=0)
+        registry.refresh()
+
+        broken = _scenario([{'step_id': 'a', 'message': 'x', 'next_steps': {'default': 'missing'}}], 'survey')
+        broken['version'] = 2
+        with open(os.path.join(self.temp_dir.name, 'survey.json'), 'w', encoding='utf-8') as f:
+            json.dump(broken, f)
+        registry.refresh()
+
+        self.assertEqual(registry.get('survey').version, '1')
+
+    def test_source_priority(self):
+        """앞선 원본의 정의 우선"""
+        self._write('survey', 1, '파일')
+        builtin = BuiltInScenarioSource({'survey': _scenario([{'step_id': 'a', 'message': '내장'}], 'survey')})
+        registry = ScenarioRegistry([builtin, FileScenarioSource(self.temp_dir.name)], reload_interval=0)
+        registry.refresh()
+
+        self.assertEqual(registry.get('survey').first_step.message.raw, '내장')
+
+    def test_session_pinned_to_start_version(self):
+        """진행 중인 세션은 시작 시점 버전 유지"""
+        self._write('survey', 1, '질문 v1')
+        chatbot = _make_chatbot_scenario(session_backend=InMemorySessionBackend(),
+                                         scenario_sources=[FileScenarioSource(self.temp_dir.name)])
+        chatbot.start_scenario('session_1', 'survey')
+
+        self._write('survey', 2, '질문 v2')
+        chatbot.scenario_registry.refresh()
+
+        self.assertEqual(chatbot._get_session('session_1').scenario_version, '1')
+        result = chatbot.process_user_input('session_1', '응답')
+        self.assertEqual(result['session_status'], ScenarioStatus.COMPLETED.value)
+        self.assertEqual(chatbot.start_scenario('session_2', 'survey')['message'], '질문 v2')
+
+
+    def _published_source(self):
+        table = FakeScenarioTable()
+        source = DynamoDBScenarioSource(table)
+        for version in ('1', '2'):
+            definition = _scenario([
+                {'step_id': 'a', 'message': f'질문 v{version}', 'next_steps': {'default': 'complete'}}
+            ], scenario_id='survey')
+            definition['version'] = version
+            source.publish(definition)
+        return table, source
+
+    def test_pinned_version_loaded_from_dynamodb_after_restart(self):
+        """다른 인스턴스에서 시작한 세션의 고정 버전은 요청 경로 밖에서 로드"""
+        table, source = self._published_source()
+        registry = ScenarioRegistry([source], reload_interval=0)
+        registry.refresh()
+        reads = table.reads
+
+        self.assertEqual(registry.scenario_ids(), ['survey'])
+        # 메모리에 없으면 원본 조회 없이 최신 버전으로 응답
+        self.assertEqual(registry.get('survey', '1').version, '2')
+        self.assertEqual(registry.get('survey', '9').version, '2')
+        self.assertEqual(table.reads, reads)
+
+        self.assertEqual(registry.load_requested_versions(), 1)
+        self.assertEqual(registry.get('survey', '1').first_step.message.raw, '질문 v1')
+        self.assertEqual(registry.get('survey', '1').scenario_id, 'survey')
+
+        # 원본에 없는 버전은 다시 요청하지 않음
+        reads = table.reads
+        registry.get('survey', '9')
+        self.assertEqual(registry.load_requested_versions(), 0)
+        self.assertEqual(table.reads, reads)
+
+    def test_reload_thread_loads_requested_version(self):
+        """로드 요청 시 재로드 주기를 기다리지 않고 백그라운드에서 로드"""
+        _, source = self._published_source()
+        registry = ScenarioRegistry([source], reload_interval=60)
+        registry.refresh()
+        registry.start()
+        self.addCleanup(registry.stop, 1.0)
+
+        registry.get('survey', '1')
+        deadline = time.monotonic() + 2
+        while registry.get('survey', '1').version != '1' and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        self.assertEqual(registry.get('survey', '1').version, '1')
+
+    def test_default_sources_share_one_registry(self):
+        """기본 원본을 쓰는 인스턴스는 레지스트리와 재로드 스레드를 공유"""
+        self.addCleanup(stop_shared_registries)
+        first = _make_chatbot_scenario()
+        second = _make_chatbot_scenario()
+
+        self.assertIs(first.scenario_registry, second.scenario_registry)
+
+        owned = _make_chatbot_scenario(scenario_sources=[FileScenarioSource(self.temp_dir.name)])
+        self.assertIsNot(owned.scenario_registry, first.scenario_registry)
+
+class TestCachedSessionStore(unittest.TestCase):
+    """시나리오 세션 저장소 테스트"""
+
+    def setUp(self):
+        self.now = 1000.0
+        self.backend = InMemorySessionBackend()
+        self.scenario = _make_chatbot_scenario(session_backend=self.backend)
+        self.store = self._make_store()
+
+    def _make_store(self):
+        return CachedSessionStore(
+            self.backend,
+            to_item=self.scenario._session_to_item,
+            from_item=self.scenario._session_from_item,
+            ttl_seconds=30,
+            clock=lambda: self.now
+        )
+
+    def _new_session(self):
+        return ScenarioSession(
+            session_id='session_1',
+            scenario_id='reservation',
+            current_step='ask_service_type',
+            status=ScenarioStatus.ACTIVE,
+            collected_data={},
+            retry_count=0,
+            created_at='2024-01-01T00:00:00',
+            updated_at='2024-01-01T00:00:00'
+        )
+
+    def test_get_uses_cache_within_ttl(self):
+        """TTL 내 조회는 백엔드를 호출하지 않음"""
+        self.store.save(self._new_session())
+
+        self.store.get('session_1')
+        self.store.get('session_1')
+        self.assertEqual(self.backend.calls['load'], 0)
+
+        self.now += 31
+        self.store.get('session_1')
+        self.assertEqual(self.backend.calls['load'], 1)
+
+    def test_save_writes_only_changed_attributes(self):
+        """변경된 속성만 기록하고 버전 증가"""
+        session = self._new_session()
+        self.store.save(session)
+        self.assertEqual(session.version, 1)
+
+        session = self.store.get('session_1')
+        session.retry_count = 1
+        self.store.save(session)
+
+        self.assertEqual(session.version, 2)
+        self.assertEqual(self.backend.items['session_1']['retry_count'], 1)
+
+    def test_unchanged_session_is_not_written(self):
+        """변경 없는 저장 생략"""
+        self.store.save(self._new_session())
+        session = self.store.get('session_1')
+
+        self.store.save(session)
+
+        self.assertEqual(self.backend.calls['update'], 0)
+        self.assertEqual(self.store.stats['skipped_writes'], 1)
+
+    def test_concurrent_update_conflicts(self):
+        """동시 갱신 시 나중 기록은 충돌"""
+        self.store.save(self._new_session())
+        other_store = self._make_store()
+
+        mine = self.store.get('session_1')
+        theirs = other_store.get('session_1')
+        theirs.current_step = 'ask_preferred_date'
+        other_store.save(theirs)
+
+        mine.retry_count = 1
+        with self.assertRaises(SessionConflictError):
+            self.store.save(mine)
+
+        # 충돌 후에는 최신 세션을 다시 읽음
+        self.assertEqual(self.store.get('session_1').current_step, 'ask_preferred_date')
+
+    def test_restart_replaces_existing_session(self):
+        """같은 세션 ID로 시나리오 재시작"""
+        self.store.save(self._new_session())
+
+        restarted = self._new_session()
+        restarted.scenario_id = 'product_inquiry'
+        self.store.save(restarted)
+
+        self.assertEqual(restarted.version, 2)
+        self.assertEqual(self.backend.items['session_1']['scenario_id'], 'product_inquiry')
+
+
+class TestChatbotScenario(unittest.TestCase):
+    """ChatbotScenario 처리 흐름 테스트"""
+
+    def setUp(self):
+        self.backend = InMemorySessionBackend()
+        self.scenario = _make_chatbot_scenario(session_backend=self.backend)
+
+    def test_built_in_scenarios_compiled(self):
+        """내장 시나리오 컴파일"""
+        self.assertEqual(set(self.scenario.scenario_registry.scenario_ids()), {'product_inquiry', 'reservation'})
+
+    def test_start_scenario(self):
+        """시나리오 시작"""
+        result = self.scenario.start_scenario('session_1', 'reservation')
+
+        self.assertTrue(result['success'])
+        self.assertEqual(result['step_id'], 'ask_service_type')
+        self.assertEqual(result['input_type'], 'choice')
+
+    def test_process_user_input_moves_to_next_step(self):
+        """입력 처리 후 다음 단계 진행"""
+        self.scenario.start_scenario('session_1', 'product_inquiry')
+
+        result = self.scenario.process_user_input('session_1', '1')
+
+        self.assertTrue(result['success'])
+        self.assertEqual(result['step_id'], 'ask_specific_product')
+        self.assertAlmostEqual(result['progress'], 200 / 3)
+
+    def test_process_user_input_escalates_on_choice(self):
+        """조건부 에스컬레이션 전이"""
+        self.scenario.start_scenario('session_1', 'product_inquiry')
+        self.scenario.process_user_input('session_1', '1')
+        self.scenario.process_user_input('session_1', '노트북')
+
+        result = self.scenario.process_user_input('session_1', '4')
+
+        self.assertEqual(result['session_status'], ScenarioStatus.ESCALATED.value)
+
+    def test_one_write_per_answer(self):
+        """답변당 세션 조회 없이 한 번만 기록"""
+        self.scenario.start_scenario('session_1', 'reservation')
+        self.scenario.process_user_input('session_1', '1')
+        self.scenario.process_user_input('session_1', '잘못된 날짜')
+
+        self.assertEqual(self.backend.calls['load'], 0)
+        self.assertEqual(self.backend.calls['create'], 1)
+        self.assertEqual(self.backend.calls['update'], 2)
+        self.assertEqual(self.backend.items['session_1']['retry_count'], 1)
+
+    def test_validate_recorded_inputs(self):
+        """녹취 입력 일괄 검증 결과는 입력 순서 유지"""
+        records = [
+            {'step_id': 'ask_service_type', 'user_input': '1'},
+            {'step_id': 'ask_contact_info', 'user_input': '010-1234-5678'},
+            {'step_id': 'ask_service_type', 'user_input': '9'},
+            {'step_id': 'unknown', 'user_input': 'x'}
+        ]
+
+        results = self.scenario.validate_recorded_inputs('reservation', records)
+
+        self.assertEqual([result['valid'] for result in results], [True, True, False, False])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,287 @@
+"""
+로깅 유틸리티 단위 테스트
+"""
+import json
+import logging
+import threading
+import time
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from botocore.exceptions import ClientError
+
+from src.utils.logger import CloudWatchHandler, JSONFormatter, log_function_call
+
+
+class FakeLogsClient:
+    """put_log_events 호출을 기록하는 CloudWatch Logs 대역"""
+
+    def __init__(self, latency: float = 0.0, errors=None):
+        self.latency = latency
+        self.errors = list(errors or [])
+        self.batches = []
+        self.tokens = []
+        self.created = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def create_log_group(self, **kwargs):
+        self.created.append(('group', kwargs))
+
+    def create_log_stream(self, **kwargs):
+        self.created.append(('stream', kwargs))
+
+    def put_log_events(self, **kwargs):
+        self.release.wait()
+        time.sleep(self.latency)
+        self.tokens.append(kwargs.get('sequenceToken'))
+        if self.errors:
+            raise self.errors.pop(0)
+        self.batches.append(kwargs['logEvents'])
+        return {'nextSequenceToken': f"token-{len(self.batches)}"}
+
+
+def _client_error(code: str, message: str = '', **extra) -> ClientError:
+    response = {'Error': {'Code': code, 'Message': message}, **extra}
+    return ClientError(response, 'PutLogEvents')
+
+
+def _record(message: str, created: float = None) -> logging.LogRecord:
+    record = logging.LogRecord('test', logging.INFO, __file__, 1, message, None, None)
+    if created is not None:
+        record.created = created
+    return record
+
+
+class TestCloudWatchHandler(unittest.TestCase):
+    """CloudWatchHandler 테스트"""
+
+    def _handler(self, client, **kwargs) -> CloudWatchHandler:
+        kwargs.setdefault('flush_interval', 60)
+        handler = CloudWatchHandler('/test/group', 'stream', logs_client=client, **kwargs)
+        self.addCleanup(handler.close)
+        return handler
+
+    def test_emit_does_not_wait_for_put_log_events(self):
+        client = FakeLogsClient(latency=0.2)
+        handler = self._handler(client, buffer_size=1)
+
+        start = time.perf_counter()
+        for i in range(20):
+            handler.emit(_record(f"message {i}"))
+        elapsed = time.perf_counter() - start
+
+        self.assertLess(elapsed, 0.2)
+        handler.flush(timeout=10)
+        shipped = [event['message'] for batch in client.batches for event in batch]
+        self.assertEqual(shipped, [f"message {i}" for i in range(20)])
+        self.assertEqual(handler.stats['shipped'], 20)
+
+    def test_log_stream_created_once_on_shipper_thread(self):
+        client = FakeLogsClient()
+        handler = self._handler(client)
+
+        handler.emit(_record('first'))
+        handler.flush()
+        handler.emit(_record('second'))
+        handler.flush()
+
+        self.assertEqual([kind for kind, _ in client.created], ['group', 'stream'])
+        self.assertEqual(client.tokens, [None, 'token-1'])
+
+    def test_drop_oldest_when_buffer_full(self):
+        client = FakeLogsClient()
+        client.release.clear()
+        handler = self._handler(client, max_queue_size=3)
+
+        for i in range(5):
+            handler.emit(_record(f"message {i}"))
+        self.assertEqual(handler.stats['dropped'], 2)
+
+        client.release.set()
+        handler.flush()
+        shipped = [event['message'] for batch in client.batches for event in batch]
+        self.assertEqual(shipped, ['message 2', 'message 3', 'message 4'])
+
+    def test_drop_newest_when_buffer_full(self):
+        client = FakeLogsClient()
+        client.release.clear()
+        handler = self._handler(client, max_queue_size=3, drop_policy='drop_newest')
+
+        for i in range(5):
+            handler.emit(_record(f"message {i}"))
+
+        client.release.set()
+        handler.flush()
+        shipped = [event['message'] for batch in client.batches for event in batch]
+        self.assertEqual(shipped, ['message 0', 'message 1', 'message 2'])
+        self.assertEqual(handler.stats['dropped'], 2)
+
+    def test_batches_respect_byte_limit_and_sort_by_timestamp(self):
+        client = FakeLogsClient()
+        client.release.clear()
+        handler = self._handler(client)
+        payload = 'x' * (400 * 1024)
+
+        handler.emit(_record(payload, created=3.0))
+        handler.emit(_record(payload, created=1.0))
+        handler.emit(_record(payload, created=2.0))
+        handler.emit(_record('small', created=0.5))
+
+        client.release.set()
+        handler.flush()
+
+        self.assertEqual([len(batch) for batch in client.batches], [2, 2])
+        for batch in client.batches:
+            size = sum(len(event['message'].encode('utf-8')) + 26 for event in batch)
+            self.assertLessEqual(size, CloudWatchHandler.MAX_BATCH_BYTES)
+        self.assertEqual([event['timestamp'] for event in client.batches[0]], [1000, 3000])
+        self.assertEqual([event['timestamp'] for event in client.batches[1]], [500, 2000])
+
+    def test_invalid_sequence_token_is_retried_with_expected_token(self):
+        client = FakeLogsClient(errors=[
+            _client_error('InvalidSequenceTokenException', 'The next expected sequenceToken is: abc123')
+        ])
+        handler = self._handler(client)
+
+        handler.emit(_record('message'))
+        handler.flush()
+
+        self.assertEqual(client.tokens, [None, 'abc123'])
+        self.assertEqual(handler.stats['shipped'], 1)
+
+    def test_throttling_is_retried(self):
+        client = FakeLogsClient(errors=[_client_error('ThrottlingException'), _client_error('ThrottlingException')])
+        handler = self._handler(client)
+
+        handler.emit(_record('message'))
+        handler.flush(timeout=10)
+
+        self.assertEqual(len(client.tokens), 3)
+        self.assertEqual(handler.stats['shipped'], 1)
+        self.assertEqual(handler.stats['failed_batches'], 0)
+
+    def test_close_drains_buffer_and_stops_shipper(self):
+        client = FakeLogsClient(latency=0.05)
+        handler = CloudWatchHandler('/test/group', 'stream', logs_client=client, flush_interval=60)
+
+        for i in range(10):
+            handler.emit(_record(f"message {i}"))
+        handler.close()
+
+        self.assertFalse(handler._shipper.is_alive())
+        self.assertEqual(handler.stats['shipped'], 10)
+
+    def test_disabled_without_client(self):
+        handler = CloudWatchHandler('/test/group', 'stream')
+        handler.emit(_record('message'))
+        handler.flush()
+        handler.close()
+        self.assertFalse(handler.enabled)
+        self.assertEqual(len(handler.buffer), 0)
+
+
+class RecordingHandler(logging.Handler):
+    """처리된 레코드를 기록하는 핸들러"""
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class TestJSONFormatter(unittest.TestCase):
+    """JSONFormatter 테스트"""
+
+    def test_format_fields_and_extra(self):
+        record = _record('주문 %s 처리', created=1700000000.25)
+        record.args = ('A-1',)
+        record.session_id = 'session_1'
+
+        for use_orjson in (True, False):
+            entry = json.loads(JSONFormatter(use_orjson=use_orjson).format(record))
+            self.assertEqual(entry['message'], '주문 A-1 처리')
+            self.assertEqual(entry['timestamp'], datetime.fromtimestamp(1700000000.25, tz=timezone.utc).isoformat())
+            self.assertEqual(entry['extra'], {'session_id': 'session_1'})
+            record.__dict__.pop(JSONFormatter._CACHE_ATTR)
+
+    def test_record_serialized_once_per_formatter_settings(self):
+        record = _record('message')
+        first = JSONFormatter(use_orjson=False)
+        second = JSONFormatter(use_orjson=False)
+
+        with patch('src.utils.logger.json.dumps', wraps=json.dumps) as dumps:
+            self.assertEqual(first.format(record), second.format(record))
+            JSONFormatter(include_extra=False, use_orjson=False).format(record)
+
+        self.assertEqual(dumps.call_count, 2)
+
+    def test_orjson_falls_back_for_unsupported_values(self):
+        record = _record('message')
+        record.counts = {1: 'non-str key'}
+
+        entry = json.loads(JSONFormatter(use_orjson=True).format(record))
+        self.assertEqual(entry['extra'], {'counts': {'1': 'non-str key'}})
+
+
+class TestLogFunctionCall(unittest.TestCase):
+    """log_function_call 데코레이터 테스트"""
+
+    def setUp(self):
+        self.logger = logging.getLogger('test.log_function_call')
+        self.logger.propagate = False
+        self.handler = RecordingHandler()
+        self.logger.addHandler(self.handler)
+        self.addCleanup(self.logger.removeHandler, self.handler)
+
+    def test_no_records_below_debug(self):
+        self.logger.setLevel(logging.INFO)
+
+        @log_function_call(self.logger)
+        def add(a, b):
+            return a + b
+
+        with patch.object(self.logger, 'makeRecord', wraps=self.logger.makeRecord) as make_record:
+            self.assertEqual(add(1, 2), 3)
+        make_record.assert_not_called()
+
+    def test_debug_records_start_and_completion(self):
+        self.logger.setLevel(logging.DEBUG)
+
+        @log_function_call(self.logger)
+        def add(a, b):
+            return a + b
+
+        add(1, b=2)
+        messages = [record.getMessage() for record in self.handler.records]
+        self.assertEqual(messages, ['함수 호출 시작: add', '함수 호출 완료: add'])
+        self.assertEqual(self.handler.records[0].kwargs_keys, ['b'])
+        self.assertGreaterEqual(self.handler.records[1].execution_time, 0)
+
+    def test_sampling_skips_debug_but_not_errors(self):
+        self.logger.setLevel(logging.DEBUG)
+
+        @log_function_call(self.logger, sample_rate=0.0)
+        def fail():
+            raise ValueError('boom')
+
+        @log_function_call(self.logger, sample_rate=0.0)
+        def ok():
+            return 'ok'
+
+        ok()
+        with self.assertRaises(ValueError):
+            fail()
+
+        self.assertEqual(len(self.handler.records), 1)
+        record = self.handler.records[0]
+        self.assertEqual(record.levelno, logging.ERROR)
+        self.assertEqual(record.error_type, 'ValueError')
+        self.assertEqual(record.function_name, 'fail')
+
+
+if __name__ == '__main__':
+    unittest.main()
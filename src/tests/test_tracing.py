@@ -0,0 +1,265 @@
+"""
+요청 추적 유틸리티 단위 테스트
+"""
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest.mock import patch
+
+import boto3
+from botocore.awsrequest import AWSResponse
+from botocore.exceptions import ClientError
+from moto import mock_dynamodb
+
+from src.utils.aws_client import AWSClientManager
+from src.utils.logger import ContextualFilter, get_log_context
+from src.utils.tracing import (
+    FileSpanExporter, LatencyHistogram, OTLPHttpSpanExporter, Tracer, current_span, set_tracer, traced
+)
+
+AWS_ENV = {
+    'AWS_ACCESS_KEY_ID': 'testing',
+    'AWS_SECRET_ACCESS_KEY': 'testing',
+    'AWS_REGION': 'ap-northeast-2'
+}
+
+
+class MemoryExporter:
+    """내보낸 스팬을 보관하는 내보내기 대역"""
+
+    def __init__(self):
+        self.spans = []
+
+    def export(self, spans):
+        self.spans.extend(spans)
+
+
+class CollectorHandler(BaseHTTPRequestHandler):
+    """OTLP/HTTP 수집기 대역"""
+
+    payloads = []
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        CollectorHandler.payloads.append((self.path, json.loads(body)))
+        self.send_response(200)
+        self.end_headers()
+        self.wfile.write(b'{}')
+
+    def log_message(self, *args):
+        pass
+
+
+class TestTracer(unittest.TestCase):
+    """Tracer 스팬 테스트"""
+
+    def setUp(self):
+        self.exporter = MemoryExporter()
+        self.tracer = Tracer(exporter=self.exporter)
+        set_tracer(self.tracer)
+        self.addCleanup(set_tracer, None)
+
+    def test_nested_spans_share_trace(self):
+        with self.tracer.span('root') as root:
+            with self.tracer.span('child', intent='faq') as child:
+                self.assertIs(current_span(), child)
+            self.assertIs(current_span(), root)
+        self.assertIsNone(current_span())
+
+        self.assertEqual(child.trace_id, root.trace_id)
+        self.assertEqual(child.parent_id, root.span_id)
+        self.assertIsNone(root.parent_id)
+        self.assertEqual(child.attributes, {'intent': 'faq'})
+        self.assertGreaterEqual(root.duration_ms, child.duration_ms)
+
+    def test_span_binds_log_context(self):
+        record = logging.LogRecord('test', logging.INFO, __file__, 1, 'message', None, None)
+
+        with self.tracer.span('root') as root:
+            ContextualFilter({'app_name': 'aicc'}).filter(record)
+        self.assertEqual(record.trace_id, root.trace_id)
+        self.assertEqual(record.span_id, root.span_id)
+        self.assertEqual(record.app_name, 'aicc')
+        self.assertEqual(get_log_context(), {})
+
+    def test_traced_records_errors_and_reraises(self):
+        @traced('stage.fail')
+        def fail():
+            raise ValueError('boom')
+
+        with self.assertRaises(ValueError):
+            fail()
+
+        self.assertTrue(self.tracer.flush())
+        span = self.exporter.spans[0]
+        self.assertEqual((span.name, span.status, span.error), ('stage.fail', 'error', 'ValueError: boom'))
+
+    def test_traced_coroutine(self):
+        @traced('stage.async')
+        async def handler():
+            await asyncio.sleep(0)
+            return current_span().name
+
+        self.assertEqual(asyncio.run(handler()), 'stage.async')
+        self.assertEqual(self.tracer.get_latency_stats()['stage.async']['count'], 1)
+
+    def test_latency_stats_reset(self):
+        for _ in range(3):
+            with self.tracer.span('stage'):
+                pass
+
+        self.assertEqual(self.tracer.get_latency_stats(reset=True)['stage']['count'], 3)
+        self.assertEqual(self.tracer.get_latency_stats(), {})
+
+    def test_spans_exported_in_background(self):
+        tracer = Tracer(exporter=self.exporter, export_interval=0.01)
+        with tracer.span('stage'):
+            pass
+
+        tracer._exporter_thread.join(timeout=0.5)
+        self.assertEqual([span.name for span in self.exporter.spans], ['stage'])
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    """LatencyHistogram 테스트"""
+
+    def test_percentiles_use_bucket_bounds(self):
+        histogram = LatencyHistogram()
+        for value in [0.5] * 90 + [30] * 9 + [20000]:
+            histogram.observe(value)
+
+        snapshot = histogram.snapshot()
+        self.assertEqual(snapshot['count'], 100)
+        self.assertEqual(snapshot['p50_ms'], 1)
+        self.assertEqual(snapshot['p95_ms'], 50)
+        self.assertEqual(snapshot['p99_ms'], 50)
+        self.assertEqual(snapshot['max_ms'], 20000)
+        self.assertEqual(snapshot['buckets']['+Inf'], 1)
+
+
+class TestSpanExporters(unittest.TestCase):
+    """스팬 내보내기 테스트"""
+
+    def test_file_exporter_writes_json_lines(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'traces', 'spans.jsonl')
+            tracer = Tracer(exporter=FileSpanExporter(path))
+            with tracer.span('root'):
+                with tracer.span('child'):
+                    pass
+            tracer.flush()
+
+            with open(path, encoding='utf-8') as f:
+                spans = [json.loads(line) for line in f]
+        self.assertEqual([span['name'] for span in spans], ['child', 'root'])
+        self.assertEqual(spans[0]['parent_id'], spans[1]['span_id'])
+
+    def test_otlp_exporter_posts_to_collector(self):
+        server = HTTPServer(('127.0.0.1', 0), CollectorHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        CollectorHandler.payloads.clear()
+
+        exporter = OTLPHttpSpanExporter(f"http://127.0.0.1:{server.server_port}", 'aicc_test')
+        tracer = Tracer(exporter=exporter)
+        with tracer.span('root', session_id='s1', attempt=2):
+            pass
+        self.assertTrue(tracer.flush())
+
+        path, payload = CollectorHandler.payloads[0]
+        self.assertEqual(path, '/v1/traces')
+        resource_spans = payload['resourceSpans'][0]
+        self.assertEqual(resource_spans['resource']['attributes'][0]['value'], {'stringValue': 'aicc_test'})
+        span = resource_spans['scopeSpans'][0]['spans'][0]
+        self.assertEqual(span['name'], 'root')
+        self.assertEqual(len(span['traceId']), 32)
+        self.assertEqual(span['attributes'], [
+            {'key': 'session_id', 'value': {'stringValue': 's1'}},
+            {'key': 'attempt', 'value': {'intValue': '2'}}
+        ])
+        self.assertEqual(span['status'], {'code': 1})
+
+
+class TestBotocoreInstrumentation(unittest.TestCase):
+    """boto3 호출 자동 스팬 테스트"""
+
+    def setUp(self):
+        self.env = patch.dict(os.environ, AWS_ENV)
+        self.env.start()
+        self.addCleanup(self.env.stop)
+        self.mock = mock_dynamodb()
+        self.mock.start()
+        self.addCleanup(self.mock.stop)
+
+        self.exporter = MemoryExporter()
+        self.tracer = Tracer(exporter=self.exporter)
+        set_tracer(self.tracer)
+        self.addCleanup(set_tracer, None)
+
+        self.manager = AWSClientManager()
+        self.client = self.manager.get_client('dynamodb')
+        self.client.create_table(
+            TableName='trace_test',
+            KeySchema=[{'AttributeName': 'id', 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': 'id', 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+
+    def test_aws_calls_recorded_under_current_span(self):
+        table = self.manager.get_resource('dynamodb').Table('trace_test')
+
+        with self.tracer.span('conversation.save') as parent:
+            table.put_item(Item={'id': '1'})
+            with self.assertRaises(ClientError):
+                self.client.get_item(TableName='missing', Key={'id': {'S': '1'}})
+        self.tracer.flush()
+
+        spans = {span.name: span for span in self.exporter.spans}
+        self.assertNotIn('aws.dynamodb.CreateTable', spans)
+        put_span = spans['aws.dynamodb.PutItem']
+        self.assertEqual(put_span.parent_id, parent.span_id)
+        self.assertEqual(put_span.attributes['http.status_code'], 200)
+        self.assertEqual(put_span.status, 'ok')
+        self.assertEqual(spans['aws.dynamodb.GetItem'].status, 'error')
+        self.assertIs(current_span(), None)
+
+    def test_client_instrumented_once(self):
+        self.tracer.instrument_botocore(self.client)
+
+        with self.tracer.span('root'):
+            self.client.describe_table(TableName='trace_test')
+        self.tracer.flush()
+
+        names = [span.name for span in self.exporter.spans]
+        self.assertEqual(names.count('aws.dynamodb.DescribeTable'), 1)
+
+
+    def test_injected_bedrock_client_instrumented(self):
+        """NLU에 전달한 Bedrock 클라이언트 호출도 기록"""
+        from src.chatbot_nlu_bedrock import BedrockChatbotNLU
+
+        class Body:
+            def stream(self, **kwargs):
+                yield b'{}'
+
+        client = boto3.client('bedrock-runtime', region_name='us-east-1')
+        client.meta.events.register(
+            'before-send', lambda request, **kwargs: AWSResponse(request.url, 200, {}, Body())
+        )
+        nlu = BedrockChatbotNLU(bedrock_client=client)
+
+        with self.tracer.span('root'):
+            nlu.bedrock_client.invoke_model(modelId='test-model', body=b'{}')
+        self.tracer.flush()
+
+        self.assertIn('aws.bedrock-runtime.InvokeModel', [span.name for span in self.exporter.spans])
+
+if __name__ == '__main__':
+    unittest.main()
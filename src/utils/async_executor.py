@@ -0,0 +1,64 @@
+"""
+비동기 핸들러용 블로킹 I/O 실행기
+boto3 등 동기 클라이언트 호출을 제한된 스레드 풀에서 실행해 이벤트 루프를 막지 않음
+"""
+import asyncio
+import contextvars
+import functools
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 기본 I/O 스레드 수 (boto3 기본 커넥션 풀 크기 10의 배수)
+DEFAULT_MAX_WORKERS = int(os.getenv('API_IO_WORKERS', '32'))
+
+
+class BoundedExecutor:
+    """
+    동시 실행 수가 제한된 블로킹 호출 실행기
+
+    스레드 수(``max_workers``)만큼만 동시에 실행하고, 대기 가능한 호출 수를
+    ``max_pending``으로 제한해 과부하 시 스레드 풀 큐가 무한히 늘어나지 않도록 합니다.
+    호출 시점의 contextvars(로깅 컨텍스트 등)는 작업 스레드로 전달됩니다.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS,
+                 max_pending: Optional[int] = None,
+                 thread_name_prefix: str = 'aicc-io'):
+        self.max_workers = max_workers
+        self.max_pending = max_pending or max_workers * 4
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+        # 세마포어는 이벤트 루프에 묶이므로 실행 중인 루프별로 생성
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        블로킹 함수를 스레드 풀에서 실행
+
+        Args:
+            func: 실행할 동기 함수
+            *args, **kwargs: 함수 인자
+
+        Returns:
+            Any: 함수 반환값
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_pending)
+
+        call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+        async with self._semaphore:
+            return await loop.run_in_executor(self._executor, call)
+
+    async def gather(self, *calls: Awaitable[Any]) -> List[Any]:
+        """서로 독립적인 호출 동시 실행 (첫 예외를 그대로 전파)"""
+        return list(await asyncio.gather(*calls))
+
+    def shutdown(self, wait: bool = True):
+        """스레드 풀 종료"""
+        self._executor.shutdown(wait=wait)
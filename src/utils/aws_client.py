@@ -3,34 +3,101 @@ AWS 서비스 클라이언트 통합 관리
 AWS Connect 콜센터 환경을 위한 각종 AWS 서비스 클라이언트 래퍼
 """
 
+import asyncio
 import boto3
 import json
 import logging
-from typing import Dict, List, Optional, Any, Union
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Any, Tuple, Union
 from datetime import datetime, timezone, timedelta
+from botocore.config import Config
 from botocore.exceptions import ClientError, BotoCoreError
 import os
-from functools import lru_cache
 from dotenv import load_dotenv
 
+from .tracing import get_tracer
+
 # .env 파일 로드
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class ClientProfile:
+    """서비스별 botocore 연결 설정"""
+    max_pool_connections: int = 10
+    connect_timeout: float = 2
+    read_timeout: float = 10
+    max_attempts: int = 3
+    retry_mode: str = 'adaptive'
+    
+    def to_config(self) -> Config:
+        """botocore Config 생성"""
+        return Config(
+            max_pool_connections=self.max_pool_connections,
+            connect_timeout=self.connect_timeout,
+            read_timeout=self.read_timeout,
+            retries={'max_attempts': self.max_attempts, 'mode': self.retry_mode},
+            tcp_keepalive=True
+        )
+
+
+# 서비스별 연결 설정 (요청 경로에서 자주 호출되는 서비스일수록 풀을 크게, 제한 시간은 짧게)
+SERVICE_PROFILES: Dict[str, ClientProfile] = {
+    'dynamodb': ClientProfile(max_pool_connections=50, connect_timeout=1, read_timeout=3, max_attempts=5),
+    's3': ClientProfile(max_pool_connections=50, connect_timeout=2, read_timeout=30),
+    'bedrock-runtime': ClientProfile(max_pool_connections=20, connect_timeout=2, read_timeout=60, max_attempts=2),
+    'lexv2-runtime': ClientProfile(max_pool_connections=20, connect_timeout=1, read_timeout=5),
+    'lex-runtime': ClientProfile(max_pool_connections=20, connect_timeout=1, read_timeout=5),
+    'comprehend': ClientProfile(max_pool_connections=20, connect_timeout=1, read_timeout=5),
+    'connect': ClientProfile(max_pool_connections=20, connect_timeout=1, read_timeout=5),
+    'cloudwatch': ClientProfile(max_pool_connections=10, connect_timeout=1, read_timeout=5),
+    'logs': ClientProfile(max_pool_connections=10, connect_timeout=1, read_timeout=5),
+}
+
+DEFAULT_PROFILE = ClientProfile()
+
+
+@dataclass
+class PoolStats:
+    """클라이언트 연결 풀 사용 통계"""
+    max_pool_connections: int
+    requests: int = 0
+    in_flight: int = 0
+    peak_in_flight: int = 0
+    saturated_requests: int = 0
+    
+    @property
+    def peak_utilization(self) -> float:
+        """관측 기간 중 최대 풀 사용률 (1.0 이상이면 풀 부족)"""
+        return self.peak_in_flight / self.max_pool_connections
+
+
 class AWSClientManager:
-    """AWS 서비스 클라이언트 통합 관리 클래스"""
+    """
+    프로세스 전역 AWS 클라이언트/리소스 레지스트리
+    
+    서비스별 연결 풀 크기, keep-alive, adaptive 재시도, 제한 시간을 적용한 클라이언트를
+    (서비스, 리전)마다 한 번만 생성해 공유합니다. 연결 확인은 ``check_connection`` 호출 시에만 수행합니다.
+    """
     
     def __init__(
         self,
         region_name: Optional[str] = None,
         profile_name: Optional[str] = None,
         aws_access_key_id: Optional[str] = None,
-        aws_secret_access_key: Optional[str] = None
+        aws_secret_access_key: Optional[str] = None,
+        service_profiles: Optional[Dict[str, ClientProfile]] = None
     ):
-        self.region_name = region_name or os.getenv('AWS_REGION', 'ap-northeast-2')
+        self.region_name = region_name or os.getenv('AWS_REGION') or os.getenv('AWS_DEFAULT_REGION', 'ap-northeast-2')
         self.profile_name = profile_name or os.getenv('AWS_PROFILE')
+        self.service_profiles = {**SERVICE_PROFILES, **(service_profiles or {})}
         
         # 세션 구성
         if self.profile_name:
@@ -42,52 +109,178 @@ class AWSClientManager:
                 region_name=self.region_name
             )
         
-        # 클라이언트 캐시
-        self._clients: Dict[str, Any] = {}
-        
-        # 연결 테스트 실행
-        self._test_connection()
+        # 클라이언트/리소스 캐시 (boto3 Session의 생성 메서드는 스레드 안전하지 않음)
+        self._clients: Dict[Tuple[str, str], Any] = {}
+        self._resources: Dict[Tuple[str, str], Any] = {}
+        self._pool_stats: Dict[str, PoolStats] = {}
+        self._lock = threading.RLock()
+    
+    def get_profile(self, service_name: str) -> ClientProfile:
+        """서비스 연결 설정 조회"""
+        return self.service_profiles.get(service_name, DEFAULT_PROFILE)
     
-    def _test_connection(self) -> bool:
-        """AWS 연결 테스트"""
+    def check_connection(self) -> bool:
+        """AWS 연결 확인 (STS 호출, 필요할 때만 사용)"""
         try:
-            sts_client = self.get_client('sts')
-            identity = sts_client.get_caller_identity()
+            identity = self.get_client('sts').get_caller_identity()
             logger.info(f"AWS 연결 성공: {identity.get('Arn')}")
             return True
         except Exception as e:
             logger.error(f"AWS 연결 실패: {e}")
             return False
     
-    @lru_cache(maxsize=32)
-    def get_client(self, service_name: str) -> Any:
-        """AWS 서비스 클라이언트 가져오기 (캐시됨)"""
-        if service_name not in self._clients:
-            try:
-                self._clients[service_name] = self.session.client(
-                    service_name,
-                    region_name=self.region_name
-                )
+    def get_client(self, service_name: str, region_name: Optional[str] = None) -> Any:
+        """
+        AWS 서비스 클라이언트 가져오기 (공유됨)
+        
+        Args:
+            service_name: 서비스 이름 (dynamodb, s3 등)
+            region_name: 리전 (기본값: 관리자 리전)
+            
+        Returns:
+            botocore 클라이언트
+        """
+        key = (service_name, region_name or self.region_name)
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+        
+        with self._lock:
+            if key not in self._clients:
+                try:
+                    client = self.session.client(
+                        service_name, region_name=key[1], config=self.get_profile(service_name).to_config()
+                    )
+                except Exception as e:
+                    logger.error(f"{service_name} 클라이언트 생성 실패: {e}")
+                    raise
+                self._track_pool(client, f"{service_name}@{key[1]}", service_name)
+                get_tracer().instrument_botocore(client)
+                self._clients[key] = client
                 logger.debug(f"{service_name} 클라이언트 생성 완료")
-            except Exception as e:
-                logger.error(f"{service_name} 클라이언트 생성 실패: {e}")
-                raise
+            return self._clients[key]
+    
+    def get_resource(self, service_name: str, region_name: Optional[str] = None) -> Any:
+        """
+        AWS 서비스 리소스 가져오기 (공유됨)
         
-        return self._clients[service_name]
+        Args:
+            service_name: 서비스 이름 (dynamodb, s3 등)
+            region_name: 리전 (기본값: 관리자 리전)
+            
+        Returns:
+            boto3 서비스 리소스
+        """
+        key = (service_name, region_name or self.region_name)
+        resource = self._resources.get(key)
+        if resource is not None:
+            return resource
+        
+        with self._lock:
+            if key not in self._resources:
+                try:
+                    resource = self.session.resource(
+                        service_name, region_name=key[1], config=self.get_profile(service_name).to_config()
+                    )
+                except Exception as e:
+                    logger.error(f"{service_name} 리소스 생성 실패: {e}")
+                    raise
+                self._track_pool(resource.meta.client, f"{service_name}@{key[1]}/resource", service_name)
+                get_tracer().instrument_botocore(resource.meta.client)
+                self._resources[key] = resource
+                logger.debug(f"{service_name} 리소스 생성 완료")
+            return self._resources[key]
     
-    def get_resource(self, service_name: str) -> Any:
-        """AWS 서비스 리소스 가져오기"""
-        try:
-            return self.session.resource(service_name, region_name=self.region_name)
-        except Exception as e:
-            logger.error(f"{service_name} 리소스 생성 실패: {e}")
-            raise
+    def _track_pool(self, client: Any, pool_name: str, service_name: str):
+        """요청 시작/종료 이벤트로 동시 요청 수 집계"""
+        stats = PoolStats(max_pool_connections=self.get_profile(service_name).max_pool_connections)
+        self._pool_stats[pool_name] = stats
+        stats_lock = threading.Lock()
+        
+        def on_send(**kwargs):
+            with stats_lock:
+                stats.requests += 1
+                if stats.in_flight >= stats.max_pool_connections:
+                    stats.saturated_requests += 1
+                stats.in_flight += 1
+                stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+        
+        def on_response(**kwargs):
+            with stats_lock:
+                stats.in_flight = max(stats.in_flight - 1, 0)
+        
+        client.meta.events.register_first('before-send', on_send)
+        client.meta.events.register('response-received', on_response)
+    
+    def get_pool_metrics(self, reset: bool = False) -> Dict[str, Dict[str, Any]]:
+        """
+        클라이언트별 연결 풀 사용 통계 조회
+        
+        Args:
+            reset: 조회 후 누적 값(requests, peak, saturated) 초기화 여부
+            
+        Returns:
+            Dict: {"서비스@리전": 통계}
+        """
+        metrics = {}
+        with self._lock:
+            for pool_name, stats in self._pool_stats.items():
+                metrics[pool_name] = {**asdict(stats), 'peak_utilization': stats.peak_utilization}
+                if reset:
+                    stats.requests = 0
+                    stats.saturated_requests = 0
+                    stats.peak_in_flight = stats.in_flight
+        return metrics
+    
+    def publish_pool_metrics(self, namespace: str = 'AICC/AWSClients') -> bool:
+        """연결 풀 사용 통계를 CloudWatch로 전송 (전송 후 누적 값 초기화)"""
+        metric_data = []
+        for pool_name, stats in self.get_pool_metrics(reset=True).items():
+            if not stats['requests']:
+                continue
+            dimensions = [{'Name': 'Pool', 'Value': pool_name}]
+            metric_data.extend([
+                {'MetricName': 'PoolPeakUtilization', 'Value': stats['peak_utilization'],
+                 'Unit': 'None', 'Dimensions': dimensions},
+                {'MetricName': 'PoolSaturatedRequests', 'Value': stats['saturated_requests'],
+                 'Unit': 'Count', 'Dimensions': dimensions}
+            ])
+        if not metric_data:
+            return True
+        return CloudWatchClient(self).put_metric_data(namespace, metric_data)
+
+
+# 프로세스 전역 클라이언트 관리자
+_client_manager: Optional[AWSClientManager] = None
+_client_manager_lock = threading.Lock()
+
+
+def get_aws_client_manager() -> AWSClientManager:
+    """프로세스 전역 AWS 클라이언트 관리자 가져오기"""
+    global _client_manager
+    
+    if _client_manager is None:
+        with _client_manager_lock:
+            if _client_manager is None:
+                _client_manager = AWSClientManager()
+    return _client_manager
+
+
+def get_client(service_name: str, region_name: Optional[str] = None) -> Any:
+    """공유 AWS 서비스 클라이언트 가져오기"""
+    return get_aws_client_manager().get_client(service_name, region_name)
+
+
+def get_resource(service_name: str, region_name: Optional[str] = None) -> Any:
+    """공유 AWS 서비스 리소스 가져오기"""
+    return get_aws_client_manager().get_resource(service_name, region_name)
 
 
 class ConnectClient:
     """AWS Connect 서비스 클라이언트"""
     
     def __init__(self, aws_manager: AWSClientManager, instance_id: str):
+        self.aws_manager = aws_manager
         self.client = aws_manager.get_client('connect')
         self.instance_id = instance_id
         self.instance_arn = f"arn:aws:connect:{aws_manager.region_name}:{self._get_account_id()}:instance/{instance_id}"
@@ -95,7 +288,7 @@ class ConnectClient:
     def _get_account_id(self) -> str:
         """계정 ID 가져오기"""
         try:
-            sts_client = boto3.client('sts')
+            sts_client = self.aws_manager.get_client('sts')
             return sts_client.get_caller_identity()['Account']
         except Exception:
             return "000000000000"  # 기본값
@@ -290,16 +483,421 @@ class LexClient:
             return {}
 
 
+# DynamoDB 처리량 초과 오류 코드 (페이지 단위 재시도 대상)
+THROTTLE_ERROR_CODES = {'ProvisionedThroughputExceededException', 'ThrottlingException', 'RequestLimitExceeded'}
+
+# 병렬 스캔 기본 세그먼트 수 (I/O 대기 위주이므로 코어 수의 2배)
+DEFAULT_SCAN_SEGMENTS = int(os.getenv('DYNAMODB_SCAN_SEGMENTS', str(min(32, (os.cpu_count() or 1) * 2))))
+
+
+@dataclass
+class ReadStats:
+    """DynamoDB 조회 통계 (페이지 수, 항목 수, 소비 용량, 처리량 초과 횟수)"""
+    pages: int = 0
+    items: int = 0
+    scanned_items: int = 0
+    consumed_capacity: float = 0.0
+    throttled: int = 0
+    
+    def add_page(self, response: Dict[str, Any]):
+        """페이지 응답 반영"""
+        self.pages += 1
+        self.items += response.get('Count', 0)
+        self.scanned_items += response.get('ScannedCount', 0)
+        self.consumed_capacity += response.get('ConsumedCapacity', {}).get('CapacityUnits', 0.0)
+    
+    def merge(self, other: 'ReadStats'):
+        """다른 통계 합산"""
+        self.pages += other.pages
+        self.items += other.items
+        self.scanned_items += other.scanned_items
+        self.consumed_capacity += other.consumed_capacity
+        self.throttled += other.throttled
+
+
+def _call_with_backoff(
+    operation: Callable[..., Dict[str, Any]],
+    params: Dict[str, Any],
+    stats: ReadStats,
+    max_retries: int = 8,
+    base_delay: float = 0.05,
+    max_delay: float = 5.0
+) -> Dict[str, Any]:
+    """처리량 초과 시 지수 백오프(full jitter)로 페이지 요청 재시도"""
+    attempt = 0
+    while True:
+        try:
+            return operation(**params)
+        except ClientError as e:
+            if e.response['Error']['Code'] not in THROTTLE_ERROR_CODES or attempt >= max_retries:
+                raise
+            stats.throttled += 1
+            _backoff(attempt, base_delay, max_delay)
+            attempt += 1
+
+
+def iter_pages(
+    operation: Callable[..., Dict[str, Any]],
+    stats: Optional[ReadStats] = None,
+    **params
+) -> Iterator[Dict[str, Any]]:
+    """
+    LastEvaluatedKey를 따라 query/scan 전체 페이지 조회
+    
+    Args:
+        operation: 테이블 query 또는 scan 메서드
+        stats: 조회 통계를 누적할 객체
+        **params: query/scan 파라미터 (Limit은 페이지 크기)
+        
+    Returns:
+        Iterator: 페이지 응답
+    """
+    stats = stats if stats is not None else ReadStats()
+    params = {**params, 'ReturnConsumedCapacity': 'TOTAL'}
+    
+    while True:
+        response = _call_with_backoff(operation, params, stats)
+        stats.add_page(response)
+        yield response
+        
+        last_key = response.get('LastEvaluatedKey')
+        if not last_key:
+            return
+        params['ExclusiveStartKey'] = last_key
+
+
+def iter_items(
+    operation: Callable[..., Dict[str, Any]],
+    limit: Optional[int] = None,
+    stats: Optional[ReadStats] = None,
+    **params
+) -> Iterator[Dict[str, Any]]:
+    """
+    query/scan 전체 항목 조회
+    
+    Args:
+        operation: 테이블 query 또는 scan 메서드
+        limit: 반환할 최대 항목 수 (페이지 크기는 params의 Limit)
+        stats: 조회 통계를 누적할 객체
+        **params: query/scan 파라미터
+        
+    Returns:
+        Iterator: 항목
+    """
+    if limit is not None and limit <= 0:
+        return
+    
+    returned = 0
+    for page in iter_pages(operation, stats=stats, **params):
+        for item in page.get('Items', []):
+            yield item
+            returned += 1
+            if limit is not None and returned >= limit:
+                return
+
+
+def count_items(operation: Callable[..., Dict[str, Any]], stats: Optional[ReadStats] = None, **params) -> int:
+    """query/scan 조건에 맞는 전체 항목 수 (Select=COUNT, 전체 페이지 합산)"""
+    return sum(page.get('Count', 0) for page in iter_pages(operation, stats=stats, Select='COUNT', **params))
+
+
+def parallel_scan(
+    table: Any,
+    total_segments: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    stats: Optional[ReadStats] = None,
+    buffer_pages: int = 64,
+    **params
+) -> Iterator[Dict[str, Any]]:
+    """
+    세그먼트 병렬 스캔 (분석/내보내기용)
+    
+    세그먼트마다 스레드에서 전체 페이지를 읽어 완료된 페이지 순서대로 항목을 반환합니다.
+    항목 순서는 보장되지 않으며, 소비가 느리면 buffer_pages 이후 스캔을 멈춥니다.
+    
+    Args:
+        table: DynamoDB 테이블 리소스
+        total_segments: 세그먼트 수 (기본값: DYNAMODB_SCAN_SEGMENTS)
+        max_workers: 스레드 수 (기본값: 세그먼트 수)
+        stats: 조회 통계를 누적할 객체 (스캔 종료 시 합산)
+        buffer_pages: 소비 전 보관할 최대 페이지 수
+        **params: scan 파라미터
+        
+    Returns:
+        Iterator: 항목
+    """
+    total_segments = total_segments or DEFAULT_SCAN_SEGMENTS
+    pages: queue.Queue = queue.Queue(maxsize=buffer_pages)
+    stop = threading.Event()
+    done = object()
+    
+    def put(entry) -> bool:
+        while not stop.is_set():
+            try:
+                pages.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def scan_segment(segment: int):
+        segment_stats = ReadStats()
+        try:
+            for page in iter_pages(table.scan, stats=segment_stats, Segment=segment,
+                                   TotalSegments=total_segments, **params):
+                if not put(page.get('Items', [])):
+                    return
+        except Exception as e:
+            put(e)
+        finally:
+            put((done, segment_stats))
+    
+    executor = ThreadPoolExecutor(max_workers=max_workers or total_segments, thread_name_prefix='dynamodb-scan')
+    try:
+        for segment in range(total_segments):
+            executor.submit(scan_segment, segment)
+        
+        remaining = total_segments
+        while remaining:
+            entry = pages.get()
+            if isinstance(entry, Exception):
+                raise entry
+            if isinstance(entry, tuple) and entry[0] is done:
+                remaining -= 1
+                if stats is not None:
+                    stats.merge(entry[1])
+                continue
+            yield from entry
+    finally:
+        # 조기 종료/오류 시 작업 스레드가 대기열에서 멈추지 않도록 중단
+        stop.set()
+        executor.shutdown(wait=False)
+
+
+# DynamoDB 일괄 요청 한도
+BATCH_WRITE_LIMIT = 25
+BATCH_GET_LIMIT = 100
+TRANSACT_WRITE_LIMIT = 100
+
+# 프로세스 전체 동시 일괄 요청 수 (여러 호출자가 함께 사용하는 예산)
+BATCH_CONCURRENCY = int(os.getenv('DYNAMODB_BATCH_CONCURRENCY', '8'))
+_batch_budget = threading.BoundedSemaphore(BATCH_CONCURRENCY)
+
+# 트랜잭션 취소 사유 중 재시도 가능한 코드
+RETRYABLE_CANCELLATION_CODES = {'ThrottlingError', 'TransactionConflict', 'ProvisionedThroughputExceeded'}
+
+class UnprocessedItemsError(Exception):
+    """재시도 후에도 처리되지 않은 일괄 요청 항목"""
+    
+    def __init__(self, message: str, unprocessed: List[Dict[str, Any]]):
+        super().__init__(message)
+        self.unprocessed = unprocessed
+
+
+def _backoff(attempt: int, base_delay: float = 0.05, max_delay: float = 5.0):
+    """full jitter 지수 백오프 대기"""
+    time.sleep(random.uniform(0, min(max_delay, base_delay * (2 ** attempt))))
+
+
+def _run_chunks(worker: Callable[[List[Any]], Any], values: List[Any], chunk_size: int) -> List[Any]:
+    """한도 단위로 나눈 요청을 동시 실행 예산 안에서 처리 (결과는 청크 순서)"""
+    chunks = [values[index:index + chunk_size] for index in range(0, len(values), chunk_size)]
+    
+    def run(chunk):
+        with _batch_budget:
+            return worker(chunk)
+    
+    if len(chunks) <= 1:
+        return [run(chunk) for chunk in chunks]
+    with ThreadPoolExecutor(max_workers=min(BATCH_CONCURRENCY, len(chunks))) as executor:
+        return list(executor.map(run, chunks))
+
+
+def batch_put(table: Any, items: List[Dict[str, Any]], max_retries: int = 8,
+              key_names: Optional[List[str]] = None) -> int:
+    """
+    항목 일괄 저장 (25개 단위, 중복 키 제거, UnprocessedItems 재시도)
+    
+    Args:
+        table: DynamoDB 테이블 리소스
+        items: 저장할 항목 목록 (같은 키가 여러 번 있으면 마지막 항목 저장)
+        max_retries: 미처리 항목 재시도 횟수
+        key_names: 기본 키 속성 이름 (None시 테이블 키 스키마 조회, DescribeTable 1회)
+        
+    Returns:
+        int: 저장한 항목 수 (중복 제거 후)
+        
+    Raises:
+        UnprocessedItemsError: 재시도 후에도 미처리 항목이 남은 경우
+    """
+    # 리소스의 클라이언트는 파이썬 값과 DynamoDB 타입을 자동 변환
+    client = table.meta.client
+    
+    # 한 요청에 같은 키가 두 번 있으면 BatchWriteItem이 전체를 거부하므로 마지막 항목만 유지
+    if key_names is None:
+        key_names = [key['AttributeName'] for key in table.key_schema]
+    if key_names:
+        items = list({
+            json.dumps([item.get(name) for name in key_names], default=str): item for item in items
+        }.values())
+    
+    def write(chunk: List[Dict[str, Any]]):
+        requests = {table.name: [{'PutRequest': {'Item': item}} for item in chunk]}
+        for attempt in range(max_retries + 1):
+            try:
+                response = client.batch_write_item(RequestItems=requests)
+            except ClientError as e:
+                if e.response['Error']['Code'] not in THROTTLE_ERROR_CODES or attempt >= max_retries:
+                    raise
+                _backoff(attempt)
+                continue
+            
+            requests = response.get('UnprocessedItems') or {}
+            if not requests:
+                return
+            if attempt < max_retries:
+                _backoff(attempt)
+        
+        unprocessed = [request['PutRequest']['Item'] for request in requests.get(table.name, [])]
+        raise UnprocessedItemsError(f"{table.name} 일괄 저장 미처리 {len(unprocessed)}건", unprocessed)
+    
+    items = list(items)
+    _run_chunks(write, items, BATCH_WRITE_LIMIT)
+    return len(items)
+
+
+def batch_get(
+    table: Any,
+    keys: List[Dict[str, Any]],
+    projection_expression: Optional[str] = None,
+    expression_attribute_names: Optional[Dict[str, str]] = None,
+    consistent_read: bool = False,
+    max_retries: int = 8
+) -> List[Dict[str, Any]]:
+    """
+    항목 일괄 조회 (100개 단위, 중복 키 제거, UnprocessedKeys 재시도)
+    
+    Args:
+        table: DynamoDB 테이블 리소스
+        keys: 조회할 키 목록
+        projection_expression: 조회할 속성
+        expression_attribute_names: 속성 이름 치환
+        consistent_read: 강한 일관성 읽기 여부
+        max_retries: 미처리 키 재시도 횟수
+        
+    Returns:
+        List: 조회된 항목 (순서는 보장되지 않음, 없는 키는 제외)
+        
+    Raises:
+        UnprocessedItemsError: 재시도 후에도 미처리 키가 남은 경우
+    """
+    client = table.meta.client
+    unique_keys = list({json.dumps(key, sort_keys=True, default=str): key for key in keys}.values())
+    
+    def read(chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        request: Dict[str, Any] = {'Keys': chunk, 'ConsistentRead': consistent_read}
+        if projection_expression:
+            request['ProjectionExpression'] = projection_expression
+        if expression_attribute_names:
+            request['ExpressionAttributeNames'] = expression_attribute_names
+        
+        found = []
+        requests = {table.name: request}
+        for attempt in range(max_retries + 1):
+            try:
+                response = client.batch_get_item(RequestItems=requests)
+            except ClientError as e:
+                if e.response['Error']['Code'] not in THROTTLE_ERROR_CODES or attempt >= max_retries:
+                    raise
+                _backoff(attempt)
+                continue
+            
+            found.extend(response.get('Responses', {}).get(table.name, []))
+            requests = response.get('UnprocessedKeys') or {}
+            if not requests:
+                return found
+            if attempt < max_retries:
+                _backoff(attempt)
+        
+        unprocessed = list(requests[table.name]['Keys'])
+        raise UnprocessedItemsError(f"{table.name} 일괄 조회 미처리 {len(unprocessed)}건", unprocessed)
+    
+    return [item for found in _run_chunks(read, unique_keys, BATCH_GET_LIMIT) for item in found]
+
+
+def transact_write(dynamodb: Any, actions: List[Dict[str, Any]], max_retries: int = 5) -> bool:
+    """
+    여러 테이블에 원자적으로 쓰기 (한 번의 요청)
+    
+    Args:
+        dynamodb: DynamoDB 서비스 리소스
+        actions: 파이썬 값으로 작성한 작업 목록, 예: {'Put': {'TableName': ..., 'Item': {...}}}
+        max_retries: 충돌/처리량 초과로 취소된 경우 재시도 횟수
+        
+    Returns:
+        bool: 성공 여부 (조건 불일치로 취소되면 False)
+    """
+    if len(actions) > TRANSACT_WRITE_LIMIT:
+        raise ValueError(f"트랜잭션 작업은 최대 {TRANSACT_WRITE_LIMIT}개입니다: {len(actions)}")
+    
+    for attempt in range(max_retries + 1):
+        try:
+            with _batch_budget:
+                dynamodb.meta.client.transact_write_items(TransactItems=actions)
+            return True
+        except ClientError as e:
+            code = e.response['Error']['Code']
+            reasons = {reason.get('Code') for reason in e.response.get('CancellationReasons', [])} - {'None'}
+            retryable = code in THROTTLE_ERROR_CODES or (
+                code == 'TransactionCanceledException' and reasons and reasons <= RETRYABLE_CANCELLATION_CODES
+            )
+            if not retryable or attempt >= max_retries:
+                if code == 'TransactionCanceledException' and 'ConditionalCheckFailed' in reasons:
+                    logger.warning(f"DynamoDB 트랜잭션 조건 불일치: {reasons}")
+                    return False
+                raise
+            _backoff(attempt)
+    return False
+
+
+async def _run_async(func: Callable[..., Any], *args, executor: Any = None, **kwargs) -> Any:
+    """동기 일괄 요청을 이벤트 루프 밖에서 실행 (BoundedExecutor 지정 가능)"""
+    if executor is not None:
+        return await executor.run(func, *args, **kwargs)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, lambda: func(*args, **kwargs))
+
+
+async def async_batch_put(table: Any, items: List[Dict[str, Any]], executor: Any = None, **kwargs) -> int:
+    """batch_put 비동기 버전"""
+    return await _run_async(batch_put, table, items, executor=executor, **kwargs)
+
+
+async def async_batch_get(table: Any, keys: List[Dict[str, Any]], executor: Any = None, **kwargs) -> List[Dict[str, Any]]:
+    """batch_get 비동기 버전"""
+    return await _run_async(batch_get, table, keys, executor=executor, **kwargs)
+
+
+async def async_transact_write(dynamodb: Any, actions: List[Dict[str, Any]], executor: Any = None, **kwargs) -> bool:
+    """transact_write 비동기 버전"""
+    return await _run_async(transact_write, dynamodb, actions, executor=executor, **kwargs)
+
+
 class DynamoDBClient:
     """AWS DynamoDB 클라이언트"""
     
     def __init__(self, aws_manager: AWSClientManager):
         self.client = aws_manager.get_client('dynamodb')
         self.resource = aws_manager.get_resource('dynamodb')
+        # 테이블별 리소스 재사용 (key_schema 등 DescribeTable 결과를 한 번만 로드)
+        self._tables: Dict[str, Any] = {}
     
     def get_table(self, table_name: str):
         """테이블 리소스 가져오기"""
-        return self.resource.Table(table_name)
+        table = self._tables.get(table_name)
+        if table is None:
+            table = self._tables.setdefault(table_name, self.resource.Table(table_name))
+        return table
     
     def put_item(self, table_name: str, item: Dict[str, Any]) -> bool:
         """항목 저장"""
@@ -342,29 +940,176 @@ class DynamoDBClient:
         limit: Optional[int] = None,
         scan_index_forward: bool = True
     ) -> List[Dict[str, Any]]:
-        """항목 쿼리"""
+        """항목 쿼리 (전체 페이지, limit은 최대 반환 항목 수)"""
         try:
-            table = self.get_table(table_name)
+            return list(self.iter_query(
+                table_name,
+                key_condition_expression,
+                filter_expression=filter_expression,
+                projection_expression=projection_expression,
+                limit=limit,
+                scan_index_forward=scan_index_forward
+            ))
             
-            query_params = {
-                'KeyConditionExpression': key_condition_expression,
-                'ScanIndexForward': scan_index_forward
-            }
+        except ClientError as e:
+            logger.error(f"DynamoDB 쿼리 실패: {e}")
+            return []
+    
+    def iter_query(
+        self,
+        table_name: str,
+        key_condition_expression,
+        filter_expression=None,
+        projection_expression: Optional[str] = None,
+        limit: Optional[int] = None,
+        page_size: Optional[int] = None,
+        index_name: Optional[str] = None,
+        scan_index_forward: bool = True,
+        stats: Optional[ReadStats] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        항목 쿼리 (전체 페이지를 순서대로 반환)
+        
+        Args:
+            table_name: 테이블 이름
+            key_condition_expression: 키 조건
+            filter_expression: 필터 조건
+            projection_expression: 조회할 속성
+            limit: 최대 반환 항목 수
+            page_size: 요청당 평가 항목 수
+            index_name: 인덱스 이름
+            scan_index_forward: 정렬 키 오름차순 여부
+            stats: 조회 통계를 누적할 객체
             
-            if filter_expression:
-                query_params['FilterExpression'] = filter_expression
-            if projection_expression:
-                query_params['ProjectionExpression'] = projection_expression
-            if limit:
-                query_params['Limit'] = limit
+        Returns:
+            Iterator: 항목
+        """
+        query_params = {
+            'KeyConditionExpression': key_condition_expression,
+            'ScanIndexForward': scan_index_forward
+        }
+        query_params.update(self._read_params(filter_expression, projection_expression, page_size))
+        if index_name:
+            query_params['IndexName'] = index_name
+        
+        return iter_items(self.get_table(table_name).query, limit=limit, stats=stats, **query_params)
+    
+    def iter_scan(
+        self,
+        table_name: str,
+        filter_expression=None,
+        projection_expression: Optional[str] = None,
+        limit: Optional[int] = None,
+        page_size: Optional[int] = None,
+        stats: Optional[ReadStats] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        테이블 전체 스캔 (단일 스레드)
+        
+        Args:
+            table_name: 테이블 이름
+            filter_expression: 필터 조건
+            projection_expression: 조회할 속성
+            limit: 최대 반환 항목 수
+            page_size: 요청당 평가 항목 수
+            stats: 조회 통계를 누적할 객체
             
-            response = table.query(**query_params)
-            return response.get('Items', [])
+        Returns:
+            Iterator: 항목
+        """
+        scan_params = self._read_params(filter_expression, projection_expression, page_size)
+        return iter_items(self.get_table(table_name).scan, limit=limit, stats=stats, **scan_params)
+    
+    def parallel_scan(
+        self,
+        table_name: str,
+        filter_expression=None,
+        projection_expression: Optional[str] = None,
+        total_segments: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        page_size: Optional[int] = None,
+        stats: Optional[ReadStats] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        테이블 세그먼트 병렬 스캔 (분석/내보내기용, 순서 보장 안 됨)
+        
+        Args:
+            table_name: 테이블 이름
+            filter_expression: 필터 조건
+            projection_expression: 조회할 속성
+            total_segments: 세그먼트 수
+            max_workers: 스레드 수
+            page_size: 요청당 평가 항목 수
+            stats: 조회 통계를 누적할 객체
             
-        except ClientError as e:
-            logger.error(f"DynamoDB 쿼리 실패: {e}")
+        Returns:
+            Iterator: 항목
+        """
+        scan_params = self._read_params(filter_expression, projection_expression, page_size)
+        read_stats = stats if stats is not None else ReadStats()
+        started = time.monotonic()
+        
+        yield from parallel_scan(
+            self.get_table(table_name),
+            total_segments=total_segments,
+            max_workers=max_workers,
+            stats=read_stats,
+            **scan_params
+        )
+        
+        logger.info(
+            f"DynamoDB 병렬 스캔 완료: {table_name} 항목 {read_stats.items}개, 페이지 {read_stats.pages}개, "
+            f"소비 용량 {read_stats.consumed_capacity:.1f} RCU, 처리량 초과 {read_stats.throttled}회, "
+            f"{time.monotonic() - started:.2f}초"
+        )
+    
+    @staticmethod
+    def _read_params(filter_expression, projection_expression: Optional[str], page_size: Optional[int]) -> Dict[str, Any]:
+        params: Dict[str, Any] = {}
+        if filter_expression:
+            params['FilterExpression'] = filter_expression
+        if projection_expression:
+            params['ProjectionExpression'] = projection_expression
+        if page_size:
+            params['Limit'] = page_size
+        return params
+    
+    def batch_put(self, table_name: str, items: List[Dict[str, Any]],
+                  key_names: Optional[List[str]] = None) -> bool:
+        """항목 일괄 저장 (25개 단위, 중복 키 제거, 미처리 항목 재시도)"""
+        try:
+            batch_put(self.get_table(table_name), items, key_names=key_names)
+            logger.debug(f"DynamoDB 일괄 저장 완료: {table_name} {len(items)}건")
+            return True
+        except (ClientError, UnprocessedItemsError) as e:
+            logger.error(f"DynamoDB 일괄 저장 실패: {e}")
+            return False
+    
+    def batch_get(
+        self,
+        table_name: str,
+        keys: List[Dict[str, Any]],
+        projection_expression: Optional[str] = None,
+        consistent_read: bool = False
+    ) -> List[Dict[str, Any]]:
+        """항목 일괄 조회 (100개 단위, 미처리 키 재시도)"""
+        try:
+            return batch_get(
+                self.get_table(table_name), keys,
+                projection_expression=projection_expression, consistent_read=consistent_read
+            )
+        except (ClientError, UnprocessedItemsError) as e:
+            logger.error(f"DynamoDB 일괄 조회 실패: {e}")
             return []
     
+    def transact_write(self, actions: List[Dict[str, Any]]) -> bool:
+        """여러 항목 원자적 쓰기 (최대 100개 작업)"""
+        try:
+            return transact_write(self.resource, actions)
+        except ClientError as e:
+            logger.error(f"DynamoDB 트랜잭션 실패: {e}")
+            return False
+    
     def update_item(
         self,
         table_name: str,
@@ -591,12 +1336,16 @@ class AWSServiceFactory:
         aws_access_key_id: Optional[str] = None,
         aws_secret_access_key: Optional[str] = None
     ):
-        self.aws_manager = AWSClientManager(
-            region_name=region_name or os.getenv('AWS_REGION', 'ap-northeast-2'),
-            profile_name=profile_name or os.getenv('AWS_PROFILE'),
-            aws_access_key_id=aws_access_key_id or os.getenv('AWS_ACCESS_KEY_ID'),
-            aws_secret_access_key=aws_secret_access_key or os.getenv('AWS_SECRET_ACCESS_KEY')
-        )
+        if any([region_name, profile_name, aws_access_key_id, aws_secret_access_key]):
+            self.aws_manager = AWSClientManager(
+                region_name=region_name,
+                profile_name=profile_name,
+                aws_access_key_id=aws_access_key_id,
+                aws_secret_access_key=aws_secret_access_key
+            )
+        else:
+            # 별도 설정이 없으면 프로세스 전역 클라이언트 관리자 공유
+            self.aws_manager = get_aws_client_manager()
     
     def get_connect_client(self, instance_id: str) -> ConnectClient:
         """Connect 클라이언트 생성"""
@@ -639,8 +1388,8 @@ def init_aws_services(
     aws_access_key_id: Optional[str] = None,
     aws_secret_access_key: Optional[str] = None
 ) -> AWSServiceFactory:
-    """AWS 서비스 초기화"""
-    global _aws_factory_instance
+    """AWS 서비스 초기화 (이후 생성되는 서비스도 같은 클라이언트 관리자 사용)"""
+    global _aws_factory_instance, _client_manager
     
     _aws_factory_instance = AWSServiceFactory(
         region_name=region_name,
@@ -648,6 +1397,7 @@ def init_aws_services(
         aws_access_key_id=aws_access_key_id,
         aws_secret_access_key=aws_secret_access_key
     )
+    _client_manager = _aws_factory_instance.aws_manager
     
     logger.info("AWS 서비스 초기화 완료")
     return _aws_factory_instance 
\ No newline at end of file
@@ -6,8 +6,13 @@ AWS Connect 콜센터 애플리케이션을 위한 통합 로깅 시스템
 import logging
 import logging.handlers
 import json
+import random
 import sys
 import os
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar, Token
 from datetime import datetime, timezone
 from typing import Dict, Any, Optional, Union
 from pathlib import Path
@@ -15,17 +20,41 @@ import traceback
 from functools import wraps
 
 
+try:
+    import orjson
+except ImportError:  # 선택 의존성: 없으면 표준 json 사용
+    orjson = None
+
+
+# LogRecord 기본 속성 (extra 필드에서 제외)
+_RECORD_ATTRS = frozenset(logging.LogRecord('', 0, '', 0, '', None, None).__dict__) | {'message', 'asctime', 'getMessage'}
+
+
 class JSONFormatter(logging.Formatter):
-    """JSON 형식 로그 포매터"""
+    """
+    JSON 형식 로그 포매터
+    
+    같은 설정의 포매터가 여러 핸들러에 붙어 있어도 레코드당 한 번만 직렬화하도록
+    결과를 레코드에 캐시하며, orjson이 설치되어 있으면 이를 사용합니다.
+    """
+    
+    _CACHE_ATTR = '_json_formatted'
     
-    def __init__(self, include_extra: bool = True):
+    def __init__(self, include_extra: bool = True, use_orjson: Optional[bool] = None):
         super().__init__()
         self.include_extra = include_extra
+        self.use_orjson = orjson is not None if use_orjson is None else (use_orjson and orjson is not None)
+        self._cache_key = (include_extra, self.use_orjson)
+        self._timestamp_cache = (None, '')
     
     def format(self, record: logging.LogRecord) -> str:
         """로그 레코드를 JSON 형식으로 포매팅"""
+        cached = record.__dict__.get(self._CACHE_ATTR)
+        if cached is not None and cached[0] == self._cache_key:
+            return cached[1]
+        
         log_entry = {
-            'timestamp': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            'timestamp': self._format_timestamp(record.created),
             'level': record.levelname,
             'logger': record.name,
             'message': record.getMessage(),
@@ -35,12 +64,12 @@ class JSONFormatter(logging.Formatter):
         }
         
         # 스레드 정보 추가
-        if hasattr(record, 'thread') and record.thread:
+        if record.thread:
             log_entry['thread_id'] = record.thread
             log_entry['thread_name'] = record.threadName
         
         # 프로세스 정보 추가
-        if hasattr(record, 'process') and record.process:
+        if record.process:
             log_entry['process_id'] = record.process
         
         # 예외 정보 추가
@@ -53,22 +82,49 @@ class JSONFormatter(logging.Formatter):
         
         # 추가 컨텍스트 정보
         if self.include_extra:
-            extra_fields = {}
-            for key, value in record.__dict__.items():
-                if key not in ['name', 'msg', 'args', 'levelname', 'levelno', 'pathname',
-                              'filename', 'module', 'exc_info', 'exc_text', 'stack_info',
-                              'lineno', 'funcName', 'created', 'msecs', 'relativeCreated',
-                              'thread', 'threadName', 'processName', 'process', 'getMessage']:
-                    extra_fields[key] = value
-            
+            extra_fields = {
+                key: value for key, value in record.__dict__.items()
+                if key not in _RECORD_ATTRS and key != self._CACHE_ATTR
+            }
             if extra_fields:
                 log_entry['extra'] = extra_fields
         
+        formatted = self._encode(log_entry)
+        record.__dict__[self._CACHE_ATTR] = (self._cache_key, formatted)
+        return formatted
+    
+    def _encode(self, log_entry: Dict[str, Any]) -> str:
+        """JSON 직렬화 (orjson 실패 시 표준 json으로 대체)"""
+        if self.use_orjson:
+            try:
+                return orjson.dumps(log_entry, default=str).decode('utf-8')
+            except TypeError:
+                pass
         return json.dumps(log_entry, ensure_ascii=False, default=str)
+    
+    def _format_timestamp(self, created: float) -> str:
+        """ISO 8601 타임스탬프 생성 (초 단위 접두어 캐시)"""
+        seconds = int(created)
+        cached_seconds, prefix = self._timestamp_cache
+        if cached_seconds != seconds:
+            prefix = datetime.fromtimestamp(seconds, tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%S')
+            self._timestamp_cache = (seconds, prefix)
+        
+        # datetime.fromtimestamp과 같은 반올림 (올림으로 초가 바뀌면 그대로 위임)
+        microseconds = round((created - seconds) * 1e6)
+        if microseconds >= 1000000:
+            return datetime.fromtimestamp(created, tz=timezone.utc).isoformat()
+        if microseconds:
+            return f"{prefix}.{microseconds:06d}+00:00"
+        return f"{prefix}+00:00"
+
+
+# 요청 단위 로그 컨텍스트 (trace_id 등, 스레드/코루틴별로 분리)
+_request_context: ContextVar[Dict[str, Any]] = ContextVar('log_request_context', default={})
 
 
 class ContextualFilter(logging.Filter):
-    """컨텍스트 정보를 로그에 추가하는 필터"""
+    """컨텍스트 정보를 로그에 추가하는 필터 (글로벌 컨텍스트 + 요청 컨텍스트)"""
     
     def __init__(self, context: Dict[str, Any] = None):
         super().__init__()
@@ -78,6 +134,8 @@ class ContextualFilter(logging.Filter):
         """로그 레코드에 컨텍스트 정보 추가"""
         for key, value in self.context.items():
             setattr(record, key, value)
+        for key, value in _request_context.get().items():
+            setattr(record, key, value)
         return True
     
     def update_context(self, **kwargs):
@@ -90,7 +148,19 @@ class ContextualFilter(logging.Filter):
 
 
 class CloudWatchHandler(logging.Handler):
-    """AWS CloudWatch Logs 핸들러"""
+    """
+    AWS CloudWatch Logs 핸들러
+    
+    emit은 포매팅 후 제한된 링 버퍼에 추가만 하고, 전송(put_log_events)은 전용 스레드가 수행합니다.
+    버퍼가 가득 차면 drop_policy에 따라 가장 오래된(drop_oldest) 또는 새(drop_newest) 로그를 버립니다.
+    """
+    
+    # put_log_events 한도: 요청당 이벤트 10,000개, 1,048,576바이트 (이벤트당 26바이트 추가)
+    MAX_BATCH_EVENTS = 10000
+    MAX_BATCH_BYTES = 1048576
+    EVENT_OVERHEAD_BYTES = 26
+    
+    RETRYABLE_ERRORS = {'ThrottlingException', 'ServiceUnavailableException'}
     
     def __init__(
         self,
@@ -98,52 +168,46 @@ class CloudWatchHandler(logging.Handler):
         log_stream: str,
         aws_client_manager=None,
         buffer_size: int = 100,
-        flush_interval: int = 60
+        flush_interval: int = 60,
+        max_queue_size: int = 10000,
+        drop_policy: str = 'drop_oldest',
+        logs_client=None
     ):
         super().__init__()
+        if drop_policy not in ('drop_oldest', 'drop_newest'):
+            raise ValueError(f"지원하지 않는 drop_policy: {drop_policy}")
+        
         self.log_group = log_group
         self.log_stream = log_stream
         self.buffer_size = buffer_size
         self.flush_interval = flush_interval
-        self.buffer = []
+        self.drop_policy = drop_policy
+        self.buffer = deque(maxlen=max_queue_size)
         self.sequence_token = None
-        self.last_flush = datetime.now()
+        self.stats = {'shipped': 0, 'dropped': 0, 'failed_batches': 0}
+        
+        self._condition = threading.Condition()
+        self._closed = False
+        self._sending = False
+        self._flush_waiters = 0
+        self._stream_ready = False
         
-        # CloudWatch 클라이언트 초기화
-        if aws_client_manager:
+        # CloudWatch 클라이언트 (로그 그룹/스트림 생성은 전송 스레드에서 수행)
+        if logs_client is None and aws_client_manager:
             try:
-                from .aws_client import CloudWatchClient
-                self.cloudwatch = CloudWatchClient(aws_client_manager)
-                self._ensure_log_group_exists()
-                self._ensure_log_stream_exists()
-                self.enabled = True
+                logs_client = aws_client_manager.get_client('logs')
             except Exception as e:
-                print(f"CloudWatch 핸들러 초기화 실패: {e}")
-                self.enabled = False
-        else:
-            self.enabled = False
-    
-    def _ensure_log_group_exists(self):
-        """로그 그룹 존재 확인 및 생성"""
-        try:
-            self.cloudwatch.create_log_group(self.log_group)
-        except Exception as e:
-            print(f"로그 그룹 생성 실패: {e}")
-    
-    def _ensure_log_stream_exists(self):
-        """로그 스트림 존재 확인 및 생성"""
-        try:
-            self.cloudwatch.logs_client.create_log_stream(
-                logGroupName=self.log_group,
-                logStreamName=self.log_stream
-            )
-        except Exception as e:
-            # 이미 존재하는 경우는 무시
-            if 'ResourceAlreadyExistsException' not in str(e):
-                print(f"로그 스트림 생성 실패: {e}")
+                print(f"CloudWatch 핸들러 초기화 실패: {e}", file=sys.stderr)
+        self.logs_client = logs_client
+        self.enabled = logs_client is not None
+        
+        self._shipper = None
+        if self.enabled:
+            self._shipper = threading.Thread(target=self._run_shipper, name='cloudwatch-log-shipper', daemon=True)
+            self._shipper.start()
     
     def emit(self, record: logging.LogRecord):
-        """로그 레코드 처리"""
+        """로그 레코드 처리 (버퍼에 추가만 함)"""
         if not self.enabled:
             return
         
@@ -153,43 +217,155 @@ class CloudWatchHandler(logging.Handler):
                 'message': self.format(record)
             }
             
-            self.buffer.append(log_event)
-            
-            # 버퍼가 가득 찼거나 일정 시간이 지나면 플러시
-            now = datetime.now()
-            if (len(self.buffer) >= self.buffer_size or 
-                (now - self.last_flush).seconds >= self.flush_interval):
-                self.flush()
+            with self._condition:
+                if len(self.buffer) == self.buffer.maxlen:
+                    self.stats['dropped'] += 1
+                    if self.drop_policy == 'drop_newest':
+                        return
+                self.buffer.append(log_event)
                 
-        except Exception as e:
+                if len(self.buffer) >= self.buffer_size:
+                    self._condition.notify()
+                
+        except Exception:
             self.handleError(record)
     
-    def flush(self):
-        """버퍼의 로그를 CloudWatch로 전송"""
-        if not self.enabled or not self.buffer:
+    def flush(self, timeout: float = 5.0):
+        """
+        버퍼의 로그 전송 요청 후 전송 완료까지 대기
+        
+        Args:
+            timeout: 최대 대기 시간(초)
+        """
+        if not self.enabled:
             return
         
-        try:
-            # 타임스탬프 순으로 정렬
-            self.buffer.sort(key=lambda x: x['timestamp'])
-            
-            self.sequence_token = self.cloudwatch.put_log_events(
-                log_group_name=self.log_group,
-                log_stream_name=self.log_stream,
-                log_events=self.buffer,
-                sequence_token=self.sequence_token
-            )
-            
-            self.buffer.clear()
-            self.last_flush = datetime.now()
-            
-        except Exception as e:
-            print(f"CloudWatch 로그 전송 실패: {e}")
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            self._flush_waiters += 1
+            self._condition.notify_all()
+            try:
+                while (self.buffer or self._sending) and self._shipper.is_alive():
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+            finally:
+                self._flush_waiters -= 1
     
     def close(self):
-        """핸들러 종료 시 버퍼 플러시"""
-        self.flush()
+        """핸들러 종료 시 버퍼 전송 후 전송 스레드 종료"""
+        if self.enabled and not self._closed:
+            self.flush()
+            with self._condition:
+                self._closed = True
+                self._condition.notify_all()
+            self._shipper.join(timeout=5.0)
         super().close()
+    
+    def _run_shipper(self):
+        """전송 스레드: 배치 크기 도달 또는 flush_interval 경과 시 전송"""
+        while True:
+            with self._condition:
+                if not (self._closed or self._flush_waiters) and len(self.buffer) < self.buffer_size:
+                    self._condition.wait(self.flush_interval)
+                if self._closed and not self.buffer:
+                    return
+                batch = self._take_batch()
+                self._sending = bool(batch)
+            
+            try:
+                if batch:
+                    self._send_batch(batch)
+            finally:
+                with self._condition:
+                    self._sending = False
+                    self._condition.notify_all()
+    
+    def _take_batch(self) -> list:
+        """요청 한도(이벤트 수, 바이트) 안에서 버퍼 앞부분 추출"""
+        batch = []
+        batch_bytes = 0
+        while self.buffer and len(batch) < self.MAX_BATCH_EVENTS:
+            event = self.buffer[0]
+            event_bytes = len(event['message'].encode('utf-8')) + self.EVENT_OVERHEAD_BYTES
+            if event_bytes > self.MAX_BATCH_BYTES:
+                # 단일 이벤트 한도 초과: 잘라서 전송
+                limit = self.MAX_BATCH_BYTES - self.EVENT_OVERHEAD_BYTES
+                event = {**event, 'message': event['message'].encode('utf-8')[:limit].decode('utf-8', 'ignore')}
+                event_bytes = len(event['message'].encode('utf-8')) + self.EVENT_OVERHEAD_BYTES
+            if batch and batch_bytes + event_bytes > self.MAX_BATCH_BYTES:
+                break
+            self.buffer.popleft()
+            batch.append(event)
+            batch_bytes += event_bytes
+        return batch
+    
+    def _send_batch(self, batch: list, max_attempts: int = 5):
+        """배치 전송 (시퀀스 토큰 갱신, 처리량 초과 시 백오프 재시도)"""
+        # 타임스탬프 순으로 정렬
+        batch.sort(key=lambda x: x['timestamp'])
+        
+        for attempt in range(max_attempts):
+            try:
+                self._ensure_log_stream()
+                params = {'logGroupName': self.log_group, 'logStreamName': self.log_stream, 'logEvents': batch}
+                if self.sequence_token:
+                    params['sequenceToken'] = self.sequence_token
+                
+                response = self.logs_client.put_log_events(**params)
+                self.sequence_token = response.get('nextSequenceToken')
+                self.stats['shipped'] += len(batch)
+                return
+                
+            except Exception as e:
+                error = getattr(e, 'response', {}).get('Error', {})
+                code = error.get('Code')
+                if code in ('InvalidSequenceTokenException', 'DataAlreadyAcceptedException'):
+                    self.sequence_token = getattr(e, 'response', {}).get('expectedSequenceToken') or \
+                        self._expected_token(error.get('Message', ''))
+                    if code == 'DataAlreadyAcceptedException':
+                        return
+                    continue
+                if code == 'ResourceNotFoundException':
+                    self._stream_ready = False
+                    continue
+                if code in self.RETRYABLE_ERRORS and attempt < max_attempts - 1:
+                    time.sleep(random.uniform(0, min(5.0, 0.2 * (2 ** attempt))))
+                    continue
+                
+                self.stats['failed_batches'] += 1
+                print(f"CloudWatch 로그 전송 실패 ({len(batch)}건 폐기): {e}", file=sys.stderr)
+                return
+        
+        self.stats['failed_batches'] += 1
+        print(f"CloudWatch 로그 전송 재시도 초과 ({len(batch)}건 폐기)", file=sys.stderr)
+    
+    @staticmethod
+    def _expected_token(message: str) -> Optional[str]:
+        """오류 메시지의 다음 시퀀스 토큰 추출"""
+        marker = 'sequenceToken is: '
+        if marker in message:
+            token = message.split(marker, 1)[1].strip()
+            return None if token == 'null' else token
+        return None
+    
+    def _ensure_log_stream(self):
+        """로그 그룹/스트림 존재 확인 및 생성 (최초 전송 시 1회)"""
+        if self._stream_ready:
+            return
+        
+        for create, params in (
+            (self.logs_client.create_log_group, {'logGroupName': self.log_group}),
+            (self.logs_client.create_log_stream, {'logGroupName': self.log_group, 'logStreamName': self.log_stream})
+        ):
+            try:
+                create(**params)
+            except Exception as e:
+                # 이미 존재하는 경우는 무시
+                if 'ResourceAlreadyExistsException' not in str(e):
+                    raise
+        self._stream_ready = True
 
 
 class LoggerManager:
@@ -249,8 +425,9 @@ class LoggerManager:
         if self.enable_cloudwatch and self.aws_client_manager:
             self._add_cloudwatch_handler(root_logger)
         
-        # 글로벌 필터 추가
-        root_logger.addFilter(self.context_filter)
+        # 글로벌 필터 추가 (하위 로거에서 전파된 레코드에도 적용되도록 핸들러에 추가)
+        for handler in root_logger.handlers:
+            handler.addFilter(self.context_filter)
     
     def _add_console_handler(self, logger: logging.Logger):
         """콘솔 핸들러 추가"""
@@ -373,52 +550,56 @@ def get_logger(name: str = None) -> logging.Logger:
         return logging.getLogger()
 
 
-def log_function_call(logger: logging.Logger = None):
-    """함수 호출 로깅 데코레이터"""
+def log_function_call(logger: logging.Logger = None, sample_rate: float = 1.0):
+    """
+    함수 호출 로깅 데코레이터
+    
+    DEBUG 레벨이 꺼져 있으면 시작/완료 로그의 메시지와 extra를 만들지 않으며,
+    실패 로그는 레벨과 샘플링에 관계없이 항상 남깁니다.
+    
+    Args:
+        logger: 사용할 로거 (없으면 함수 모듈 이름의 로거)
+        sample_rate: 시작/완료 DEBUG 로그를 남길 호출 비율 (0.0 ~ 1.0)
+    """
     def decorator(func):
+        resolved = [logger]
+        
         @wraps(func)
         def wrapper(*args, **kwargs):
-            func_logger = logger or get_logger(func.__module__)
+            func_logger = resolved[0]
+            if func_logger is None:
+                func_logger = resolved[0] = get_logger(func.__module__)
             
-            # 함수 시작 로깅
-            func_logger.debug(
-                f"함수 호출 시작: {func.__name__}",
-                extra={
-                    'function': func.__name__,
-                    'module': func.__module__,
-                    'args_count': len(args),
-                    'kwargs_keys': list(kwargs.keys())
-                }
+            trace = func_logger.isEnabledFor(logging.DEBUG) and (
+                sample_rate >= 1.0 or random.random() < sample_rate
             )
             
-            start_time = datetime.now()
-            
-            try:
-                result = func(*args, **kwargs)
-                
-                # 성공 로깅
-                execution_time = (datetime.now() - start_time).total_seconds()
+            # 함수 시작 로깅
+            if trace:
                 func_logger.debug(
-                    f"함수 호출 완료: {func.__name__}",
+                    "함수 호출 시작: %s", func.__name__,
                     extra={
-                        'function': func.__name__,
-                        'module': func.__module__,
-                        'execution_time': execution_time,
-                        'status': 'success'
+                        'function_name': func.__name__,
+                        'function_module': func.__module__,
+                        'args_count': len(args),
+                        'kwargs_keys': list(kwargs.keys())
                     }
                 )
-                
-                return result
+            
+            start_time = time.perf_counter()
+            
+            try:
+                result = func(*args, **kwargs)
                 
             except Exception as e:
                 # 예외 로깅
-                execution_time = (datetime.now() - start_time).total_seconds()
+                execution_time = time.perf_counter() - start_time
                 func_logger.error(
-                    f"함수 호출 실패: {func.__name__}",
+                    "함수 호출 실패: %s", func.__name__,
                     exc_info=True,
                     extra={
-                        'function': func.__name__,
-                        'module': func.__module__,
+                        'function_name': func.__name__,
+                        'function_module': func.__module__,
                         'execution_time': execution_time,
                         'status': 'error',
                         'error_type': type(e).__name__,
@@ -426,6 +607,20 @@ def log_function_call(logger: logging.Logger = None):
                     }
                 )
                 raise
+            
+            # 성공 로깅
+            if trace:
+                func_logger.debug(
+                    "함수 호출 완료: %s", func.__name__,
+                    extra={
+                        'function_name': func.__name__,
+                        'function_module': func.__module__,
+                        'execution_time': time.perf_counter() - start_time,
+                        'status': 'success'
+                    }
+                )
+            
+            return result
         
         return wrapper
     return decorator
@@ -452,6 +647,29 @@ def log_with_context(**context_kwargs):
     return decorator
 
 
+def bind_log_context(**kwargs) -> Token:
+    """
+    현재 요청(스레드/코루틴) 범위의 로그 컨텍스트 추가
+    
+    Args:
+        **kwargs: 로그 레코드에 추가할 필드
+        
+    Returns:
+        Token: reset_log_context에 전달할 복원 토큰
+    """
+    return _request_context.set({**_request_context.get(), **kwargs})
+
+
+def reset_log_context(token: Token):
+    """bind_log_context 이전의 요청 로그 컨텍스트로 복원"""
+    _request_context.reset(token)
+
+
+def get_log_context() -> Dict[str, Any]:
+    """현재 요청 로그 컨텍스트 조회"""
+    return dict(_request_context.get())
+
+
 # 편의 함수들
 def debug(message: str, **kwargs):
     """디버그 로그"""
@@ -0,0 +1,427 @@
+"""
+요청 단위 추적(tracing) 유틸리티
+
+contextvars 기반 스팬으로 한 번의 채팅 요청이 API → NLU → Bedrock → FAQ → DynamoDB 단계에서
+소비한 시간을 기록합니다. 스팬이 열려 있는 동안 trace_id/span_id가 로그 컨텍스트에 추가되며,
+완료된 스팬은 단계별 지연 히스토그램에 집계되고 파일 또는 OTLP/HTTP 수집기로 내보내집니다.
+"""
+import asyncio
+import json
+import logging
+import os
+import random
+import threading
+import time
+import urllib.request
+import weakref
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .logger import bind_log_context, reset_log_context
+
+logger = logging.getLogger(__name__)
+
+# 단계별 지연 히스토그램 버킷 상한 (밀리초)
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_current_span: ContextVar[Optional['Span']] = ContextVar('current_span', default=None)
+
+
+@dataclass
+class Span:
+    """추적 스팬"""
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str] = None
+    start_time: float = field(default_factory=time.time)
+    duration_ms: Optional[float] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    status: str = 'ok'
+    error: Optional[str] = None
+    _start_perf: float = field(default_factory=time.perf_counter, repr=False)
+
+    def set_attribute(self, key: str, value: Any):
+        """스팬 속성 설정"""
+        self.attributes[key] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """딕셔너리로 변환"""
+        data = asdict(self)
+        data.pop('_start_perf')
+        return data
+
+
+class LatencyHistogram:
+    """고정 버킷 지연 히스토그램 (백분위수는 버킷 상한으로 근사)"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.min_ms = None
+        self.max_ms = None
+
+    def observe(self, value_ms: float):
+        """측정값 추가"""
+        index = next((i for i, bound in enumerate(self.buckets) if value_ms <= bound), len(self.buckets))
+        self.counts[index] += 1
+        self.count += 1
+        self.sum_ms += value_ms
+        self.min_ms = value_ms if self.min_ms is None else min(self.min_ms, value_ms)
+        self.max_ms = value_ms if self.max_ms is None else max(self.max_ms, value_ms)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """백분위수 근사값 (해당 버킷 상한, 마지막 버킷은 최대값)"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                bound = self.buckets[index] if index < len(self.buckets) else self.max_ms
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    def snapshot(self) -> Dict[str, Any]:
+        """현재 통계"""
+        buckets = {str(bound): count for bound, count in zip(self.buckets, self.counts)}
+        buckets['+Inf'] = self.counts[-1]
+        return {
+            'count': self.count,
+            'avg_ms': round(self.sum_ms / self.count, 3) if self.count else None,
+            'min_ms': self.min_ms,
+            'max_ms': self.max_ms,
+            'p50_ms': self.percentile(0.5),
+            'p95_ms': self.percentile(0.95),
+            'p99_ms': self.percentile(0.99),
+            'buckets': buckets
+        }
+
+
+class FileSpanExporter:
+    """스팬을 JSON Lines 파일로 내보내기"""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def export(self, spans: List[Span]):
+        """스팬 목록 기록"""
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for span in spans:
+                f.write(json.dumps(span.to_dict(), ensure_ascii=False, default=str) + '\n')
+
+
+class OTLPHttpSpanExporter:
+    """스팬을 OTLP/HTTP(JSON) 수집기로 내보내기"""
+
+    def __init__(self, endpoint: str, service_name: str, timeout: float = 5.0):
+        self.endpoint = endpoint.rstrip('/')
+        if not self.endpoint.endswith('/v1/traces'):
+            self.endpoint += '/v1/traces'
+        self.service_name = service_name
+        self.timeout = timeout
+
+    def export(self, spans: List[Span]):
+        """스팬 목록 전송"""
+        body = json.dumps(self._to_otlp(spans), default=str).encode('utf-8')
+        request = urllib.request.Request(
+            self.endpoint, data=body, method='POST', headers={'Content-Type': 'application/json'}
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+    def _to_otlp(self, spans: List[Span]) -> Dict[str, Any]:
+        """OTLP JSON 페이로드 구성"""
+        return {
+            'resourceSpans': [{
+                'resource': {'attributes': [_otlp_attribute('service.name', self.service_name)]},
+                'scopeSpans': [{
+                    'scope': {'name': __name__},
+                    'spans': [{
+                        'traceId': span.trace_id,
+                        'spanId': span.span_id,
+                        'parentSpanId': span.parent_id or '',
+                        'name': span.name,
+                        'kind': 1,
+                        'startTimeUnixNano': str(int(span.start_time * 1e9)),
+                        'endTimeUnixNano': str(int((span.start_time + (span.duration_ms or 0) / 1000) * 1e9)),
+                        'attributes': [_otlp_attribute(k, v) for k, v in span.attributes.items()],
+                        'status': {'code': 2, 'message': span.error or ''} if span.status == 'error' else {'code': 1}
+                    } for span in spans]
+                }]
+            }]
+        }
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    """OTLP 속성 값 변환"""
+    if isinstance(value, bool):
+        return {'key': key, 'value': {'boolValue': value}}
+    if isinstance(value, int):
+        return {'key': key, 'value': {'intValue': str(value)}}
+    if isinstance(value, float):
+        return {'key': key, 'value': {'doubleValue': value}}
+    return {'key': key, 'value': {'stringValue': str(value)}}
+
+
+class Tracer:
+    """
+    스팬 생성, 단계별 지연 집계 및 내보내기 관리
+
+    내보내기는 전용 스레드가 일정 주기로 모아서 수행하므로 스팬 종료 비용에 포함되지 않습니다.
+    """
+
+    EXPORT_BATCH_SIZE = 512
+
+    def __init__(self, service_name: str = 'aicc_chatbot', exporter=None,
+                 max_queue_size: int = 2048, export_interval: float = 1.0):
+        self.service_name = service_name
+        self.exporter = exporter
+        self.export_interval = export_interval
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.dropped_spans = 0
+
+        self._lock = threading.Lock()
+        self._pending = deque(maxlen=max_queue_size)
+        self._export_event = threading.Event()
+        self._export_lock = threading.Lock()
+        self._exporter_thread = None
+        self._instrumented = weakref.WeakSet()
+
+    def start_span(self, name: str, attributes: Optional[Dict[str, Any]] = None,
+                   activate: bool = True) -> Tuple[Span, Any]:
+        """
+        스팬 시작
+
+        Args:
+            name: 스팬(단계) 이름
+            attributes: 스팬 속성
+            activate: 현재 스팬으로 지정 여부 (하위 스팬의 부모, 로그 컨텍스트 적용)
+
+        Returns:
+            Tuple[Span, Any]: 스팬과 end_span에 전달할 복원 토큰
+        """
+        parent = _current_span.get()
+        span = Span(
+            name=name,
+            trace_id=parent.trace_id if parent else f"{random.getrandbits(128):032x}",
+            span_id=f"{random.getrandbits(64):016x}",
+            parent_id=parent.span_id if parent else None,
+            attributes=dict(attributes or {})
+        )
+
+        token = None
+        if activate:
+            token = (
+                _current_span.set(span),
+                bind_log_context(trace_id=span.trace_id, span_id=span.span_id)
+            )
+        return span, token
+
+    def end_span(self, span: Span, token: Any = None, error: Optional[BaseException] = None):
+        """스팬 종료 (지연 집계 및 내보내기 대기열 추가)"""
+        span.duration_ms = (time.perf_counter() - span._start_perf) * 1000
+        if error is not None:
+            span.status = 'error'
+            span.error = f"{type(error).__name__}: {error}"
+
+        if token is not None:
+            span_token, log_token = token
+            reset_log_context(log_token)
+            _current_span.reset(span_token)
+
+        with self._lock:
+            histogram = self.histograms.get(span.name)
+            if histogram is None:
+                histogram = self.histograms[span.name] = LatencyHistogram()
+            histogram.observe(span.duration_ms)
+
+            if self.exporter is not None:
+                if len(self._pending) == self._pending.maxlen:
+                    self.dropped_spans += 1
+                self._pending.append(span)
+                if len(self._pending) >= self.EXPORT_BATCH_SIZE:
+                    self._export_event.set()
+                if self._exporter_thread is None:
+                    self._exporter_thread = threading.Thread(
+                        target=self._run_exporter, name='span-exporter', daemon=True
+                    )
+                    self._exporter_thread.start()
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        """스팬 컨텍스트 매니저"""
+        span, token = self.start_span(name, attributes)
+        try:
+            yield span
+        except BaseException as e:
+            self.end_span(span, token, error=e)
+            raise
+        else:
+            self.end_span(span, token)
+
+    def instrument_botocore(self, client: Any):
+        """
+        boto3 클라이언트 호출마다 aws.<서비스>.<오퍼레이션> 스팬 기록
+
+        추적 중인 요청(현재 스팬이 있는 경우) 안에서 발생한 호출만 기록합니다.
+
+        Args:
+            client: boto3 클라이언트 (리소스는 resource.meta.client)
+        """
+        if client in self._instrumented:
+            return
+        self._instrumented.add(client)
+        service_name = client.meta.service_model.service_name
+
+        def before_call(model, context, **kwargs):
+            if _current_span.get() is None:
+                return
+            context['trace_span'], _ = self.start_span(
+                f"aws.{service_name}.{model.name}",
+                {'aws.service': service_name, 'aws.operation': model.name},
+                activate=False
+            )
+
+        def after_call(context, http_response=None, parsed=None, **kwargs):
+            span = context.pop('trace_span', None)
+            if span is None:
+                return
+            metadata = (parsed or {}).get('ResponseMetadata', {})
+            span.set_attribute('http.status_code', metadata.get('HTTPStatusCode'))
+            span.set_attribute('aws.retry_attempts', metadata.get('RetryAttempts', 0))
+            if 'Error' in (parsed or {}):
+                span.status = 'error'
+                span.error = parsed['Error'].get('Code')
+            self.end_span(span)
+
+        def after_call_error(context, exception, **kwargs):
+            span = context.pop('trace_span', None)
+            if span is not None:
+                self.end_span(span, error=exception)
+
+        client.meta.events.register('before-call', before_call)
+        client.meta.events.register('after-call', after_call)
+        client.meta.events.register('after-call-error', after_call_error)
+
+    def get_latency_stats(self, reset: bool = False) -> Dict[str, Dict[str, Any]]:
+        """
+        단계별 지연 통계 조회
+
+        Args:
+            reset: 조회 후 초기화 여부
+
+        Returns:
+            Dict: {"스팬 이름": 히스토그램 통계}
+        """
+        with self._lock:
+            stats = {name: histogram.snapshot() for name, histogram in sorted(self.histograms.items())}
+            if reset:
+                self.histograms.clear()
+        return stats
+
+    def flush(self) -> bool:
+        """대기 중인 스팬을 호출 스레드에서 즉시 내보내기 (성공 여부 반환)"""
+        if self.exporter is None:
+            return True
+        with self._lock:
+            batch = list(self._pending)
+            self._pending.clear()
+        return self._export(batch)
+
+    def _run_exporter(self):
+        """내보내기 스레드: export_interval마다 또는 대기열이 차면 내보내기"""
+        while True:
+            self._export_event.wait(self.export_interval)
+            self._export_event.clear()
+            self.flush()
+
+    def _export(self, batch: List[Span]) -> bool:
+        """스팬 목록 내보내기 (내보내기 호출은 직렬화)"""
+        if not batch:
+            return True
+        with self._export_lock:
+            try:
+                self.exporter.export(batch)
+                return True
+            except Exception as e:
+                logger.warning(f"스팬 내보내기 실패 ({len(batch)}건): {str(e)}")
+                return False
+
+
+def _create_exporter(service_name: str):
+    """환경 변수(TRACE_EXPORTER)에 따른 내보내기 생성"""
+    exporter_type = os.getenv('TRACE_EXPORTER', 'none').lower()
+    if exporter_type == 'file':
+        return FileSpanExporter(os.getenv('TRACE_FILE_PATH', 'logs/traces.jsonl'))
+    if exporter_type == 'otlp':
+        return OTLPHttpSpanExporter(
+            os.getenv('OTEL_EXPORTER_OTLP_ENDPOINT', 'http://localhost:4318'), service_name
+        )
+    return None
+
+
+# 전역 트레이서 인스턴스
+_tracer: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+    """전역 트레이서 조회 (최초 호출 시 환경 변수로 생성)"""
+    global _tracer
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                service_name = os.getenv('OTEL_SERVICE_NAME', 'aicc_chatbot')
+                _tracer = Tracer(service_name, exporter=_create_exporter(service_name))
+    return _tracer
+
+
+def set_tracer(tracer: Optional[Tracer]):
+    """전역 트레이서 교체 (None이면 다음 조회 시 다시 생성)"""
+    global _tracer
+    _tracer = tracer
+
+
+def current_span() -> Optional[Span]:
+    """현재 스팬 조회"""
+    return _current_span.get()
+
+
+def span(name: str, **attributes):
+    """전역 트레이서로 스팬 컨텍스트 매니저 생성"""
+    return get_tracer().span(name, **attributes)
+
+
+def traced(name: Optional[str] = None):
+    """
+    함수 실행을 스팬으로 기록하는 데코레이터 (코루틴 함수 지원)
+
+    Args:
+        name: 스팬 이름 (없으면 "모듈.함수")
+    """
+    def decorator(func: Callable):
+        span_name = name or f"{func.__module__}.{func.__qualname__}"
+
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with get_tracer().span(span_name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with get_tracer().span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
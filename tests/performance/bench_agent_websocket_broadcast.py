@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+상담원 WebSocket 브로드캐스트 전달 지연 벤치마크 (순차 전송 vs 연결별 송신 대기열)
+
+상담원 N명의 가상 소켓(대부분 수 ms, 일부는 느린 소비자)에 브로드캐스트를 여러 번 보내고
+브로드캐스트 시작부터 각 상담원 수신까지의 지연 백분위수를 비교합니다.
+
+사용법:
+    python tests/performance/bench_agent_websocket_broadcast.py --agents 1000 --broadcasts 5
+    python tests/performance/bench_agent_websocket_broadcast.py --slow-ratio 0.02 --slow-ms 3000
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT / '산출물' / '3.3_상담원_UI_개발' / '소스코드' / 'backend'))
+
+from websocket_manager import ConnectionManager  # noqa: E402
+
+
+class SimulatedAgentSocket:
+    """전송마다 네트워크 지연을 재현하고 수신 시각을 기록하는 소켓"""
+
+    def __init__(self, latency: float, jitter: float):
+        self.latency = latency
+        self.jitter = jitter
+        self.received: List[float] = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        await asyncio.sleep(max(0.0, random.gauss(self.latency, self.jitter)))
+        self.received.append(time.perf_counter())
+
+    async def close(self, code: int = 1000):
+        pass
+
+
+async def legacy_broadcast(connections: Dict[str, SimulatedAgentSocket], message: dict):
+    """기존 구현: 수신자마다 json.dumps 후 순차 전송"""
+    for agent_id, websocket in connections.items():
+        try:
+            await websocket.send_text(json.dumps(message))
+        except Exception:
+            pass
+
+
+def make_sockets(args) -> Dict[str, SimulatedAgentSocket]:
+    rng = random.Random(42)
+    sockets = {}
+    for i in range(args.agents):
+        slow = rng.random() < args.slow_ratio
+        latency = (args.slow_ms if slow else args.latency_ms) / 1000
+        sockets[f"agent_{i}"] = SimulatedAgentSocket(latency, latency * 0.2)
+    return sockets
+
+
+def summarize(name: str, latencies: List[float], call_times: List[float], evicted: int = 0):
+    ordered = sorted(latencies)
+
+    def pct(q):
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q))] * 1000
+
+    print(
+        f"{name:<8} deliveries={len(ordered):6d} p50={pct(0.5):8.1f}ms p95={pct(0.95):8.1f}ms "
+        f"p99={pct(0.99):8.1f}ms max={ordered[-1] * 1000:8.1f}ms "
+        f"broadcast_call={statistics.mean(call_times) * 1000:8.2f}ms evicted={evicted}"
+    )
+
+
+async def run_legacy(args):
+    sockets = make_sockets(args)
+    latencies, call_times = [], []
+    for seq in range(args.broadcasts):
+        for socket in sockets.values():
+            socket.received.clear()
+        start = time.perf_counter()
+        await legacy_broadcast(sockets, {'type': 'ping', 'seq': seq})
+        call_times.append(time.perf_counter() - start)
+        latencies.extend(t - start for socket in sockets.values() for t in socket.received)
+    summarize('legacy', latencies, call_times)
+
+
+async def run_queued(args):
+    sockets = make_sockets(args)
+    manager = ConnectionManager(send_timeout=args.send_timeout)
+    for agent_id, socket in sockets.items():
+        await manager.connect(socket, agent_id)
+    await manager.drain(timeout=args.send_timeout * 2)
+
+    latencies, call_times = [], []
+    for seq in range(args.broadcasts):
+        for socket in sockets.values():
+            socket.received.clear()
+        start = time.perf_counter()
+        await manager.broadcast_to_all({'type': 'ping', 'seq': seq})
+        call_times.append(time.perf_counter() - start)
+        await manager.drain(timeout=args.send_timeout * 2)
+        latencies.extend(t - start for socket in sockets.values() for t in socket.received)
+    summarize('queued', latencies, call_times, manager.evicted_connections)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--agents', type=int, default=1000)
+    parser.add_argument('--broadcasts', type=int, default=5)
+    parser.add_argument('--latency-ms', type=float, default=2.0, help='일반 상담원 전송 지연')
+    parser.add_argument('--slow-ratio', type=float, default=0.01, help='느린 소비자 비율')
+    parser.add_argument('--slow-ms', type=float, default=500.0, help='느린 소비자 전송 지연')
+    parser.add_argument('--send-timeout', type=float, default=1.0)
+    parser.add_argument('--skip-legacy', action='store_true', help='순차 전송(수 분 소요) 생략')
+    args = parser.parse_args()
+
+    if not args.skip_legacy:
+        asyncio.run(run_legacy(args))
+    asyncio.run(run_queued(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+REST 부하 중 상담원 WebSocket 전달 지연 벤치마크 (동기 세션 vs 비동기 세션)
+
+동시에 여러 REST 요청이 고객 검색 쿼리를 반복하는 동안 일정 간격으로 브로드캐스트를 보내고,
+예정 시각부터 각 상담원 수신까지의 지연 백분위수를 비교합니다.
+sync 모드는 async def 엔드포인트에서 동기 Session을 쓰던 기존 방식(쿼리가 이벤트 루프를 막음)을 재현합니다.
+
+사용법:
+    python tests/performance/bench_agent_ws_under_db_load.py --customers 50000 --rest-clients 20
+    python tests/performance/bench_agent_ws_under_db_load.py --database-url postgresql://user:pw@localhost/agent_desktop_db
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT / '산출물' / '3.3_상담원_UI_개발' / '소스코드' / 'backend'))
+
+
+class TimestampSocket:
+    """수신 시각만 기록하는 소켓"""
+
+    def __init__(self):
+        self.received: List[float] = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        self.received.append(time.perf_counter())
+
+    async def close(self, code: int = 1000):
+        pass
+
+
+def seed(database_url: str, customers: int):
+    from sqlalchemy import create_engine, func, select
+    from sqlalchemy.orm import Session
+    from models import Base, Customer
+
+    engine = create_engine(database_url)
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        existing = db.execute(select(func.count()).select_from(Customer)).scalar()
+        rows = [
+            {'id': f"cust_{i}", 'name': f"고객{i}", 'phone': f"010-{i % 10000:04d}-{i // 10000:04d}",
+             'email': f"user{i}@example.com"}
+            for i in range(existing, customers)
+        ]
+        if rows:
+            db.execute(Customer.__table__.insert(), rows)
+            db.commit()
+    engine.dispose()
+
+
+async def run(args, mode: str):
+    from sqlalchemy import create_engine, or_, select
+    from sqlalchemy.orm import Session
+    import crud
+    from database import create_async_db_engine
+    from models import Customer
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+    from websocket_manager import ConnectionManager
+
+    manager = ConnectionManager()
+    sockets = {f"agent_{i}": TimestampSocket() for i in range(args.agents)}
+    for agent_id, socket in sockets.items():
+        await manager.connect(socket, agent_id)
+    await manager.drain(timeout=5)
+
+    sync_engine = create_engine(args.database_url)
+    async_engine = create_async_db_engine(args.database_url, workers=1)
+    AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+    stop = asyncio.Event()
+    requests = 0
+
+    async def rest_client(seq: int):
+        nonlocal requests
+        query = str(seq % 10)
+        while not stop.is_set():
+            if mode == 'sync':
+                # 기존 방식: async def 안에서 동기 쿼리 (이벤트 루프 정지)
+                with Session(sync_engine) as db:
+                    pattern = f"%{query}%"
+                    db.execute(select(Customer).where(or_(
+                        Customer.name.like(pattern), Customer.phone.like(pattern), Customer.email.like(pattern)
+                    )).limit(args.limit)).scalars().all()
+            else:
+                async with AsyncSessionLocal() as db:
+                    await crud.search_customers(db, query, args.limit)
+            requests += 1
+            await asyncio.sleep(0)
+
+    clients = [asyncio.create_task(rest_client(i)) for i in range(args.rest_clients)]
+    await asyncio.sleep(0.2)
+
+    latencies = []
+    started = time.perf_counter()
+    for seq in range(args.broadcasts):
+        for socket in sockets.values():
+            socket.received.clear()
+        scheduled = started + seq * args.interval
+        await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+        await manager.broadcast_to_all({'type': 'ping', 'seq': seq})
+        await manager.drain(timeout=10)
+        latencies.extend(t - scheduled for socket in sockets.values() for t in socket.received)
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await asyncio.gather(*clients)
+    await manager.stop()
+    await async_engine.dispose()
+    sync_engine.dispose()
+
+    ordered = sorted(latencies)
+
+    def pct(q):
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q))] * 1000
+
+    print(
+        f"{mode:<6} deliveries={len(ordered):6d} p50={pct(0.5):8.1f}ms p95={pct(0.95):8.1f}ms "
+        f"p99={pct(0.99):8.1f}ms max={ordered[-1] * 1000:8.1f}ms rest_rps={requests / elapsed:8.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-url', default=None, help='기본값: 임시 SQLite 파일')
+    parser.add_argument('--customers', type=int, default=50000)
+    parser.add_argument('--agents', type=int, default=200)
+    parser.add_argument('--rest-clients', type=int, default=20)
+    parser.add_argument('--broadcasts', type=int, default=50)
+    parser.add_argument('--interval', type=float, default=0.05, help='브로드캐스트 간격(초)')
+    parser.add_argument('--limit', type=int, default=20)
+    parser.add_argument('--mode', choices=['sync', 'async', 'both'], default='both')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.database_url is None:
+            args.database_url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        os.environ.setdefault('DATABASE_URL', args.database_url)
+        seed(args.database_url, args.customers)
+
+        for mode in (['sync', 'async'] if args.mode == 'both' else [args.mode]):
+            asyncio.run(run(args, mode))
+
+
+if __name__ == '__main__':
+    main()
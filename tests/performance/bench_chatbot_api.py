@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+챗봇 API 부하 벤치마크 (Flask vs ASGI)
+
+로컬 AWS 대역(stand-in) 서비스가 실제 서비스와 같은 횟수의 AWS 호출 지연을 재현하고,
+각 API 서버를 CPU 코어 1개에 고정한 단일 프로세스로 실행해 코어당 초당 요청 수를 비교합니다.
+
+사용법:
+    python tests/performance/bench_chatbot_api.py --duration 10 --concurrency 64 --latency-ms 20
+    python tests/performance/bench_chatbot_api.py --stacks asgi --flask-mode sync
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+
+class StandInConversationService:
+    """AWS 호출 지연을 재현하는 인메모리 대화 서비스 (호출 횟수는 ConversationService 기준)"""
+
+    def __init__(self, latency: float):
+        from src.models.conversation import Conversation, ConversationStatus, Message, MessageSource, MessageType
+
+        self._models = SimpleNamespace(
+            Conversation=Conversation, ConversationStatus=ConversationStatus,
+            Message=Message, MessageSource=MessageSource, MessageType=MessageType
+        )
+        self.latency = latency
+        self.conversations = {}
+        self._lock = threading.Lock()
+
+    def create_conversation(self, session_id, user_id=None, channel='web_chat'):
+        # put_item(대화) + put_item(메시지) + put_item(대화) + put_metric_data
+        self._aws_calls(4)
+        conversation = self._models.Conversation(
+            conversation_id=f"conv_{uuid.uuid4().hex[:12]}",
+            session_id=session_id,
+            user_id=user_id,
+            channel=channel,
+            status=self._models.ConversationStatus.ACTIVE
+        )
+        with self._lock:
+            self.conversations[conversation.conversation_id] = conversation
+        return conversation
+
+    def get_conversation(self, conversation_id):
+        # get_item + query(메시지)
+        self._aws_calls(2)
+        with self._lock:
+            conversation = self.conversations.get(conversation_id)
+            if conversation is None:
+                return None
+            return self._models.Conversation(**{**conversation.__dict__, 'messages': list(conversation.messages)})
+
+    def send_user_message(self, conversation_id, content):
+        return self._add_message(conversation_id, self._models.MessageSource.USER, content)
+
+    def send_bot_message(self, conversation_id, content, metadata=None):
+        return self._add_message(conversation_id, self._models.MessageSource.BOT, content)
+
+    def _add_message(self, conversation_id, source, content):
+        # get_conversation(2) + put_item(메시지) + put_item(대화)
+        self._aws_calls(4)
+        message = self._models.Message(
+            message_id=uuid.uuid4().hex,
+            conversation_id=conversation_id,
+            source=source,
+            message_type=self._models.MessageType.TEXT,
+            content=content
+        )
+        with self._lock:
+            conversation = self.conversations.get(conversation_id)
+            if conversation is None:
+                return None
+            # 대화가 길어져도 벤치마크 메모리가 늘지 않도록 최근 메시지만 유지
+            conversation.messages = conversation.messages[-20:] + [message]
+        return message
+
+    def _aws_calls(self, count: int):
+        time.sleep(self.latency * count)
+
+
+class StandInNLUService:
+    """AWS 호출 지연을 재현하는 NLU 서비스 (Lex + Comprehend + DynamoDB + CloudWatch)"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def process_user_input(self, user_input, session_id, session_attributes=None):
+        time.sleep(self.latency * 4)
+        return {
+            'success': True,
+            'intent': 'general_inquiry',
+            'confidence': 0.92,
+            'entities': {},
+            'sentiment': None,
+            'response_text': '문의하신 내용을 확인했습니다.',
+            'next_action': 'respond',
+            'session_attributes': {}
+        }
+
+
+def _serve_flask(port: int, latency: float, mode: str):
+    """Flask 버전 실행 (모듈 임포트 시 생성되는 실제 서비스는 moto로 격리 후 대역으로 교체)"""
+    os.environ.setdefault('AWS_DEFAULT_REGION', 'ap-northeast-2')
+    os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+    os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+
+    from moto import mock_dynamodb
+    from werkzeug.serving import make_server
+
+    with mock_dynamodb():
+        from src.api import chatbot_api
+
+    chatbot_api.conversation_service = StandInConversationService(latency)
+    chatbot_api.nlu_service = StandInNLUService(latency)
+    chatbot_api.scenario_manager.scenario_registry.stop()
+
+    server = make_server('127.0.0.1', port, chatbot_api.app, threaded=(mode == 'threaded'))
+    server.serve_forever()
+
+
+def _serve_asgi(port: int, latency: float, io_workers: int):
+    """ASGI 버전 실행"""
+    import uvicorn
+
+    from src.api.chatbot_api_async import create_app
+    from src.utils.async_executor import BoundedExecutor
+
+    unused = SimpleNamespace()
+    app = create_app(
+        conversation_service=StandInConversationService(latency),
+        nlu_service=StandInNLUService(latency),
+        escalation_service=unused,
+        scenario_manager=unused,
+        faq_manager=unused,
+        executor=BoundedExecutor(max_workers=io_workers)
+    )
+    uvicorn.run(app, host='127.0.0.1', port=port, log_level='warning', access_log=False)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _cpu_seconds(pid: int) -> Optional[float]:
+    """프로세스 누적 CPU 시간 (Linux /proc 기준)"""
+    try:
+        fields = Path(f'/proc/{pid}/stat').read_text().rsplit(')', 1)[1].split()
+    except OSError:
+        return None
+    return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+
+
+async def _wait_until_ready(base_url: str, timeout: float = 30.0):
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(f'{base_url}/health')).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f'서버가 응답하지 않습니다: {base_url}')
+
+
+async def _virtual_user(base_url: str, stop_at: float, latencies: List[float], errors: List[int]):
+    """대화 시작 후 종료 시각까지 메시지 전송 반복"""
+    import httpx
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=30.0) as client:
+        response = await client.post('/api/v1/conversation/start', json={'channel': 'web_chat'})
+        if response.status_code != 200:
+            errors.append(response.status_code)
+            return
+
+        while time.monotonic() < stop_at:
+            started = time.perf_counter()
+            response = await client.post('/api/v1/conversation/message', json={'message': '요금제 변경 문의'})
+            if response.status_code == 200 and response.json().get('success'):
+                latencies.append(time.perf_counter() - started)
+            else:
+                errors.append(response.status_code)
+
+
+async def _drive_load(base_url: str, concurrency: int, duration: float) -> Dict[str, float]:
+    latencies: List[float] = []
+    errors: List[int] = []
+    stop_at = time.monotonic() + duration
+    started = time.monotonic()
+    await asyncio.gather(*(_virtual_user(base_url, stop_at, latencies, errors) for _ in range(concurrency)))
+    elapsed = time.monotonic() - started
+
+    ordered = sorted(latencies)
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'elapsed': elapsed,
+        'p50_ms': statistics.median(ordered) * 1000 if ordered else 0.0,
+        'p95_ms': ordered[int(len(ordered) * 0.95) - 1] * 1000 if ordered else 0.0
+    }
+
+
+def _run_stack(stack: str, args) -> Dict[str, float]:
+    """서버 프로세스를 코어 1개에 고정해 실행하고 부하 측정"""
+    port = _free_port()
+    command = [sys.executable, __file__, '--serve', stack, '--port', str(port),
+               '--latency-ms', str(args.latency_ms), '--flask-mode', args.flask_mode,
+               '--io-workers', str(args.io_workers)]
+    server = subprocess.Popen(command, cwd=PROJECT_ROOT)
+
+    try:
+        if hasattr(os, 'sched_setaffinity'):
+            os.sched_setaffinity(server.pid, {args.server_cpu})
+
+        base_url = f'http://127.0.0.1:{port}'
+        asyncio.run(_wait_until_ready(base_url))
+
+        cpu_before = _cpu_seconds(server.pid)
+        result = asyncio.run(_drive_load(base_url, args.concurrency, args.duration))
+        cpu_after = _cpu_seconds(server.pid)
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+    result['rps_per_core'] = result['requests'] / result['elapsed']
+    if cpu_before is not None and cpu_after is not None:
+        result['cpu_utilization'] = (cpu_after - cpu_before) / result['elapsed']
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='챗봇 API Flask/ASGI 처리량 비교')
+    parser.add_argument('--stacks', default='flask,asgi', help='비교할 스택 (쉼표 구분)')
+    parser.add_argument('--duration', type=float, default=10.0, help='스택별 부하 시간(초)')
+    parser.add_argument('--concurrency', type=int, default=64, help='동시 가상 사용자 수')
+    parser.add_argument('--latency-ms', type=float, default=20.0, help='AWS 호출 1회당 지연(ms)')
+    parser.add_argument('--flask-mode', choices=['sync', 'threaded'], default='threaded',
+                        help='sync: 워커당 요청 1개(gunicorn sync), threaded: 요청별 스레드(app.run 기본값)')
+    parser.add_argument('--io-workers', type=int, default=32, help='ASGI 버전 I/O 스레드 수')
+    parser.add_argument('--server-cpu', type=int, default=0, help='서버 프로세스를 고정할 CPU 번호')
+    parser.add_argument('--serve', choices=['flask', 'asgi'], help=argparse.SUPPRESS)
+    parser.add_argument('--port', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    latency = args.latency_ms / 1000
+    if args.serve == 'flask':
+        _serve_flask(args.port, latency, args.flask_mode)
+        return
+    if args.serve == 'asgi':
+        _serve_asgi(args.port, latency, args.io_workers)
+        return
+
+    print(f"동시 사용자 {args.concurrency}, AWS 호출 지연 {args.latency_ms}ms, 스택별 {args.duration}초")
+    print(f"{'stack':<8}{'requests':>10}{'errors':>8}{'rps/core':>11}{'p50(ms)':>10}{'p95(ms)':>10}{'cpu':>7}")
+    for stack in args.stacks.split(','):
+        result = _run_stack(stack.strip(), args)
+        cpu = f"{result['cpu_utilization']:.0%}" if 'cpu_utilization' in result else '-'
+        print(f"{stack:<8}{result['requests']:>10}{result['errors']:>8}{result['rps_per_core']:>11.1f}"
+              f"{result['p50_ms']:>10.1f}{result['p95_ms']:>10.1f}{cpu:>7}")
+
+
+if __name__ == '__main__':
+    main()
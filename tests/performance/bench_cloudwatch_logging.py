@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+CloudWatch 로그 핸들러 emit 지연 벤치마크 (동기 전송 vs 백그라운드 전송)
+
+put_log_events 지연을 재현하는 대역 클라이언트로 여러 스레드가 동시에 로그를 남기고,
+logger.info 호출 1회의 지연(p50/p99/max)을 비교합니다.
+
+사용법:
+    python tests/performance/bench_cloudwatch_logging.py --threads 8 --messages 2000 --latency-ms 50
+"""
+import argparse
+import logging
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import List
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.utils.logger import CloudWatchHandler, JSONFormatter  # noqa: E402
+
+
+class StandInLogsClient:
+    """put_log_events 네트워크 지연을 재현하는 CloudWatch Logs 대역"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+        self.events = 0
+
+    def create_log_group(self, **kwargs):
+        time.sleep(self.latency)
+
+    def create_log_stream(self, **kwargs):
+        time.sleep(self.latency)
+
+    def put_log_events(self, **kwargs):
+        time.sleep(self.latency)
+        self.calls += 1
+        self.events += len(kwargs['logEvents'])
+        return {'nextSequenceToken': str(self.calls)}
+
+
+class InlineCloudWatchHandler(logging.Handler):
+    """기존 방식: 버퍼가 차면 emit을 호출한 스레드에서 직접 전송"""
+
+    def __init__(self, logs_client, buffer_size: int = 100):
+        super().__init__()
+        self.logs_client = logs_client
+        self.buffer_size = buffer_size
+        self.buffer = []
+        self.sequence_token = None
+
+    def emit(self, record: logging.LogRecord):
+        self.buffer.append({'timestamp': int(record.created * 1000), 'message': self.format(record)})
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if not self.buffer:
+            return
+        self.buffer.sort(key=lambda x: x['timestamp'])
+        params = {'logGroupName': 'bench', 'logStreamName': 'bench', 'logEvents': self.buffer}
+        if self.sequence_token:
+            params['sequenceToken'] = self.sequence_token
+        self.sequence_token = self.logs_client.put_log_events(**params).get('nextSequenceToken')
+        self.buffer = []
+
+
+def run(handler: logging.Handler, threads: int, messages: int) -> List[float]:
+    logger = logging.getLogger(f"bench.{type(handler).__name__}")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    handler.setFormatter(JSONFormatter())
+    logger.addHandler(handler)
+
+    latencies: List[float] = []
+    lock = threading.Lock()
+
+    def worker(worker_id: int):
+        local = []
+        for i in range(messages):
+            start = time.perf_counter()
+            logger.info("챗봇 응답 완료", extra={'worker': worker_id, 'seq': i})
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+
+    logger.removeHandler(handler)
+    handler.close()
+    return latencies
+
+
+def report(name: str, latencies: List[float], elapsed: float, client: StandInLogsClient):
+    ordered = sorted(latencies)
+    p99 = ordered[int(len(ordered) * 0.99) - 1]
+    print(
+        f"{name:<12} p50={statistics.median(ordered) * 1e6:9.1f}us "
+        f"p99={p99 * 1e6:10.1f}us max={ordered[-1] * 1e3:8.1f}ms "
+        f"total={elapsed:6.2f}s put_log_events={client.calls} events={client.events}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--messages', type=int, default=2000, help='스레드당 로그 수')
+    parser.add_argument('--latency-ms', type=float, default=50.0, help='put_log_events 지연')
+    parser.add_argument('--buffer-size', type=int, default=100)
+    args = parser.parse_args()
+    latency = args.latency_ms / 1000
+
+    client = StandInLogsClient(latency)
+    start = time.perf_counter()
+    latencies = run(InlineCloudWatchHandler(client, args.buffer_size), args.threads, args.messages)
+    report('inline', latencies, time.perf_counter() - start, client)
+
+    client = StandInLogsClient(latency)
+    start = time.perf_counter()
+    handler = CloudWatchHandler(
+        'bench', 'bench', logs_client=client, buffer_size=args.buffer_size,
+        max_queue_size=args.threads * args.messages
+    )
+    latencies = run(handler, args.threads, args.messages)
+    report('background', latencies, time.perf_counter() - start, client)
+    print(f"{'':<12} dropped={handler.stats['dropped']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Connect Lambda 콜드 스타트 벤치마크
+
+새 인터프리터에서 핸들러 모듈 임포트 시간, 첫 호출(콜드) 지연, 이후 호출(웜) 지연을 측정합니다.
+DynamoDB는 moto, Bedrock은 고정 응답을 지연 후 반환하는 로컬 대역으로 대체합니다.
+
+사용법:
+    python tests/performance/bench_connect_lambda_startup.py --runs 5 --bedrock-latency-ms 300
+    python tests/performance/bench_connect_lambda_startup.py --importtime
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+LAMBDA_DIR = PROJECT_ROOT / 'connect' / 'lambda'
+
+# 자식 프로세스에서 실행되는 측정 스크립트
+CHILD_SCRIPT = r'''
+import io, json, os, sys, tempfile, time
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'ap-northeast-2')
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+os.environ.setdefault('LOG_SPOOL_DIR', tempfile.mkdtemp())
+sys.path[:0] = [{project_root!r}, {lambda_dir!r}]
+
+# moto가 boto3를 먼저 임포트하므로 import_ms에는 boto3 임포트 비용이 포함되지 않음
+from moto import mock_dynamodb
+mock = mock_dynamodb()
+mock.start()
+import boto3
+boto3.resource('dynamodb').create_table(
+    TableName='aicc-conversations',
+    KeySchema=[{{'AttributeName': 'contact_id', 'KeyType': 'HASH'}},
+               {{'AttributeName': 'timestamp', 'KeyType': 'RANGE'}}],
+    AttributeDefinitions=[{{'AttributeName': 'contact_id', 'AttributeType': 'S'}},
+                          {{'AttributeName': 'timestamp', 'AttributeType': 'S'}}],
+    BillingMode='PAY_PER_REQUEST'
+)
+
+BEDROCK_LATENCY = {bedrock_latency}
+CLAUDE_TEXT = json.dumps({{
+    'intent': 'product_inquiry', 'confidence': 0.93, 'entities': {{}},
+    'reasoning': '상품 문의', 'response_text': '어떤 상품이 궁금하신가요?',
+    'next_action': 'continue', 'suggested_actions': []
+}}, ensure_ascii=False)
+
+def invoke_model(**kwargs):
+    time.sleep(BEDROCK_LATENCY)
+    body = json.dumps({{'content': [{{'text': CLAUDE_TEXT}}]}}).encode()
+    return {{'body': io.BytesIO(body)}}
+
+def event(request_type='chat'):
+    return {{'Details': {{
+        'ContactData': {{'ContactId': 'bench-contact', 'CustomerEndpoint': {{'Address': '+821012345678'}}}},
+        'Parameters': {{'requestType': request_type, 'userInput': '요금제가 궁금해요', 'sessionAttributes': {{}}}}
+    }}}}
+
+started = time.perf_counter()
+import chatbot_handler
+imported = time.perf_counter()
+
+nlu = chatbot_handler.get_nlu()
+nlu.bedrock_client.invoke_model = invoke_model
+nlu_ready = time.perf_counter()
+
+chatbot_handler.lambda_handler(event(), None)
+first = time.perf_counter()
+
+warm = []
+for _ in range({warm_calls}):
+    call_started = time.perf_counter()
+    chatbot_handler.lambda_handler(event(), None)
+    warm.append(time.perf_counter() - call_started)
+
+# 이전 구현은 호출마다 NLU(클라이언트 + 시스템 프롬프트)를 새로 생성
+from src.chatbot_nlu_bedrock import BedrockChatbotNLU
+construct_started = time.perf_counter()
+BedrockChatbotNLU()
+construct = time.perf_counter() - construct_started
+
+print(json.dumps({{
+    'import_ms': (imported - started) * 1000,
+    'nlu_init_ms': (nlu_ready - imported) * 1000,
+    'first_call_ms': (first - nlu_ready) * 1000,
+    'cold_total_ms': (first - started) * 1000,
+    'warm_call_ms': sorted(warm)[len(warm) // 2] * 1000,
+    'per_call_nlu_construct_ms': construct * 1000
+}}))
+'''
+
+
+def _run_child(args) -> dict:
+    script = CHILD_SCRIPT.format(
+        project_root=str(PROJECT_ROOT),
+        lambda_dir=str(LAMBDA_DIR),
+        bedrock_latency=args.bedrock_latency_ms / 1000,
+        warm_calls=args.warm_calls
+    )
+    command = [sys.executable]
+    if args.importtime:
+        command += ['-X', 'importtime']
+    command += ['-c', script]
+
+    completed = subprocess.run(command, cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+    if args.importtime:
+        _print_slowest_imports(completed.stderr)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def _print_slowest_imports(stderr: str, limit: int = 15):
+    """-X importtime 출력 중 누적 시간이 큰 모듈"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = [part.strip() for part in line[len('import time:'):].split('|')]
+        rows.append((int(cumulative), name))
+    print('누적 임포트 시간 상위 모듈 (us):')
+    for cumulative, name in sorted(rows, reverse=True)[:limit]:
+        print(f"  {cumulative:>10}  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Connect Lambda 콜드 스타트 측정')
+    parser.add_argument('--runs', type=int, default=5, help='새 인터프리터 실행 횟수')
+    parser.add_argument('--warm-calls', type=int, default=20, help='실행당 웜 호출 수')
+    parser.add_argument('--bedrock-latency-ms', type=float, default=300.0, help='Bedrock 대역 응답 지연(ms)')
+    parser.add_argument('--importtime', action='store_true', help='첫 실행의 느린 임포트 모듈 출력')
+    args = parser.parse_args()
+
+    results = []
+    for _ in range(args.runs):
+        results.append(_run_child(args))
+        args.importtime = False
+
+    print(f"실행 {args.runs}회 중앙값 (Bedrock 대역 지연 {args.bedrock_latency_ms}ms, Connect 제한 8000ms)")
+    for key in results[0]:
+        print(f"  {key:<28}{statistics.median(result[key] for result in results):>10.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+고객 검색 지연 벤치마크 (LIKE 전체 스캔 vs 트라이그램 색인)
+
+고객 N명을 SQLite에 넣고 이름/전화번호 뒷자리/오타가 섞인 검색어로
+기존 LIKE '%...%' 검색과 CustomerSearchService(프로세스 내 트라이그램 색인) 지연 백분위수를 비교합니다.
+PostgreSQL(pg_trgm)은 --database-url로 지정합니다.
+
+사용법:
+    python tests/performance/bench_customer_search.py --customers 200000 --queries 300
+    python tests/performance/bench_customer_search.py --database-url postgresql://user:pw@localhost/agent_desktop_db
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT / '산출물' / '3.3_상담원_UI_개발' / '소스코드' / 'backend'))
+
+SURNAMES = '김이박최정강조윤장임한오서신권황안송류홍'
+SYLLABLES = '민서준지현우예하도윤수아연은주영진성혜경태희동철순길'
+
+
+def make_rows(count: int, seed: int = 42):
+    rng = random.Random(seed)
+    for i in range(count):
+        name = rng.choice(SURNAMES) + ''.join(rng.choice(SYLLABLES) for _ in range(2))
+        phone = f"010-{rng.randint(0, 9999):04d}-{rng.randint(0, 9999):04d}"
+        yield {'id': f"cust_{i}", 'name': name, 'phone': phone, 'email': f"user{i}@example.com"}
+
+
+def make_queries(rows: List[dict], count: int, seed: int = 7) -> List[str]:
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        row = rng.choice(rows)
+        kind = rng.random()
+        if kind < 0.4:
+            queries.append(row['name'])
+        elif kind < 0.7:
+            queries.append(row['phone'][-4:])
+        elif kind < 0.85:
+            queries.append(row['name'][:2] + rng.choice(SYLLABLES))  # 오타
+        else:
+            queries.append(row['phone'])
+    return queries
+
+
+def summarize(name: str, latencies: List[float]):
+    ordered = sorted(latencies)
+
+    def pct(q):
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q))] * 1000
+
+    print(f"{name:<9} queries={len(ordered):5d} p50={pct(0.5):8.2f}ms p95={pct(0.95):8.2f}ms "
+          f"p99={pct(0.99):8.2f}ms max={ordered[-1] * 1000:8.2f}ms")
+
+
+async def run(args, queries: List[str]):
+    from sqlalchemy import or_, select
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+    from customer_search import CustomerSearchService
+    from database import create_async_db_engine
+    from models import Customer
+
+    engine = create_async_db_engine(args.database_url, workers=1)
+    async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+        latencies = []
+        for query in queries:
+            start = time.perf_counter()
+            pattern = f"%{query}%"
+            await db.execute(select(Customer).where(or_(
+                Customer.name.like(pattern), Customer.phone.like(pattern), Customer.email.like(pattern)
+            )).limit(args.limit))
+            latencies.append(time.perf_counter() - start)
+        summarize('like', latencies)
+
+        service = CustomerSearchService()
+        start = time.perf_counter()
+        await service.search(db, queries[0], args.limit)
+        print(f"index warm-up (first search) {time.perf_counter() - start:.2f}s")
+
+        latencies = []
+        for query in queries:
+            start = time.perf_counter()
+            await service.search(db, query, args.limit)
+            latencies.append(time.perf_counter() - start)
+        summarize('trigram', latencies)
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-url', default=None, help='기본값: 임시 SQLite 파일')
+    parser.add_argument('--customers', type=int, default=200000)
+    parser.add_argument('--queries', type=int, default=300)
+    parser.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.database_url is None:
+            args.database_url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        os.environ.setdefault('DATABASE_URL', args.database_url)
+
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import Session
+        from customer_search import normalize_email, normalize_name, normalize_phone
+        from models import Base, Customer
+
+        rows = list(make_rows(args.customers))
+        for row in rows:
+            row.update(search_name=normalize_name(row['name']), search_phone=normalize_phone(row['phone']),
+                       search_email=normalize_email(row['email']))
+        engine = create_engine(args.database_url)
+        Base.metadata.create_all(engine)
+        with Session(engine) as db:
+            db.execute(Customer.__table__.insert(), rows)
+            db.commit()
+        engine.dispose()
+
+        asyncio.run(run(args, make_queries(rows, args.queries)))
+
+
+if __name__ == '__main__':
+    main()
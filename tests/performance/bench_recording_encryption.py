@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+녹취 파일 암호화 메모리/처리량 벤치마크 (Fernet 전체 암호화 vs 청크 스트리밍 암호화)
+
+임시 파일을 만들어 파일 전체를 읽어 Fernet으로 암호화하는 기존 방식과
+ChunkedCipher 스트리밍 방식의 최대 메모리 사용량(tracemalloc)과 처리 시간을 비교하고,
+파일 중간 구간 복호화(탐색) 지연을 측정합니다.
+
+사용법:
+    python tests/performance/bench_recording_encryption.py --size-mb 256
+    python tests/performance/bench_recording_encryption.py --size-mb 64 --chunk-kb 256
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT / '산출물' / '3.4_공통_통합_기능_개발' / '소스코드' / 'recording'))
+
+
+def measure(name: str, func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<18} time={elapsed:7.2f}s peak_memory={peak / 1024 / 1024:9.2f}MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size-mb', type=int, default=256)
+    parser.add_argument('--chunk-kb', type=int, default=64)
+    args = parser.parse_args()
+
+    from cryptography.fernet import Fernet
+    from chunked_encryption import ChunkedCipher
+
+    key = Fernet.generate_key()
+    fernet = Fernet(key)
+    cipher = ChunkedCipher(key, args.chunk_kb * 1024)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, 'recording.wav')
+        with open(source, 'wb') as f:
+            for _ in range(args.size_mb):
+                f.write(os.urandom(1024 * 1024))
+
+        def fernet_encrypt():
+            with open(source, 'rb') as f_in:
+                data = f_in.read()
+            with open(source + '.fernet', 'wb') as f_out:
+                f_out.write(fernet.encrypt(data))
+
+        def fernet_decrypt():
+            with open(source + '.fernet', 'rb') as f_in:
+                data = fernet.decrypt(f_in.read())
+            with open(source + '.out', 'wb') as f_out:
+                f_out.write(data)
+
+        measure('fernet encrypt', fernet_encrypt)
+        measure('fernet decrypt', fernet_decrypt)
+        os.remove(source + '.fernet')
+
+        encrypted = source + '.enc'
+        measure('chunked encrypt', lambda: cipher.encrypt_file(source, encrypted))
+        measure('chunked decrypt', lambda: cipher.decrypt_file(encrypted, source + '.out'))
+
+        middle = args.size_mb * 1024 * 1024 // 2
+        measure('chunked seek 1MB', lambda: b''.join(cipher.read_file_range(encrypted, middle, middle + 1024 * 1024)))
+
+
+if __name__ == '__main__':
+    main()
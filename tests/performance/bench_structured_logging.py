@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+구조화 로깅 호출 오버헤드 벤치마크
+
+기존 JSONFormatter/log_function_call 구현과 현재 구현의 호출 1회당 비용을
+INFO/DEBUG 레벨에서 비교합니다. 핸들러는 메모리 스트림에 기록합니다.
+
+사용법:
+    python tests/performance/bench_structured_logging.py --iterations 50000
+"""
+import argparse
+import io
+import json
+import logging
+import sys
+import time
+import traceback
+from datetime import datetime, timezone
+from functools import wraps
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.utils.logger import JSONFormatter, log_function_call  # noqa: E402
+
+
+class LegacyJSONFormatter(logging.Formatter):
+    """기존 구현: 레코드마다 dict 구성 + json.dumps, extra 판별은 리스트 탐색"""
+
+    def format(self, record):
+        log_entry = {
+            'timestamp': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'module': record.module,
+            'function': record.funcName,
+            'line': record.lineno
+        }
+        if hasattr(record, 'thread') and record.thread:
+            log_entry['thread_id'] = record.thread
+            log_entry['thread_name'] = record.threadName
+        if hasattr(record, 'process') and record.process:
+            log_entry['process_id'] = record.process
+        if record.exc_info:
+            log_entry['exception'] = {'traceback': traceback.format_exception(*record.exc_info)}
+        extra_fields = {}
+        for key, value in record.__dict__.items():
+            if key not in ['name', 'msg', 'args', 'levelname', 'levelno', 'pathname',
+                           'filename', 'module', 'exc_info', 'exc_text', 'stack_info',
+                           'lineno', 'funcName', 'created', 'msecs', 'relativeCreated',
+                           'thread', 'threadName', 'processName', 'process', 'getMessage']:
+                extra_fields[key] = value
+        if extra_fields:
+            log_entry['extra'] = extra_fields
+        return json.dumps(log_entry, ensure_ascii=False, default=str)
+
+
+def legacy_log_function_call(logger):
+    """기존 구현: 레벨과 무관하게 메시지/extra 구성, datetime.now() 2회"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            logger.debug(f"함수 호출 시작: {func.__name__}",
+                         extra={'function_name': func.__name__, 'args_count': len(args),
+                                'kwargs_keys': list(kwargs.keys())})
+            start_time = datetime.now()
+            result = func(*args, **kwargs)
+            execution_time = (datetime.now() - start_time).total_seconds()
+            logger.debug(f"함수 호출 완료: {func.__name__}",
+                         extra={'function_name': func.__name__, 'execution_time': execution_time})
+            return result
+        return wrapper
+    return decorator
+
+
+def make_logger(name: str, formatter: logging.Formatter, handlers: int) -> logging.Logger:
+    logger = logging.getLogger(f"bench.{name}")
+    logger.propagate = False
+    logger.handlers.clear()
+    for _ in range(handlers):
+        handler = logging.StreamHandler(io.StringIO())
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+    return logger
+
+
+def measure(func, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=50000)
+    parser.add_argument('--handlers', type=int, default=3, help='JSON 포매터를 쓰는 핸들러 수 (콘솔/파일/CloudWatch)')
+    args = parser.parse_args()
+
+    for label, formatter in (('legacy', LegacyJSONFormatter()), ('current', JSONFormatter())):
+        for level in (logging.INFO, logging.DEBUG):
+            logger = make_logger(f"{label}.{level}", formatter, args.handlers)
+            logger.setLevel(level)
+
+            info_us = measure(
+                lambda: logger.info("챗봇 응답 완료", extra={'session_id': 'session_1', 'intent': 'faq'}),
+                args.iterations
+            )
+            decorate = legacy_log_function_call(logger) if label == 'legacy' else log_function_call(logger)
+            traced = decorate(lambda a, b=0: a + b)
+            traced_us = measure(lambda: traced(1, b=2), args.iterations)
+
+            print(
+                f"{label:<8} level={logging.getLevelName(level):<5} "
+                f"logger.info={info_us:7.2f}us log_function_call={traced_us:7.2f}us"
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+"""
+상담원 데스크탑 비동기 DB 세션/CRUD 테스트 (aiosqlite 메모리 DB)
+"""
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT / '산출물' / '3.3_상담원_UI_개발' / '소스코드' / 'backend'))
+
+# 테스트는 항상 SQLite 사용 (모듈 import 시 엔진이 생성됨)
+os.environ['DATABASE_URL'] = 'sqlite:///:memory:'
+
+from sqlalchemy import select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker  # noqa: E402
+
+import crud  # noqa: E402
+import database  # noqa: E402
+from customer_search import customer_search  # noqa: E402
+from models import (  # noqa: E402
+    Agent, Base, Call, CallDirection, ChatSession, ChatSessionStatus, Customer, Message, MessageSender
+)
+
+
+def _run(scenario):
+    """메모리 DB에 테이블과 기본 데이터를 만든 뒤 scenario(db) 실행"""
+    async def runner():
+        customer_search.reset()
+        engine = database.create_async_db_engine('sqlite:///:memory:')
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        try:
+            async with session_factory() as db:
+                db.add_all([
+                    Agent(id='agent_1', username='kim', email='kim@example.com', password_hash='x',
+                          first_name='민수', last_name='김', department='카드', hire_date=datetime(2020, 1, 1)),
+                    Customer(id='cust_1', name='홍길동', phone='010-1234-5678', email='hong@example.com'),
+                    Customer(id='cust_2', name='김철수', phone='010-9999-0000'),
+                ])
+                await db.commit()
+                return await scenario(db)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(runner())
+
+
+class TestAsyncEngineConfig:
+    """비동기 엔진 설정 테스트"""
+
+    def test_sync_urls_mapped_to_async_drivers(self):
+        assert database.to_async_url('postgresql://u:p@db:5432/app') == 'postgresql+asyncpg://u:p@db:5432/app'
+        assert database.to_async_url('sqlite:///:memory:') == 'sqlite+aiosqlite:///:memory:'
+        assert database.to_async_url('postgresql+asyncpg://u:p@db/app') == 'postgresql+asyncpg://u:p@db/app'
+
+    def test_pool_size_split_across_workers(self):
+        assert database.get_pool_settings(workers=1, max_connections=100) == {'pool_size': 50, 'max_overflow': 50}
+        assert database.get_pool_settings(workers=4, max_connections=100) == {'pool_size': 12, 'max_overflow': 13}
+        assert database.get_pool_settings(workers=200, max_connections=100) == {'pool_size': 1, 'max_overflow': 1}
+
+    def test_get_async_db_yields_async_session(self):
+        async def scenario():
+            sessions = database.get_async_db()
+            db = await sessions.__anext__()
+            value = (await db.execute(select(1))).scalar()
+            await sessions.aclose()
+            return db, value
+
+        db, value = asyncio.run(scenario())
+
+        assert isinstance(db, AsyncSession)
+        assert value == 1
+
+
+class TestAsyncCrud:
+    """비동기 CRUD 함수 테스트"""
+
+    def test_chat_session_with_messages(self):
+        async def scenario(db):
+            db.add_all([
+                ChatSession(id='s1', customer_id='cust_1', agent_id='agent_1', department='카드', source='web',
+                            status=ChatSessionStatus.active),
+                ChatSession(id='s2', customer_id='cust_2', agent_id='agent_1', department='카드', source='web',
+                            status=ChatSessionStatus.ended),
+            ])
+            await db.commit()
+
+            await crud.create_message(db, 's1', 'agent_1', {'content': '안녕하세요'})
+            active = await crud.get_active_chat_sessions(db, 'agent_1')
+            session = await crud.get_chat_session(db, 's1')
+            messages = await crud.get_session_messages(db, 's1')
+            ended = await crud.update_chat_session_status(db, 's1', 'ended')
+            return active, session, messages, ended
+
+        active, session, messages, ended = _run(scenario)
+
+        assert [s.id for s in active.items] == ['s1']
+        assert active.next_cursor is None
+        assert session.id == 's1'
+        assert [(m.sender, m.content) for m in messages.items] == [(MessageSender.agent, '안녕하세요')]
+        assert ended.status == ChatSessionStatus.ended
+        assert ended.end_time is not None
+
+    def test_customer_search_and_update(self):
+        async def scenario(db):
+            by_phone = await crud.search_customers(db, '1234', limit=10)
+            updated = await crud.update_customer(db, 'cust_2', {'email': 'kim@example.com'})
+            by_email = await crud.search_customers(db, 'kim@', limit=10)
+            missing = await crud.update_customer(db, 'unknown', {'email': 'x'})
+            return by_phone, updated, by_email, missing
+
+        by_phone, updated, by_email, missing = _run(scenario)
+
+        assert [c.id for c in by_phone] == ['cust_1']
+        assert updated.email == 'kim@example.com'
+        assert [c.id for c in by_email] == ['cust_2']
+        assert missing is None
+
+    def test_calls_filtered_by_day(self):
+        async def scenario(db):
+            today = datetime.now()
+            db.add(Call(id='old', customer_id='cust_1', agent_id='agent_1', direction=CallDirection.inbound,
+                        created_at=today - timedelta(days=2)))
+            await db.commit()
+            await crud.create_call(db, 'agent_1', {'customer_id': 'cust_1', 'direction': CallDirection.outbound})
+            await crud.update_agent_status(db, 'agent_1', 'busy')
+
+            todays = await crud.get_agent_calls_by_date(db, 'agent_1', today.date())
+            history = await crud.get_agent_call_history(db, 'agent_1', limit=10)
+            agent = await crud.get_agent(db, 'agent_1')
+            return todays, history, agent
+
+        todays, history, agent = _run(scenario)
+
+        assert [c.direction for c in todays] == [CallDirection.outbound]
+        assert len(history) == 2
+        assert agent.status.value == 'busy'
+
+    def test_queries_do_not_block_event_loop(self):
+        async def scenario(db):
+            db.add_all([Message(chat_session_id='s', sender=MessageSender.customer, content=str(i))
+                        for i in range(200)])
+            await db.commit()
+
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0)
+
+            task = asyncio.create_task(ticker())
+            for _ in range(20):
+                await crud.get_customer_interactions(db, 'cust_1')
+            task.cancel()
+            return ticks
+
+        ticks = _run(scenario)
+
+        # aiosqlite는 전용 스레드에서 쿼리하므로 쿼리 대기 중에도 다른 태스크가 실행됨
+        assert ticks > 20
@@ -0,0 +1,186 @@
+"""
+상담원 데스크탑 고객 검색 테스트 (정규화, 트라이그램 색인, 순위, 증분 색인)
+"""
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT / '산출물' / '3.3_상담원_UI_개발' / '소스코드' / 'backend'))
+
+# 테스트는 항상 SQLite 사용 (모듈 import 시 엔진이 생성됨)
+os.environ['DATABASE_URL'] = 'sqlite:///:memory:'
+
+from sqlalchemy.dialects import postgresql  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker  # noqa: E402
+
+import crud  # noqa: E402
+import database  # noqa: E402
+from customer_search import (  # noqa: E402
+    CustomerSearchService, TrigramIndex, normalize_email, normalize_name, normalize_phone, normalize_query,
+    similarity, trigrams
+)
+from models import Base, Customer  # noqa: E402
+
+CUSTOMERS = [
+    Customer(id='c1', name='홍길동', phone='010-1234-5678', email='gildong.hong@example.com'),
+    Customer(id='c2', name='홍길순', phone='+82 10-2222-5678', email='gilsoon@example.com'),
+    Customer(id='c3', name='김철수', phone='010-9999-0000', email='chulsoo_kim@example.com'),
+    Customer(id='c4', name='John Smith', phone='02-555-1234', email='john.smith@example.com'),
+]
+
+
+def _run(scenario, service=None):
+    """고객 데이터를 넣은 메모리 DB에서 scenario(db, service) 실행"""
+    async def runner():
+        engine = database.create_async_db_engine('sqlite:///:memory:')
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+                db.add_all([Customer(id=c.id, name=c.name, phone=c.phone, email=c.email) for c in CUSTOMERS])
+                await db.commit()
+                return await scenario(db, service or CustomerSearchService())
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(runner())
+
+
+class TestNormalization:
+    """정규화 테스트"""
+
+    def test_fields_normalized(self):
+        assert normalize_name(' 홍 길동 ') == '홍길동'
+        assert normalize_name('ＪＯＨＮ  Smith') == 'johnsmith'
+        assert normalize_phone('+82 10-1234-5678') == '01012345678'
+        assert normalize_phone('010.1234.5678') == '01012345678'
+        assert normalize_email(' John.Smith@Example.COM ') == 'john.smith@example.com'
+
+    def test_query_routed_to_fields(self):
+        assert normalize_query('홍길동') == {'name': '홍길동'}
+        assert normalize_query('5678') == {'phone': '5678'}
+        assert normalize_query('010-1234') == {'phone': '0101234'}
+        assert normalize_query('john@ex') == {'name': 'johnex', 'email': 'john@ex'}
+        assert normalize_query('홍길동 5678') == {'name': '홍길동', 'phone': '5678'}
+        assert normalize_query('--') == {}
+
+    def test_trigrams_match_pg_trgm_padding(self):
+        assert trigrams('ab') == {'  a', ' ab', 'ab '}
+        assert similarity('홍길동', '홍길동') == 1.0
+        assert round(similarity('홍길동', '홍길돈'), 2) == 0.33
+
+
+class TestTrigramIndex:
+    """프로세스 내 색인 테스트"""
+
+    def test_update_replaces_only_changed_grams(self):
+        index = TrigramIndex()
+        index.add('c1', {'name': '홍길동', 'phone': '01012345678'})
+        index.add('c1', {'name': '홍길순', 'phone': '01012345678'})
+
+        assert index.search({'name': '홍길순'}, 10) == [('c1', 3.0)]
+        assert index.search({'name': '길동'}, 10) == []
+        assert [cid for cid, _ in index.search({'phone': '5678'}, 10)] == ['c1']
+
+        index.remove('c1')
+        assert len(index) == 0
+        assert index.search({'phone': '5678'}, 10) == []
+        assert all(not postings for postings in index._postings.values())
+
+
+class TestCustomerSearch:
+    """고객 검색 테스트"""
+
+    def test_exact_name_ranked_before_similar(self):
+        async def scenario(db, service):
+            return [c.id for c in await service.search(db, '홍길동', 10)]
+
+        assert _run(scenario) == ['c1', 'c2']
+
+    def test_name_and_phone_matches_add_up(self):
+        async def scenario(db, service):
+            return [c.id for c in await service.search(db, '홍길 1234', 10)]
+
+        assert _run(scenario) == ['c1', 'c2', 'c4']
+
+    def test_typo_tolerant_name_search(self):
+        async def scenario(db, service):
+            return [c.id for c in await service.search(db, '홍길돈', 10)]
+
+        assert _run(scenario)[0] == 'c1'
+
+    def test_phone_suffix_and_formatting(self):
+        async def scenario(db, service):
+            suffix = [c.id for c in await service.search(db, '5678', 10)]
+            formatted = [c.id for c in await service.search(db, '+82 10 2222', 10)]
+            return suffix, formatted
+
+        suffix, formatted = _run(scenario)
+
+        assert sorted(suffix) == ['c1', 'c2']
+        assert formatted == ['c2']
+
+    def test_email_and_latin_name(self):
+        async def scenario(db, service):
+            email = [c.id for c in await service.search(db, 'chulsoo_kim@', 10)]
+            name = [c.id for c in await service.search(db, 'john smith', 10)]
+            return email, name
+
+        email, name = _run(scenario)
+
+        assert email == ['c3']
+        assert name == ['c4']
+
+    def test_update_customer_reindexed_incrementally(self):
+        async def scenario(db, service):
+            crud.customer_search, original = service, crud.customer_search
+            try:
+                before = [c.id for c in await crud.search_customers(db, '김영희', 10)]
+                customer = await crud.update_customer(db, 'c3', {'name': '김영희', 'phone': '010-7777-1111'})
+                after = [c.id for c in await crud.search_customers(db, '김영희', 10)]
+                by_phone = [c.id for c in await crud.search_customers(db, '7777', 10)]
+                return before, after, by_phone, customer.search_name, len(service.index)
+            finally:
+                crud.customer_search = original
+
+        before, after, by_phone, search_name, indexed = _run(scenario)
+
+        assert before == []
+        assert after == ['c3']
+        assert by_phone == ['c3']
+        assert search_name == '김영희'
+        assert indexed == len(CUSTOMERS)
+
+    def test_search_columns_populated_on_insert(self):
+        async def scenario(db, service):
+            customer = await db.get(Customer, 'c2')
+            return customer.search_name, customer.search_phone, customer.search_email
+
+        assert _run(scenario) == ('홍길순', '01022225678', 'gilsoon@example.com')
+
+
+class TestPostgresQuery:
+    """PostgreSQL 검색 쿼리 테스트"""
+
+    def test_query_uses_trigram_operators(self):
+        class Recorder:
+            statements = []
+
+            def get_bind(self):
+                return type('Bind', (), {'dialect': postgresql.dialect()})()
+
+            async def execute(self, statement):
+                self.statements.append(str(statement.compile(dialect=postgresql.dialect())))
+                return type('Result', (), {'scalars': lambda self: []})()
+
+        db = Recorder()
+        asyncio.run(CustomerSearchService().search(db, '홍길동 5678', 10))
+
+        set_limit, query = db.statements
+        assert 'set_limit' in set_limit
+        assert 'customers.search_name %% ' in query
+        assert 'similarity(customers.search_name' in query
+        assert 'similarity(customers.search_phone' in query
+        assert 'LIKE' in query
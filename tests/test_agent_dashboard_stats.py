@@ -0,0 +1,194 @@
+"""
+상담원 대시보드 통계 서비스 테스트 (집계 쿼리 1회, 캐시, 무효화)
+"""
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT / '산출물' / '3.3_상담원_UI_개발' / '소스코드' / 'backend'))
+
+# 테스트는 항상 SQLite 사용 (모듈 import 시 엔진이 생성됨)
+os.environ['DATABASE_URL'] = 'sqlite:///:memory:'
+
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker  # noqa: E402
+
+import database  # noqa: E402
+from models import (  # noqa: E402
+    Agent, Base, Call, CallDirection, ChatSession, ChatSessionStatus, Customer, Message, MessageSender
+)
+from stats_service import DashboardStatsService  # noqa: E402
+
+TODAY = datetime.now().replace(hour=10, minute=0, second=0, microsecond=0)
+YESTERDAY = TODAY - timedelta(days=1)
+
+
+def _seed():
+    call = dict(customer_id='cust', agent_id='agent_1', direction=CallDirection.inbound)
+    chat = dict(customer_id='cust', agent_id='agent_1', department='카드', source='web')
+    return [
+        Agent(id='agent_1', username='kim', email='kim@example.com', password_hash='x',
+              first_name='민수', last_name='김', department='카드', hire_date=datetime(2020, 1, 1)),
+        Customer(id='cust', name='홍길동', phone='010-1234-5678'),
+        Call(id='c1', duration=60, created_at=TODAY, **call),
+        Call(id='c2', duration=None, created_at=TODAY, **call),
+        Call(id='c_old', duration=600, created_at=YESTERDAY, **call),
+        ChatSession(id='s1', status=ChatSessionStatus.active, created_at=TODAY, **chat),
+        ChatSession(id='s2', status=ChatSessionStatus.ended, created_at=TODAY, **chat),
+        ChatSession(id='s3', status=ChatSessionStatus.active, created_at=TODAY, **chat),
+        ChatSession(id='s_old', status=ChatSessionStatus.waiting, created_at=YESTERDAY, **chat),
+        # s1: 30초, s2: 90초 만에 첫 응답, s3: 상담원이 먼저 보낸 세션 (제외)
+        Message(chat_session_id='s1', sender=MessageSender.customer, content='q', created_at=TODAY),
+        Message(chat_session_id='s1', sender=MessageSender.agent, content='a',
+                created_at=TODAY + timedelta(seconds=30)),
+        Message(chat_session_id='s1', sender=MessageSender.agent, content='a',
+                created_at=TODAY + timedelta(seconds=300)),
+        Message(chat_session_id='s2', sender=MessageSender.customer, content='q', created_at=TODAY),
+        Message(chat_session_id='s2', sender=MessageSender.agent, content='a',
+                created_at=TODAY + timedelta(seconds=90)),
+        Message(chat_session_id='s3', sender=MessageSender.agent, content='안내', created_at=TODAY),
+    ]
+
+
+def _run(scenario):
+    """기본 데이터를 넣은 메모리 DB에서 scenario(db, statements) 실행"""
+    async def runner():
+        engine = database.create_async_db_engine('sqlite:///:memory:')
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        statements = []
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+                db.add_all(_seed())
+                await db.commit()
+                event.listen(engine.sync_engine, 'before_cursor_execute',
+                             lambda conn, cursor, sql, *args: statements.append(sql))
+                return await scenario(db, statements)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(runner())
+
+
+class TestDashboardStats:
+    """통계 집계 테스트"""
+
+    def test_stats_computed_in_single_query(self):
+        async def scenario(db, statements):
+            stats = await DashboardStatsService().get_agent_stats(db, 'agent_1', TODAY.date())
+            return stats, len(statements)
+
+        stats, query_count = _run(scenario)
+
+        assert query_count == 1
+        assert stats == {
+            'today_calls': 2,
+            'today_chats': 3,
+            'active_sessions': 3,
+            'total_talk_time': 60,
+            'average_response_time': 60.0,
+        }
+
+    def test_agent_without_activity(self):
+        async def scenario(db, statements):
+            return await DashboardStatsService().get_agent_stats(db, 'nobody', TODAY.date())
+
+        stats = _run(scenario)
+
+        assert stats == {
+            'today_calls': 0, 'today_chats': 0, 'active_sessions': 0,
+            'total_talk_time': 0, 'average_response_time': 0,
+        }
+
+
+class TestDashboardStatsCache:
+    """통계 캐시 테스트"""
+
+    def test_cached_until_ttl_or_invalidation(self):
+        now = [0.0]
+
+        async def scenario(db, statements):
+            service = DashboardStatsService(ttl=5, clock=lambda: now[0])
+            day = TODAY.date()
+            await service.get_agent_stats(db, 'agent_1', day)
+            now[0] = 4
+            cached = await service.get_agent_stats(db, 'agent_1', day)
+            after_cache = len(statements)
+
+            db.add(Call(id='c3', customer_id='cust', agent_id='agent_1', direction=CallDirection.outbound,
+                        duration=40, created_at=TODAY))
+            await db.commit()
+            service.invalidate('agent_1')
+            fresh = await service.get_agent_stats(db, 'agent_1', day)
+            now[0] = 20
+            await service.get_agent_stats(db, 'agent_1', day)
+            return cached, after_cache, fresh, service.stats
+
+        cached, after_cache, fresh, counters = _run(scenario)
+
+        assert cached['today_calls'] == 2
+        assert after_cache == 1
+        assert (fresh['today_calls'], fresh['total_talk_time']) == (3, 100)
+        assert counters == {'hits': 1, 'misses': 3, 'invalidations': 1}
+
+    def test_concurrent_requests_share_one_query(self):
+        async def scenario(db, statements):
+            service = DashboardStatsService()
+            results = await asyncio.gather(*[
+                service.get_agent_stats(db, 'agent_1', TODAY.date()) for _ in range(10)
+            ])
+            return results, len(statements)
+
+        results, query_count = _run(scenario)
+
+        assert query_count == 1
+        assert all(result == results[0] for result in results)
+
+    def test_invalidation_during_query_not_cached(self):
+        async def scenario(db, statements):
+            service = DashboardStatsService()
+            original = service._query
+
+            async def slow_query(*args):
+                result = await original(*args)
+                service.invalidate('agent_1')
+                return result
+
+            service._query = slow_query
+            await service.get_agent_stats(db, 'agent_1', TODAY.date())
+            return service._cache
+
+        assert _run(scenario) == {}
+
+    def test_cancelled_leader_does_not_strand_waiters(self):
+        async def scenario(db, statements):
+            service = DashboardStatsService()
+            original = service._query
+            started = asyncio.Event()
+            calls = []
+
+            async def query(*args):
+                calls.append(args)
+                if len(calls) == 1:
+                    started.set()
+                    await asyncio.sleep(10)
+                return await original(*args)
+
+            service._query = query
+            leader = asyncio.create_task(service.get_agent_stats(db, 'agent_1', TODAY.date()))
+            await started.wait()
+            waiter = asyncio.create_task(service.get_agent_stats(db, 'agent_1', TODAY.date()))
+            await asyncio.sleep(0)
+            leader.cancel()
+            result = await asyncio.wait_for(waiter, timeout=2)
+            return leader.cancelled(), result, len(calls), service._inflight
+
+        leader_cancelled, result, query_calls, inflight = _run(scenario)
+
+        assert leader_cancelled
+        assert result['today_calls'] == 2
+        assert query_calls == 2
+        assert inflight == {}
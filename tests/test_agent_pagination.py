@@ -0,0 +1,178 @@
+"""
+상담원 데스크탑 키셋 페이지네이션 테스트 (커서, 동일 시각 항목, 메시지 페이지, 인덱스 사용)
+"""
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT / '산출물' / '3.3_상담원_UI_개발' / '소스코드' / 'backend'))
+
+# 테스트는 항상 SQLite 사용 (모듈 import 시 엔진이 생성됨)
+os.environ['DATABASE_URL'] = 'sqlite:///:memory:'
+
+from sqlalchemy import select, text  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker  # noqa: E402
+
+import crud  # noqa: E402
+import database  # noqa: E402
+from models import (  # noqa: E402
+    Agent, Base, ChatSession, Customer, CustomerInteraction, InteractionType, Message, MessageSender
+)
+from pagination import MAX_PAGE_SIZE, InvalidCursorError, decode_cursor, encode_cursor, paginate  # noqa: E402
+
+BASE_TIME = datetime(2024, 1, 1, 9, 0, 0)
+
+
+def _seed(interactions: int, messages: int):
+    rows = [
+        Agent(id='agent_1', username='kim', email='kim@example.com', password_hash='x',
+              first_name='민수', last_name='김', department='카드', hire_date=datetime(2020, 1, 1)),
+        Customer(id='cust_1', name='홍길동', phone='010-1234-5678'),
+        ChatSession(id='s1', customer_id='cust_1', agent_id='agent_1', department='카드', source='web'),
+    ]
+    # 3건씩 같은 시각 (id로 순서 결정)
+    rows += [
+        CustomerInteraction(id=f"i{i:04d}", customer_id='cust_1', agent_id='agent_1',
+                            interaction_type=InteractionType.call, subject='문의', description='-', category='카드',
+                            created_at=BASE_TIME + timedelta(minutes=i // 3))
+        for i in range(interactions)
+    ]
+    rows += [
+        Message(id=f"m{i:04d}", chat_session_id='s1', sender=MessageSender.customer, content=str(i),
+                created_at=BASE_TIME + timedelta(seconds=i))
+        for i in range(messages)
+    ]
+    return rows
+
+
+def _run(scenario, interactions: int = 0, messages: int = 0):
+    """테스트 데이터를 넣은 메모리 DB에서 scenario(db) 실행"""
+    async def runner():
+        engine = database.create_async_db_engine('sqlite:///:memory:')
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+                db.add_all(_seed(interactions, messages))
+                await db.commit()
+                return await scenario(db)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(runner())
+
+
+class TestCursor:
+    """커서 인코딩 테스트"""
+
+    def test_round_trip(self):
+        cursor = encode_cursor(datetime(2024, 1, 1, 9, 30, 0, 123456), 'id-1')
+
+        assert '=' not in cursor
+        assert decode_cursor(cursor) == (datetime(2024, 1, 1, 9, 30, 0, 123456), 'id-1')
+
+    @pytest.mark.parametrize('cursor', ['not-a-cursor', encode_cursor(BASE_TIME, 'x')[:-3], 'WzFd'])
+    def test_invalid_cursor_rejected(self, cursor):
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor)
+
+
+class TestKeysetPagination:
+    """키셋 페이지 조회 테스트"""
+
+    def test_pages_cover_all_rows_once_with_timestamp_ties(self):
+        async def scenario(db):
+            seen, cursor, pages = [], None, 0
+            while True:
+                page = await crud.get_customer_interactions(db, 'cust_1', limit=7, cursor=cursor)
+                seen.extend(item.id for item in page.items)
+                pages += 1
+                if page.next_cursor is None:
+                    return seen, pages
+                cursor = page.next_cursor
+
+        seen, pages = _run(scenario, interactions=50)
+
+        assert seen == [f"i{i:04d}" for i in reversed(range(50))]
+        assert pages == 8
+
+    def test_rows_added_between_pages_not_duplicated(self):
+        async def scenario(db):
+            first = await crud.get_agent_interactions(db, 'agent_1', limit=5)
+            db.add(CustomerInteraction(
+                id='new', customer_id='cust_1', agent_id='agent_1', interaction_type=InteractionType.chat,
+                subject='신규', description='-', category='카드', created_at=BASE_TIME + timedelta(days=1)
+            ))
+            await db.commit()
+            second = await crud.get_agent_interactions(db, 'agent_1', limit=5, cursor=first.next_cursor)
+            return first, second
+
+        first, second = _run(scenario, interactions=10)
+
+        assert [i.id for i in first.items] == [f"i{i:04d}" for i in range(9, 4, -1)]
+        assert [i.id for i in second.items] == [f"i{i:04d}" for i in range(4, -1, -1)]
+        assert second.next_cursor is None
+
+    def test_session_messages_paged_newest_first(self):
+        async def scenario(db):
+            latest = await crud.get_session_messages(db, 's1', limit=20)
+            older = await crud.get_session_messages(db, 's1', limit=20, cursor=latest.next_cursor)
+            oldest_first = await paginate(db, select(Message).where(Message.chat_session_id == 's1'),
+                                          Message, limit=3, newest_first=False)
+            return latest, older, oldest_first
+
+        latest, older, oldest_first = _run(scenario, messages=30)
+
+        assert [m.content for m in latest.items] == [str(i) for i in range(29, 9, -1)]
+        assert [m.content for m in older.items] == [str(i) for i in range(9, -1, -1)]
+        assert older.next_cursor is None
+        assert [m.content for m in oldest_first.items] == ['0', '1', '2']
+
+    def test_messages_created_through_crud_paged_once(self):
+        """서버 기본 시각으로 저장된 메시지도 커서 항목을 다시 읽지 않음"""
+        async def scenario(db):
+            for i in range(5):
+                await crud.create_message(db, 's1', 'agent_1', {'content': str(i)})
+            contents, cursor = [], None
+            for _ in range(10):
+                page = await crud.get_session_messages(db, 's1', limit=2, cursor=cursor)
+                contents += [m.content for m in page.items]
+                cursor = page.next_cursor
+                if cursor is None:
+                    break
+            return contents, cursor
+
+        contents, cursor = _run(scenario)
+
+        # 같은 초에 만들어진 메시지는 id 순서 (각 메시지는 한 번씩만)
+        assert cursor is None
+        assert sorted(contents) == ['0', '1', '2', '3', '4']
+
+    def test_page_size_capped(self):
+        async def scenario(db):
+            return await crud.get_customer_interactions(db, 'cust_1', limit=10000)
+
+        page = _run(scenario, interactions=MAX_PAGE_SIZE + 5)
+
+        assert len(page.items) == MAX_PAGE_SIZE
+        assert page.next_cursor is not None
+
+    def test_deep_page_uses_composite_index(self):
+        async def scenario(db):
+            created_at, item_id = BASE_TIME + timedelta(minutes=5), 'i0015'
+            plan = await db.execute(text(
+                "EXPLAIN QUERY PLAN SELECT * FROM customer_interactions "
+                "WHERE customer_id = :customer_id AND (created_at, id) < (:created_at, :id) "
+                "ORDER BY created_at DESC, id DESC LIMIT 8"
+            ), {'customer_id': 'cust_1', 'created_at': str(created_at), 'id': item_id})
+            return ' '.join(str(row) for row in plan)
+
+        plan = _run(scenario, interactions=20)
+
+        assert 'ix_customer_interactions_customer_created' in plan
+        assert 'TEMP B-TREE' not in plan
@@ -0,0 +1,479 @@
+"""
+상담원 UI WebSocket 연결 관리자 테스트
+메시지 1회 인코딩, 동시 전송, 느린 소비자 정리, 노드 간 전달, 이벤트 병합과 수신 제한 확인
+"""
+import asyncio
+import json
+import os
+import sys
+import uuid
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT / '산출물' / '3.3_상담원_UI_개발' / '소스코드' / 'backend'))
+
+import backplane
+import websocket_manager
+from backplane import InMemoryBackplane, InMemoryBroker, decode_envelope, encode_envelope
+from websocket_manager import ConnectionManager, TokenBucket
+
+
+class FakeWebSocket:
+    """전송 지연을 설정할 수 있는 WebSocket 대역"""
+
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.sent = []
+        self.closed_code = None
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        if self.fail:
+            raise RuntimeError('connection reset')
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.sent.append(json.loads(text))
+
+    async def close(self, code: int = 1000):
+        self.closed_code = code
+
+
+async def _connect(manager, agents):
+    sockets = {}
+    for agent_id, socket in agents.items():
+        await manager.connect(socket, agent_id)
+        sockets[agent_id] = socket
+    await manager.drain(timeout=1)
+    for socket in sockets.values():
+        socket.sent.clear()
+    return sockets
+
+
+class TestBroadcast:
+    """브로드캐스트 테스트"""
+
+    def test_payload_encoded_once_per_broadcast(self):
+        async def scenario():
+            manager = ConnectionManager()
+            sockets = await _connect(manager, {f"agent_{i}": FakeWebSocket() for i in range(5)})
+
+            with patch.object(websocket_manager.json, 'dumps', wraps=json.dumps) as dumps:
+                delivered = await manager.broadcast_to_all({'type': 'ping'})
+            await manager.drain(timeout=1)
+            # 백플레인 헤더 인코딩은 제외하고 메시지 본문 인코딩 횟수만 집계
+            payload_calls = [c for c in dumps.call_args_list if c.args[0] == {'type': 'ping'}]
+            return len(payload_calls), delivered, sockets
+
+        dumps_calls, delivered, sockets = asyncio.run(scenario())
+
+        assert dumps_calls == 1
+        assert delivered == 5
+        assert all(socket.sent == [{'type': 'ping'}] for socket in sockets.values())
+
+    def test_slow_agent_does_not_delay_others(self):
+        async def scenario():
+            manager = ConnectionManager(send_timeout=5)
+            sockets = await _connect(manager, {'fast': FakeWebSocket(), 'slow': FakeWebSocket()})
+            sockets['slow'].delay = 0.5
+
+            await manager.broadcast_to_all({'type': 'new_session'})
+            await asyncio.sleep(0.05)
+            fast_received = list(sockets['fast'].sent)
+            slow_received = list(sockets['slow'].sent)
+            await manager.drain(timeout=2)
+            return fast_received, slow_received, sockets
+
+        fast_received, slow_received, sockets = asyncio.run(scenario())
+
+        assert fast_received == [{'type': 'new_session'}]
+        assert slow_received == []
+        assert sockets['slow'].sent == [{'type': 'new_session'}]
+
+    def test_session_broadcast_preserves_order(self):
+        async def scenario():
+            manager = ConnectionManager()
+            sockets = await _connect(manager, {'a': FakeWebSocket(), 'b': FakeWebSocket(), 'c': FakeWebSocket()})
+            await manager.join_session('a', 'session_1')
+            await manager.join_session('b', 'session_1')
+            await manager.drain(timeout=1)
+            for socket in sockets.values():
+                socket.sent.clear()
+
+            for seq in range(10):
+                await manager.broadcast_to_session('session_1', {'type': 'message', 'seq': seq})
+            await manager.drain(timeout=1)
+            return sockets
+
+        sockets = asyncio.run(scenario())
+
+        assert [m['seq'] for m in sockets['a'].sent] == list(range(10))
+        assert [m['seq'] for m in sockets['b'].sent] == list(range(10))
+        assert sockets['c'].sent == []
+
+    def test_status_change_sent_once_per_agent(self):
+        async def scenario():
+            manager = ConnectionManager()
+            sockets = await _connect(manager, {'a': FakeWebSocket(), 'b': FakeWebSocket()})
+            for session_id in ('s1', 's2'):
+                await manager.join_session('a', session_id)
+                await manager.join_session('b', session_id)
+            await manager.drain(timeout=1)
+            sockets['b'].sent.clear()
+
+            await manager.notify_agent_status_change('a', 'away')
+            await manager.drain(timeout=1)
+            return sockets
+
+        sockets = asyncio.run(scenario())
+
+        assert [m['type'] for m in sockets['b'].sent] == ['agent_status_change']
+
+
+class TestSlowConsumerEviction:
+    """느린 소비자 정리 테스트"""
+
+    def test_send_timeout_evicts_connection(self):
+        async def scenario():
+            manager = ConnectionManager(send_timeout=0.05)
+            sockets = await _connect(manager, {'ok': FakeWebSocket(), 'stuck': FakeWebSocket()})
+            await manager.join_session('stuck', 'session_1')
+            await manager.drain(timeout=1)
+            sockets['stuck'].delay = 10
+
+            await manager.broadcast_to_all({'type': 'ping'})
+            await asyncio.sleep(0.2)
+            return manager, sockets
+
+        manager, sockets = asyncio.run(scenario())
+
+        assert list(manager.active_connections) == ['ok']
+        assert manager.get_session_participants('session_1') == []
+        assert sockets['stuck'].closed_code == websocket_manager.SLOW_CONSUMER_CLOSE_CODE
+        assert manager.get_connection_stats()['evicted_connections'] == 1
+
+    def test_full_queue_evicts_connection(self):
+        async def scenario():
+            manager = ConnectionManager(queue_size=3, send_timeout=5)
+            sockets = await _connect(manager, {'ok': FakeWebSocket(), 'slow': FakeWebSocket()})
+            sockets['slow'].delay = 1
+
+            delivered = []
+            for seq in range(6):
+                delivered.append(await manager.broadcast_to_all({'type': 'ping', 'seq': seq}))
+                await asyncio.sleep(0.01)
+            await manager.drain(timeout=1)
+            return manager, sockets, delivered
+
+        manager, sockets, delivered = asyncio.run(scenario())
+
+        assert delivered[:4] == [2, 2, 2, 2]
+        assert delivered[4:] == [1, 1]
+        assert 'slow' not in manager.active_connections
+        assert [m['seq'] for m in sockets['ok'].sent] == list(range(6))
+
+    def test_send_error_evicts_connection(self):
+        async def scenario():
+            manager = ConnectionManager()
+            await _connect(manager, {'broken': FakeWebSocket(fail=True)})
+            await asyncio.sleep(0.05)
+            return manager
+
+        manager = asyncio.run(scenario())
+
+        assert manager.active_connections == {}
+
+    def test_stale_disconnect_keeps_new_connection(self):
+        async def scenario():
+            manager = ConnectionManager()
+            old_socket, new_socket = FakeWebSocket(), FakeWebSocket()
+            await manager.connect(old_socket, 'agent')
+            await manager.connect(new_socket, 'agent')
+            manager.disconnect('agent', old_socket)
+            await manager.send_personal_message('agent', {'type': 'hello'})
+            await manager.drain(timeout=1)
+            return manager, new_socket
+
+        manager, new_socket = asyncio.run(scenario())
+
+        assert 'agent' in manager.active_connections
+        assert new_socket.sent[-1] == {'type': 'hello'}
+
+
+class TestEventCoalescing:
+    """타이핑/상태 이벤트 병합 및 수신 제한 테스트"""
+
+    def test_typing_bursts_coalesced_into_latest_state(self):
+        async def scenario():
+            manager = ConnectionManager(flush_interval=60)
+            sockets = await _connect(manager, {'a': FakeWebSocket(), 'b': FakeWebSocket()})
+            await manager.join_session('a', 's1')
+            await manager.join_session('b', 's1')
+            await manager.drain(timeout=1)
+            sockets['b'].sent.clear()
+
+            for is_typing in (True, False, True, True, True):
+                manager.update_typing('a', 's1', is_typing)
+            await manager.flush_events()
+            await manager.drain(timeout=1)
+            first = list(sockets['b'].sent)
+
+            # 주기 안에서 켰다가 끈 상태는 전송하지 않음
+            manager.update_typing('a', 's1', False)
+            manager.update_typing('a', 's1', True)
+            await manager.flush_events()
+            await manager.drain(timeout=1)
+            return first, sockets['b'].sent, manager.get_connection_stats()['suppressed_events']
+
+        first, all_sent, suppressed = asyncio.run(scenario())
+
+        assert [(m['type'], m['data']['is_typing']) for m in first] == [('typing_status', True)]
+        assert len(all_sent) == 1
+        assert suppressed['typing'] == 6
+
+    def test_presence_changes_flushed_on_interval(self):
+        async def scenario():
+            manager = ConnectionManager(flush_interval=0.02)
+            sockets = await _connect(manager, {'a': FakeWebSocket(), 'b': FakeWebSocket()})
+            await manager.join_session('a', 's1')
+            await manager.join_session('b', 's1')
+            await manager.drain(timeout=1)
+            sockets['b'].sent.clear()
+
+            manager.update_presence('a', 'busy')
+            manager.update_presence('a', 'away')
+            await asyncio.sleep(0.1)
+            manager.update_presence('a', 'away')
+            await asyncio.sleep(0.1)
+            await manager.drain(timeout=1)
+            await manager.stop()
+            return sockets['b'].sent, manager.suppressed_events
+
+        sent, suppressed = asyncio.run(scenario())
+
+        assert [m['data']['status'] for m in sent] == ['away']
+        assert suppressed['presence'] == 2
+
+    def test_inbound_frames_rate_limited_per_connection(self):
+        async def scenario():
+            manager = ConnectionManager(inbound_rate=1, inbound_burst=3)
+            await _connect(manager, {'a': FakeWebSocket(), 'b': FakeWebSocket()})
+            allowed_a = [manager.allow_inbound('a') for _ in range(5)]
+            allowed_b = manager.allow_inbound('b')
+            return allowed_a, allowed_b, manager.suppressed_events['rate_limited']
+
+        allowed_a, allowed_b, rate_limited = asyncio.run(scenario())
+
+        assert allowed_a == [True, True, True, False, False]
+        assert allowed_b is True
+        assert rate_limited == 2
+
+    def test_token_bucket_refills_over_time(self):
+        now = [0.0]
+        bucket = TokenBucket(rate=2, capacity=2, clock=lambda: now[0])
+
+        assert [bucket.allow() for _ in range(3)] == [True, True, False]
+        now[0] = 0.5
+        assert [bucket.allow() for _ in range(2)] == [True, False]
+        now[0] = 10
+        assert [bucket.allow() for _ in range(3)] == [True, True, False]
+
+
+def _node(broker, node_id, **kwargs):
+    return ConnectionManager(backplane=InMemoryBackplane(broker), node_id=node_id, **kwargs)
+
+
+class TestBackplaneRouting:
+    """여러 노드 간 메시지 전달 테스트 (공유 InMemoryBroker로 노드 흉내)"""
+
+    def test_envelope_round_trip_keeps_payload_bytes(self):
+        payload = json.dumps({'type': 'message', 'text': '안녕\n하세요'})
+        envelope = encode_envelope('session', ['s1', 's2'], 'node-a', payload)
+
+        assert decode_envelope(envelope) == ('session', ['s1', 's2'], 'node-a', payload)
+
+    def test_session_broadcast_reaches_participants_on_other_nodes(self):
+        async def scenario():
+            broker = InMemoryBroker()
+            node_a, node_b, node_c = _node(broker, 'a'), _node(broker, 'b'), _node(broker, 'c')
+            sockets = {'agent_a': FakeWebSocket(), 'agent_b': FakeWebSocket(), 'agent_c': FakeWebSocket()}
+            await _connect(node_a, {'agent_a': sockets['agent_a']})
+            await _connect(node_b, {'agent_b': sockets['agent_b']})
+            await _connect(node_c, {'agent_c': sockets['agent_c']})
+            await node_a.join_session('agent_a', 's1')
+            await node_b.join_session('agent_b', 's1')
+
+            with patch.object(node_c, '_on_backplane_message', wraps=node_c._on_backplane_message) as on_c:
+                broker.nodes['c'] = on_c
+                for node in (node_a, node_b, node_c):
+                    await node.drain(timeout=1)
+                for socket in sockets.values():
+                    socket.sent.clear()
+                await node_a.broadcast_to_session('s1', {'type': 'message', 'seq': 1})
+                for node in (node_a, node_b, node_c):
+                    await node.drain(timeout=1)
+            members = await node_c.get_all_session_participants('s1')
+            return sockets, on_c.call_count, members
+
+        sockets, node_c_calls, members = asyncio.run(scenario())
+
+        assert sockets['agent_a'].sent == [{'type': 'message', 'seq': 1}]
+        assert sockets['agent_b'].sent == [{'type': 'message', 'seq': 1}]
+        assert sockets['agent_c'].sent == []
+        assert node_c_calls == 0
+        assert sorted(members) == ['agent_a', 'agent_b']
+
+    def test_personal_message_and_broadcast_to_all_cross_nodes(self):
+        async def scenario():
+            broker = InMemoryBroker()
+            node_a, node_b = _node(broker, 'a'), _node(broker, 'b')
+            socket_a, socket_b = FakeWebSocket(), FakeWebSocket()
+            await _connect(node_a, {'agent_a': socket_a})
+            await _connect(node_b, {'agent_b': socket_b})
+
+            await node_a.send_personal_message('agent_b', {'type': 'hello'})
+            delivered = await node_b.broadcast_to_all({'type': 'new_session'})
+            await node_a.drain(timeout=1)
+            await node_b.drain(timeout=1)
+            return socket_a, socket_b, delivered
+
+        socket_a, socket_b, delivered = asyncio.run(scenario())
+
+        assert delivered == 1
+        assert socket_a.sent == [{'type': 'new_session'}]
+        assert socket_b.sent == [{'type': 'hello'}, {'type': 'new_session'}]
+
+    def test_disconnect_and_session_end_clean_up_index(self):
+        async def scenario():
+            broker = InMemoryBroker()
+            node_a, node_b = _node(broker, 'a'), _node(broker, 'b')
+            socket_a, socket_b = FakeWebSocket(), FakeWebSocket()
+            await _connect(node_a, {'agent_a': socket_a})
+            await _connect(node_b, {'agent_b': socket_b})
+            for node, agent_id in ((node_a, 'agent_a'), (node_b, 'agent_b')):
+                await node.join_session(agent_id, 's1')
+                await node.join_session(agent_id, 's2')
+
+            node_b.disconnect('agent_b')
+            await node_b._wait_index_updates()
+            after_disconnect = (dict(broker.agents), await node_a.get_all_session_participants('s2'))
+
+            await node_a.notify_session_ended('s1')
+            await node_a._wait_index_updates()
+            await node_a.stop()
+            await node_b.stop()
+            return after_disconnect, broker
+
+        (agents, s2_members), broker = asyncio.run(scenario())
+
+        assert agents == {'agent_a': 'a'}
+        assert s2_members == ['agent_a']
+        assert broker.members == {}
+        assert broker.agents == {}
+        assert broker.nodes == {}
+
+    def test_reconnect_on_other_node_keeps_registration(self):
+        async def scenario():
+            broker = InMemoryBroker()
+            node_a, node_b = _node(broker, 'a'), _node(broker, 'b')
+            old_socket, new_socket = FakeWebSocket(), FakeWebSocket()
+            await node_a.connect(old_socket, 'agent')
+            await node_b.connect(new_socket, 'agent')
+            node_a.disconnect('agent', old_socket)
+            await node_a._wait_index_updates()
+            await node_a.send_personal_message('agent', {'type': 'hello'})
+            await node_b.drain(timeout=1)
+            return broker, new_socket
+
+        broker, new_socket = asyncio.run(scenario())
+
+        assert broker.agents == {'agent': 'b'}
+        assert new_socket.sent[-1] == {'type': 'hello'}
+
+    def test_stale_disconnect_keeps_session_membership_on_new_node(self):
+        async def scenario():
+            broker = InMemoryBroker()
+            node_a, node_b, node_c = _node(broker, 'a'), _node(broker, 'b'), _node(broker, 'c')
+            old_socket, new_socket, other_socket = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+            await node_a.connect(old_socket, 'agent')
+            await node_a.join_session('agent', 's1')
+            await node_b.connect(new_socket, 'agent')
+            await node_b.join_session('agent', 's1')
+            await _connect(node_c, {'other': other_socket})
+            await node_c.join_session('other', 's1')
+
+            # 이전 노드의 늦은 연결 해제
+            node_a.disconnect('agent', old_socket)
+            await node_a._wait_index_updates()
+            members = dict(broker.members)
+
+            await node_a.stop()
+            await node_b._wait_index_updates()
+            after_stop = dict(broker.members.get('s1', {}))
+            await node_c.broadcast_to_session('s1', {'type': 'typing'})
+            await node_b.drain(timeout=1)
+            return members, after_stop, new_socket
+
+        members, after_stop, new_socket = asyncio.run(scenario())
+
+        assert members == {'s1': {'agent': 'b', 'other': 'c'}}
+        assert after_stop == {'agent': 'b', 'other': 'c'}
+        assert new_socket.sent[-1] == {'type': 'typing'}
+
+
+def _redis_url():
+    url = os.getenv('REDIS_URL')
+    if not url or backplane.redis is None:
+        return None
+
+    async def ping():
+        client = backplane.redis.from_url(url)
+        try:
+            return await asyncio.wait_for(client.ping(), 1)
+        finally:
+            await client.aclose()
+
+    try:
+        asyncio.run(ping())
+    except Exception:
+        return None
+    return url
+
+
+class TestRedisBackplane:
+    """Redis 백플레인 테스트 (REDIS_URL로 접속 가능한 Redis가 있을 때만 실행)"""
+
+    def test_session_broadcast_across_nodes(self):
+        url = _redis_url()
+        if url is None:
+            pytest.skip('REDIS_URL에 접속 가능한 Redis 없음')
+
+        async def scenario():
+            prefix = f"test_ws_{uuid.uuid4().hex[:8]}"
+            node_a = ConnectionManager(backplane=backplane.RedisBackplane(url, prefix), node_id='a')
+            node_b = ConnectionManager(backplane=backplane.RedisBackplane(url, prefix), node_id='b')
+            socket_a, socket_b = FakeWebSocket(), FakeWebSocket()
+            await _connect(node_a, {'agent_a': socket_a})
+            await _connect(node_b, {'agent_b': socket_b})
+            await node_a.join_session('agent_a', 's1')
+            await node_b.join_session('agent_b', 's1')
+            await asyncio.sleep(0.1)
+            socket_a.sent.clear()
+            socket_b.sent.clear()
+
+            await node_a.broadcast_to_session('s1', {'type': 'message'})
+            await asyncio.sleep(0.2)
+            await node_b.drain(timeout=1)
+            await node_a.stop()
+            await node_b.stop()
+            return socket_a, socket_b
+
+        socket_a, socket_b = asyncio.run(scenario())
+
+        assert socket_a.sent == [{'type': 'message'}]
+        assert socket_b.sent == [{'type': 'message'}]
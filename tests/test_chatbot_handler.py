@@ -3,6 +3,7 @@
 pytest를 사용한 로컬 개발환경 테스트
 """
 import pytest
+import base64
 import json
 import os
 import sys
@@ -295,6 +296,135 @@ class TestPerformance:
         assert total_time < 10.0
 
 
+class TestBatchProcessing:
+    """배치 처리 테스트"""
+    
+    @pytest.fixture
+    def aws_handler(self):
+        """NLU/DynamoDB를 모킹한 AWS 환경용 핸들러"""
+        with patch.dict(os.environ, {'ENVIRONMENT': 'production'}):
+            with patch('boto3.resource'), patch('boto3.client'):
+                handler = ChatbotHandler()
+        handler._call_bedrock_nlu = MagicMock(return_value={
+            'intent': 'general_inquiry', 'confidence': 0.8, 'response_text': '확인했습니다.'
+        })
+        return handler
+    
+    def test_duplicate_utterances_share_nlu_call(self, aws_handler):
+        """동일 발화는 NLU를 한 번만 호출하고 결과는 일괄 저장"""
+        messages = [
+            {'item_id': '1', 'message': '요금 문의', 'session_id': 's1'},
+            {'item_id': '2', 'message': '요금 문의 ', 'session_id': 's2'},
+            {'item_id': '3', 'message': '해지 문의', 'session_id': 's3'}
+        ]
+        
+        result = aws_handler.process_chat_batch(messages)
+        
+        assert aws_handler._call_bedrock_nlu.call_count == 2
+        assert sorted(item['item_id'] for item in result['results']) == ['1', '2', '3']
+        assert result['batchItemFailures'] == []
+        table = aws_handler.dynamodb.Table.return_value
+        batch = table.batch_writer.return_value.__enter__.return_value
+        assert table.put_item.call_count == 0
+        assert batch.put_item.call_count == 3
+    
+    def test_nlu_failure_reports_only_affected_items(self, aws_handler):
+        """NLU 실패 발화의 항목만 실패로 반환"""
+        def nlu(message, context):
+            if message == '실패':
+                raise RuntimeError('throttled')
+            return {'intent': 'greeting', 'confidence': 0.9, 'response_text': '안녕하세요'}
+        aws_handler._call_bedrock_nlu = nlu
+        
+        result = aws_handler.process_chat_batch([
+            {'item_id': 'a', 'message': '실패', 'session_id': 's1'},
+            {'item_id': 'b', 'message': '안녕', 'session_id': 's2'},
+            {'item_id': 'c', 'message': '실패', 'session_id': 's3'}
+        ])
+        
+        assert result['batchItemFailures'] == [{'itemIdentifier': 'a'}, {'itemIdentifier': 'c'}]
+        assert [item['item_id'] for item in result['results']] == ['b']
+    
+    def test_save_failure_fails_whole_batch(self, aws_handler):
+        """일괄 저장 실패 시 모든 항목을 재시도 대상으로 반환"""
+        aws_handler.dynamodb.Table.return_value.batch_writer.side_effect = Exception('unavailable')
+        
+        result = aws_handler.process_chat_batch([
+            {'item_id': '1', 'message': '요금 문의', 'session_id': 's1'},
+            {'item_id': '2', 'message': '해지 문의', 'session_id': 's2'}
+        ])
+        
+        assert result['results'] == []
+        assert len(result['batchItemFailures']) == 2
+    
+    def test_same_session_items_saved_under_distinct_keys(self, aws_handler):
+        """같은 세션의 메시지가 같은 시각에 처리되어도 서로 덮어쓰지 않음"""
+        aws_handler.process_chat_batch([
+            {'item_id': '1', 'message': '요금 문의', 'session_id': 's1', 'timestamp': '2024-01-01T09:00:00'},
+            {'item_id': '2', 'message': '해지 문의', 'session_id': 's1', 'timestamp': '2024-01-01T09:00:00'},
+            {'item_id': '3', 'message': '상품 문의', 'session_id': 's1'}
+        ])
+
+        batch = aws_handler.dynamodb.Table.return_value.batch_writer.return_value.__enter__.return_value
+        keys = [call.kwargs['Item']['timestamp'] for call in batch.put_item.call_args_list]
+        assert len(set(keys)) == 3
+        assert keys[0] == '2024-01-01T09:00:00#1'
+
+    def test_non_string_message_reported_as_failure(self, aws_handler):
+        """문자열이 아닌 메시지는 해당 항목만 실패로 반환"""
+        result = aws_handler.process_chat_batch([
+            {'item_id': '1', 'message': {'text': '요금'}, 'session_id': 's1'},
+            {'item_id': '2', 'message': 123, 'session_id': 's2'},
+            {'item_id': '3', 'message': '요금 문의', 'session_id': 's3'}
+        ])
+
+        assert result['batchItemFailures'] == [{'itemIdentifier': '1'}, {'itemIdentifier': '2'}]
+        assert [item['item_id'] for item in result['results']] == ['3']
+
+    def test_records_event_failure_retries_whole_batch(self):
+        """SQS/Kinesis 이벤트 처리 중 예외가 나면 500 대신 전체 레코드를 실패로 반환"""
+        event = {'Records': [
+            {'messageId': 'm1', 'body': json.dumps({'message': '안녕하세요'})},
+            {'kinesis': {'sequenceNumber': '49590', 'data': ''}}
+        ]}
+
+        with patch('src.handlers.chatbot_handler.ChatbotHandler', side_effect=RuntimeError('init failed')):
+            result = lambda_handler(event, {})
+
+        assert result == {'batchItemFailures': [{'itemIdentifier': 'm1'}, {'itemIdentifier': '49590'}]}
+
+    def test_sqs_event_returns_partial_failures(self):
+        """SQS 이벤트는 부분 실패 응답 형식으로 반환"""
+        event = {'Records': [
+            {'messageId': 'm1', 'body': json.dumps({'message': '안녕하세요', 'session_id': 's1'})},
+            {'messageId': 'm2', 'body': 'not json'},
+            {'messageId': 'm3', 'body': json.dumps({'session_id': 's3'})}
+        ]}
+        
+        with patch.dict(os.environ, {'ENVIRONMENT': 'development'}):
+            result = lambda_handler(event, {})
+        
+        assert result == {'batchItemFailures': [{'itemIdentifier': 'm2'}, {'itemIdentifier': 'm3'}]}
+    
+    def test_kinesis_and_direct_batch(self):
+        """Kinesis 레코드와 직접 배치 호출 처리"""
+        data = base64.b64encode(json.dumps({'message': '상품 문의'}).encode()).decode()
+        kinesis_event = {'Records': [{'kinesis': {'sequenceNumber': '49590', 'data': data}}]}
+        direct_event = {'request_type': 'batch', 'messages': [
+            {'id': 'x', 'message': '안녕하세요'}, {'id': 'y', 'message': '안녕하세요'}
+        ]}
+        
+        with patch.dict(os.environ, {'ENVIRONMENT': 'development'}):
+            kinesis_result = lambda_handler(kinesis_event, {})
+            direct_result = lambda_handler(direct_event, {})
+        
+        assert kinesis_result == {'batchItemFailures': []}
+        body = json.loads(direct_result['body'])
+        assert direct_result['statusCode'] == 200
+        assert [item['intent'] for item in body['results']] == ['greeting', 'greeting']
+        assert [item['session_id'] for item in body['results']] == ['session_x', 'session_y']
+
+
 # 통합 테스트
 class TestIntegration:
     """통합 테스트"""
@@ -0,0 +1,224 @@
+"""
+Connect Lambda 핸들러 테스트
+컨테이너 재사용 시 NLU/AWS 클라이언트 재사용, 호출 로그, 응답 이후 로그 전송 확인
+"""
+import importlib.util
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+sys.path.append(str(PROJECT_ROOT / 'connect' / 'lambda'))
+
+from conversation_log_pipeline import CONVERSATION_LOG, ConversationLogPipeline, LogSpool
+from src.chatbot_nlu_bedrock import IntentResult, NLUResponse
+
+
+def _load_handler():
+    """connect/lambda/chatbot_handler.py를 새 모듈로 로드 (새 컨테이너와 동일)"""
+    spec = importlib.util.spec_from_file_location(
+        'connect_chatbot_handler', PROJECT_ROOT / 'connect' / 'lambda' / 'chatbot_handler.py'
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _event(request_type='chat', user_input='요금제가 궁금해요'):
+    return {
+        'Details': {
+            'ContactData': {'ContactId': 'contact-1', 'CustomerEndpoint': {'Address': '+821012345678'}},
+            'Parameters': {'requestType': request_type, 'userInput': user_input, 'sessionAttributes': {}}
+        }
+    }
+
+
+def _nlu_response():
+    return NLUResponse(
+        intent_result=IntentResult('product_inquiry', 0.9, {}, '상품 문의', []),
+        response_text='어떤 상품이 궁금하신가요?',
+        next_action='continue',
+        session_attributes={},
+        claude_reasoning='상품 문의'
+    )
+
+
+class TestConnectChatbotHandler:
+    """Connect Lambda 핸들러 테스트 클래스"""
+
+    @pytest.fixture
+    def handler(self, tmp_path):
+        env = {'AWS_DEFAULT_REGION': 'ap-northeast-2', 'LOG_DELIVERY_MODE': 'manual', 'LOG_SPOOL_DIR': str(tmp_path)}
+        with patch.dict(os.environ, env):
+            module = _load_handler()
+            module._aws_clients['dynamodb'] = MagicMock()
+            yield module
+
+    def test_nlu_created_once_per_container(self, handler):
+        """NLU 인스턴스는 첫 호출에서만 생성"""
+        nlu = MagicMock()
+        nlu.process_message.return_value = _nlu_response()
+
+        with patch('src.chatbot_nlu_bedrock.BedrockChatbotNLU', return_value=nlu) as nlu_class:
+            first = handler.lambda_handler(_event(), None)
+            second = handler.lambda_handler(_event(), None)
+
+        assert nlu_class.call_count == 1
+        assert first['body']['intent'] == 'product_inquiry'
+        assert second['body']['responseText'] == '어떤 상품이 궁금하신가요?'
+
+    def test_logs_written_after_response(self, handler):
+        """로그는 응답 시점에 스풀에만 기록되고 이후 일괄 전송"""
+        nlu = MagicMock()
+        nlu.process_message.return_value = _nlu_response()
+        table = handler._aws_clients['dynamodb'].Table.return_value
+        batch = table.batch_writer.return_value.__enter__.return_value
+
+        with patch('src.chatbot_nlu_bedrock.BedrockChatbotNLU', return_value=nlu):
+            handler.lambda_handler(_event(), None)
+            handler.lambda_handler(_event(), None)
+
+        assert batch.put_item.call_count == 0
+        assert handler.log_pipeline.flush() == 2
+        assert batch.put_item.call_count == 2
+        assert batch.put_item.call_args.kwargs['Item']['user_input'] == '요금제가 궁금해요'
+
+    def test_escalation_log_key_is_deterministic(self, handler):
+        """재전송된 에스컬레이션 로그는 같은 S3 키에 기록"""
+        s3_client = MagicMock()
+        handler._aws_clients['s3'] = s3_client
+        record = {
+            'kind': 'escalation', 'contact_id': 'contact-1', 'timestamp': '2024-01-02T03:04:05.123456',
+            'item': {'contact_id': 'contact-1'}
+        }
+
+        handler.write_escalation_logs([record])
+        handler.write_escalation_logs([record])
+
+        keys = {call.kwargs['Key'] for call in s3_client.put_object.call_args_list}
+        assert keys == {'escalations/contact-1/20240102_030405_123456.json'}
+
+    def test_business_hours_needs_no_aws_client(self, handler):
+        """영업시간 확인은 AWS 클라이언트 없이 처리"""
+        handler._aws_clients.clear()
+
+        response = handler.lambda_handler(_event('business_hours'), None)
+
+        assert response['statusCode'] == 200
+        assert handler._aws_clients == {}
+        assert handler._nlu is None
+
+    def test_event_not_logged_at_info(self, handler, caplog):
+        """INFO 레벨에서는 이벤트 전체 대신 처리 시간만 기록"""
+        with caplog.at_level(logging.INFO):
+            handler.lambda_handler(_event('default', '주민번호 9001011234567'), None)
+
+        assert '9001011234567' not in caplog.text
+        assert '호출 처리 시간' in caplog.text
+        assert '"cold_start": true' in caplog.text
+
+
+class TestConversationLogPipeline:
+    """로그 스풀/일괄 전송 테스트 클래스"""
+
+    def _pipeline(self, directory, sink):
+        return ConversationLogPipeline(LogSpool(str(directory)), {CONVERSATION_LOG: sink})
+
+    def test_failed_flush_is_replayed(self, tmp_path):
+        """일괄/건별 기록이 모두 실패하면 다음 전송에서 다시 기록"""
+        delivered = []
+        failures = [RuntimeError('throttled'), RuntimeError('throttled')]
+
+        def sink(records):
+            if failures:
+                raise failures.pop()
+            delivered.extend(records)
+
+        pipeline = self._pipeline(tmp_path, sink)
+        pipeline.enqueue(CONVERSATION_LOG, 'contact-1', 't1', {'n': 1})
+
+        assert pipeline.flush() == 0
+        assert pipeline.stats['failed_flushes'] == 1
+        assert pipeline.flush() == 1
+        assert [record['item'] for record in delivered] == [{'n': 1}]
+        assert delivered[0]['attempts'] == 1
+        assert pipeline.flush() == 0
+
+    def test_poison_record_does_not_block_others(self, tmp_path):
+        """기록할 수 없는 로그는 건별로 골라내고 나머지는 기록"""
+        delivered = []
+
+        def sink(records):
+            if any(record['item'].get('poison') for record in records):
+                raise ValueError('invalid item')
+            delivered.extend(records)
+
+        pipeline = self._pipeline(tmp_path, sink)
+        pipeline.enqueue(CONVERSATION_LOG, 'contact-1', 't1', {'n': 1})
+        pipeline.enqueue(CONVERSATION_LOG, 'contact-1', 't2', {'poison': True})
+        pipeline.enqueue(CONVERSATION_LOG, 'contact-1', 't3', {'n': 3})
+
+        assert pipeline.flush() == 2
+        assert sorted(record['timestamp'] for record in delivered) == ['t1', 't3']
+        assert pipeline.stats['retried'] == 1
+        assert [record['timestamp'] for record in pipeline.spool.pending()[0]] == ['t2']
+
+    def test_poison_record_dead_lettered_after_max_attempts(self, tmp_path):
+        """재시도 한도를 넘은 로그는 격리 파일로 옮기고 스풀을 비움"""
+        def sink(records):
+            raise ValueError('invalid item')
+
+        pipeline = ConversationLogPipeline(LogSpool(str(tmp_path)), {CONVERSATION_LOG: sink}, max_attempts=3)
+        pipeline.enqueue(CONVERSATION_LOG, 'contact-1', 't1', {'poison': True})
+
+        for _ in range(3):
+            assert pipeline.flush() == 0
+
+        dead_letters = (tmp_path / 'dead_letter.jsonl').read_text(encoding='utf-8').splitlines()
+        assert len(dead_letters) == 1
+        assert json.loads(dead_letters[0])['attempts'] == 3
+        assert pipeline.stats['dead_lettered'] == 1
+        assert pipeline.spool.pending() == ([], 0)
+        assert (tmp_path / 'records.jsonl').read_bytes() == b''
+
+    def test_spool_survives_new_container_and_dedups(self, tmp_path):
+        """확정 전 종료된 로그는 새 인스턴스에서 전송하고 같은 키는 한 번만 기록"""
+        first = self._pipeline(tmp_path, MagicMock())
+        first.enqueue(CONVERSATION_LOG, 'contact-1', 't1', {'n': 1})
+        first.enqueue(CONVERSATION_LOG, 'contact-1', 't1', {'n': 1})
+        first.enqueue(CONVERSATION_LOG, 'contact-1', 't2', {'n': 2})
+
+        delivered = []
+        second = self._pipeline(tmp_path, delivered.extend)
+
+        assert second.flush() == 2
+        assert second.stats['duplicates'] == 1
+        assert sorted(record['timestamp'] for record in delivered) == ['t1', 't2']
+
+    def test_commit_truncates_spool(self, tmp_path):
+        """모두 전송되면 스풀 파일을 비움"""
+        pipeline = self._pipeline(tmp_path, MagicMock())
+        pipeline.enqueue(CONVERSATION_LOG, 'contact-1', 't1', {'n': 1})
+
+        pipeline.flush()
+
+        assert (tmp_path / 'records.jsonl').read_bytes() == b''
+        assert pipeline.spool.pending() == ([], 0)
+
+    def test_partial_line_left_for_next_flush(self, tmp_path):
+        """기록 도중인 마지막 줄은 전송하지 않음"""
+        delivered = []
+        pipeline = self._pipeline(tmp_path, delivered.extend)
+        pipeline.enqueue(CONVERSATION_LOG, 'contact-1', 't1', {'n': 1})
+        with open(tmp_path / 'records.jsonl', 'a', encoding='utf-8') as spool:
+            spool.write('{"kind": "conversation", "contact_id"')
+
+        assert pipeline.flush() == 1
+        assert len(delivered) == 1
+        assert (tmp_path / 'records.jsonl').read_text(encoding='utf-8').endswith('"contact_id"')
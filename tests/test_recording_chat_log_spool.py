@@ -0,0 +1,210 @@
+"""
+채팅 로그 WAL 스풀 테스트 (기록/조회, 그룹 커밋, 세그먼트 교체, 장애 후 복구)
+"""
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT / '산출물' / '3.4_공통_통합_기능_개발' / '소스코드' / 'recording'))
+
+import chat_log_spool  # noqa: E402
+from chat_log_spool import ChatLogSpool  # noqa: E402
+
+
+def _entry(i: int, session: str = 's1'):
+    return {'id': f"{session}-{i}", 'timestamp': f"2024-01-01T09:00:{i % 60:02d}", 'sender_id': 'agent_1',
+            'sender_type': 'agent', 'message_type': 'text', 'content': f"메시지 {i}", 'metadata': {}}
+
+
+def _segments(spool, session_id):
+    return spool._segment_paths(session_id)
+
+
+class TestAppend:
+    """기록/조회 테스트"""
+
+    def test_entries_read_back_in_order(self, tmp_path):
+        async def scenario():
+            spool = ChatLogSpool(str(tmp_path), commit_interval=0)
+            session = await spool.open_session('s1', 'rec-1', 'agent_1', 'cust_1')
+            for i in range(5):
+                await spool.append('s1', _entry(i))
+            await spool.close()
+            return spool, session
+
+        spool, session = asyncio.run(scenario())
+
+        assert [e['id'] for e in spool.iter_entries('s1')] == [f"s1-{i}" for i in range(5)]
+        assert session.message_count == 5
+        assert session.first_message_at == '2024-01-01T09:00:00'
+
+    def test_open_session_idempotent_and_sealed_rejects_appends(self, tmp_path):
+        async def scenario():
+            spool = ChatLogSpool(str(tmp_path), commit_interval=0)
+            first = await spool.open_session('s1', 'rec-1')
+            second = await spool.open_session('s1', 'rec-2')
+            await spool.seal('s1')
+            with pytest.raises(ValueError):
+                await spool.append('s1', _entry(0))
+            with pytest.raises(ValueError):
+                await spool.append('unknown', _entry(0))
+            return first, second, spool
+
+        first, second, spool = asyncio.run(scenario())
+
+        assert first is second
+        assert second.recording_id == 'rec-1'
+        assert spool.list_sessions() == []
+        assert spool.list_sessions(include_sealed=True) == [first]
+
+    def test_discard_removes_files(self, tmp_path):
+        async def scenario():
+            spool = ChatLogSpool(str(tmp_path), commit_interval=0)
+            await spool.open_session('세션/1', 'rec-1')
+            await spool.append('세션/1', _entry(0))
+            await spool.seal('세션/1')
+            spool.discard('세션/1')
+            return spool
+
+        spool = asyncio.run(scenario())
+
+        assert spool.get_session('세션/1') is None
+        assert os.listdir(tmp_path) == []
+
+
+class TestGroupCommit:
+    """그룹 커밋 테스트"""
+
+    def test_concurrent_appends_share_fsync(self, tmp_path, monkeypatch):
+        fsyncs = []
+        real_fsync = os.fsync
+        monkeypatch.setattr(chat_log_spool.os, 'fsync', lambda fd: (fsyncs.append(fd), real_fsync(fd)))
+
+        async def scenario():
+            spool = ChatLogSpool(str(tmp_path), commit_interval=0.01)
+            await asyncio.gather(*(spool.open_session(f"s{n}", f"rec-{n}") for n in range(10)))
+            fsyncs.clear()
+            await asyncio.gather(*(spool.append(f"s{n}", _entry(i, f"s{n}")) for n in range(10) for i in range(20)))
+            await spool.close()
+            return spool
+
+        spool = asyncio.run(scenario())
+
+        assert sum(s.message_count for s in spool.list_sessions()) == 200
+        # 200건 쓰기가 세션 파일당 한 번 수준의 fsync로 묶임
+        assert len(fsyncs) <= 20
+
+    def test_append_returns_after_fsync(self, tmp_path, monkeypatch):
+        events = []
+        real_fsync = os.fsync
+        monkeypatch.setattr(chat_log_spool.os, 'fsync', lambda fd: (events.append('fsync'), real_fsync(fd)))
+
+        async def scenario():
+            spool = ChatLogSpool(str(tmp_path), commit_interval=0)
+            await spool.open_session('s1', 'rec-1')
+            events.clear()
+            await spool.append('s1', _entry(0))
+            events.append('returned')
+            await spool.close()
+
+        asyncio.run(scenario())
+
+        assert events.index('fsync') < events.index('returned')
+
+
+class TestSegments:
+    """세그먼트 교체 및 파일 핸들 제한 테스트"""
+
+    def test_segments_rotate_and_open_files_bounded(self, tmp_path):
+        async def scenario():
+            spool = ChatLogSpool(str(tmp_path), commit_interval=0, segment_bytes=1024, max_open_files=2)
+            for n in range(5):
+                await spool.open_session(f"s{n}", f"rec-{n}")
+            for i in range(30):
+                for n in range(5):
+                    await spool.append(f"s{n}", _entry(i, f"s{n}"))
+            open_files = len(spool._files)
+            await spool.close()
+            return spool, open_files
+
+        spool, open_files = asyncio.run(scenario())
+
+        assert open_files <= 2
+        assert len(_segments(spool, 's0')) > 3
+        assert all(os.path.getsize(p) <= 1024 for p in _segments(spool, 's0'))
+        assert [e['id'] for e in spool.iter_entries('s3')] == [f"s3-{i}" for i in range(30)]
+
+
+class TestRecovery:
+    """장애 후 복구 테스트"""
+
+    def test_unsealed_sessions_recovered_after_crash(self, tmp_path):
+        async def write():
+            spool = ChatLogSpool(str(tmp_path), commit_interval=0, segment_bytes=512)
+            await spool.open_session('s1', 'rec-1', 'agent_1', 'cust_1')
+            for i in range(12):
+                await spool.append('s1', _entry(i))
+            # close 없이 종료 (프로세스 장애)
+
+        asyncio.run(write())
+
+        spool = ChatLogSpool(str(tmp_path))
+        recovered = spool.recover()
+        session = spool.get_session('s1')
+
+        assert recovered == ['s1']
+        assert (session.recording_id, session.agent_id, session.customer_id) == ('rec-1', 'agent_1', 'cust_1')
+        assert session.message_count == 12
+        assert session.first_message_at == '2024-01-01T09:00:00'
+        assert len(list(spool.iter_entries('s1'))) == 12
+
+    def test_torn_tail_truncated_and_appends_continue(self, tmp_path):
+        async def write():
+            spool = ChatLogSpool(str(tmp_path), commit_interval=0)
+            await spool.open_session('s1', 'rec-1')
+            for i in range(3):
+                await spool.append('s1', _entry(i))
+            await spool.close()
+            return _segments(spool, 's1')[-1]
+
+        segment = asyncio.run(write())
+        intact = os.path.getsize(segment)
+        with open(segment, 'ab') as f:
+            f.write(b'\x00\x00\x01\x00partial')
+
+        async def resume():
+            spool = ChatLogSpool(str(tmp_path), commit_interval=0)
+            spool.recover()
+            truncated = os.path.getsize(segment)
+            await spool.append('s1', _entry(3))
+            await spool.close()
+            return spool, truncated
+
+        spool, truncated = asyncio.run(resume())
+
+        assert truncated == intact
+        assert [e['id'] for e in spool.iter_entries('s1')] == [f"s1-{i}" for i in range(4)]
+        assert spool.get_session('s1').message_count == 4
+
+    def test_corrupted_record_stops_replay(self, tmp_path):
+        async def write():
+            spool = ChatLogSpool(str(tmp_path), commit_interval=0)
+            await spool.open_session('s1', 'rec-1')
+            for i in range(3):
+                await spool.append('s1', _entry(i))
+            await spool.close()
+            return _segments(spool, 's1')[-1]
+
+        segment = asyncio.run(write())
+        data = bytearray(Path(segment).read_bytes())
+        data[-5] ^= 0xFF
+        Path(segment).write_bytes(bytes(data))
+
+        spool = ChatLogSpool(str(tmp_path))
+        spool.recover()
+
+        assert spool.get_session('s1').message_count == 2
@@ -0,0 +1,147 @@
+"""
+녹취 파일 청크 스트리밍 암호화 테스트 (왕복, 구간 복호화, 변조/잘림 검출)
+"""
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT / '산출물' / '3.4_공통_통합_기능_개발' / '소스코드' / 'recording'))
+
+from chunked_encryption import (  # noqa: E402
+    HEADER_SIZE, TAG_SIZE, ChunkedCipher, ChunkedEncryptionError, encrypted_size, is_chunked_file
+)
+
+KEY = b'test-master-key'
+CHUNK = 1024
+
+
+def _pieces(data: bytes, size: int):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class TestStreaming:
+    """스트리밍 암복호화 테스트"""
+
+    @pytest.mark.parametrize('length', [0, 1, CHUNK - 1, CHUNK, CHUNK + 1, CHUNK * 5, CHUNK * 5 + 17])
+    def test_round_trip_any_length(self, length):
+        cipher = ChunkedCipher(KEY, CHUNK)
+        data = os.urandom(length)
+
+        encrypted = b''.join(cipher.encrypt_stream(_pieces(data, 300)))
+
+        assert len(encrypted) == encrypted_size(length, CHUNK)
+        # 복호화 입력을 프레임 경계와 어긋나게 잘라도 동일
+        assert b''.join(cipher.decrypt_stream(_pieces(encrypted, 777))) == data
+
+    def test_frames_bounded_by_chunk_size(self):
+        cipher = ChunkedCipher(KEY, CHUNK)
+
+        frames = list(cipher.encrypt_stream([os.urandom(CHUNK * 10)]))
+
+        assert len(frames[0]) == HEADER_SIZE
+        assert all(len(frame) == CHUNK + TAG_SIZE for frame in frames[1:])
+
+    def test_same_plaintext_encrypts_differently(self):
+        cipher = ChunkedCipher(KEY, CHUNK)
+
+        first = b''.join(cipher.encrypt_stream([b'a' * 100]))
+        second = b''.join(cipher.encrypt_stream([b'a' * 100]))
+
+        assert first != second
+
+    def test_reader_uses_chunk_size_from_header(self):
+        data = os.urandom(CHUNK * 3)
+        encrypted = b''.join(ChunkedCipher(KEY, CHUNK).encrypt_stream([data]))
+
+        assert b''.join(ChunkedCipher(KEY, 4096).decrypt_stream([encrypted])) == data
+
+
+class TestTamperDetection:
+    """변조/잘림 검출 테스트"""
+
+    def _encrypted(self):
+        return bytearray(b''.join(ChunkedCipher(KEY, CHUNK).encrypt_stream([os.urandom(CHUNK * 3 + 10)])))
+
+    def _decrypt(self, data, key=KEY):
+        return b''.join(ChunkedCipher(key, CHUNK).decrypt_stream([bytes(data)]))
+
+    def test_wrong_key_rejected(self):
+        with pytest.raises(ChunkedEncryptionError):
+            self._decrypt(self._encrypted(), key=b'other-key')
+
+    def test_flipped_bit_rejected(self):
+        data = self._encrypted()
+        data[HEADER_SIZE + CHUNK + 5] ^= 1
+
+        with pytest.raises(ChunkedEncryptionError):
+            self._decrypt(data)
+
+    def test_truncation_at_frame_boundary_rejected(self):
+        data = self._encrypted()
+
+        with pytest.raises(ChunkedEncryptionError):
+            self._decrypt(data[:HEADER_SIZE + 2 * (CHUNK + TAG_SIZE)])
+
+    def test_reordered_frames_rejected(self):
+        data = self._encrypted()
+        frame = CHUNK + TAG_SIZE
+        first, second = data[HEADER_SIZE:HEADER_SIZE + frame], data[HEADER_SIZE + frame:HEADER_SIZE + 2 * frame]
+        data[HEADER_SIZE:HEADER_SIZE + 2 * frame] = second + first
+
+        with pytest.raises(ChunkedEncryptionError):
+            self._decrypt(data)
+
+    def test_header_tampering_rejected(self):
+        data = self._encrypted()
+        data[HEADER_SIZE - 1] ^= 1
+
+        with pytest.raises(ChunkedEncryptionError):
+            self._decrypt(data)
+
+
+class TestRangeDecryption:
+    """구간 복호화 테스트"""
+
+    def test_range_reads_only_needed_frames(self):
+        cipher = ChunkedCipher(KEY, CHUNK)
+        data = os.urandom(CHUNK * 40 + 123)
+        encrypted = b''.join(cipher.encrypt_stream([data]))
+        reads = []
+
+        def read_at(offset, length):
+            reads.append((offset, length))
+            return encrypted[offset:offset + length]
+
+        start, end = CHUNK * 20 + 500, CHUNK * 22 + 10
+        result = b''.join(cipher.decrypt_range(read_at, len(encrypted), start, end))
+
+        assert result == data[start:end]
+        assert sum(length for _, length in reads) == HEADER_SIZE + 3 * (CHUNK + TAG_SIZE)
+
+    @pytest.mark.parametrize('start,end', [(0, None), (0, 1), (CHUNK * 3, None), (CHUNK * 40, CHUNK * 50),
+                                           (5, 5), (CHUNK * 100, None)])
+    def test_range_bounds(self, tmp_path, start, end):
+        cipher = ChunkedCipher(KEY, CHUNK)
+        data = os.urandom(CHUNK * 40 + 123)
+        source, target = tmp_path / 'rec.wav', tmp_path / 'rec.wav.enc'
+        source.write_bytes(data)
+        cipher.encrypt_file(str(source), str(target))
+
+        assert b''.join(cipher.read_file_range(str(target), start, end)) == data[start:end]
+
+    def test_file_round_trip_and_format_detection(self, tmp_path):
+        cipher = ChunkedCipher(KEY, CHUNK)
+        data = os.urandom(CHUNK * 7 + 3)
+        source, encrypted, restored = tmp_path / 'a.mp3', tmp_path / 'a.mp3.enc', tmp_path / 'b.mp3'
+        source.write_bytes(data)
+
+        cipher.encrypt_file(str(source), str(encrypted))
+        cipher.decrypt_file(str(encrypted), str(restored))
+
+        assert restored.read_bytes() == data
+        assert is_chunked_file(str(encrypted))
+        assert not is_chunked_file(str(source))
+        assert cipher.plaintext_size(encrypted.read_bytes()[:HEADER_SIZE], encrypted.stat().st_size) == len(data)
@@ -0,0 +1,139 @@
+"""
+녹취 S3 전송 계층 테스트 (moto S3에서 멀티파트 업로드, 병렬 다운로드, 구간 읽기, 통계)
+"""
+import os
+import sys
+from pathlib import Path
+
+import boto3
+import pytest
+from moto import mock_s3
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT / '산출물' / '3.4_공통_통합_기능_개발' / '소스코드' / 'recording'))
+
+from chunked_encryption import ChunkedCipher  # noqa: E402
+from s3_transfer import MIN_PART_SIZE, S3TransferManager  # noqa: E402
+
+BUCKET = 'aicc-recordings-test'
+PART = MIN_PART_SIZE
+
+
+@pytest.fixture
+def s3_client(monkeypatch):
+    monkeypatch.setenv('AWS_ACCESS_KEY_ID', 'testing')
+    monkeypatch.setenv('AWS_SECRET_ACCESS_KEY', 'testing')
+    # 최신 botocore의 aws-chunked 체크섬 전송은 moto가 해석하지 못함
+    monkeypatch.setenv('AWS_REQUEST_CHECKSUM_CALCULATION', 'when_required')
+    with mock_s3():
+        client = boto3.client('s3', region_name='ap-northeast-2')
+        client.create_bucket(Bucket=BUCKET, CreateBucketConfiguration={'LocationConstraint': 'ap-northeast-2'})
+        yield client
+
+
+@pytest.fixture
+def transfer(s3_client):
+    manager = S3TransferManager(s3_client, BUCKET, part_size=PART, max_concurrency=3)
+    yield manager
+    manager.close()
+
+
+def _pieces(data: bytes, size: int):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+class TestUpload:
+    """업로드 테스트"""
+
+    def test_small_stream_uses_single_put(self, transfer, s3_client):
+        stats = transfer.upload_stream('small.bin', _pieces(b'x' * 1000, 100), metadata={'recording_id': 'r1'},
+                                       extra_args={'ServerSideEncryption': 'AES256'})
+
+        head = s3_client.head_object(Bucket=BUCKET, Key='small.bin')
+        assert (stats.size, stats.parts) == (1000, 1)
+        assert head['ContentLength'] == 1000
+        assert head['Metadata'] == {'recording_id': 'r1'}
+        assert head['ServerSideEncryption'] == 'AES256'
+
+    def test_large_stream_uploaded_in_parts(self, transfer, s3_client):
+        data = os.urandom(PART * 3 + 1234)
+
+        stats = transfer.upload_stream('large.bin', _pieces(data, 64 * 1024))
+
+        body = s3_client.get_object(Bucket=BUCKET, Key='large.bin')['Body'].read()
+        assert body == data
+        assert (stats.size, stats.parts) == (len(data), 4)
+
+    def test_failed_upload_aborted(self, transfer, s3_client):
+        def broken():
+            yield os.urandom(PART * 2)
+            raise IOError('encoder failed')
+
+        with pytest.raises(IOError):
+            transfer.upload_stream('broken.bin', broken())
+
+        assert s3_client.list_multipart_uploads(Bucket=BUCKET).get('Uploads', []) == []
+        assert 'Contents' not in s3_client.list_objects_v2(Bucket=BUCKET)
+
+
+class TestDownload:
+    """다운로드/구간 읽기 테스트"""
+
+    def test_parallel_download_in_order(self, transfer, s3_client, tmp_path):
+        data = os.urandom(PART * 4 + 99)
+        s3_client.put_object(Bucket=BUCKET, Key='rec.bin', Body=data)
+
+        chunks = list(transfer.iter_object('rec.bin'))
+        stats = transfer.download_file('rec.bin', str(tmp_path / 'rec.bin'))
+
+        assert b''.join(chunks) == data
+        assert [len(c) for c in chunks] == [PART] * 4 + [99]
+        assert (tmp_path / 'rec.bin').read_bytes() == data
+        assert stats.size == len(data)
+
+    def test_read_range(self, transfer, s3_client):
+        s3_client.put_object(Bucket=BUCKET, Key='rec.bin', Body=bytes(range(256)) * 10)
+
+        assert transfer.read_range('rec.bin', 300, 5) == bytes([44, 45, 46, 47, 48])
+
+    def test_metrics_by_operation(self, transfer, s3_client):
+        transfer.upload_stream('a.bin', [os.urandom(PART + 1)])
+        list(transfer.iter_object('a.bin'))
+        transfer.read_range('a.bin', 0, 10)
+
+        metrics = transfer.metrics.snapshot()
+
+        assert metrics['upload']['count'] == 1
+        assert metrics['upload']['bytes'] == PART + 1
+        assert metrics['upload']['parts'] == 2
+        assert metrics['download']['bytes'] == PART + 1
+        assert metrics['range']['bytes'] == 10
+        assert all(m['throughput_mb_s'] >= 0 for m in metrics.values())
+
+
+class TestEncryptedRecording:
+    """암호화 스트림 업로드 후 재생 테스트"""
+
+    def test_encrypted_upload_restore_and_seek(self, transfer, tmp_path):
+        cipher = ChunkedCipher(b'master-key', 64 * 1024)
+        data = os.urandom(PART * 2 + 5000)
+        source = tmp_path / 'call.mp3'
+        source.write_bytes(data)
+
+        stats = transfer.upload_stream('voice/call.mp3.enc', cipher.iter_encrypted_file(str(source)))
+        restored = b''.join(cipher.decrypt_stream(transfer.iter_object('voice/call.mp3.enc')))
+        start = PART + 100
+        window = b''.join(cipher.decrypt_range(
+            lambda offset, length: transfer.read_range('voice/call.mp3.enc', offset, length),
+            stats.size, start, start + 4096
+        ))
+
+        assert restored == data
+        assert window == data[start:start + 4096]
+        assert transfer.metrics.snapshot()['range']['bytes'] < 2 * 64 * 1024
+
+
+def test_part_size_below_s3_minimum_rejected(s3_client):
+    with pytest.raises(ValueError):
+        S3TransferManager(s3_client, BUCKET, part_size=1024)
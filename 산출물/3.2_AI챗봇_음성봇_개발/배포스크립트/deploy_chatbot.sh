@@ -92,7 +92,10 @@ build_and_push_image() {
     
     # Docker 이미지 빌드
     log_info "Docker 이미지 빌드 중..."
+    # 공용 시나리오 검증기 모듈을 빌드 컨텍스트에 포함
+    cp ../../../src/chatbot_scenario_validators.py ../소스코드/
     docker build -t ${PROJECT_NAME}:${IMAGE_TAG} -f ../Dockerfile ../
+    rm -f ../소스코드/chatbot_scenario_validators.py
     
     # 이미지 태그 지정
     docker tag ${PROJECT_NAME}:${IMAGE_TAG} ${ECR_URI}:${IMAGE_TAG}
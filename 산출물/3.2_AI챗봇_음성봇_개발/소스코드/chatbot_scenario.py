@@ -5,11 +5,20 @@ AI 챗봇 시나리오 관리 모듈
 
 import json
 import logging
-from typing import Dict, List, Optional, Any
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 from enum import Enum
 import uuid
 
+try:
+    from chatbot_scenario_validators import StepValidator, create_default_registry
+except ImportError:
+    # 저장소에서 직접 실행하는 경우 공용 검증기 모듈(src) 경로 추가
+    sys.path.append(str(Path(__file__).resolve().parents[3] / 'src'))
+    from chatbot_scenario_validators import StepValidator, create_default_registry
+
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -42,6 +51,47 @@ class ChatbotScenario:
         """시나리오 관리자 초기화"""
         self.scenarios = self._load_scenarios()
         self.active_sessions = {}
+        self.validators = create_default_registry()
+        # (시나리오 타입, 플로우) -> 단계 ID -> (단계, 컴파일된 검증기)
+        self._step_index = self._compile_steps()
+
+    def _compile_steps(self) -> Dict[Tuple[str, str], Dict[str, Tuple[Dict, StepValidator]]]:
+        """플로우별 단계 색인 및 검증기 사전 컴파일"""
+        index = {}
+        for scenario_type, scenario in self.scenarios.items():
+            for flow_name, flow in scenario['flows'].items():
+                index[(scenario_type, flow_name)] = {
+                    step['id']: (step, self.validators.compile(*self._validation_rules(step)))
+                    for step in flow['steps']
+                }
+        return index
+
+    def _validation_rules(self, step: Dict) -> Tuple[str, Dict]:
+        """단계 정의를 공용 검증기 유형/규칙으로 변환"""
+        input_type = step['input_type']
+
+        if input_type == 'selection':
+            options = step.get('options', [])
+            return 'choice', {
+                'choices': options,
+                'error_message': f"다음 중에서 선택해 주세요: {', '.join(options)}"
+            }
+
+        if input_type == 'secure_text' and step.get('validation') == 'resident_number':
+            return 'text', {
+                'min_length': 7,
+                'max_length': 7,
+                'length_error_message': "주민등록번호 뒷자리 7자리를 정확히 입력해 주세요."
+            }
+
+        if input_type == 'text':
+            return 'text', {
+                'min_length': 1,
+                'max_length': None,
+                'length_error_message': "내용을 입력해 주세요."
+            }
+
+        return 'any', {}
         
     def _load_scenarios(self) -> Dict:
         """
@@ -280,20 +330,14 @@ class ChatbotScenario:
             return {"error": "진행 중인 플로우가 없습니다."}
         
         # 현재 단계 정보 가져오기
-        scenario = self.scenarios[session['scenario_type']]
-        flow = scenario['flows'][current_flow]
-        current_step = None
-        
-        for step in flow['steps']:
-            if step['id'] == current_step_id:
-                current_step = step
-                break
+        steps = self._step_index.get((session['scenario_type'], current_flow), {})
+        current_step, validator = steps.get(current_step_id, (None, None))
         
         if not current_step:
             return {"error": "현재 단계를 찾을 수 없습니다."}
         
         # 입력 검증
-        validation_result = self._validate_input(current_step, user_input)
+        validation_result = self._validate_input(current_step, user_input, validator)
         if not validation_result['valid']:
             return {
                 'error': validation_result['message'],
@@ -325,11 +369,7 @@ class ChatbotScenario:
             }
         
         # 다음 단계 찾기
-        next_step = None
-        for step in flow['steps']:
-            if step['id'] == next_step_id:
-                next_step = step
-                break
+        next_step = steps.get(next_step_id, (None, None))[0]
         
         if not next_step:
             return {"error": "다음 단계를 찾을 수 없습니다."}
@@ -347,44 +387,59 @@ class ChatbotScenario:
             'fields': next_step.get('fields', [])
         }
     
-    def _validate_input(self, step: Dict, user_input: Any) -> Dict:
+    def _validate_input(self, step: Dict, user_input: Any,
+                        validator: Optional[StepValidator] = None) -> Dict:
         """
         사용자 입력 검증
         
         Args:
             step: 현재 단계 정보
             user_input: 사용자 입력
+            validator: 사전 컴파일된 검증기 (None시 단계 정의로 컴파일)
             
         Returns:
             검증 결과
         """
-        input_type = step['input_type']
-        
-        if input_type == 'selection':
-            options = step.get('options', [])
-            if user_input not in options:
-                return {
-                    'valid': False,
-                    'message': f"다음 중에서 선택해 주세요: {', '.join(options)}"
-                }
-        
-        elif input_type == 'secure_text':
-            validation = step.get('validation')
-            if validation == 'resident_number':
-                if not user_input or len(user_input) != 7:
-                    return {
-                        'valid': False,
-                        'message': "주민등록번호 뒷자리 7자리를 정확히 입력해 주세요."
-                    }
-        
-        elif input_type == 'text':
-            if not user_input or len(user_input.strip()) == 0:
-                return {
-                    'valid': False,
-                    'message': "내용을 입력해 주세요."
-                }
-        
+        if validator is None:
+            validator = self.validators.compile(*self._validation_rules(step))
+        result = validator(user_input)
+        if not result['valid']:
+            return {'valid': False, 'message': result['error_message']}
         return {'valid': True}
+
+    def validate_recorded_inputs(self, scenario_type: str, flow_name: str,
+                                 records: List[Dict]) -> List[Dict]:
+        """
+        녹취/대화 기록의 입력 일괄 재검증 (QA용)
+
+        Args:
+            scenario_type: 시나리오 타입
+            flow_name: 플로우 이름
+            records: {'step_id', 'user_input'} 형태의 기록 목록 (세션 history와 동일)
+
+        Returns:
+            기록 순서대로의 검증 결과
+        """
+        steps = self._step_index.get((scenario_type, flow_name), {})
+        results: List[Optional[Dict]] = [None] * len(records)
+
+        grouped: Dict[str, List[int]] = {}
+        for position, record in enumerate(records):
+            grouped.setdefault(record.get('step_id'), []).append(position)
+
+        for step_id, positions in grouped.items():
+            entry = steps.get(step_id)
+            if entry is None:
+                for position in positions:
+                    results[position] = {'valid': False, 'message': f"알 수 없는 단계: {step_id}"}
+                continue
+
+            batch = entry[1].validate_batch(records[position].get('user_input') for position in positions)
+            for position, result in zip(positions, batch):
+                results[position] = {'valid': True} if result['valid'] else \
+                    {'valid': False, 'message': result['error_message']}
+
+        return results
     
     def get_available_flows(self, scenario_type: str) -> List[Dict]:
         """
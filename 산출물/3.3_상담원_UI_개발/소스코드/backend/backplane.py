@@ -0,0 +1,269 @@
+"""
+WebSocket 브로드캐스트 백플레인
+
+여러 워커/파드(노드)에 나뉘어 접속한 상담원에게 메시지를 전달하기 위한 노드 간 통신 계층.
+각 노드는 자기 노드에 접속한 상담원의 세션 참여 정보만 보관하고(세션 참여 정보 샤딩),
+백플레인에는 "세션/상담원 → 노드" 색인만 공유합니다. 메시지는 수신자가 있는 노드에만 전달됩니다.
+"""
+from typing import Callable, Dict, Iterable, List, Optional, Set, Union
+import asyncio
+import json
+import logging
+import os
+
+try:
+    import redis.asyncio as redis
+except ImportError:  # 선택 의존성: 단일 노드에서는 InMemoryBackplane 사용
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+# 전달 범위
+SCOPE_SESSION = "session"
+SCOPE_SESSION_END = "session_end"
+SCOPE_AGENT = "agent"
+SCOPE_ALL = "all"
+
+
+def encode_envelope(scope: str, target: Union[str, List[str]], origin: str, payload: str) -> str:
+    """노드 간 전달 메시지 구성 (인코딩된 payload는 다시 인코딩하지 않음)"""
+    return json.dumps([scope, target, origin]) + "\n" + payload
+
+
+def decode_envelope(envelope: str):
+    """노드 간 전달 메시지 해석 -> (scope, target, origin, payload)"""
+    header, payload = envelope.split("\n", 1)
+    scope, target, origin = json.loads(header)
+    return scope, target, origin, payload
+
+
+class Backplane:
+    """백플레인 인터페이스"""
+
+    async def start(self, node_id: str, on_message: Callable[[str], None]):
+        """노드 등록 및 수신 시작 (on_message는 수신한 전달 메시지로 호출)"""
+        raise NotImplementedError
+
+    async def stop(self):
+        """수신 중단 및 이 노드의 색인 정리"""
+        raise NotImplementedError
+
+    async def publish(self, node_ids: Iterable[str], envelope: str):
+        """지정한 노드들에 전달"""
+        raise NotImplementedError
+
+    async def publish_all(self, envelope: str):
+        """모든 노드에 전달"""
+        raise NotImplementedError
+
+    async def add_member(self, session_id: str, agent_id: str, node_id: str):
+        """세션 참여자 색인 추가"""
+        raise NotImplementedError
+
+    async def remove_member(self, session_id: str, agent_id: str, node_id: str):
+        """세션 참여자 색인 제거 (다른 노드로 재접속해 다시 참여한 경우는 유지)"""
+        raise NotImplementedError
+
+    async def get_session_members(self, session_id: str) -> Dict[str, str]:
+        """세션 참여자 조회 -> {agent_id: node_id}"""
+        raise NotImplementedError
+
+    async def get_session_nodes(self, session_id: str) -> Set[str]:
+        """세션 참여자가 접속한 노드 조회"""
+        return set((await self.get_session_members(session_id)).values())
+
+    async def register_agent(self, agent_id: str, node_id: str):
+        """상담원 접속 노드 등록"""
+        raise NotImplementedError
+
+    async def unregister_agent(self, agent_id: str, node_id: str):
+        """상담원 접속 노드 해제 (다른 노드로 재접속한 경우는 유지)"""
+        raise NotImplementedError
+
+    async def get_agent_node(self, agent_id: str) -> Optional[str]:
+        """상담원 접속 노드 조회"""
+        raise NotImplementedError
+
+
+class InMemoryBroker:
+    """같은 프로세스의 InMemoryBackplane들이 공유하는 색인과 노드 목록"""
+
+    def __init__(self):
+        self.members: Dict[str, Dict[str, str]] = {}
+        self.agents: Dict[str, str] = {}
+        self.nodes: Dict[str, Callable[[str], None]] = {}
+
+
+class InMemoryBackplane(Backplane):
+    """프로세스 내 백플레인 (단일 워커 또는 테스트용, broker를 공유하면 여러 노드 흉내)"""
+
+    def __init__(self, broker: Optional[InMemoryBroker] = None):
+        self.broker = broker or InMemoryBroker()
+        self.node_id: Optional[str] = None
+
+    async def start(self, node_id: str, on_message: Callable[[str], None]):
+        self.node_id = node_id
+        self.broker.nodes[node_id] = on_message
+
+    async def stop(self):
+        self.broker.nodes.pop(self.node_id, None)
+        for session_id, members in list(self.broker.members.items()):
+            for agent_id in [a for a, n in members.items() if n == self.node_id]:
+                del members[agent_id]
+            if not members:
+                del self.broker.members[session_id]
+        for agent_id in [a for a, n in self.broker.agents.items() if n == self.node_id]:
+            del self.broker.agents[agent_id]
+
+    async def publish(self, node_ids: Iterable[str], envelope: str):
+        for node_id in node_ids:
+            on_message = self.broker.nodes.get(node_id)
+            if on_message is not None:
+                on_message(envelope)
+
+    async def publish_all(self, envelope: str):
+        await self.publish(list(self.broker.nodes), envelope)
+
+    async def add_member(self, session_id: str, agent_id: str, node_id: str):
+        self.broker.members.setdefault(session_id, {})[agent_id] = node_id
+
+    async def remove_member(self, session_id: str, agent_id: str, node_id: str):
+        members = self.broker.members.get(session_id)
+        if members is not None and members.get(agent_id) == node_id:
+            del members[agent_id]
+            if not members:
+                del self.broker.members[session_id]
+
+    async def get_session_members(self, session_id: str) -> Dict[str, str]:
+        return dict(self.broker.members.get(session_id, {}))
+
+    async def register_agent(self, agent_id: str, node_id: str):
+        self.broker.agents[agent_id] = node_id
+
+    async def unregister_agent(self, agent_id: str, node_id: str):
+        if self.broker.agents.get(agent_id) == node_id:
+            del self.broker.agents[agent_id]
+
+    async def get_agent_node(self, agent_id: str) -> Optional[str]:
+        return self.broker.agents.get(agent_id)
+
+
+# 현재 값이 이 노드일 때만 삭제 (다른 노드로 재접속한 상담원 보호)
+_HDEL_IF_EQUAL = """
+if redis.call('hget', KEYS[1], ARGV[1]) == ARGV[2] then
+    return redis.call('hdel', KEYS[1], ARGV[1])
+end
+return 0
+"""
+
+
+class RedisBackplane(Backplane):
+    """Redis Pub/Sub 백플레인
+
+    키 구성 (prefix 기본값 "agent_ws"):
+        {prefix}:session:{session_id}  해시 agent_id -> node_id
+        {prefix}:agents                해시 agent_id -> node_id
+        {prefix}:node:{node_id}        노드별 채널
+        {prefix}:all                   전체 채널
+    """
+
+    def __init__(self, redis_url: str = "redis://localhost:6379/0", prefix: str = "agent_ws"):
+        if redis is None:
+            raise ImportError("RedisBackplane requires the 'redis' package (pip install redis)")
+        self.client = redis.from_url(redis_url, decode_responses=True)
+        self.prefix = prefix
+        self.node_id: Optional[str] = None
+        self._pubsub = None
+        self._listener: Optional[asyncio.Task] = None
+        self._local_members: Set[tuple] = set()
+        self._hdel_if_equal = self.client.register_script(_HDEL_IF_EQUAL)
+
+    def _session_key(self, session_id: str) -> str:
+        return f"{self.prefix}:session:{session_id}"
+
+    def _node_channel(self, node_id: str) -> str:
+        return f"{self.prefix}:node:{node_id}"
+
+    async def start(self, node_id: str, on_message: Callable[[str], None]):
+        self.node_id = node_id
+        self._pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        await self._pubsub.subscribe(self._node_channel(node_id), f"{self.prefix}:all")
+        self._listener = asyncio.create_task(self._listen(on_message))
+
+    async def _listen(self, on_message: Callable[[str], None]):
+        """구독 채널 수신 루프"""
+        async for message in self._pubsub.listen():
+            if message.get("type") != "message":
+                continue
+            try:
+                on_message(message["data"])
+            except Exception as e:
+                logger.error(f"Error handling backplane message: {e}")
+
+    async def stop(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+        if self._pubsub is not None:
+            await self._pubsub.unsubscribe()
+            await self._pubsub.aclose()
+
+        # 이 노드에 남은 세션 참여 색인 정리
+        if self._local_members:
+            async with self.client.pipeline(transaction=False) as pipe:
+                for session_id, agent_id in self._local_members:
+                    await self._hdel_if_equal(
+                        keys=[self._session_key(session_id)], args=[agent_id, self.node_id], client=pipe
+                    )
+                await pipe.execute()
+            self._local_members.clear()
+        await self.client.aclose()
+
+    async def publish(self, node_ids: Iterable[str], envelope: str):
+        node_ids = list(node_ids)
+        if len(node_ids) == 1:
+            await self.client.publish(self._node_channel(node_ids[0]), envelope)
+            return
+        async with self.client.pipeline(transaction=False) as pipe:
+            for node_id in node_ids:
+                pipe.publish(self._node_channel(node_id), envelope)
+            await pipe.execute()
+
+    async def publish_all(self, envelope: str):
+        await self.client.publish(f"{self.prefix}:all", envelope)
+
+    async def add_member(self, session_id: str, agent_id: str, node_id: str):
+        await self.client.hset(self._session_key(session_id), agent_id, node_id)
+        if node_id == self.node_id:
+            self._local_members.add((session_id, agent_id))
+
+    async def remove_member(self, session_id: str, agent_id: str, node_id: str):
+        await self._hdel_if_equal(keys=[self._session_key(session_id)], args=[agent_id, node_id])
+        if node_id == self.node_id:
+            self._local_members.discard((session_id, agent_id))
+
+    async def get_session_members(self, session_id: str) -> Dict[str, str]:
+        return await self.client.hgetall(self._session_key(session_id))
+
+    async def get_session_nodes(self, session_id: str) -> Set[str]:
+        return set(await self.client.hvals(self._session_key(session_id)))
+
+    async def register_agent(self, agent_id: str, node_id: str):
+        await self.client.hset(f"{self.prefix}:agents", agent_id, node_id)
+
+    async def unregister_agent(self, agent_id: str, node_id: str):
+        await self._hdel_if_equal(keys=[f"{self.prefix}:agents"], args=[agent_id, node_id])
+
+    async def get_agent_node(self, agent_id: str) -> Optional[str]:
+        return await self.client.hget(f"{self.prefix}:agents", agent_id)
+
+
+def create_backplane() -> Backplane:
+    """환경 변수에 따라 백플레인 생성 (REDIS_URL이 있으면 Redis, 없으면 프로세스 내)"""
+    redis_url = os.getenv("REDIS_URL")
+    if redis_url:
+        return RedisBackplane(redis_url, prefix=os.getenv("WS_BACKPLANE_PREFIX", "agent_ws"))
+    return InMemoryBackplane()
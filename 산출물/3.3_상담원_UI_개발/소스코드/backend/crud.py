@@ -0,0 +1,190 @@
+"""
+상담원 데스크탑 비동기 CRUD 함수
+
+모든 함수는 AsyncSession을 받아 이벤트 루프를 막지 않고 쿼리합니다.
+"""
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional
+
+from sqlalchemy import inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from customer_search import customer_search
+from models import (
+    Agent, AgentStatus, Call, ChatSession, ChatSessionStatus, Customer, CustomerInteraction,
+    Message, MessageSender
+)
+from pagination import DEFAULT_PAGE_SIZE, Page, paginate
+
+# 상담원에게 배정된 진행 중 세션 상태
+OPEN_SESSION_STATUSES = (ChatSessionStatus.active, ChatSessionStatus.waiting)
+
+
+def _day_range(day: date):
+    """하루의 [시작, 다음날 시작) 구간 (created_at 인덱스를 쓰도록 날짜 함수 대신 범위 비교)"""
+    start = datetime.combine(day, time.min)
+    return start, start + timedelta(days=1)
+
+
+def _fields(schema, exclude_unset: bool = False) -> dict:
+    """요청 스키마(pydantic)를 컬럼 값 dict로 변환"""
+    if isinstance(schema, dict):
+        return dict(schema)
+    return schema.model_dump(exclude_unset=exclude_unset)
+
+
+async def _commit_refresh(db: AsyncSession, obj):
+    """커밋 후 서버 기본값(created_at 등)을 다시 읽어 반환 (이미 읽은 관계는 유지)"""
+    await db.commit()
+    await db.refresh(obj, attribute_names=[attr.key for attr in inspect(obj).mapper.column_attrs])
+    return obj
+
+
+# 상담원
+async def get_agent(db: AsyncSession, agent_id: str) -> Optional[Agent]:
+    return await db.get(Agent, agent_id)
+
+
+async def get_agent_by_username(db: AsyncSession, username: str) -> Optional[Agent]:
+    result = await db.execute(select(Agent).where(Agent.username == username))
+    return result.scalar_one_or_none()
+
+
+async def authenticate_agent(db: AsyncSession, username: str, password: str) -> Optional[Agent]:
+    """사용자명/비밀번호 확인 (비활성 상담원은 거부)"""
+    from auth import verify_password  # auth가 crud를 사용하므로 순환 import 방지
+
+    agent = await get_agent_by_username(db, username)
+    if agent is None or not agent.is_active or not verify_password(password, agent.password_hash):
+        return None
+    return agent
+
+
+async def update_agent_status(db: AsyncSession, agent_id: str, status: str) -> Optional[Agent]:
+    agent = await db.get(Agent, agent_id)
+    if agent is None:
+        return None
+    agent.status = AgentStatus(status)
+    return await _commit_refresh(db, agent)
+
+
+# 고객
+async def get_customer(db: AsyncSession, customer_id: str) -> Optional[Customer]:
+    return await db.get(Customer, customer_id)
+
+
+async def search_customers(db: AsyncSession, query: str, limit: int = 20) -> List[Customer]:
+    """이름/전화번호/이메일 트라이그램 검색 (관련도 순)"""
+    return await customer_search.search(db, query, limit)
+
+
+async def update_customer(db: AsyncSession, customer_id: str, customer_update) -> Optional[Customer]:
+    customer = await db.get(Customer, customer_id)
+    if customer is None:
+        return None
+    for field, value in _fields(customer_update, exclude_unset=True).items():
+        setattr(customer, field, value)
+    await _commit_refresh(db, customer)
+    customer_search.index_customer(customer)
+    return customer
+
+
+# 채팅
+async def get_active_chat_sessions(db: AsyncSession, agent_id: str, limit: int = DEFAULT_PAGE_SIZE,
+                                   cursor: Optional[str] = None) -> Page:
+    """상담원의 진행 중 세션 (최신순 키셋 페이지)"""
+    statement = select(ChatSession).where(
+        ChatSession.agent_id == agent_id, ChatSession.status.in_(OPEN_SESSION_STATUSES)
+    )
+    return await paginate(db, statement, ChatSession, cursor, limit)
+
+
+async def get_chat_session(db: AsyncSession, session_id: str) -> Optional[ChatSession]:
+    # 메시지는 get_session_messages로 페이지 단위 조회
+    return await db.get(ChatSession, session_id)
+
+
+async def get_session_messages(db: AsyncSession, session_id: str, limit: int = DEFAULT_PAGE_SIZE,
+                               cursor: Optional[str] = None) -> Page:
+    """세션 메시지 (최신순 키셋 페이지, 위로 스크롤하며 이전 메시지 조회)"""
+    statement = select(Message).where(Message.chat_session_id == session_id)
+    return await paginate(db, statement, Message, cursor, limit)
+
+
+async def create_message(db: AsyncSession, session_id: str, agent_id: str, message) -> Message:
+    new_message = Message(
+        chat_session_id=session_id, agent_id=agent_id, sender=MessageSender.agent, **_fields(message)
+    )
+    db.add(new_message)
+    return await _commit_refresh(db, new_message)
+
+
+async def update_chat_session_status(db: AsyncSession, session_id: str, status: str) -> Optional[ChatSession]:
+    session = await db.get(ChatSession, session_id)
+    if session is None:
+        return None
+    session.status = ChatSessionStatus(status)
+    if session.status == ChatSessionStatus.ended and session.end_time is None:
+        session.end_time = datetime.now()
+    return await _commit_refresh(db, session)
+
+
+async def get_agent_chats_by_date(db: AsyncSession, agent_id: str, day: date) -> List[ChatSession]:
+    start, end = _day_range(day)
+    result = await db.execute(
+        select(ChatSession).where(
+            ChatSession.agent_id == agent_id, ChatSession.created_at >= start, ChatSession.created_at < end
+        )
+    )
+    return list(result.scalars())
+
+
+# 통화
+async def get_agent_call_history(db: AsyncSession, agent_id: str, limit: int = 50) -> List[Call]:
+    result = await db.execute(
+        select(Call).where(Call.agent_id == agent_id).order_by(Call.created_at.desc()).limit(limit)
+    )
+    return list(result.scalars())
+
+
+async def create_call(db: AsyncSession, agent_id: str, call) -> Call:
+    new_call = Call(agent_id=agent_id, **_fields(call))
+    db.add(new_call)
+    return await _commit_refresh(db, new_call)
+
+
+async def update_call(db: AsyncSession, call_id: str, call_update) -> Optional[Call]:
+    call = await db.get(Call, call_id)
+    if call is None:
+        return None
+    for field, value in _fields(call_update, exclude_unset=True).items():
+        setattr(call, field, value)
+    return await _commit_refresh(db, call)
+
+
+async def get_agent_calls_by_date(db: AsyncSession, agent_id: str, day: date) -> List[Call]:
+    start, end = _day_range(day)
+    result = await db.execute(
+        select(Call).where(Call.agent_id == agent_id, Call.created_at >= start, Call.created_at < end)
+    )
+    return list(result.scalars())
+
+
+# 상담 이력
+async def get_customer_interactions(db: AsyncSession, customer_id: str, limit: int = DEFAULT_PAGE_SIZE,
+                                    cursor: Optional[str] = None) -> Page:
+    """고객 상담 이력 (최신순 키셋 페이지)"""
+    statement = select(CustomerInteraction).where(CustomerInteraction.customer_id == customer_id)
+    return await paginate(db, statement, CustomerInteraction, cursor, limit)
+
+
+async def get_agent_interactions(db: AsyncSession, agent_id: str, limit: int = DEFAULT_PAGE_SIZE,
+                                 cursor: Optional[str] = None) -> Page:
+    """상담원 상담 이력 (최신순 키셋 페이지)"""
+    statement = select(CustomerInteraction).where(CustomerInteraction.agent_id == agent_id)
+    return await paginate(db, statement, CustomerInteraction, cursor, limit)
+
+
+async def create_customer_interaction(db: AsyncSession, agent_id: str, interaction) -> CustomerInteraction:
+    new_interaction = CustomerInteraction(agent_id=agent_id, **_fields(interaction))
+    db.add(new_interaction)
+    return await _commit_refresh(db, new_interaction)
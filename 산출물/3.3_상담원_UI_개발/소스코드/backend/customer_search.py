@@ -0,0 +1,323 @@
+"""
+고객 검색 서브시스템
+
+이름/전화번호/이메일을 정규화해 Customer.search_* 컬럼에 저장하고 트라이그램으로 검색합니다.
+- PostgreSQL: pg_trgm GIN 인덱스 + similarity() 순위
+  (한글 트라이그램은 DB의 LC_CTYPE이 UTF-8 로케일이어야 생성됨)
+- 그 외(SQLite 테스트 등): 프로세스 내 트라이그램 역색인
+"""
+from typing import Dict, List, Optional, Set, Tuple
+import asyncio
+import logging
+import math
+import os
+import re
+import unicodedata
+
+from sqlalchemy import case, event, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import Customer
+
+logger = logging.getLogger(__name__)
+
+# 검색 결과에 포함할 최소 유사도 (부분 문자열 일치는 유사도와 관계없이 포함)
+SEARCH_MIN_SIMILARITY = float(os.getenv("CUSTOMER_SEARCH_MIN_SIMILARITY", "0.3"))
+
+# 전화번호 검색 최소 자릿수
+MIN_PHONE_DIGITS = 3
+
+# 부분 문자열 일치 가산점 (정확히 일치하면 2배)
+SUBSTRING_BONUS = 1.0
+
+_NON_WORD = re.compile(r"[\W_]+", re.UNICODE)
+_NON_DIGIT = re.compile(r"\D+")
+_DIGIT = re.compile(r"\d+")
+
+
+def normalize_name(value: Optional[str]) -> str:
+    """이름 정규화 (전각/반각 통일, 소문자, 공백/기호 제거)"""
+    if not value:
+        return ""
+    return _NON_WORD.sub("", unicodedata.normalize("NFKC", value).lower())
+
+
+def normalize_phone(value: Optional[str]) -> str:
+    """전화번호 정규화 (숫자만, 국가번호 +82는 0으로)"""
+    if not value:
+        return ""
+    value = unicodedata.normalize("NFKC", value).strip()
+    digits = _NON_DIGIT.sub("", value)
+    if digits.startswith("82") and (value.startswith("+") or len(digits) >= 11):
+        digits = "0" + digits[2:]
+    return digits
+
+
+def normalize_email(value: Optional[str]) -> str:
+    """이메일 정규화 (소문자, 앞뒤 공백 제거)"""
+    if not value:
+        return ""
+    return unicodedata.normalize("NFKC", value).strip().lower()
+
+
+def trigrams(value: str) -> Set[str]:
+    """pg_trgm과 같은 방식의 트라이그램 (앞 2칸, 뒤 1칸 공백 패딩)"""
+    if not value:
+        return set()
+    padded = f"  {value} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def similarity(a: str, b: str) -> float:
+    """트라이그램 자카드 유사도 (pg_trgm similarity와 동일한 정의)"""
+    ga, gb = trigrams(a), trigrams(b)
+    if not ga or not gb:
+        return 0.0
+    shared = len(ga & gb)
+    return shared / (len(ga) + len(gb) - shared)
+
+
+def normalize_query(query: str) -> Dict[str, str]:
+    """검색어를 필드별 정규화 값으로 변환 (숫자는 전화번호, 나머지 글자는 이름으로 검색)"""
+    terms = {}
+    name = normalize_name(_DIGIT.sub("", query))
+    if name:
+        terms["name"] = name
+    digits = normalize_phone(query)
+    if len(digits) >= MIN_PHONE_DIGITS:
+        terms["phone"] = digits
+    email = normalize_email(query)
+    if len(email) >= 3 and email.isascii() and any(c.isalpha() for c in email) and not any(c.isspace() for c in email):
+        terms["email"] = email
+    return terms
+
+
+def apply_search_fields(customer: Customer):
+    """고객의 정규화 검색 컬럼 갱신"""
+    customer.search_name = normalize_name(customer.name)
+    customer.search_phone = normalize_phone(customer.phone)
+    customer.search_email = normalize_email(customer.email)
+
+
+@event.listens_for(Customer, "before_insert")
+@event.listens_for(Customer, "before_update")
+def _sync_search_fields(mapper, connection, customer: Customer):
+    """고객 저장 시 검색 컬럼 자동 갱신"""
+    apply_search_fields(customer)
+
+
+class TrigramIndex:
+    """프로세스 내 트라이그램 역색인 (필드별 트라이그램 -> 고객 ID)"""
+
+    FIELDS = ("name", "phone", "email")
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[str, Set[str]]] = {field: {} for field in self.FIELDS}
+        self._documents: Dict[str, Dict[str, str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def add(self, customer_id: str, fields: Dict[str, str]):
+        """고객 색인 추가/갱신 (바뀐 필드의 트라이그램만 갱신)"""
+        previous = self._documents.get(customer_id, {})
+        for field in self.FIELDS:
+            old_value, new_value = previous.get(field, ""), fields.get(field, "")
+            if old_value == new_value:
+                continue
+            postings = self._postings[field]
+            for gram in trigrams(old_value) - trigrams(new_value):
+                ids = postings.get(gram)
+                if ids is not None:
+                    ids.discard(customer_id)
+                    if not ids:
+                        del postings[gram]
+            for gram in trigrams(new_value) - trigrams(old_value):
+                postings.setdefault(gram, set()).add(customer_id)
+        self._documents[customer_id] = {field: fields.get(field, "") for field in self.FIELDS}
+
+    def remove(self, customer_id: str):
+        """고객 색인 제거"""
+        if customer_id in self._documents:
+            self.add(customer_id, {})
+            del self._documents[customer_id]
+
+    def search(self, terms: Dict[str, str], limit: int, min_similarity: float = SEARCH_MIN_SIMILARITY) -> List[Tuple[str, float]]:
+        """
+        필드별 검색어로 고객 ID 순위 조회
+
+        Args:
+            terms: normalize_query() 결과
+            limit: 최대 결과 수
+            min_similarity: 최소 유사도
+
+        Returns:
+            (customer_id, 점수) 목록 (점수 내림차순)
+        """
+        scores: Dict[str, float] = {}
+        for field, term in terms.items():
+            query_grams = trigrams(term)
+            postings = self._postings[field]
+            for customer_id in self._candidates(field, term, query_grams, min_similarity):
+                value = self._documents[customer_id][field]
+                shared = sum(1 for gram in query_grams if customer_id in postings.get(gram, ()))
+                score = shared / (len(query_grams) + len(trigrams(value)) - shared)
+                if term in value:
+                    score += SUBSTRING_BONUS * (2 if term == value else 1)
+                elif score < min_similarity:
+                    continue
+                # 여러 필드가 맞으면 합산 (예: "홍길동 5678")
+                scores[customer_id] = scores.get(customer_id, 0.0) + score
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:limit]
+
+    def _candidates(self, field: str, term: str, query_grams: Set[str], min_similarity: float) -> Set[str]:
+        """
+        후보 고객 ID (흔한 트라이그램의 긴 목록은 훑지 않음)
+
+        - 부분 문자열 일치: 검색어 내부 트라이그램을 모두 포함해야 하므로 짧은 목록부터 교집합
+        - 유사도 일치(전화번호 제외): 유사도 >= t 이면 공유 트라이그램이 ceil(t * |Q|)개 이상이므로
+          가장 드문 |Q| - ceil(t * |Q|) + 1개 트라이그램 중 하나에는 반드시 포함됨
+        """
+        postings = self._postings[field]
+        candidates: Set[str] = set()
+
+        interior = sorted(
+            (postings.get(term[i:i + 3], set()) for i in range(len(term) - 2)), key=len
+        )
+        if interior:
+            matched = set(interior[0])
+            for ids in interior[1:]:
+                if not matched:
+                    break
+                matched &= ids
+            candidates |= matched
+
+        if field != "phone":
+            required = max(1, math.ceil(min_similarity * len(query_grams)))
+            rarest = sorted((postings.get(gram, set()) for gram in query_grams), key=len)
+            for ids in rarest[:len(query_grams) - required + 1]:
+                candidates |= ids
+        return candidates
+
+
+class CustomerSearchService:
+    """고객 검색 (DB 트라이그램 인덱스 또는 프로세스 내 색인)"""
+
+    def __init__(self, min_similarity: float = SEARCH_MIN_SIMILARITY):
+        self.min_similarity = min_similarity
+        self.index: Optional[TrigramIndex] = None
+        self._index_lock = asyncio.Lock()
+
+    async def search(self, db: AsyncSession, query: str, limit: int = 20) -> List[Customer]:
+        """
+        고객 검색
+
+        Args:
+            db: 비동기 DB 세션
+            query: 이름, 전화번호(일부), 이메일 등 자유 입력
+            limit: 최대 결과 수
+
+        Returns:
+            관련도 순 고객 목록
+        """
+        terms = normalize_query(query)
+        if not terms:
+            return []
+        if db.get_bind().dialect.name == "postgresql":
+            return await self._search_postgres(db, terms, limit)
+        return await self._search_index(db, terms, limit)
+
+    async def _search_postgres(self, db: AsyncSession, terms: Dict[str, str], limit: int) -> List[Customer]:
+        """pg_trgm 인덱스 검색 (% 연산자와 LIKE 모두 GIN 트라이그램 인덱스 사용)"""
+        columns = {"name": Customer.search_name, "phone": Customer.search_phone, "email": Customer.search_email}
+        conditions, scores = [], []
+        for field, term in terms.items():
+            column = columns[field]
+            conditions.append(column.contains(term, autoescape=True))
+            scores.append(func.similarity(column, term) + case(
+                (column == term, SUBSTRING_BONUS * 2),
+                (func.strpos(column, term) > 0, SUBSTRING_BONUS),
+                else_=0.0
+            ))
+            if field != "phone":
+                conditions.append(column.op("%")(term))
+
+        # 여러 필드가 맞으면 합산 (예: "홍길동 5678")
+        score = sum(scores[1:], scores[0])
+        await db.execute(select(func.set_limit(self.min_similarity)))
+        result = await db.execute(
+            select(Customer).where(or_(*conditions)).order_by(score.desc(), Customer.id).limit(limit)
+        )
+        return list(result.scalars())
+
+    async def _search_index(self, db: AsyncSession, terms: Dict[str, str], limit: int) -> List[Customer]:
+        """프로세스 내 색인 검색 (첫 검색 시 전체 색인 생성)"""
+        index = await self._ensure_index(db)
+        ranked = index.search(terms, limit, self.min_similarity)
+        if not ranked:
+            return []
+        ids = [customer_id for customer_id, _ in ranked]
+        result = await db.execute(select(Customer).where(Customer.id.in_(ids)))
+        customers = {customer.id: customer for customer in result.scalars()}
+        return [customers[customer_id] for customer_id in ids if customer_id in customers]
+
+    async def _ensure_index(self, db: AsyncSession) -> TrigramIndex:
+        """프로세스 내 색인이 없으면 고객 테이블에서 생성"""
+        if self.index is not None:
+            return self.index
+        async with self._index_lock:
+            if self.index is None:
+                index = TrigramIndex()
+                result = await db.stream(select(
+                    Customer.id, Customer.name, Customer.phone, Customer.email,
+                    Customer.search_name, Customer.search_phone, Customer.search_email
+                ))
+                async for row in result:
+                    # 저장된 정규화 값 사용 (backfill 전 행만 다시 정규화)
+                    index.add(row.id, {
+                        "name": row.search_name if row.search_name is not None else normalize_name(row.name),
+                        "phone": row.search_phone if row.search_phone is not None else normalize_phone(row.phone),
+                        "email": row.search_email if row.search_email is not None else normalize_email(row.email),
+                    })
+                self.index = index
+                logger.info(f"Built in-process customer search index: {len(index)} customers")
+        return self.index
+
+    def index_customer(self, customer: Customer):
+        """고객 추가/수정 시 색인 갱신 (프로세스 내 색인을 쓰는 경우)"""
+        if self.index is not None:
+            self.index.add(customer.id, {
+                "name": customer.search_name or normalize_name(customer.name),
+                "phone": customer.search_phone or normalize_phone(customer.phone),
+                "email": customer.search_email or normalize_email(customer.email),
+            })
+
+    def remove_customer(self, customer_id: str):
+        """고객 삭제 시 색인 제거"""
+        if self.index is not None:
+            self.index.remove(customer_id)
+
+    def reset(self):
+        """프로세스 내 색인 폐기 (다음 검색 시 다시 생성)"""
+        self.index = None
+
+    async def backfill(self, db: AsyncSession, batch_size: int = 1000) -> int:
+        """검색 컬럼이 비어 있는 기존 고객 정규화 (배포 후 1회 실행)"""
+        updated = 0
+        while True:
+            result = await db.execute(
+                select(Customer).where(Customer.search_name.is_(None)).limit(batch_size)
+            )
+            customers = list(result.scalars())
+            if not customers:
+                return updated
+            for customer in customers:
+                apply_search_fields(customer)
+            await db.commit()
+            updated += len(customers)
+
+
+# 전역 고객 검색 서비스 인스턴스
+customer_search = CustomerSearchService()
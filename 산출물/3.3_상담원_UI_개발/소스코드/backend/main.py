@@ -1,7 +1,8 @@
-from fastapi import FastAPI, HTTPException, Depends, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, HTTPException, Depends, Request, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 import asyncio
 import json
@@ -9,7 +10,7 @@ import logging
 from datetime import datetime, timedelta
 import uuid
 
-from database import get_db, engine
+from database import get_async_db, create_tables_async
 from models import Base, Agent, Customer, ChatSession, Message, Call, CustomerInteraction
 from schemas import (
     AgentCreate, AgentResponse, AgentLogin, AgentStatusUpdate,
@@ -20,11 +21,11 @@ from schemas import (
 )
 from auth import create_access_token, verify_token, get_current_agent
 from websocket_manager import ConnectionManager
+from backplane import create_backplane
+from stats_service import stats_service
+from pagination import InvalidCursorError, Page
 import crud
 
-# 데이터베이스 테이블 생성
-Base.metadata.create_all(bind=engine)
-
 app = FastAPI(
     title="상담원 데스크탑 API",
     description="AWS Connect 기반 콜센터 상담원 UI API",
@@ -38,18 +39,38 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # 보안 설정
 security = HTTPBearer()
 
-# WebSocket 연결 관리자
-manager = ConnectionManager()
+# WebSocket 연결 관리자 (REDIS_URL 설정 시 여러 워커/파드 간 메시지 전달)
+manager = ConnectionManager(backplane=create_backplane())
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def startup_event():
+    # 데이터베이스 테이블 생성
+    await create_tables_async(Base.metadata)
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await manager.stop()
+
+@app.exception_handler(InvalidCursorError)
+async def invalid_cursor_handler(request: Request, exc: InvalidCursorError):
+    return JSONResponse(status_code=400, content={"detail": "잘못된 페이지 커서입니다."})
+
+def page_items(response: Response, page: Page):
+    """페이지 항목 반환 (다음 페이지 커서는 X-Next-Cursor 헤더로 전달)"""
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.items
+
 @app.get("/")
 async def root():
     return {"message": "상담원 데스크탑 API 서버가 실행 중입니다."}
@@ -60,16 +81,16 @@ async def health_check():
 
 # 인증 관련 엔드포인트
 @app.post("/auth/login", response_model=dict)
-async def login(agent_login: AgentLogin, db: Session = Depends(get_db)):
+async def login(agent_login: AgentLogin, db: AsyncSession = Depends(get_async_db)):
     """상담원 로그인"""
-    agent = crud.authenticate_agent(db, agent_login.username, agent_login.password)
+    agent = await crud.authenticate_agent(db, agent_login.username, agent_login.password)
     if not agent:
         raise HTTPException(status_code=401, detail="잘못된 사용자명 또는 비밀번호")
     
     access_token = create_access_token(data={"sub": agent.username})
     
     # 상담원 상태를 'available'로 업데이트
-    crud.update_agent_status(db, agent.id, "available")
+    await crud.update_agent_status(db, agent.id, "available")
     
     return {
         "access_token": access_token,
@@ -85,19 +106,20 @@ async def login(agent_login: AgentLogin, db: Session = Depends(get_db)):
     }
 
 @app.post("/auth/logout")
-async def logout(current_agent: Agent = Depends(get_current_agent), db: Session = Depends(get_db)):
+async def logout(current_agent: Agent = Depends(get_current_agent), db: AsyncSession = Depends(get_async_db)):
     """상담원 로그아웃"""
-    crud.update_agent_status(db, current_agent.id, "offline")
+    await crud.update_agent_status(db, current_agent.id, "offline")
     return {"message": "로그아웃되었습니다."}
 
 @app.put("/auth/status")
 async def update_status(
     status_update: AgentStatusUpdate,
     current_agent: Agent = Depends(get_current_agent),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """상담원 상태 업데이트"""
-    crud.update_agent_status(db, current_agent.id, status_update.status)
+    await crud.update_agent_status(db, current_agent.id, status_update.status)
+    manager.update_presence(str(current_agent.id), status_update.status)
     return {"message": "상태가 업데이트되었습니다.", "status": status_update.status}
 
 # 고객 관련 엔드포인트
@@ -106,20 +128,20 @@ async def search_customers(
     query: str,
     limit: int = 10,
     current_agent: Agent = Depends(get_current_agent),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """고객 검색"""
-    customers = crud.search_customers(db, query, limit)
+    customers = await crud.search_customers(db, query, limit)
     return customers
 
 @app.get("/customers/{customer_id}", response_model=CustomerResponse)
 async def get_customer(
     customer_id: str,
     current_agent: Agent = Depends(get_current_agent),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """고객 정보 조회"""
-    customer = crud.get_customer(db, customer_id)
+    customer = await crud.get_customer(db, customer_id)
     if not customer:
         raise HTTPException(status_code=404, detail="고객을 찾을 수 없습니다.")
     return customer
@@ -129,10 +151,10 @@ async def update_customer(
     customer_id: str,
     customer_update: CustomerUpdate,
     current_agent: Agent = Depends(get_current_agent),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """고객 정보 업데이트"""
-    customer = crud.update_customer(db, customer_id, customer_update)
+    customer = await crud.update_customer(db, customer_id, customer_update)
     if not customer:
         raise HTTPException(status_code=404, detail="고객을 찾을 수 없습니다.")
     return customer
@@ -140,46 +162,65 @@ async def update_customer(
 @app.get("/customers/{customer_id}/history", response_model=List[CustomerInteractionResponse])
 async def get_customer_history(
     customer_id: str,
+    response: Response,
     limit: int = 50,
+    cursor: Optional[str] = None,
     current_agent: Agent = Depends(get_current_agent),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """고객 상담 이력 조회"""
-    history = crud.get_customer_interactions(db, customer_id, limit)
-    return history
+    """고객 상담 이력 조회 (다음 페이지는 X-Next-Cursor 값을 cursor로 전달)"""
+    history = await crud.get_customer_interactions(db, customer_id, limit, cursor)
+    return page_items(response, history)
 
 # 채팅 관련 엔드포인트
 @app.get("/chat/sessions", response_model=List[ChatSessionResponse])
 async def get_chat_sessions(
+    response: Response,
+    limit: int = 50,
+    cursor: Optional[str] = None,
     current_agent: Agent = Depends(get_current_agent),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """활성 채팅 세션 목록 조회"""
-    sessions = crud.get_active_chat_sessions(db, current_agent.id)
-    return sessions
+    """활성 채팅 세션 목록 조회 (다음 페이지는 X-Next-Cursor 값을 cursor로 전달)"""
+    sessions = await crud.get_active_chat_sessions(db, current_agent.id, limit, cursor)
+    return page_items(response, sessions)
 
 @app.get("/chat/sessions/{session_id}", response_model=ChatSessionResponse)
 async def get_chat_session(
     session_id: str,
     current_agent: Agent = Depends(get_current_agent),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """특정 채팅 세션 조회"""
-    session = crud.get_chat_session(db, session_id)
+    session = await crud.get_chat_session(db, session_id)
     if not session:
         raise HTTPException(status_code=404, detail="채팅 세션을 찾을 수 없습니다.")
     return session
 
+@app.get("/chat/sessions/{session_id}/messages", response_model=List[MessageResponse])
+async def get_session_messages(
+    session_id: str,
+    response: Response,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    current_agent: Agent = Depends(get_current_agent),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """채팅 메시지 조회 (최신순, 이전 메시지는 X-Next-Cursor 값을 cursor로 전달)"""
+    messages = await crud.get_session_messages(db, session_id, limit, cursor)
+    return page_items(response, messages)
+
 @app.post("/chat/sessions/{session_id}/messages", response_model=MessageResponse)
 async def send_message(
     session_id: str,
     message: MessageCreate,
     current_agent: Agent = Depends(get_current_agent),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """메시지 전송"""
     # 메시지 저장
-    new_message = crud.create_message(db, session_id, current_agent.id, message)
+    new_message = await crud.create_message(db, session_id, current_agent.id, message)
+    stats_service.invalidate(current_agent.id)
     
     # WebSocket을 통해 실시간 전송
     await manager.broadcast_to_session(session_id, {
@@ -201,12 +242,13 @@ async def update_chat_session_status(
     session_id: str,
     status: str,
     current_agent: Agent = Depends(get_current_agent),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """채팅 세션 상태 업데이트"""
-    session = crud.update_chat_session_status(db, session_id, status)
+    session = await crud.update_chat_session_status(db, session_id, status)
     if not session:
         raise HTTPException(status_code=404, detail="채팅 세션을 찾을 수 없습니다.")
+    stats_service.invalidate(session.agent_id)
     
     # WebSocket을 통해 상태 변경 알림
     await manager.broadcast_to_session(session_id, {
@@ -221,20 +263,21 @@ async def update_chat_session_status(
 async def get_call_history(
     limit: int = 50,
     current_agent: Agent = Depends(get_current_agent),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """통화 이력 조회"""
-    calls = crud.get_agent_call_history(db, current_agent.id, limit)
+    calls = await crud.get_agent_call_history(db, current_agent.id, limit)
     return calls
 
 @app.post("/calls", response_model=CallResponse)
 async def create_call(
     call: CallCreate,
     current_agent: Agent = Depends(get_current_agent),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """새 통화 생성"""
-    new_call = crud.create_call(db, current_agent.id, call)
+    new_call = await crud.create_call(db, current_agent.id, call)
+    stats_service.invalidate(current_agent.id)
     return new_call
 
 @app.put("/calls/{call_id}", response_model=CallResponse)
@@ -242,42 +285,45 @@ async def update_call(
     call_id: str,
     call_update: CallUpdate,
     current_agent: Agent = Depends(get_current_agent),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """통화 정보 업데이트"""
-    call = crud.update_call(db, call_id, call_update)
+    call = await crud.update_call(db, call_id, call_update)
     if not call:
         raise HTTPException(status_code=404, detail="통화를 찾을 수 없습니다.")
+    stats_service.invalidate(call.agent_id)
     return call
 
 # 상담 이력 관련 엔드포인트
 @app.get("/interactions", response_model=List[CustomerInteractionResponse])
 async def get_interactions(
+    response: Response,
     limit: int = 50,
     customer_id: Optional[str] = None,
+    cursor: Optional[str] = None,
     current_agent: Agent = Depends(get_current_agent),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """상담 이력 조회"""
+    """상담 이력 조회 (다음 페이지는 X-Next-Cursor 값을 cursor로 전달)"""
     if customer_id:
-        interactions = crud.get_customer_interactions(db, customer_id, limit)
+        interactions = await crud.get_customer_interactions(db, customer_id, limit, cursor)
     else:
-        interactions = crud.get_agent_interactions(db, current_agent.id, limit)
-    return interactions
+        interactions = await crud.get_agent_interactions(db, current_agent.id, limit, cursor)
+    return page_items(response, interactions)
 
 @app.post("/interactions", response_model=CustomerInteractionResponse)
 async def create_interaction(
     interaction: CustomerInteractionCreate,
     current_agent: Agent = Depends(get_current_agent),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """새 상담 이력 생성"""
-    new_interaction = crud.create_customer_interaction(db, current_agent.id, interaction)
+    new_interaction = await crud.create_customer_interaction(db, current_agent.id, interaction)
     return new_interaction
 
 # WebSocket 엔드포인트
 @app.websocket("/ws/{agent_id}")
-async def websocket_endpoint(websocket: WebSocket, agent_id: str, db: Session = Depends(get_db)):
+async def websocket_endpoint(websocket: WebSocket, agent_id: str):
     """WebSocket 연결 처리"""
     await manager.connect(websocket, agent_id)
     try:
@@ -285,53 +331,48 @@ async def websocket_endpoint(websocket: WebSocket, agent_id: str, db: Session =
             data = await websocket.receive_text()
             message_data = json.loads(data)
             
+            # 타이핑 상태는 세션별 최신 값만 남겨 주기적으로 브로드캐스트하므로 수신 제한 없이 항상 반영
+            # (제한으로 버리면 마지막 is_typing: false가 유실되어 입력 중 표시가 남음)
+            if message_data.get("type") == "typing":
+                manager.update_typing(agent_id, message_data["session_id"], message_data["is_typing"])
+                continue
+            
+            # 수신 제한 초과 프레임은 처리하지 않고 재시도 안내
+            if not manager.allow_inbound(agent_id):
+                await manager.send_personal_message(agent_id, {
+                    "type": "error",
+                    "data": {"code": "rate_limited", "request_type": message_data.get("type")}
+                })
+                continue
+            
             # 메시지 타입에 따른 처리
-            if message_data["type"] == "typing":
-                # 타이핑 상태 브로드캐스트
-                await manager.broadcast_to_session(
-                    message_data["session_id"],
-                    {
-                        "type": "typing",
-                        "data": {
-                            "agent_id": agent_id,
-                            "is_typing": message_data["is_typing"]
-                        }
-                    }
-                )
-            elif message_data["type"] == "join_session":
+            if message_data["type"] == "join_session":
                 # 세션 참여
                 await manager.join_session(agent_id, message_data["session_id"])
             elif message_data["type"] == "leave_session":
                 # 세션 떠나기
-                await manager.leave_session(agent_id, message_data["session_id"])
+                manager.leave_session(agent_id, message_data["session_id"])
                 
     except WebSocketDisconnect:
-        manager.disconnect(agent_id)
+        manager.disconnect(agent_id, websocket)
         logger.info(f"Agent {agent_id} disconnected")
 
 # 통계 및 대시보드 엔드포인트
 @app.get("/dashboard/stats")
 async def get_dashboard_stats(
     current_agent: Agent = Depends(get_current_agent),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """대시보드 통계 조회"""
-    today = datetime.now().date()
-    
-    # 오늘의 통계
-    today_calls = crud.get_agent_calls_by_date(db, current_agent.id, today)
-    today_chats = crud.get_agent_chats_by_date(db, current_agent.id, today)
-    
-    # 활성 세션 수
-    active_sessions = crud.get_active_chat_sessions(db, current_agent.id)
+    """대시보드 통계 조회 (집계 쿼리 1회, 상담원별 수 초 캐시)"""
+    stats = await stats_service.get_agent_stats(db, current_agent.id, datetime.now().date())
     
     return {
-        "today_calls": len(today_calls),
-        "today_chats": len(today_chats),
-        "active_sessions": len(active_sessions),
+        "today_calls": stats["today_calls"],
+        "today_chats": stats["today_chats"],
+        "active_sessions": stats["active_sessions"],
         "agent_status": current_agent.status,
-        "total_talk_time": sum(call.duration or 0 for call in today_calls),
-        "average_response_time": 0,  # 계산 로직 추가 필요
+        "total_talk_time": stats["total_talk_time"],
+        "average_response_time": stats["average_response_time"],  # 첫 응답까지 평균(초)
     }
 
 if __name__ == "__main__":
@@ -1,10 +1,19 @@
-from sqlalchemy import Column, String, DateTime, Integer, Text, Boolean, ForeignKey, Enum, Float
+from sqlalchemy import Column, String, DateTime, Integer, Text, Boolean, ForeignKey, Enum, Float, Index, DDL, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.sql import func
 import enum
 import uuid
 
+# 키셋 페이지네이션 정렬 컬럼용 DateTime
+# SQLite는 시각을 문자열로 비교하므로 CURRENT_TIMESTAMP 기본값과 같은 초 단위 형식으로 바인딩/저장
+# (기본 형식은 마이크로초를 붙여 커서 항목이 다음 페이지에 다시 포함됨). 다른 DB는 기본 DateTime
+KeysetDateTime = DateTime().with_variant(
+    sqlite.DATETIME(storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"),
+    "sqlite"
+)
+
 Base = declarative_base()
 
 class AgentStatus(enum.Enum):
@@ -130,6 +139,11 @@ class Customer(Base):
     last_contact_date = Column(DateTime)
     satisfaction_score = Column(Float)
     
+    # 검색용 정규화 값 (customer_search에서 저장 시 갱신)
+    search_name = Column(String(100))
+    search_phone = Column(String(20))
+    search_email = Column(String(100))
+    
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     
@@ -137,6 +151,21 @@ class Customer(Base):
     chat_sessions = relationship("ChatSession", back_populates="customer")
     calls = relationship("Call", back_populates="customer")
     interactions = relationship("CustomerInteraction", back_populates="customer")
+    
+    # PostgreSQL 트라이그램 인덱스 (% 유사도 검색과 LIKE '%...%' 모두 사용)
+    __table_args__ = tuple(
+        Index(
+            f"ix_customers_{column}_trgm", column,
+            postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"}
+        ).ddl_if(dialect="postgresql")
+        for column in ("search_name", "search_phone", "search_email")
+    )
+
+# 트라이그램 인덱스 생성 전에 pg_trgm 확장 활성화
+event.listen(
+    Customer.__table__, "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+)
 
 class ChatSession(Base):
     __tablename__ = "chat_sessions"
@@ -154,19 +183,28 @@ class ChatSession(Base):
     end_time = Column(DateTime)
     queue_time = Column(Integer)  # 대기 시간 (초)
     
-    created_at = Column(DateTime, server_default=func.now())
+    created_at = Column(KeysetDateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     
     # 관계
     customer = relationship("Customer", back_populates="chat_sessions")
     agent = relationship("Agent", back_populates="chat_sessions")
-    messages = relationship("Message", back_populates="chat_session", cascade="all, delete-orphan")
+    # 긴 세션의 메시지를 한 번에 읽지 않도록 쓰기 전용 (조회는 crud.get_session_messages로 페이지 단위)
+    messages = relationship(
+        "Message", back_populates="chat_session", cascade="all, delete-orphan",
+        lazy="write_only", passive_deletes=True
+    )
+    
+    # 키셋 페이지네이션 인덱스 (상담원별 진행 중 세션 목록)
+    __table_args__ = (
+        Index("ix_chat_sessions_agent_status_created", "agent_id", "status", "created_at", "id"),
+    )
 
 class Message(Base):
     __tablename__ = "messages"
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    chat_session_id = Column(String, ForeignKey("chat_sessions.id"), nullable=False)
+    chat_session_id = Column(String, ForeignKey("chat_sessions.id", ondelete="CASCADE"), nullable=False)
     agent_id = Column(String, ForeignKey("agents.id"))
     sender = Column(Enum(MessageSender), nullable=False)
     content = Column(Text, nullable=False)
@@ -179,11 +217,16 @@ class Message(Base):
     file_url = Column(String(500))
     
     is_read = Column(Boolean, default=False)
-    created_at = Column(DateTime, server_default=func.now())
+    created_at = Column(KeysetDateTime, server_default=func.now())
     
     # 관계
     chat_session = relationship("ChatSession", back_populates="messages")
     agent = relationship("Agent", back_populates="messages")
+    
+    # 키셋 페이지네이션 인덱스 (세션별 메시지)
+    __table_args__ = (
+        Index("ix_messages_session_created", "chat_session_id", "created_at", "id"),
+    )
 
 class Call(Base):
     __tablename__ = "calls"
@@ -243,7 +286,7 @@ class CustomerInteraction(Base):
     duration = Column(Integer)  # 상담 시간 (초)
     follow_up_date = Column(DateTime)
     
-    created_at = Column(DateTime, server_default=func.now())
+    created_at = Column(KeysetDateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     resolved_at = Column(DateTime)
     
@@ -251,6 +294,12 @@ class CustomerInteraction(Base):
     customer = relationship("Customer", back_populates="interactions")
     agent = relationship("Agent", back_populates="interactions")
     attachments = relationship("InteractionAttachment", back_populates="interaction", cascade="all, delete-orphan")
+    
+    # 키셋 페이지네이션 인덱스 (고객별/상담원별 상담 이력)
+    __table_args__ = (
+        Index("ix_customer_interactions_customer_created", "customer_id", "created_at", "id"),
+        Index("ix_customer_interactions_agent_created", "agent_id", "created_at", "id"),
+    )
 
 class InteractionAttachment(Base):
     __tablename__ = "interaction_attachments"
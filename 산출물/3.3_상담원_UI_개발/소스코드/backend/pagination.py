@@ -0,0 +1,82 @@
+"""
+키셋(커서) 페이지네이션
+
+(created_at, id) 순서로 정렬된 목록을 마지막 항목 기준으로 이어서 조회합니다.
+OFFSET과 달리 앞 페이지를 건너뛰며 읽지 않으므로 깊은 페이지도 첫 페이지와 비용이 같습니다.
+커서는 마지막 항목의 (created_at, id)를 base64url로 인코딩한 불투명 문자열입니다.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+import base64
+import json
+
+from sqlalchemy import tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# 페이지 크기 기본값/최대값
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class InvalidCursorError(ValueError):
+    """해석할 수 없는 커서"""
+
+
+@dataclass
+class Page:
+    """조회 결과 한 페이지"""
+    items: List[Any] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+
+def encode_cursor(created_at: datetime, item_id: str) -> str:
+    """마지막 항목의 정렬 키를 커서 문자열로 변환"""
+    raw = json.dumps([created_at.isoformat(), item_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """커서 문자열을 (created_at, id)로 변환"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, item_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), str(item_id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {cursor!r}") from e
+
+
+async def paginate(db: AsyncSession, statement, model, cursor: Optional[str] = None,
+                   limit: int = DEFAULT_PAGE_SIZE, newest_first: bool = True) -> Page:
+    """
+    키셋 페이지 조회
+
+    Args:
+        db: 비동기 DB 세션
+        statement: 필터가 적용된 SELECT (정렬/LIMIT은 여기서 추가)
+        model: created_at, id 컬럼을 가진 모델
+        cursor: 이전 페이지의 next_cursor (없으면 첫 페이지)
+        limit: 페이지 크기 (MAX_PAGE_SIZE로 제한)
+        newest_first: True면 최신순, False면 오래된 순
+
+    Returns:
+        Page (다음 페이지가 없으면 next_cursor는 None)
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    key = tuple_(model.created_at, model.id)
+    if cursor:
+        created_at, item_id = decode_cursor(cursor)
+        statement = statement.where(key < (created_at, item_id) if newest_first else key > (created_at, item_id))
+    if newest_first:
+        statement = statement.order_by(model.created_at.desc(), model.id.desc())
+    else:
+        statement = statement.order_by(model.created_at.asc(), model.id.asc())
+
+    # 한 건 더 읽어 다음 페이지 존재 여부 확인
+    rows = list((await db.execute(statement.limit(limit + 1))).scalars())
+    items = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    return Page(items=items, next_cursor=next_cursor)
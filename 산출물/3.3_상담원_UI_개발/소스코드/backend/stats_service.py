@@ -0,0 +1,171 @@
+"""
+상담원 대시보드 통계 서비스
+
+상담원/날짜별 통계를 집계 쿼리 1회로 계산하고 짧은 시간 캐시합니다.
+메시지/통화/세션 상태가 바뀌면 해당 상담원 캐시를 무효화합니다.
+"""
+from datetime import date, datetime, time as dt_time, timedelta
+from typing import Callable, Dict, Optional, Tuple
+import asyncio
+import logging
+import os
+import time
+
+from sqlalchemy import and_, case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import Call, ChatSession, ChatSessionStatus, Message, MessageSender
+
+logger = logging.getLogger(__name__)
+
+# 통계 캐시 유지 시간(초)
+DASHBOARD_STATS_TTL = float(os.getenv("DASHBOARD_STATS_TTL", "5"))
+
+# 진행 중 세션 상태 (crud.get_active_chat_sessions와 동일)
+OPEN_SESSION_STATUSES = (ChatSessionStatus.active, ChatSessionStatus.waiting)
+
+
+def _epoch_seconds(column, dialect_name: str):
+    """DATETIME 컬럼을 초 단위 숫자로 변환 (DB별 함수 차이 흡수)"""
+    if dialect_name == "sqlite":
+        return (func.julianday(column) - 2440587.5) * 86400.0
+    return func.extract("epoch", column)
+
+
+def build_agent_stats_query(agent_id: str, day: date, dialect_name: str):
+    """
+    상담원/날짜 통계 집계 쿼리 (스칼라 서브쿼리로 한 번에 조회)
+
+    Args:
+        agent_id: 상담원 ID
+        day: 집계 날짜
+        dialect_name: DB 종류 (sqlite, postgresql 등)
+
+    Returns:
+        today_calls, total_talk_time, today_chats, active_sessions, average_response_time 컬럼의 SELECT
+    """
+    start = datetime.combine(day, dt_time.min)
+    end = start + timedelta(days=1)
+
+    calls_today = and_(Call.agent_id == agent_id, Call.created_at >= start, Call.created_at < end)
+    chats_today = and_(ChatSession.agent_id == agent_id, ChatSession.created_at >= start, ChatSession.created_at < end)
+
+    # 세션별 첫 고객 메시지 -> 첫 상담원 메시지 간격
+    first_messages = (
+        select(
+            func.min(case((Message.sender == MessageSender.customer, Message.created_at))).label("first_customer"),
+            func.min(case((Message.sender == MessageSender.agent, Message.created_at))).label("first_agent"),
+        )
+        .join(ChatSession, ChatSession.id == Message.chat_session_id)
+        .where(chats_today)
+        .group_by(Message.chat_session_id)
+        .subquery()
+    )
+    response_seconds = (
+        _epoch_seconds(first_messages.c.first_agent, dialect_name)
+        - _epoch_seconds(first_messages.c.first_customer, dialect_name)
+    )
+
+    return select(
+        select(func.count(Call.id)).where(calls_today).scalar_subquery().label("today_calls"),
+        select(func.coalesce(func.sum(Call.duration), 0)).where(calls_today).scalar_subquery().label("total_talk_time"),
+        select(func.count(ChatSession.id)).where(chats_today).scalar_subquery().label("today_chats"),
+        select(func.count(ChatSession.id)).where(
+            ChatSession.agent_id == agent_id, ChatSession.status.in_(OPEN_SESSION_STATUSES)
+        ).scalar_subquery().label("active_sessions"),
+        select(func.avg(response_seconds)).where(
+            first_messages.c.first_agent >= first_messages.c.first_customer
+        ).scalar_subquery().label("average_response_time"),
+    )
+
+
+class DashboardStatsService:
+    """상담원 대시보드 통계 (집계 1회 + 상담원별 캐시)"""
+
+    def __init__(self, ttl: float = DASHBOARD_STATS_TTL, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self._clock = clock
+        # agent_id -> (만료 시각, 날짜, 통계)
+        self._cache: Dict[str, Tuple[float, date, dict]] = {}
+        # agent_id -> 무효화 횟수 (조회 중 무효화되면 결과를 캐시하지 않음)
+        self._generations: Dict[str, int] = {}
+        # (agent_id, 날짜) -> 진행 중인 조회 (동시 요청은 한 번만 조회)
+        self._inflight: Dict[Tuple[str, date], asyncio.Future] = {}
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def invalidate(self, agent_id: Optional[str]):
+        """상담원 통계 캐시 무효화 (메시지/통화 기록 시 호출)"""
+        if agent_id is None:
+            return
+        self._generations[agent_id] = self._generations.get(agent_id, 0) + 1
+        if self._cache.pop(agent_id, None) is not None:
+            self.stats["invalidations"] += 1
+
+    async def get_agent_stats(self, db: AsyncSession, agent_id: str, day: Optional[date] = None) -> dict:
+        """
+        상담원 일별 통계 조회
+
+        Args:
+            db: 비동기 DB 세션
+            agent_id: 상담원 ID
+            day: 집계 날짜 (기본값: 오늘)
+
+        Returns:
+            today_calls, today_chats, active_sessions, total_talk_time, average_response_time(초)
+        """
+        day = day or datetime.now().date()
+        cached = self._cache.get(agent_id)
+        if cached is not None and cached[0] > self._clock() and cached[1] == day:
+            self.stats["hits"] += 1
+            return dict(cached[2])
+
+        key = (agent_id, day)
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.stats["hits"] += 1
+            try:
+                return dict(await asyncio.shield(inflight))
+            except asyncio.CancelledError:
+                # 선행 조회가 취소되면 직접 조회 (이 요청이 취소된 경우는 그대로 전파)
+                if not inflight.cancelled():
+                    raise
+            return await self.get_agent_stats(db, agent_id, day)
+
+        self.stats["misses"] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        generation = self._generations.get(agent_id, 0)
+        try:
+            stats = await self._query(db, agent_id, day)
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # 대기자가 없을 때 경고 방지
+            raise
+        except BaseException:
+            # 취소 시에도 future를 정리해 대기자가 멈추지 않도록 함
+            future.cancel()
+            raise
+        finally:
+            del self._inflight[key]
+
+        if self._generations.get(agent_id, 0) == generation:
+            self._cache[agent_id] = (self._clock() + self.ttl, day, stats)
+        future.set_result(stats)
+        return dict(stats)
+
+    async def _query(self, db: AsyncSession, agent_id: str, day: date) -> dict:
+        """집계 쿼리 실행"""
+        dialect_name = db.get_bind().dialect.name
+        row = (await db.execute(build_agent_stats_query(agent_id, day, dialect_name))).one()
+        average = row.average_response_time
+        return {
+            "today_calls": row.today_calls,
+            "today_chats": row.today_chats,
+            "active_sessions": row.active_sessions,
+            "total_talk_time": int(row.total_talk_time or 0),
+            "average_response_time": round(float(average), 1) if average is not None else 0,
+        }
+
+
+# 전역 통계 서비스 인스턴스
+stats_service = DashboardStatsService()
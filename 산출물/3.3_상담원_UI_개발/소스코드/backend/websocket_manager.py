@@ -1,20 +1,147 @@
 from fastapi import WebSocket, WebSocketDisconnect
-from typing import Dict, List, Set
+from typing import Callable, Dict, Iterable, List, Optional, Set
 import json
 import asyncio
 import logging
+import os
+import socket
+import time
+import uuid
 from datetime import datetime
 
+from backplane import (
+    SCOPE_AGENT, SCOPE_ALL, SCOPE_SESSION, SCOPE_SESSION_END, Backplane, InMemoryBackplane,
+    decode_envelope, encode_envelope
+)
+
 logger = logging.getLogger(__name__)
 
+# 메시지 1건 전송 제한 시간(초)과 연결별 송신 대기열 크기
+SEND_TIMEOUT = float(os.getenv("WS_SEND_TIMEOUT", "5"))
+SEND_QUEUE_SIZE = int(os.getenv("WS_SEND_QUEUE_SIZE", "256"))
+
+# 느린 소비자 연결 종료 코드 (1013: Try Again Later)
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+# 타이핑/상태 이벤트 병합 전송 주기(초)
+EVENT_FLUSH_INTERVAL = float(os.getenv("WS_EVENT_FLUSH_INTERVAL", "0.25"))
+
+# 연결별 수신 프레임 제한 (초당 허용 수, 순간 허용량)
+INBOUND_RATE = float(os.getenv("WS_INBOUND_RATE", "10"))
+INBOUND_BURST = int(os.getenv("WS_INBOUND_BURST", "20"))
+
+
+class TokenBucket:
+    """토큰 버킷 수신 제한기"""
+    
+    def __init__(self, rate: float = INBOUND_RATE, capacity: int = INBOUND_BURST,
+                 clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self._clock = clock
+        self._updated = clock()
+    
+    def allow(self) -> bool:
+        """토큰 1개 사용 (남은 토큰이 없으면 False)"""
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class AgentConnection:
+    """상담원 WebSocket 연결 (전용 송신 대기열과 송신 태스크)
+    
+    브로드캐스트는 대기열에 넣기만 하므로 느린 연결이 다른 상담원에게 가는 전송을 막지 않습니다.
+    대기열이 가득 차거나 전송이 제한 시간을 넘기면 on_evict로 연결 정리를 요청합니다.
+    """
+    
+    def __init__(self, agent_id: str, websocket: WebSocket,
+                 on_evict: Callable[["AgentConnection", str], None],
+                 queue_size: int = SEND_QUEUE_SIZE, send_timeout: float = SEND_TIMEOUT,
+                 inbound_limiter: Optional[TokenBucket] = None):
+        self.agent_id = agent_id
+        self.websocket = websocket
+        self.send_timeout = send_timeout
+        self.inbound_limiter = inbound_limiter or TokenBucket()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.sent_messages = 0
+        self.closed = False
+        self._on_evict = on_evict
+        self._task = asyncio.create_task(self._send_loop())
+    
+    def enqueue(self, payload: str) -> bool:
+        """인코딩된 메시지를 송신 대기열에 추가 (대기열이 가득 차면 연결 정리)"""
+        if self.closed:
+            return False
+        try:
+            self.queue.put_nowait(payload)
+            return True
+        except asyncio.QueueFull:
+            self._evict(f"send queue full ({self.queue.maxsize})")
+            return False
+    
+    async def _send_loop(self):
+        """송신 대기열의 메시지를 순서대로 전송"""
+        while True:
+            payload = await self.queue.get()
+            try:
+                await asyncio.wait_for(self.websocket.send_text(payload), self.send_timeout)
+                self.sent_messages += 1
+            except asyncio.TimeoutError:
+                self._evict(f"send timeout ({self.send_timeout}s)")
+                return
+            except Exception as e:
+                self._evict(f"send error: {e}")
+                return
+            finally:
+                self.queue.task_done()
+    
+    def _evict(self, reason: str):
+        """연결 정리 요청"""
+        if not self.closed:
+            logger.warning(f"Evicting agent {self.agent_id}: {reason}")
+            self._on_evict(self, reason)
+    
+    def close(self):
+        """송신 태스크 종료 및 대기 중인 메시지 폐기"""
+        if self.closed:
+            return
+        self.closed = True
+        if self._task is not asyncio.current_task():
+            self._task.cancel()
+        while not self.queue.empty():
+            self.queue.get_nowait()
+            self.queue.task_done()
+    
+    async def close_socket(self, code: int = SLOW_CONSUMER_CLOSE_CODE):
+        """WebSocket 닫기 (응답하지 않는 소켓을 위해 제한 시간 적용)"""
+        try:
+            await asyncio.wait_for(self.websocket.close(code=code), self.send_timeout)
+        except Exception as e:
+            logger.debug(f"Error closing socket for agent {self.agent_id}: {e}")
+
+
 class ConnectionManager:
-    """WebSocket 연결 관리 클래스"""
+    """WebSocket 연결 관리 클래스
     
-    def __init__(self):
-        # 활성 연결: agent_id -> WebSocket
-        self.active_connections: Dict[str, WebSocket] = {}
+    이 노드(워커/파드)에 접속한 상담원의 연결과 세션 참여 정보만 보관하고,
+    다른 노드에 접속한 참여자에게는 백플레인을 통해 해당 노드로만 메시지를 전달합니다.
+    타이핑/상태 이벤트는 최신 상태만 모아 두었다가 flush_interval마다 변경분만 전송합니다.
+    """
+    
+    def __init__(self, queue_size: int = SEND_QUEUE_SIZE, send_timeout: float = SEND_TIMEOUT,
+                 backplane: Optional[Backplane] = None, node_id: Optional[str] = None,
+                 flush_interval: float = EVENT_FLUSH_INTERVAL,
+                 inbound_rate: float = INBOUND_RATE, inbound_burst: int = INBOUND_BURST):
+        # 활성 연결: agent_id -> AgentConnection
+        self.active_connections: Dict[str, AgentConnection] = {}
         
-        # 세션 참여자: session_id -> Set[agent_id]
+        # 세션 참여자 (이 노드에 접속한 상담원만): session_id -> Set[agent_id]
         self.session_participants: Dict[str, Set[str]] = {}
         
         # 상담원별 참여 세션: agent_id -> Set[session_id]
@@ -22,11 +149,80 @@ class ConnectionManager:
         
         # 타이핑 상태: session_id -> Dict[agent_id, is_typing]
         self.typing_status: Dict[str, Dict[str, bool]] = {}
+        
+        # 송신 설정 및 느린 소비자 정리 횟수
+        self.queue_size = queue_size
+        self.send_timeout = send_timeout
+        self.evicted_connections = 0
+        
+        # 노드 간 전달
+        self.node_id = node_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.backplane = backplane or InMemoryBackplane()
+        self._started = False
+        self._index_tasks: Set[asyncio.Task] = set()
+        
+        # 이벤트 병합: 전송 대기 중인 최신 타이핑/상태, 마지막으로 전송한 상태
+        self.flush_interval = flush_interval
+        self._pending_typing: Dict[str, Dict[str, bool]] = {}
+        self._pending_presence: Dict[str, str] = {}
+        self.agent_presence: Dict[str, str] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        
+        # 수신 제한 설정과 전송하지 않은 이벤트 수
+        self.inbound_rate = inbound_rate
+        self.inbound_burst = inbound_burst
+        self.suppressed_events: Dict[str, int] = {"typing": 0, "presence": 0, "rate_limited": 0}
+
+    async def start(self):
+        """백플레인 수신 시작 (첫 연결 시 자동 호출)"""
+        if not self._started:
+            self._started = True
+            await self.backplane.start(self.node_id, self._on_backplane_message)
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        """모든 연결 정리 후 백플레인 수신 중단"""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        for agent_id in list(self.active_connections):
+            self.disconnect(agent_id)
+        await self._wait_index_updates()
+        if self._started:
+            self._started = False
+            await self.backplane.stop()
+
+    def _update_index(self, coro):
+        """백플레인 색인 갱신을 백그라운드로 실행 (동기 메서드에서 호출)"""
+        task = asyncio.create_task(coro)
+        self._index_tasks.add(task)
+        task.add_done_callback(self._index_update_done)
+
+    def _index_update_done(self, task: asyncio.Task):
+        self._index_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Error updating backplane index: {task.exception()}")
+
+    async def _wait_index_updates(self):
+        """진행 중인 색인 갱신 완료 대기 (갱신 순서 보장)"""
+        if self._index_tasks:
+            await asyncio.gather(*list(self._index_tasks), return_exceptions=True)
 
     async def connect(self, websocket: WebSocket, agent_id: str):
         """새로운 WebSocket 연결 수락"""
+        await self.start()
         await websocket.accept()
-        self.active_connections[agent_id] = websocket
+        
+        # 같은 상담원의 이전 연결은 송신만 중단 (세션 참여 정보는 유지)
+        previous = self.active_connections.get(agent_id)
+        if previous is not None:
+            previous.close()
+        self.active_connections[agent_id] = AgentConnection(
+            agent_id, websocket, self._evict, self.queue_size, self.send_timeout,
+            TokenBucket(self.inbound_rate, self.inbound_burst)
+        )
+        await self._wait_index_updates()
+        await self.backplane.register_agent(agent_id, self.node_id)
         
         # 상담원 세션 초기화
         if agent_id not in self.agent_sessions:
@@ -43,10 +239,16 @@ class ConnectionManager:
             }
         })
 
-    def disconnect(self, agent_id: str):
-        """WebSocket 연결 해제"""
-        if agent_id in self.active_connections:
+    def disconnect(self, agent_id: str, websocket: Optional[WebSocket] = None):
+        """WebSocket 연결 해제 (websocket이 주어지면 현재 연결일 때만 해제)"""
+        connection = self.active_connections.get(agent_id)
+        if connection is not None and websocket is not None and connection.websocket is not websocket:
+            return
+        
+        if connection is not None:
             del self.active_connections[agent_id]
+            connection.close()
+            self._update_index(self.backplane.unregister_agent(agent_id, self.node_id))
         
         # 모든 세션에서 상담원 제거
         if agent_id in self.agent_sessions:
@@ -56,49 +258,100 @@ class ConnectionManager:
         
         logger.info(f"Agent {agent_id} disconnected. Total connections: {len(self.active_connections)}")
 
-    async def send_personal_message(self, agent_id: str, message: dict):
-        """특정 상담원에게 개인 메시지 전송"""
-        if agent_id in self.active_connections:
-            try:
-                await self.active_connections[agent_id].send_text(json.dumps(message))
-            except Exception as e:
-                logger.error(f"Error sending message to agent {agent_id}: {e}")
-                # 연결이 끊어진 경우 정리
-                self.disconnect(agent_id)
+    def _evict(self, connection: AgentConnection, reason: str):
+        """느린 소비자 연결 정리 후 소켓 닫기"""
+        self.evicted_connections += 1
+        if self.active_connections.get(connection.agent_id) is connection:
+            self.disconnect(connection.agent_id)
+        else:
+            connection.close()
+        asyncio.create_task(connection.close_socket())
 
-    async def broadcast_to_session(self, session_id: str, message: dict):
-        """특정 세션의 모든 참여자에게 메시지 브로드캐스트"""
-        if session_id in self.session_participants:
-            disconnected_agents = []
-            
-            for agent_id in self.session_participants[session_id]:
-                if agent_id in self.active_connections:
-                    try:
-                        await self.active_connections[agent_id].send_text(json.dumps(message))
-                    except Exception as e:
-                        logger.error(f"Error broadcasting to agent {agent_id}: {e}")
-                        disconnected_agents.append(agent_id)
-                else:
-                    disconnected_agents.append(agent_id)
+    def _enqueue(self, agent_ids: Iterable[str], payload: str) -> int:
+        """인코딩된 메시지를 각 상담원의 송신 대기열에 추가 (추가된 수 반환)"""
+        delivered = 0
+        for agent_id in list(agent_ids):
+            connection = self.active_connections.get(agent_id)
+            if connection is not None and connection.enqueue(payload):
+                delivered += 1
+        return delivered
+
+    def _deliver_to_sessions(self, session_ids: Iterable[str], payload: str) -> int:
+        """이 노드에 접속한 세션 참여자들에게 전달 (여러 세션에 함께 있는 상담원에게는 한 번만)"""
+        recipients = set()
+        for session_id in session_ids:
+            participants = self.session_participants.get(session_id)
+            if not participants:
+                continue
             
             # 연결이 끊어진 상담원들 정리
-            for agent_id in disconnected_agents:
+            for agent_id in [a for a in participants if a not in self.active_connections]:
                 self.leave_session(agent_id, session_id)
+            recipients |= self.session_participants.get(session_id, set())
+        return self._enqueue(recipients, payload)
 
-    async def broadcast_to_all(self, message: dict):
-        """모든 연결된 상담원에게 메시지 브로드캐스트"""
-        disconnected_agents = []
+    def _on_backplane_message(self, envelope: str):
+        """다른 노드에서 전달된 메시지를 이 노드의 상담원에게 전달"""
+        scope, target, origin, payload = decode_envelope(envelope)
+        if origin == self.node_id:
+            return
         
-        for agent_id, websocket in self.active_connections.items():
-            try:
-                await websocket.send_text(json.dumps(message))
-            except Exception as e:
-                logger.error(f"Error broadcasting to agent {agent_id}: {e}")
-                disconnected_agents.append(agent_id)
+        if scope == SCOPE_SESSION:
+            self._deliver_to_sessions(target, payload)
+        elif scope == SCOPE_SESSION_END:
+            self._deliver_to_sessions(target, payload)
+            self._end_local_sessions(target)
+        elif scope == SCOPE_AGENT:
+            self._enqueue([target], payload)
+        elif scope == SCOPE_ALL:
+            self._enqueue(self.active_connections, payload)
+
+    async def _publish_to_sessions(self, session_ids: List[str], payload: str, scope: str = SCOPE_SESSION) -> int:
+        """세션 참여자에게 전달 (이 노드는 직접, 다른 노드는 참여자가 있는 노드에만 백플레인으로)"""
+        nodes = set()
+        for session_id in session_ids:
+            nodes |= await self.backplane.get_session_nodes(session_id)
+        nodes.discard(self.node_id)
         
-        # 연결이 끊어진 상담원들 정리
-        for agent_id in disconnected_agents:
-            self.disconnect(agent_id)
+        delivered = self._deliver_to_sessions(session_ids, payload)
+        if nodes:
+            await self.backplane.publish(nodes, encode_envelope(scope, session_ids, self.node_id, payload))
+        await asyncio.sleep(0)  # 송신 태스크에 실행 기회 제공 (연속 브로드캐스트 시 대기열 누적 방지)
+        return delivered
+
+    async def send_personal_message(self, agent_id: str, message: dict):
+        """특정 상담원에게 개인 메시지 전송 (다른 노드에 접속한 경우 해당 노드로 전달)"""
+        payload = json.dumps(message)
+        if agent_id in self.active_connections:
+            self._enqueue([agent_id], payload)
+        else:
+            node_id = await self.backplane.get_agent_node(agent_id)
+            if node_id is not None and node_id != self.node_id:
+                await self.backplane.publish([node_id], encode_envelope(SCOPE_AGENT, agent_id, self.node_id, payload))
+        await asyncio.sleep(0)
+
+    async def broadcast_to_session(self, session_id: str, message: dict) -> int:
+        """특정 세션의 모든 참여자에게 메시지 브로드캐스트 (이 노드에서 전달한 수 반환)"""
+        return await self._publish_to_sessions([session_id], json.dumps(message))
+
+    async def broadcast_to_all(self, message: dict) -> int:
+        """모든 연결된 상담원에게 메시지 브로드캐스트 (이 노드에서 전달한 수 반환)"""
+        payload = json.dumps(message)
+        delivered = self._enqueue(self.active_connections, payload)
+        await self.backplane.publish_all(encode_envelope(SCOPE_ALL, "", self.node_id, payload))
+        await asyncio.sleep(0)
+        return delivered
+
+    async def drain(self, timeout: Optional[float] = None) -> bool:
+        """송신 대기열의 메시지가 모두 전송(또는 연결 정리)될 때까지 대기"""
+        waits = [connection.queue.join() for connection in list(self.active_connections.values())]
+        if not waits:
+            return True
+        try:
+            await asyncio.wait_for(asyncio.gather(*waits), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
 
     async def join_session(self, agent_id: str, session_id: str):
         """상담원을 세션에 추가"""
@@ -107,6 +360,8 @@ class ConnectionManager:
         
         self.session_participants[session_id].add(agent_id)
         self.agent_sessions[agent_id].add(session_id)
+        await self._wait_index_updates()
+        await self.backplane.add_member(session_id, agent_id, self.node_id)
         
         logger.info(f"Agent {agent_id} joined session {session_id}")
         
@@ -122,6 +377,9 @@ class ConnectionManager:
 
     def leave_session(self, agent_id: str, session_id: str):
         """상담원을 세션에서 제거"""
+        if agent_id in self.session_participants.get(session_id, ()):
+            self._update_index(self.backplane.remove_member(session_id, agent_id, self.node_id))
+        
         if session_id in self.session_participants:
             self.session_participants[session_id].discard(agent_id)
             
@@ -134,8 +392,69 @@ class ConnectionManager:
         if agent_id in self.agent_sessions:
             self.agent_sessions[agent_id].discard(session_id)
         
+        pending = self._pending_typing.get(session_id)
+        if pending is not None:
+            pending.pop(agent_id, None)
+            if not pending:
+                del self._pending_typing[session_id]
+        
         logger.info(f"Agent {agent_id} left session {session_id}")
 
+    def _end_local_sessions(self, session_ids: Iterable[str]):
+        """이 노드의 세션 참여자 정리"""
+        for session_id in session_ids:
+            for agent_id in list(self.session_participants.get(session_id, ())):
+                self.leave_session(agent_id, session_id)
+
+    def allow_inbound(self, agent_id: str) -> bool:
+        """수신 프레임 처리 허용 여부 (연결별 토큰 버킷 초과 시 False)"""
+        connection = self.active_connections.get(agent_id)
+        if connection is None or connection.inbound_limiter.allow():
+            return True
+        self.suppressed_events["rate_limited"] += 1
+        return False
+
+    def update_typing(self, agent_id: str, session_id: str, is_typing: bool):
+        """타이핑 상태 갱신 (다음 병합 전송 시 변경분만 브로드캐스트)"""
+        pending = self._pending_typing.setdefault(session_id, {})
+        if agent_id in pending:
+            self.suppressed_events["typing"] += 1
+        pending[agent_id] = is_typing
+
+    def update_presence(self, agent_id: str, status: str):
+        """상담원 상태 갱신 (다음 병합 전송 시 변경분만 알림)"""
+        if agent_id in self._pending_presence:
+            self.suppressed_events["presence"] += 1
+        self._pending_presence[agent_id] = status
+
+    async def flush_events(self):
+        """병합된 타이핑/상태 이벤트 중 마지막 전송 상태와 다른 것만 전송"""
+        pending_typing, self._pending_typing = self._pending_typing, {}
+        pending_presence, self._pending_presence = self._pending_presence, {}
+        
+        for session_id, states in pending_typing.items():
+            for agent_id, is_typing in states.items():
+                if self.typing_status.get(session_id, {}).get(agent_id, False) == is_typing:
+                    self.suppressed_events["typing"] += 1
+                    continue
+                await self.set_typing_status(agent_id, session_id, is_typing)
+        
+        for agent_id, status in pending_presence.items():
+            if self.agent_presence.get(agent_id) == status:
+                self.suppressed_events["presence"] += 1
+                continue
+            self.agent_presence[agent_id] = status
+            await self.notify_agent_status_change(agent_id, status)
+
+    async def _flush_loop(self):
+        """flush_interval마다 병합된 이벤트 전송"""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush_events()
+            except Exception as e:
+                logger.error(f"Error flushing coalesced events: {str(e)}")
+
     async def set_typing_status(self, agent_id: str, session_id: str, is_typing: bool):
         """타이핑 상태 설정 및 브로드캐스트"""
         if session_id not in self.typing_status:
@@ -165,10 +484,10 @@ class ConnectionManager:
             }
         }
         
-        # 해당 상담원의 모든 세션 참여자들에게 알림
-        if agent_id in self.agent_sessions:
-            for session_id in self.agent_sessions[agent_id]:
-                await self.broadcast_to_session(session_id, message)
+        # 해당 상담원의 모든 세션 참여자들에게 알림 (여러 세션에 함께 있는 상담원에게는 한 번만)
+        session_ids = sorted(self.agent_sessions.get(agent_id, ()))
+        if session_ids:
+            await self._publish_to_sessions(session_ids, json.dumps(message))
 
     async def notify_new_session(self, session_id: str, session_data: dict):
         """새로운 세션 생성 알림"""
@@ -185,7 +504,7 @@ class ConnectionManager:
         await self.broadcast_to_all(message)
 
     async def notify_session_ended(self, session_id: str):
-        """세션 종료 알림"""
+        """세션 종료 알림 (모든 노드의 참여자에게 알린 뒤 각 노드에서 세션 정리)"""
         message = {
             "type": "session_ended",
             "data": {
@@ -194,32 +513,35 @@ class ConnectionManager:
             }
         }
         
-        # 세션 참여자들에게 알림
-        await self.broadcast_to_session(session_id, message)
-        
-        # 세션 정리
-        if session_id in self.session_participants:
-            for agent_id in self.session_participants[session_id].copy():
-                self.leave_session(agent_id, session_id)
+        await self._publish_to_sessions([session_id], json.dumps(message), scope=SCOPE_SESSION_END)
+        self._end_local_sessions([session_id])
 
     def get_session_participants(self, session_id: str) -> List[str]:
-        """세션 참여자 목록 반환"""
+        """이 노드에 접속한 세션 참여자 목록 반환"""
         return list(self.session_participants.get(session_id, set()))
 
+    async def get_all_session_participants(self, session_id: str) -> List[str]:
+        """모든 노드의 세션 참여자 목록 반환"""
+        return list(await self.backplane.get_session_members(session_id))
+
     def get_agent_sessions(self, agent_id: str) -> List[str]:
         """상담원이 참여 중인 세션 목록 반환"""
         return list(self.agent_sessions.get(agent_id, set()))
 
     def get_connection_stats(self) -> dict:
-        """연결 통계 반환"""
+        """연결 통계 반환 (이 노드 기준)"""
         return {
+            "node_id": self.node_id,
             "total_connections": len(self.active_connections),
             "active_sessions": len(self.session_participants),
-            "total_participants": sum(len(participants) for participants in self.session_participants.values())
+            "total_participants": sum(len(participants) for participants in self.session_participants.values()),
+            "queued_messages": sum(c.queue.qsize() for c in self.active_connections.values()),
+            "evicted_connections": self.evicted_connections,
+            "suppressed_events": dict(self.suppressed_events)
         }
 
     async def ping_all_connections(self):
-        """모든 연결에 ping 메시지 전송 (연결 상태 확인)"""
+        """이 노드의 모든 연결에 ping 메시지 전송 (연결 상태 확인, 노드별로 실행)"""
         ping_message = {
             "type": "ping",
             "data": {
@@ -227,7 +549,8 @@ class ConnectionManager:
             }
         }
         
-        await self.broadcast_to_all(ping_message)
+        self._enqueue(self.active_connections, json.dumps(ping_message))
+        await asyncio.sleep(0)
 
 # 전역 연결 관리자 인스턴스
 manager = ConnectionManager()
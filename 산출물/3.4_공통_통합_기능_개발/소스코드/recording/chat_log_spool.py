@@ -0,0 +1,342 @@
+"""
+채팅 로그 WAL 스풀
+진행 중인 채팅 세션 메시지를 세션별 세그먼트 파일에 추가 기록 (메모리에 쌓지 않음)
+
+레코드 형식:
+    length(4) | crc32(4) | JSON payload(length)
+
+- 세션 디렉토리: {spool_dir}/{quote(session_id)}/{segment:06d}.wal
+- 첫 레코드는 세션 시작 정보(type=start), 이후 메시지(type=message)
+- 쓰기는 바로 파일에 추가하고 fsync는 commit_interval 동안 모인 쓰기를 한 번에 처리 (그룹 커밋)
+- append는 fsync 완료 후 반환하므로 반환된 메시지는 프로세스/서버 장애 후에도 남음
+- 재시작 시 남아 있는 세션 디렉토리를 읽어 활성 세션 복구 (끝이 잘린 레코드는 잘라냄)
+- 메모리에는 세션별 요약 정보와 최근 사용한 파일 핸들(max_open_files개)만 유지
+"""
+
+import asyncio
+import json
+import os
+import shutil
+import struct
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import quote, unquote
+
+_FRAME = struct.Struct(">II")
+SEGMENT_SUFFIX = '.wal'
+DEFAULT_COMMIT_INTERVAL = 0.01  # seconds
+DEFAULT_SEGMENT_BYTES = 4 * 1024 * 1024
+DEFAULT_MAX_OPEN_FILES = 256
+
+
+@dataclass
+class SpoolSession:
+    """스풀 세션 요약 정보 (메시지 본문은 디스크에만 있음)"""
+    session_id: str
+    recording_id: str
+    agent_id: str
+    customer_id: str
+    start_time: str
+    message_count: int = 0
+    first_message_at: Optional[str] = None
+    segment: int = 0
+    segment_bytes: int = 0
+    sealed: bool = False
+
+
+class ChatLogSpool:
+    """채팅 로그 WAL 스풀"""
+
+    def __init__(self, directory: str, commit_interval: float = DEFAULT_COMMIT_INTERVAL,
+                 segment_bytes: int = DEFAULT_SEGMENT_BYTES, max_open_files: int = DEFAULT_MAX_OPEN_FILES):
+        self.directory = directory
+        self.commit_interval = commit_interval
+        self.segment_bytes = segment_bytes
+        self.max_open_files = max_open_files
+        os.makedirs(directory, exist_ok=True)
+
+        self._sessions: Dict[str, SpoolSession] = {}
+        self._files: "OrderedDict[str, Any]" = OrderedDict()  # session_id -> 열린 세그먼트 (LRU)
+        self._dirty_fds: Dict[str, int] = {}  # 세그먼트 경로 -> fsync용으로 dup한 fd
+        self._dirty_dirs = set()
+        self._waiters: List[asyncio.Future] = []
+        self._commit_task: Optional[asyncio.Task] = None
+        self.stats = {'appends': 0, 'commits': 0, 'fsyncs': 0}
+
+    # 조회
+
+    def get_session(self, session_id: str) -> Optional[SpoolSession]:
+        """세션 요약 정보 조회"""
+        return self._sessions.get(session_id)
+
+    def list_sessions(self, include_sealed: bool = False) -> List[SpoolSession]:
+        """스풀에 있는 세션 목록"""
+        return [s for s in self._sessions.values() if include_sealed or not s.sealed]
+
+    def iter_entries(self, session_id: str) -> Iterator[Dict[str, Any]]:
+        """
+        세션 메시지를 기록 순서대로 디스크에서 읽기
+
+        Args:
+            session_id: 채팅 세션 ID
+
+        Returns:
+            메시지 dict 이터레이터 (시작 레코드 제외)
+        """
+        for path in self._segment_paths(session_id):
+            with open(path, 'rb') as f:
+                for record, _ in _read_records(f):
+                    if record.get('type') == 'message':
+                        yield record['entry']
+
+    # 기록
+
+    async def open_session(self, session_id: str, recording_id: str, agent_id: str = '',
+                           customer_id: str = '') -> SpoolSession:
+        """
+        세션 시작 (이미 있으면 기존 세션 반환)
+
+        Args:
+            session_id: 채팅 세션 ID
+            recording_id: 녹취 ID
+            agent_id: 상담원 ID
+            customer_id: 고객 ID
+
+        Returns:
+            세션 요약 정보
+        """
+        session = self._sessions.get(session_id)
+        if session:
+            return session
+
+        session = SpoolSession(session_id=session_id, recording_id=recording_id, agent_id=agent_id,
+                               customer_id=customer_id, start_time=datetime.now().isoformat())
+        self._sessions[session_id] = session
+        os.makedirs(self._session_dir(session_id), exist_ok=True)
+        self._dirty_dirs.add(self.directory)
+        await self._append(session, {
+            'type': 'start', 'session_id': session_id, 'recording_id': recording_id,
+            'agent_id': agent_id, 'customer_id': customer_id, 'start_time': session.start_time
+        })
+        return session
+
+    async def append(self, session_id: str, entry: Dict[str, Any]):
+        """
+        메시지 추가 (그룹 커밋 fsync 완료 후 반환)
+
+        Args:
+            session_id: 채팅 세션 ID
+            entry: 메시지 dict (timestamp 포함)
+        """
+        session = self._sessions.get(session_id)
+        if session is None:
+            raise ValueError(f"스풀에 없는 채팅 세션입니다: {session_id}")
+        if session.sealed:
+            raise ValueError(f"이미 종료된 채팅 세션입니다: {session_id}")
+
+        await self._append(session, {'type': 'message', 'entry': entry})
+        session.message_count += 1
+        if session.first_message_at is None:
+            session.first_message_at = entry.get('timestamp')
+
+    async def seal(self, session_id: str) -> SpoolSession:
+        """세션 종료 표시 (이후 추가 불가, 업로드 실패 시 다시 seal해도 됨)"""
+        session = self._sessions.get(session_id)
+        if session is None:
+            raise ValueError(f"스풀에 없는 채팅 세션입니다: {session_id}")
+        await self._wait_commits()
+        self._close_file(session_id)
+        session.sealed = True
+        return session
+
+    def discard(self, session_id: str):
+        """업로드가 끝난 세션의 스풀 파일 삭제"""
+        self._close_file(session_id)
+        self._sessions.pop(session_id, None)
+        shutil.rmtree(self._session_dir(session_id), ignore_errors=True)
+
+    async def close(self):
+        """대기 중인 커밋 완료 후 모든 파일 닫기"""
+        await self._wait_commits()
+        for session_id in list(self._files):
+            self._close_file(session_id)
+
+    async def _wait_commits(self):
+        """진행 중인 그룹 커밋이 모두 끝날 때까지 대기"""
+        while self._commit_task:
+            await asyncio.shield(self._commit_task)
+
+    async def _append(self, session: SpoolSession, record: Dict[str, Any]):
+        """레코드 한 건 기록 후 그룹 커밋 대기"""
+        payload = json.dumps(record, ensure_ascii=False).encode('utf-8')
+        frame = _FRAME.pack(len(payload), zlib.crc32(payload)) + payload
+
+        f = self._writer(session, len(frame))
+        f.write(frame)
+        session.segment_bytes += len(frame)
+        if f.name not in self._dirty_fds:
+            self._dirty_fds[f.name] = os.dup(f.fileno())
+        self.stats['appends'] += 1
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        if self._commit_task is None:
+            self._commit_task = asyncio.create_task(self._group_commit())
+        await waiter
+
+    async def _group_commit(self):
+        """모인 쓰기를 한 번에 fsync"""
+        await asyncio.sleep(self.commit_interval)
+        fds, self._dirty_fds = list(self._dirty_fds.values()), {}
+        dirs, self._dirty_dirs = self._dirty_dirs, set()
+        waiters, self._waiters = self._waiters, []
+
+        try:
+            synced = await asyncio.to_thread(_fsync_all, fds, dirs)
+            self.stats['commits'] += 1
+            self.stats['fsyncs'] += synced
+            error = None
+        except Exception as e:
+            error = e
+        for waiter in waiters:
+            if not waiter.done():
+                if error:
+                    waiter.set_exception(error)
+                else:
+                    waiter.set_result(None)
+
+        # fsync 중에 들어온 쓰기는 다음 그룹으로 커밋
+        self._commit_task = asyncio.create_task(self._group_commit()) if self._waiters else None
+
+    def _writer(self, session: SpoolSession, frame_size: int):
+        """세션의 현재 세그먼트 파일 (크기 초과 시 다음 세그먼트로 교체)"""
+        f = self._files.get(session.session_id)
+        if session.segment_bytes and session.segment_bytes + frame_size > self.segment_bytes:
+            self._close_file(session.session_id)
+            session.segment += 1
+            session.segment_bytes = 0
+            f = None
+
+        if f is None:
+            path = self._segment_path(session.session_id, session.segment)
+            if not os.path.exists(path):
+                self._dirty_dirs.add(self._session_dir(session.session_id))
+            f = open(path, 'ab', buffering=0)
+            self._files[session.session_id] = f
+            while len(self._files) > self.max_open_files:
+                self._close_file(next(iter(self._files)))
+        self._files.move_to_end(session.session_id)
+        return f
+
+    def _close_file(self, session_id: str):
+        """세그먼트 파일 핸들 닫기 (fsync는 dup한 fd로 진행되므로 안전)"""
+        f = self._files.pop(session_id, None)
+        if f is not None:
+            f.close()
+
+    # 복구
+
+    def recover(self) -> List[str]:
+        """
+        재시작 시 스풀 디렉토리에 남은 세션 복구
+
+        끝이 잘리거나 손상된 레코드는 마지막 정상 레코드 위치로 잘라냅니다.
+
+        Returns:
+            복구된 세션 ID 목록
+        """
+        recovered = []
+        for name in sorted(os.listdir(self.directory)):
+            session_dir = os.path.join(self.directory, name)
+            if not os.path.isdir(session_dir):
+                continue
+            session = self._recover_session(unquote(name))
+            if session is None:
+                shutil.rmtree(session_dir, ignore_errors=True)
+                continue
+            self._sessions[session.session_id] = session
+            recovered.append(session.session_id)
+        return recovered
+
+    def _recover_session(self, session_id: str) -> Optional[SpoolSession]:
+        """세션 세그먼트를 읽어 요약 정보 재구성"""
+        session = None
+        for path in self._segment_paths(session_id):
+            with open(path, 'r+b') as f:
+                end = 0
+                for record, end in _read_records(f):
+                    if record.get('type') == 'start' and session is None:
+                        session = SpoolSession(
+                            session_id=session_id, recording_id=record.get('recording_id', ''),
+                            agent_id=record.get('agent_id', ''), customer_id=record.get('customer_id', ''),
+                            start_time=record.get('start_time') or datetime.now().isoformat()
+                        )
+                    elif record.get('type') == 'message' and session is not None:
+                        session.message_count += 1
+                        if session.first_message_at is None:
+                            session.first_message_at = record['entry'].get('timestamp')
+                if f.seek(0, os.SEEK_END) != end:
+                    f.truncate(end)
+                    os.fsync(f.fileno())
+            if session is not None:
+                session.segment = int(os.path.basename(path)[:-len(SEGMENT_SUFFIX)])
+                session.segment_bytes = end
+        return session
+
+    # 경로
+
+    def _session_dir(self, session_id: str) -> str:
+        return os.path.join(self.directory, quote(session_id, safe=''))
+
+    def _segment_path(self, session_id: str, segment: int) -> str:
+        return os.path.join(self._session_dir(session_id), f"{segment:06d}{SEGMENT_SUFFIX}")
+
+    def _segment_paths(self, session_id: str) -> List[str]:
+        session_dir = self._session_dir(session_id)
+        if not os.path.isdir(session_dir):
+            return []
+        names = sorted(n for n in os.listdir(session_dir) if n.endswith(SEGMENT_SUFFIX))
+        return [os.path.join(session_dir, n) for n in names]
+
+
+def _read_records(f) -> Iterator:
+    """세그먼트에서 (레코드, 레코드 끝 위치)를 차례로 읽기 (잘리거나 손상된 레코드에서 멈춤)"""
+    offset = 0
+    while True:
+        header = f.read(_FRAME.size)
+        if len(header) < _FRAME.size:
+            return
+        length, crc = _FRAME.unpack(header)
+        payload = f.read(length)
+        if len(payload) < length or zlib.crc32(payload) != crc:
+            return
+        try:
+            record = json.loads(payload)
+        except ValueError:
+            return
+        offset += _FRAME.size + length
+        yield record, offset
+
+
+def _fsync_all(fds: List[int], dirs) -> int:
+    """fd와 디렉토리 fsync (dup한 fd는 닫음)"""
+    synced = 0
+    try:
+        for fd in fds:
+            os.fsync(fd)
+            synced += 1
+        for path in dirs:
+            dir_fd = os.open(path, os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)
+                synced += 1
+            finally:
+                os.close(dir_fd)
+    finally:
+        for fd in fds:
+            os.close(fd)
+    return synced
+
@@ -0,0 +1,256 @@
+"""
+청크 단위 스트리밍 암호화
+녹음/채팅 로그 파일을 고정 크기 청크로 나눠 AES-256-GCM으로 암호화
+
+파일 형식:
+    헤더   magic(7) | version(1) | chunk_size(4) | salt(16) | nonce_prefix(7)
+    프레임 ciphertext(chunk_size) | tag(16)   (마지막 프레임만 더 짧을 수 있음)
+
+- 파일 키는 마스터 키와 파일별 salt로 HKDF 유도
+- 청크 nonce는 nonce_prefix | 청크 번호(4) | 마지막 청크 여부(1) 로 청크마다 다름
+- 헤더 전체를 AAD로 사용하므로 헤더 변조, 청크 순서 변경, 잘라내기를 모두 검출
+- 프레임 크기가 고정이라 원하는 구간의 청크만 읽어 복호화 가능 (녹음 탐색)
+- 파일 크기와 관계없이 메모리 사용량은 청크 크기 수준으로 일정
+"""
+
+import os
+import struct
+from typing import BinaryIO, Callable, Iterable, Iterator, Optional
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+MAGIC = b"AICCENC"
+VERSION = 1
+DEFAULT_CHUNK_SIZE = 64 * 1024
+MAX_CHUNK_SIZE = 16 * 1024 * 1024
+TAG_SIZE = 16
+SALT_SIZE = 16
+NONCE_PREFIX_SIZE = 7
+
+_HEADER = struct.Struct(f">{len(MAGIC)}sBI{SALT_SIZE}s{NONCE_PREFIX_SIZE}s")
+_NONCE_SUFFIX = struct.Struct(">IB")
+HEADER_SIZE = _HEADER.size
+_KDF_INFO = b"aicc-recording-chunked-v1"
+
+# 구간 복호화 시 한 번에 읽는 최대 프레임 수 (S3 범위 요청 횟수 절감)
+RANGE_READ_FRAMES = 16
+
+
+class ChunkedEncryptionError(ValueError):
+    """청크 암호화 파일 형식 오류 또는 인증 실패"""
+
+
+class _FrameCodec:
+    """헤더 하나에 묶인 청크 암복호화기"""
+
+    def __init__(self, master_key: bytes, header: bytes):
+        try:
+            magic, version, chunk_size, salt, nonce_prefix = _HEADER.unpack(header)
+        except struct.error as e:
+            raise ChunkedEncryptionError("암호화 헤더가 잘렸습니다") from e
+        if magic != MAGIC:
+            raise ChunkedEncryptionError("청크 암호화 파일이 아닙니다")
+        if version != VERSION:
+            raise ChunkedEncryptionError(f"지원하지 않는 암호화 형식 버전입니다: {version}")
+        if not 0 < chunk_size <= MAX_CHUNK_SIZE:
+            raise ChunkedEncryptionError(f"잘못된 청크 크기입니다: {chunk_size}")
+
+        self.header = header
+        self.chunk_size = chunk_size
+        self.frame_size = chunk_size + TAG_SIZE
+        self._nonce_prefix = nonce_prefix
+        key = HKDF(algorithm=hashes.SHA256(), length=32, salt=salt, info=_KDF_INFO).derive(master_key)
+        self._aead = AESGCM(key)
+
+    def _nonce(self, index: int, final: bool) -> bytes:
+        if index >= 2 ** 32:
+            raise ChunkedEncryptionError("청크 수가 너무 많습니다")
+        return self._nonce_prefix + _NONCE_SUFFIX.pack(index, 1 if final else 0)
+
+    def seal(self, index: int, chunk: bytes, final: bool) -> bytes:
+        """청크 하나 암호화"""
+        return self._aead.encrypt(self._nonce(index, final), chunk, self.header)
+
+    def open(self, index: int, frame: bytes, final: bool) -> bytes:
+        """프레임 하나 복호화 및 인증"""
+        try:
+            return self._aead.decrypt(self._nonce(index, final), frame, self.header)
+        except InvalidTag as e:
+            raise ChunkedEncryptionError(f"청크 {index} 인증 실패 (변조 또는 잘린 파일)") from e
+
+    def frame_count(self, total_size: int) -> int:
+        """암호화 파일 크기로 프레임 수 계산"""
+        body = total_size - HEADER_SIZE
+        if body < TAG_SIZE:
+            raise ChunkedEncryptionError("암호화 파일이 잘렸습니다")
+        count = -(-body // self.frame_size)
+        if body - (count - 1) * self.frame_size < TAG_SIZE:
+            raise ChunkedEncryptionError("암호화 파일이 잘렸습니다")
+        return count
+
+    def plaintext_size(self, total_size: int) -> int:
+        """암호화 파일 크기로 원본 크기 계산"""
+        return total_size - HEADER_SIZE - self.frame_count(total_size) * TAG_SIZE
+
+
+class ChunkedCipher:
+    """청크 단위 스트리밍 암호화기"""
+
+    def __init__(self, master_key: bytes, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        if not 0 < chunk_size <= MAX_CHUNK_SIZE:
+            raise ValueError(f"잘못된 청크 크기입니다: {chunk_size}")
+        self.master_key = master_key
+        self.chunk_size = chunk_size
+
+    def _new_codec(self) -> _FrameCodec:
+        """파일별 salt/nonce 접두어로 새 헤더 생성"""
+        header = _HEADER.pack(MAGIC, VERSION, self.chunk_size,
+                              os.urandom(SALT_SIZE), os.urandom(NONCE_PREFIX_SIZE))
+        return _FrameCodec(self.master_key, header)
+
+    def encrypt_stream(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """
+        평문 스트림 암호화
+
+        Args:
+            chunks: 임의 크기로 나뉜 평문 바이트 스트림
+
+        Returns:
+            헤더와 암호화 프레임을 차례로 내보내는 이터레이터
+        """
+        codec = self._new_codec()
+        yield codec.header
+
+        buffer = bytearray()
+        index = 0
+        for data in chunks:
+            buffer += data
+            # 마지막 청크 여부를 알아야 하므로 청크 크기를 초과할 때만 내보냄
+            while len(buffer) > self.chunk_size:
+                yield codec.seal(index, bytes(buffer[:self.chunk_size]), final=False)
+                del buffer[:self.chunk_size]
+                index += 1
+        yield codec.seal(index, bytes(buffer), final=True)
+
+    def decrypt_stream(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """
+        암호화 스트림 복호화
+
+        Args:
+            chunks: 임의 크기로 나뉜 암호화 바이트 스트림
+
+        Returns:
+            인증된 평문 청크 이터레이터 (변조/잘림 시 ChunkedEncryptionError)
+        """
+        buffer = bytearray()
+        codec = None
+        index = 0
+        for data in chunks:
+            buffer += data
+            if codec is None:
+                if len(buffer) < HEADER_SIZE:
+                    continue
+                codec = _FrameCodec(self.master_key, bytes(buffer[:HEADER_SIZE]))
+                del buffer[:HEADER_SIZE]
+            while len(buffer) > codec.frame_size:
+                yield codec.open(index, bytes(buffer[:codec.frame_size]), final=False)
+                del buffer[:codec.frame_size]
+                index += 1
+
+        if codec is None:
+            raise ChunkedEncryptionError("암호화 헤더가 잘렸습니다")
+        if len(buffer) < TAG_SIZE:
+            raise ChunkedEncryptionError("암호화 파일이 잘렸습니다")
+        yield codec.open(index, bytes(buffer), final=True)
+
+    def decrypt_range(self, read_at: Callable[[int, int], bytes], total_size: int,
+                      start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+        """
+        평문 구간 복호화 (필요한 프레임만 읽음)
+
+        Args:
+            read_at: (offset, length) -> bytes 암호화 파일 임의 위치 읽기 함수
+            total_size: 암호화 파일 전체 크기
+            start: 평문 시작 위치
+            end: 평문 끝 위치 (포함하지 않음, None이면 끝까지)
+
+        Returns:
+            요청 구간의 평문 청크 이터레이터
+        """
+        codec = _FrameCodec(self.master_key, read_at(0, HEADER_SIZE))
+        count = codec.frame_count(total_size)
+        size = total_size - HEADER_SIZE - count * TAG_SIZE
+        end = size if end is None else min(end, size)
+        if start < 0 or start >= end:
+            return
+
+        first = start // codec.chunk_size
+        last = (end - 1) // codec.chunk_size
+        for batch_start in range(first, last + 1, RANGE_READ_FRAMES):
+            batch_end = min(batch_start + RANGE_READ_FRAMES, last + 1)
+            offset = HEADER_SIZE + batch_start * codec.frame_size
+            length = min(batch_end * codec.frame_size, total_size - HEADER_SIZE) - batch_start * codec.frame_size
+            data = read_at(offset, length)
+            if len(data) != length:
+                raise ChunkedEncryptionError("암호화 파일이 잘렸습니다")
+
+            for index in range(batch_start, batch_end):
+                pos = (index - batch_start) * codec.frame_size
+                chunk = codec.open(index, data[pos:pos + codec.frame_size], final=index == count - 1)
+                chunk_start = index * codec.chunk_size
+                yield chunk[max(start - chunk_start, 0):end - chunk_start]
+
+    def iter_encrypted_file(self, input_path: str) -> Iterator[bytes]:
+        """파일을 읽으며 암호화 프레임 생성 (임시 파일 없이 업로드할 때 사용)"""
+        with open(input_path, 'rb') as f_in:
+            yield from self.encrypt_stream(_read_chunks(f_in, self.chunk_size))
+
+    def encrypt_file(self, input_path: str, output_path: str):
+        """파일 스트리밍 암호화"""
+        with open(output_path, 'wb') as f_out:
+            for frame in self.iter_encrypted_file(input_path):
+                f_out.write(frame)
+
+    def decrypt_file(self, input_path: str, output_path: str):
+        """파일 스트리밍 복호화"""
+        with open(input_path, 'rb') as f_in, open(output_path, 'wb') as f_out:
+            for chunk in self.decrypt_stream(_read_chunks(f_in, self.chunk_size + TAG_SIZE)):
+                f_out.write(chunk)
+
+    def read_file_range(self, path: str, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+        """로컬 암호화 파일의 평문 구간 복호화"""
+        with open(path, 'rb') as f:
+            def read_at(offset: int, length: int) -> bytes:
+                f.seek(offset)
+                return f.read(length)
+
+            yield from self.decrypt_range(read_at, os.path.getsize(path), start, end)
+
+    def plaintext_size(self, header: bytes, total_size: int) -> int:
+        """헤더와 암호화 파일 크기로 원본 크기 계산"""
+        return _FrameCodec(self.master_key, header).plaintext_size(total_size)
+
+
+def is_chunked_file(path: str) -> bool:
+    """청크 암호화 형식 파일 여부 (기존 Fernet 전체 암호화 파일과 구분)"""
+    with open(path, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def encrypted_size(plaintext_size: int, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """원본 크기로 암호화 파일 크기 계산"""
+    frames = max(1, -(-plaintext_size // chunk_size))
+    return HEADER_SIZE + plaintext_size + frames * TAG_SIZE
+
+
+def _read_chunks(f: BinaryIO, size: int) -> Iterator[bytes]:
+    """파일을 고정 크기로 나눠 읽기"""
+    while True:
+        data = f.read(size)
+        if not data:
+            return
+        yield data
+
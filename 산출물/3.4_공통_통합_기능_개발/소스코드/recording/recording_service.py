@@ -5,17 +5,17 @@ AWS S3, 암호화, 압축, 메타데이터 관리
 """
 
 import asyncio
+import itertools
 import json
 import logging
 import os
 import tempfile
 import uuid
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, BinaryIO
+from typing import Dict, List, Optional, Any, AsyncIterator, BinaryIO, Iterable, Iterator
 from dataclasses import dataclass, asdict
 from enum import Enum
 import boto3
-import aiofiles
 import aioredis
 from cryptography.fernet import Fernet
 from sqlalchemy import create_engine, Column, String, DateTime, Integer, Text, Boolean, LargeBinary
@@ -23,6 +23,10 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import structlog
 
+from .chunked_encryption import DEFAULT_CHUNK_SIZE, MAGIC, ChunkedCipher, encrypted_size
+from .chat_log_spool import DEFAULT_COMMIT_INTERVAL, ChatLogSpool, SpoolSession
+from .s3_transfer import DEFAULT_MAX_CONCURRENCY, DEFAULT_PART_SIZE, S3TransferManager
+
 # 로깅 설정
 logger = structlog.get_logger(__name__)
 
@@ -123,13 +127,15 @@ class ChatLog(Base):
 class EncryptionManager:
     """암호화 관리자"""
     
-    def __init__(self, master_key: str = None):
+    def __init__(self, master_key: str = None, chunk_size: int = DEFAULT_CHUNK_SIZE):
         if master_key:
             self.master_key = master_key.encode()
         else:
             self.master_key = Fernet.generate_key()
         
         self.cipher_suite = Fernet(self.master_key)
+        # 파일은 청크 단위로 암호화 (메모리 사용량이 파일 크기와 무관)
+        self.file_cipher = ChunkedCipher(self.master_key, chunk_size)
     
     def encrypt_data(self, data: bytes) -> bytes:
         """데이터 암호화"""
@@ -142,35 +148,88 @@ class EncryptionManager:
     def generate_key(self) -> str:
         """새로운 암호화 키 생성"""
         return Fernet.generate_key().decode()
+    
+    def encrypt_file(self, input_path: str, output_path: str):
+        """파일 청크 단위 스트리밍 암호화"""
+        self.file_cipher.encrypt_file(input_path, output_path)
+    
+    def encrypt_stream(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """바이트 스트림 청크 단위 암호화 (S3 스트리밍 업로드용)"""
+        return self.file_cipher.encrypt_stream(chunks)
+    
+    def encrypt_file_stream(self, input_path: str) -> Iterator[bytes]:
+        """파일을 읽으며 암호화 데이터 생성 (S3 스트리밍 업로드용)"""
+        return self.file_cipher.iter_encrypted_file(input_path)
+    
+    def encrypted_size(self, plaintext_size: int) -> int:
+        """원본 크기로 암호화 데이터 크기 계산"""
+        return encrypted_size(plaintext_size, self.file_cipher.chunk_size)
+    
+    def decrypt_file(self, input_path: str, output_path: str):
+        """파일 복호화 (청크 형식 이전에 Fernet으로 통째로 암호화된 파일도 지원)"""
+        with open(input_path, 'rb') as f_in, open(output_path, 'wb') as f_out:
+            for chunk in self.decrypt_stream(iter(lambda: f_in.read(1024 * 1024), b'')):
+                f_out.write(chunk)
+    
+    def decrypt_stream(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """암호화 스트림 복호화 (Fernet 전체 암호화 데이터면 모아서 한 번에 복호화)"""
+        chunks = iter(chunks)
+        first = next(chunks, b'')
+        stream = itertools.chain([first], chunks)
+        if first.startswith(MAGIC):
+            yield from self.file_cipher.decrypt_stream(stream)
+        else:
+            yield self.decrypt_data(b''.join(stream))
+
+def _iter_file(file_path: str, chunk_size: int = 1024 * 1024) -> Iterator[bytes]:
+    """파일을 고정 크기로 나눠 읽기"""
+    with open(file_path, 'rb') as f:
+        yield from iter(lambda: f.read(chunk_size), b'')
 
 class S3StorageManager:
     """AWS S3 저장소 관리자"""
     
-    def __init__(self, bucket_name: str, region_name: str = 'ap-northeast-2'):
+    def __init__(self, bucket_name: str, region_name: str = 'ap-northeast-2',
+                 endpoint_url: Optional[str] = None, part_size: int = DEFAULT_PART_SIZE,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY):
         self.bucket_name = bucket_name
-        self.s3_client = boto3.client('s3', region_name=region_name)
+        # endpoint_url 지정 시 MinIO 등 S3 호환 저장소 사용
+        self.s3_client = boto3.client('s3', region_name=region_name, endpoint_url=endpoint_url)
         self.region_name = region_name
+        # 모든 S3 I/O는 전송 계층을 통해 이벤트 루프 밖(스레드)에서 실행
+        self.transfer = S3TransferManager(self.s3_client, bucket_name, part_size, max_concurrency)
+    
+    def get_s3_url(self, s3_key: str) -> str:
+        """S3 키의 s3:// URL"""
+        return f"s3://{self.bucket_name}/{s3_key}"
     
     async def upload_file(self, file_path: str, s3_key: str, 
                          metadata: Dict[str, str] = None) -> str:
         """파일을 S3에 업로드"""
+        return await self.upload_stream(_iter_file(file_path), s3_key, metadata)
+    
+    async def upload_stream(self, chunks: Iterable[bytes], s3_key: str,
+                            metadata: Dict[str, str] = None) -> str:
+        """
+        바이트 스트림을 S3에 업로드 (멀티파트 병렬 업로드)
+        
+        Args:
+            chunks: 업로드할 바이트 청크 이터레이터 (예: 스트리밍 암호화기 출력)
+            s3_key: S3 키
+            metadata: 객체 메타데이터
+        
+        Returns:
+            s3:// URL
+        """
         try:
-            extra_args = {}
-            if metadata:
-                extra_args['Metadata'] = metadata
-            
-            # 서버 사이드 암호화 설정
-            extra_args['ServerSideEncryption'] = 'AES256'
-            
-            self.s3_client.upload_file(
-                file_path, 
-                self.bucket_name, 
-                s3_key,
-                ExtraArgs=extra_args
+            stats = await asyncio.to_thread(
+                self.transfer.upload_stream, s3_key, chunks, metadata,
+                {'ServerSideEncryption': 'AES256'}  # 서버 사이드 암호화 설정
             )
             
-            s3_url = f"s3://{self.bucket_name}/{s3_key}"
-            logger.info("S3 업로드 완료", s3_url=s3_url, file_size=os.path.getsize(file_path))
+            s3_url = self.get_s3_url(s3_key)
+            logger.info("S3 업로드 완료", s3_url=s3_url, file_size=stats.size, parts=stats.parts,
+                        throughput_mb_s=round(stats.throughput / (1024 * 1024), 2))
             
             return s3_url
             
@@ -181,18 +240,36 @@ class S3StorageManager:
     async def download_file(self, s3_key: str, local_path: str) -> str:
         """S3에서 파일 다운로드"""
         try:
-            self.s3_client.download_file(self.bucket_name, s3_key, local_path)
-            logger.info("S3 다운로드 완료", s3_key=s3_key, local_path=local_path)
+            stats = await asyncio.to_thread(self.transfer.download_file, s3_key, local_path)
+            logger.info("S3 다운로드 완료", s3_key=s3_key, local_path=local_path,
+                        throughput_mb_s=round(stats.throughput / (1024 * 1024), 2))
             return local_path
             
         except Exception as e:
             logger.error("S3 다운로드 실패", error=str(e), s3_key=s3_key)
             raise
     
+    def iter_object(self, s3_key: str) -> Iterator[bytes]:
+        """S3 객체 병렬 다운로드 청크 이터레이터 (동기 호출, 스레드에서 사용)"""
+        return self.transfer.iter_object(s3_key)
+    
+    def read_range(self, s3_key: str, offset: int, length: int) -> bytes:
+        """S3 객체 일부 구간 읽기 (동기 호출, 스레드에서 사용)"""
+        try:
+            return self.transfer.read_range(s3_key, offset, length)
+            
+        except Exception as e:
+            logger.error("S3 범위 읽기 실패", error=str(e), s3_key=s3_key, offset=offset)
+            raise
+    
+    def get_transfer_metrics(self) -> Dict[str, Dict[str, float]]:
+        """작업 종류별 전송량/처리량 통계"""
+        return self.transfer.metrics.snapshot()
+    
     async def delete_file(self, s3_key: str):
         """S3에서 파일 삭제"""
         try:
-            self.s3_client.delete_object(Bucket=self.bucket_name, Key=s3_key)
+            await asyncio.to_thread(self.s3_client.delete_object, Bucket=self.bucket_name, Key=s3_key)
             logger.info("S3 파일 삭제 완료", s3_key=s3_key)
             
         except Exception as e:
@@ -202,7 +279,8 @@ class S3StorageManager:
     async def generate_presigned_url(self, s3_key: str, expiration: int = 3600) -> str:
         """사전 서명된 URL 생성"""
         try:
-            url = self.s3_client.generate_presigned_url(
+            url = await asyncio.to_thread(
+                self.s3_client.generate_presigned_url,
                 'get_object',
                 Params={'Bucket': self.bucket_name, 'Key': s3_key},
                 ExpiresIn=expiration
@@ -337,14 +415,10 @@ class VoiceRecordingManager:
                 temp_file, converted_file, 'mp3', 'medium'
             )
             
-            # 파일 암호화
-            encrypted_file = converted_file + '.enc'
-            await self._encrypt_file(converted_file, encrypted_file)
-            
-            # S3에 업로드
+            # 암호화하면서 S3에 바로 업로드 (임시 암호화 파일 없음)
             s3_key = f"recordings/voice/{recording_info['session_id']}/{recording_id}.mp3.enc"
-            s3_url = await self.storage_manager.upload_file(
-                encrypted_file, 
+            s3_url = await self.storage_manager.upload_stream(
+                self.encryption_manager.encrypt_file_stream(converted_file),
                 s3_key,
                 metadata={
                     'recording_id': recording_id,
@@ -365,14 +439,14 @@ class VoiceRecordingManager:
                 start_time=recording_info['start_time'],
                 end_time=recording_info['end_time'],
                 duration=int(audio_metadata.get('duration', 0)),
-                file_size=os.path.getsize(encrypted_file),
+                file_size=self.encryption_manager.encrypted_size(os.path.getsize(converted_file)),
                 file_format='mp3',
                 quality='medium',
                 storage_location=s3_url
             )
             
             # 임시 파일 정리
-            for file_path in [temp_file, converted_file, encrypted_file]:
+            for file_path in [temp_file, converted_file]:
                 if os.path.exists(file_path):
                     os.remove(file_path)
             
@@ -392,46 +466,46 @@ class VoiceRecordingManager:
                         recording_id=recording_id, 
                         error=str(e))
             raise
-    
-    async def _encrypt_file(self, input_file: str, output_file: str):
-        """파일 암호화"""
-        async with aiofiles.open(input_file, 'rb') as f_in:
-            data = await f_in.read()
-        
-        encrypted_data = self.encryption_manager.encrypt_data(data)
-        
-        async with aiofiles.open(output_file, 'wb') as f_out:
-            await f_out.write(encrypted_data)
 
 class ChatLogManager:
     """채팅 로그 관리자"""
     
     def __init__(self, storage_manager: S3StorageManager,
-                 encryption_manager: EncryptionManager):
+                 encryption_manager: EncryptionManager,
+                 spool: ChatLogSpool):
         self.storage_manager = storage_manager
         self.encryption_manager = encryption_manager
-        self.active_sessions: Dict[str, List[Dict]] = {}
+        # 진행 중인 세션 메시지는 메모리 대신 WAL 스풀에 기록
+        self.spool = spool
+        
+        recovered = self.spool.recover()
+        if recovered:
+            logger.warning("종료되지 않은 채팅 로그 복구", session_count=len(recovered), session_ids=recovered)
+    
+    @property
+    def active_sessions(self) -> List[str]:
+        """로깅 중인 채팅 세션 ID 목록"""
+        return [session.session_id for session in self.spool.list_sessions()]
     
     async def start_chat_logging(self, session_id: str, agent_id: str, 
                                customer_id: str) -> str:
         """채팅 로깅 시작"""
         recording_id = str(uuid.uuid4())
         
-        if session_id not in self.active_sessions:
-            self.active_sessions[session_id] = []
+        session = await self.spool.open_session(session_id, recording_id, agent_id, customer_id)
         
         logger.info("채팅 로깅 시작", 
-                   recording_id=recording_id,
+                   recording_id=session.recording_id,
                    session_id=session_id)
         
-        return recording_id
+        return session.recording_id
     
     async def log_message(self, session_id: str, sender_id: str, 
                          sender_type: str, message_type: str, 
                          content: str, metadata: Dict = None):
-        """메시지 로깅"""
-        if session_id not in self.active_sessions:
-            self.active_sessions[session_id] = []
+        """메시지 로깅 (스풀 fsync 후 반환)"""
+        if not self.spool.get_session(session_id):
+            await self.spool.open_session(session_id, '')
         
         log_entry = {
             'id': str(uuid.uuid4()),
@@ -443,7 +517,7 @@ class ChatLogManager:
             'metadata': metadata or {}
         }
         
-        self.active_sessions[session_id].append(log_entry)
+        await self.spool.append(session_id, log_entry)
         
         logger.debug("메시지 로깅", 
                     session_id=session_id,
@@ -451,75 +525,57 @@ class ChatLogManager:
                     message_type=message_type)
     
     async def end_chat_logging(self, session_id: str, recording_id: str) -> RecordingMetadata:
-        """채팅 로깅 종료 및 저장"""
-        if session_id not in self.active_sessions:
+        """채팅 로깅 종료 및 저장 (업로드 실패 시 스풀에 남아 다시 시도 가능)"""
+        if not self.spool.get_session(session_id):
             raise ValueError(f"활성 채팅 세션을 찾을 수 없습니다: {session_id}")
         
-        chat_logs = self.active_sessions[session_id]
-        
         try:
-            # 채팅 로그를 JSON으로 직렬화
-            chat_data = {
-                'session_id': session_id,
-                'recording_id': recording_id,
-                'start_time': chat_logs[0]['timestamp'] if chat_logs else datetime.now().isoformat(),
-                'end_time': datetime.now().isoformat(),
-                'message_count': len(chat_logs),
-                'messages': chat_logs
-            }
+            session = await self.spool.seal(session_id)
+            start_time = datetime.fromisoformat(session.first_message_at or session.start_time)
+            end_time = datetime.now()
             
-            # 임시 파일에 저장
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as temp_file:
-                json.dump(chat_data, temp_file, ensure_ascii=False, indent=2)
-                temp_file_path = temp_file.name
+            # 스풀에서 읽어 JSON 직렬화 -> 암호화 -> S3 업로드를 스트리밍으로 진행
+            plaintext_size = [0]
             
-            # 파일 암호화
-            encrypted_file = temp_file_path + '.enc'
-            await self._encrypt_file(temp_file_path, encrypted_file)
+            def transcript() -> Iterator[bytes]:
+                for data in self._iter_transcript(session, recording_id, start_time, end_time):
+                    plaintext_size[0] += len(data)
+                    yield data
             
-            # S3에 업로드
             s3_key = f"recordings/chat/{session_id}/{recording_id}.json.enc"
-            s3_url = await self.storage_manager.upload_file(
-                encrypted_file,
+            s3_url = await self.storage_manager.upload_stream(
+                self.encryption_manager.encrypt_stream(transcript()),
                 s3_key,
                 metadata={
                     'recording_id': recording_id,
                     'session_id': session_id,
                     'recording_type': RecordingType.CHAT_SESSION.value,
-                    'message_count': str(len(chat_logs))
+                    'message_count': str(session.message_count)
                 }
             )
             
             # 메타데이터 생성
-            start_time = datetime.fromisoformat(chat_logs[0]['timestamp']) if chat_logs else datetime.now()
-            end_time = datetime.now()
-            
             metadata = RecordingMetadata(
                 recording_id=recording_id,
                 session_id=session_id,
-                agent_id=chat_logs[0]['sender_id'] if chat_logs else '',
-                customer_id='',  # 채팅에서 고객 ID 추출 로직 필요
+                agent_id=session.agent_id,
+                customer_id=session.customer_id,
                 recording_type=RecordingType.CHAT_SESSION,
                 start_time=start_time,
                 end_time=end_time,
                 duration=int((end_time - start_time).total_seconds()),
-                file_size=os.path.getsize(encrypted_file),
+                file_size=self.encryption_manager.encrypted_size(plaintext_size[0]),
                 file_format='json',
                 storage_location=s3_url
             )
             
-            # 임시 파일 정리
-            for file_path in [temp_file_path, encrypted_file]:
-                if os.path.exists(file_path):
-                    os.remove(file_path)
-            
-            # 활성 세션에서 제거
-            del self.active_sessions[session_id]
+            # 업로드 완료된 스풀 파일 삭제
+            self.spool.discard(session_id)
             
             logger.info("채팅 로깅 완료",
                        recording_id=recording_id,
                        session_id=session_id,
-                       message_count=len(chat_logs))
+                       message_count=session.message_count)
             
             return metadata
             
@@ -530,15 +586,22 @@ class ChatLogManager:
                         error=str(e))
             raise
     
-    async def _encrypt_file(self, input_file: str, output_file: str):
-        """파일 암호화"""
-        async with aiofiles.open(input_file, 'rb') as f_in:
-            data = await f_in.read()
+    def _iter_transcript(self, session: SpoolSession, recording_id: str,
+                         start_time: datetime, end_time: datetime) -> Iterator[bytes]:
+        """스풀 메시지를 채팅 로그 JSON으로 조금씩 직렬화"""
+        header = json.dumps({
+            'session_id': session.session_id,
+            'recording_id': recording_id,
+            'start_time': start_time.isoformat(),
+            'end_time': end_time.isoformat(),
+            'message_count': session.message_count
+        }, ensure_ascii=False)
+        yield (header[:-1] + ', "messages": [').encode('utf-8')
         
-        encrypted_data = self.encryption_manager.encrypt_data(data)
+        for index, entry in enumerate(self.spool.iter_entries(session.session_id)):
+            yield ((', ' if index else '') + json.dumps(entry, ensure_ascii=False)).encode('utf-8')
         
-        async with aiofiles.open(output_file, 'wb') as f_out:
-            await f_out.write(encrypted_data)
+        yield b']}'
 
 class RecordingService:
     """통합 녹취/저장 서비스"""
@@ -557,10 +620,16 @@ class RecordingService:
             self.redis_client = aioredis.from_url(config['redis_url'])
         
         # 컴포넌트 초기화
-        self.encryption_manager = EncryptionManager(config.get('encryption_key'))
+        self.encryption_manager = EncryptionManager(
+            config.get('encryption_key'),
+            config.get('encryption_chunk_size', DEFAULT_CHUNK_SIZE)
+        )
         self.storage_manager = S3StorageManager(
             config['s3_bucket'], 
-            config.get('aws_region', 'ap-northeast-2')
+            config.get('aws_region', 'ap-northeast-2'),
+            endpoint_url=config.get('s3_endpoint_url'),
+            part_size=config.get('s3_part_size', DEFAULT_PART_SIZE),
+            max_concurrency=config.get('s3_max_concurrency', DEFAULT_MAX_CONCURRENCY)
         )
         self.audio_processor = AudioProcessor()
         
@@ -572,7 +641,11 @@ class RecordingService:
         
         self.chat_log_manager = ChatLogManager(
             self.storage_manager,
-            self.encryption_manager
+            self.encryption_manager,
+            ChatLogSpool(
+                config.get('chat_log_spool_dir', os.path.join(tempfile.gettempdir(), 'chat_log_spool')),
+                commit_interval=config.get('chat_log_commit_interval', DEFAULT_COMMIT_INTERVAL)
+            )
         )
     
     async def start_voice_recording(self, session_id: str, agent_id: str, 
@@ -669,23 +742,15 @@ class RecordingService:
         if not recording:
             raise ValueError(f"녹음을 찾을 수 없습니다: {recording_id}")
         
-        # S3에서 다운로드
+        # S3에서 병렬로 받으면서 바로 복호화 (임시 암호화 파일 없음, 이벤트 루프 밖에서 실행)
         s3_key = recording.storage_location.replace(f"s3://{self.config['s3_bucket']}/", "")
-        encrypted_file = output_path + '.enc'
-        
-        await self.storage_manager.download_file(s3_key, encrypted_file)
-        
-        # 복호화
-        async with aiofiles.open(encrypted_file, 'rb') as f_in:
-            encrypted_data = await f_in.read()
         
-        decrypted_data = self.encryption_manager.decrypt_data(encrypted_data)
+        def restore():
+            with open(output_path, 'wb') as f_out:
+                for chunk in self.encryption_manager.decrypt_stream(self.storage_manager.iter_object(s3_key)):
+                    f_out.write(chunk)
         
-        async with aiofiles.open(output_path, 'wb') as f_out:
-            await f_out.write(decrypted_data)
-        
-        # 임시 암호화 파일 삭제
-        os.remove(encrypted_file)
+        await asyncio.to_thread(restore)
         
         logger.info("녹음 파일 다운로드 완료", 
                    recording_id=recording_id,
@@ -693,6 +758,44 @@ class RecordingService:
         
         return output_path
     
+    async def read_recording_range(self, recording_id: str, start: int,
+                                   end: Optional[int] = None) -> AsyncIterator[bytes]:
+        """
+        녹음 파일 일부 구간 복호화 (재생 위치 탐색용)
+        
+        필요한 청크만 S3 범위 요청으로 읽어 복호화하므로 전체 파일을 내려받지 않습니다.
+        
+        Args:
+            recording_id: 녹음 ID
+            start: 평문 시작 바이트
+            end: 평문 끝 바이트 (포함하지 않음, None이면 끝까지)
+        
+        Returns:
+            복호화된 평문 청크 비동기 이터레이터
+        """
+        recording = await self.get_recording(recording_id)
+        if not recording:
+            raise ValueError(f"녹음을 찾을 수 없습니다: {recording_id}")
+        if not recording.file_size:
+            raise ValueError(f"녹음 파일 크기를 알 수 없습니다: {recording_id}")
+        
+        s3_key = recording.storage_location.replace(f"s3://{self.config['s3_bucket']}/", "")
+        chunks = self.encryption_manager.file_cipher.decrypt_range(
+            lambda offset, length: self.storage_manager.read_range(s3_key, offset, length),
+            recording.file_size, start, end
+        )
+        
+        # S3 요청과 복호화는 스레드에서 한 청크씩 진행
+        while True:
+            chunk = await asyncio.to_thread(next, chunks, None)
+            if chunk is None:
+                break
+            yield chunk
+    
+    def get_transfer_metrics(self) -> Dict[str, Dict[str, float]]:
+        """S3 전송량/처리량 통계 (업로드, 다운로드, 구간 읽기)"""
+        return self.storage_manager.get_transfer_metrics()
+    
     async def delete_recording(self, recording_id: str):
         """녹음 삭제"""
         recording = await self.get_recording(recording_id)
@@ -773,7 +876,13 @@ DEFAULT_CONFIG = {
     'redis_url': 'redis://localhost:6379',
     's3_bucket': 'aicc-recordings',
     'aws_region': 'ap-northeast-2',
-    'encryption_key': None  # 자동 생성
+    's3_endpoint_url': None,  # S3 호환 저장소 주소 (예: 로컬 MinIO)
+    's3_part_size': 8 * 1024 * 1024,  # 멀티파트 파트 크기 (bytes, 최소 5MB)
+    's3_max_concurrency': 4,  # 동시 전송 파트 수
+    'chat_log_spool_dir': '/app/temp/chat_log_spool',  # 진행 중 채팅 로그 WAL 디렉토리 (재시작 후에도 유지되는 볼륨)
+    'chat_log_commit_interval': 0.01,  # 그룹 커밋 fsync 간격 (초)
+    'encryption_key': None,  # 자동 생성
+    'encryption_chunk_size': 64 * 1024  # 파일 암호화 청크 크기 (bytes)
 }
 
 async def main():
@@ -0,0 +1,247 @@
+"""
+S3 전송 계층
+스트리밍 멀티파트 업로드, 병렬 범위 다운로드, 구간 읽기, 전송 처리량 통계
+
+- 모든 S3 호출은 동기 boto3 호출이며 호출자가 이벤트 루프 밖(스레드)에서 실행
+- 업로드는 청크 이터레이터(예: 스트리밍 암호화기 출력)를 파트 크기로 모아 병렬 업로드하므로
+  임시 파일 없이 메모리 사용량이 (동시 파트 수 + 1) x 파트 크기로 제한됨
+- 다운로드는 파트 크기 구간을 병렬로 미리 읽어 순서대로 내보냄
+- endpoint_url로 MinIO 등 S3 호환 로컬 저장소 사용 가능
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import chain
+from typing import Any, Dict, Iterable, Iterator, List
+
+# S3 멀티파트 파트 최소 크기 (마지막 파트 제외)
+MIN_PART_SIZE = 5 * 1024 * 1024
+DEFAULT_PART_SIZE = 8 * 1024 * 1024
+DEFAULT_MAX_CONCURRENCY = 4
+
+
+@dataclass
+class TransferStats:
+    """전송 1건 결과"""
+    operation: str  # upload, download, range
+    key: str
+    size: int  # bytes
+    parts: int
+    seconds: float
+
+    @property
+    def throughput(self) -> float:
+        """초당 전송 바이트"""
+        return self.size / self.seconds if self.seconds > 0 else 0.0
+
+
+class TransferMetrics:
+    """작업 종류별 전송량/처리량 누적 통계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals: Dict[str, Dict[str, float]] = {}
+
+    def record(self, stats: TransferStats):
+        """전송 결과 누적"""
+        with self._lock:
+            totals = self._totals.setdefault(
+                stats.operation, {'count': 0, 'bytes': 0, 'parts': 0, 'seconds': 0.0, 'last_throughput': 0.0}
+            )
+            totals['count'] += 1
+            totals['bytes'] += stats.size
+            totals['parts'] += stats.parts
+            totals['seconds'] += stats.seconds
+            totals['last_throughput'] = stats.throughput
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """
+        작업 종류별 통계 조회
+
+        Returns:
+            {operation: {count, bytes, parts, seconds, throughput_mb_s, last_throughput_mb_s}}
+        """
+        with self._lock:
+            result = {}
+            for operation, totals in self._totals.items():
+                throughput = totals['bytes'] / totals['seconds'] if totals['seconds'] > 0 else 0.0
+                result[operation] = {
+                    'count': totals['count'],
+                    'bytes': totals['bytes'],
+                    'parts': totals['parts'],
+                    'seconds': round(totals['seconds'], 3),
+                    'throughput_mb_s': round(throughput / (1024 * 1024), 2),
+                    'last_throughput_mb_s': round(totals['last_throughput'] / (1024 * 1024), 2),
+                }
+            return result
+
+
+class S3TransferManager:
+    """S3 스트리밍/병렬 전송 관리자"""
+
+    def __init__(self, s3_client, bucket_name: str, part_size: int = DEFAULT_PART_SIZE,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY):
+        if part_size < MIN_PART_SIZE:
+            raise ValueError(f"파트 크기는 {MIN_PART_SIZE} bytes 이상이어야 합니다: {part_size}")
+        if max_concurrency < 1:
+            raise ValueError(f"동시 전송 수는 1 이상이어야 합니다: {max_concurrency}")
+
+        self.s3_client = s3_client
+        self.bucket_name = bucket_name
+        self.part_size = part_size
+        self.max_concurrency = max_concurrency
+        self.metrics = TransferMetrics()
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='s3-transfer')
+
+    def upload_stream(self, key: str, chunks: Iterable[bytes], metadata: Dict[str, str] = None,
+                      extra_args: Dict[str, Any] = None) -> TransferStats:
+        """
+        청크 스트림을 S3에 업로드
+
+        파트 크기 이하면 PutObject 한 번, 넘으면 멀티파트 업로드로 파트를 병렬 전송합니다.
+        실패하면 멀티파트 업로드를 중단해 미완성 파트가 남지 않게 합니다.
+
+        Args:
+            key: S3 키
+            chunks: 업로드할 바이트 청크 이터레이터
+            metadata: 객체 메타데이터
+            extra_args: PutObject/CreateMultipartUpload 추가 인자 (예: ServerSideEncryption)
+
+        Returns:
+            전송 결과
+        """
+        start = time.perf_counter()
+        params = dict(extra_args or {})
+        if metadata:
+            params['Metadata'] = metadata
+
+        parts = _rechunk(chunks, self.part_size)
+        first = next(parts, b'')
+        second = next(parts, None)
+        if second is None:
+            self.s3_client.put_object(Bucket=self.bucket_name, Key=key, Body=first, **params)
+            size, count = len(first), 1
+        else:
+            size, count = self._upload_multipart(key, chain([first, second], parts), params)
+
+        stats = TransferStats('upload', key, size, count, time.perf_counter() - start)
+        self.metrics.record(stats)
+        return stats
+
+    def _upload_multipart(self, key: str, parts: Iterator[bytes], params: Dict[str, Any]):
+        """멀티파트 업로드 (동시 파트 수 제한)"""
+        upload_id = self.s3_client.create_multipart_upload(
+            Bucket=self.bucket_name, Key=key, **params
+        )['UploadId']
+        pending = deque()
+        completed: List[Dict[str, Any]] = []
+        size = 0
+        try:
+            for number, body in enumerate(parts, start=1):
+                if len(pending) >= self.max_concurrency:
+                    completed.append(pending.popleft().result())
+                pending.append(self._executor.submit(self._upload_part, key, upload_id, number, body))
+                size += len(body)
+            while pending:
+                completed.append(pending.popleft().result())
+
+            self.s3_client.complete_multipart_upload(
+                Bucket=self.bucket_name, Key=key, UploadId=upload_id,
+                MultipartUpload={'Parts': completed}
+            )
+            return size, len(completed)
+        except BaseException:
+            for future in pending:
+                future.cancel()
+            self.s3_client.abort_multipart_upload(Bucket=self.bucket_name, Key=key, UploadId=upload_id)
+            raise
+
+    def _upload_part(self, key: str, upload_id: str, number: int, body: bytes) -> Dict[str, Any]:
+        """파트 하나 업로드"""
+        response = self.s3_client.upload_part(
+            Bucket=self.bucket_name, Key=key, UploadId=upload_id, PartNumber=number, Body=body
+        )
+        return {'PartNumber': number, 'ETag': response['ETag']}
+
+    def upload_file(self, file_path: str, key: str, metadata: Dict[str, str] = None,
+                    extra_args: Dict[str, Any] = None) -> TransferStats:
+        """로컬 파일 업로드 (파트 단위로 읽음)"""
+        with open(file_path, 'rb') as f:
+            return self.upload_stream(key, iter(lambda: f.read(self.part_size), b''), metadata, extra_args)
+
+    def iter_object(self, key: str) -> Iterator[bytes]:
+        """
+        S3 객체를 파트 크기 구간으로 병렬 다운로드해 순서대로 반환
+
+        Args:
+            key: S3 키
+
+        Returns:
+            객체 내용 청크 이터레이터 (동시에 최대 max_concurrency 구간을 미리 읽음)
+        """
+        start = time.perf_counter()
+        total = self.get_object_size(key)
+        pending = deque()
+        count = 0
+        try:
+            for offset in range(0, total, self.part_size):
+                if len(pending) >= self.max_concurrency:
+                    yield pending.popleft().result()
+                length = min(self.part_size, total - offset)
+                pending.append(self._executor.submit(self._get_range, key, offset, length))
+                count += 1
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+        self.metrics.record(TransferStats('download', key, total, count, time.perf_counter() - start))
+
+    def download_file(self, key: str, file_path: str) -> TransferStats:
+        """S3 객체를 로컬 파일로 다운로드"""
+        start = time.perf_counter()
+        size = count = 0
+        with open(file_path, 'wb') as f:
+            for data in self.iter_object(key):
+                f.write(data)
+                size += len(data)
+                count += 1
+        return TransferStats('download', key, size, count, time.perf_counter() - start)
+
+    def read_range(self, key: str, offset: int, length: int) -> bytes:
+        """S3 객체 일부 구간 읽기 (재생 위치 탐색용)"""
+        start = time.perf_counter()
+        data = self._get_range(key, offset, length)
+        self.metrics.record(TransferStats('range', key, len(data), 1, time.perf_counter() - start))
+        return data
+
+    def _get_range(self, key: str, offset: int, length: int) -> bytes:
+        """범위 GET 한 번"""
+        response = self.s3_client.get_object(
+            Bucket=self.bucket_name, Key=key, Range=f"bytes={offset}-{offset + length - 1}"
+        )
+        return response['Body'].read()
+
+    def get_object_size(self, key: str) -> int:
+        """S3 객체 크기 조회"""
+        return self.s3_client.head_object(Bucket=self.bucket_name, Key=key)['ContentLength']
+
+    def close(self):
+        """전송 스레드 풀 종료"""
+        self._executor.shutdown(wait=True)
+
+
+def _rechunk(chunks: Iterable[bytes], size: int) -> Iterator[bytes]:
+    """임의 크기 청크를 고정 크기 파트로 재구성 (마지막 파트만 짧을 수 있음)"""
+    buffer = bytearray()
+    for data in chunks:
+        buffer += data
+        while len(buffer) >= size:
+            yield bytes(buffer[:size])
+            del buffer[:size]
+    if buffer:
+        yield bytes(buffer)